@@ -5,6 +5,7 @@ from collections.abc import AsyncGenerator
 import os
 from pathlib import Path
 import sys
+import time
 from typing import Any, cast, override
 
 from acp import (
@@ -38,8 +39,13 @@ from acp.schema import (
     ModelInfo,
     PromptCapabilities,
     ResumeSessionResponse,
+    SessionCapabilities,
+    SessionForkCapabilities,
+    SessionInfo,
+    SessionListCapabilities,
     SessionModelState,
     SessionModeState,
+    SessionResumeCapabilities,
     SseMcpServer,
     TextContentBlock,
     TextResourceContents,
@@ -47,7 +53,7 @@ from acp.schema import (
     ToolCallUpdate,
     UserMessageChunk,
 )
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from bloom import BLOOM_ROOT, __version__
 from bloom.acp.tools.base import BaseAcpTool
@@ -55,18 +61,22 @@ from bloom.acp.tools.session_update import (
     tool_call_session_update,
     tool_result_session_update,
 )
+from bloom.acp.update_queue import SessionUpdateQueue, UpdateQueueStats
 from bloom.acp.utils import (
     TOOL_OPTIONS,
     ToolOption,
     create_compact_end_session_update,
     create_compact_start_session_update,
     get_all_acp_session_modes,
+    history_session_updates,
     is_valid_acp_agent,
 )
 from bloom.core.agent_loop import AgentLoop
 from bloom.core.agents.models import BuiltinAgentName
 from bloom.core.autocompletion.path_prompt_adapter import render_path_prompt
 from bloom.core.config import BloomConfig, MissingAPIKeyError, load_dotenv_values
+from bloom.core.session.session_index import SessionIndex, SessionSummary
+from bloom.core.session.session_loader import SessionLoader
 from bloom.core.tools.base import BaseToolConfig, ToolPermission
 from bloom.core.types import (
     ApprovalResponse,
@@ -74,7 +84,9 @@ from bloom.core.types import (
     AsyncApprovalCallback,
     CompactEndEvent,
     CompactStartEvent,
+    LLMMessage,
     ReasoningEvent,
+    Role,
     ToolCallEvent,
     ToolResultEvent,
     ToolStreamEvent,
@@ -82,12 +94,75 @@ from bloom.core.types import (
 )
 from bloom.core.utils import CancellationReason, get_user_cancellation_message
 
+SESSION_STATS_METHOD = "bloom/session_stats"
+# A loaded session shows the client only its latest messages; the agent still
+# gets the whole history.
+REPLAY_TAIL_MESSAGES = 100
+LIST_SESSIONS_PAGE_SIZE = 50
+
+
+def _share_messages(messages: list[LLMMessage]) -> list[LLMMessage]:
+    """Copy a history for a forked session without copying what it says.
+
+    Each copy is a new message object that points at the same content, reasoning
+    and tool calls as the original. Nothing in a history is edited in place
+    except by assigning a message's attributes, which then lands on one side of
+    the fork only.
+    """
+    return [message.model_copy() for message in messages]
+
+
+class PromptStats(BaseModel):
+    """How long a session's prompts waited behind each other and then ran."""
+
+    completed: int = 0
+    last_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    total_wait_seconds: float = 0.0
+    last_run_seconds: float = 0.0
+    total_run_seconds: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.last_wait_seconds = seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+        self.total_wait_seconds += seconds
+
+    def record_run(self, seconds: float) -> None:
+        self.completed += 1
+        self.last_run_seconds = seconds
+        self.total_run_seconds += seconds
+
 
 class AcpSessionLoop(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     id: str
     agent_loop: AgentLoop
+    # The prompt being answered, and the ones waiting for it, oldest first.
     task: asyncio.Task[None] | None = None
+    queue: list[asyncio.Task[None]] = Field(default_factory=list)
+    prompt_lock: asyncio.Lock = Field(default_factory=asyncio.Lock)
+    stats: PromptStats = Field(default_factory=PromptStats)
+    updates: UpdateQueueStats = Field(default_factory=UpdateQueueStats)
+    # Loads a saved history in the background; prompts wait for it.
+    history: asyncio.Task[None] | None = None
+
+    def stats_snapshot(self) -> dict[str, Any]:
+        return {
+            "sessionId": self.id,
+            "running": self.task is not None,
+            "queueDepth": len(self.queue),
+            "completedPrompts": self.stats.completed,
+            "lastWaitMs": round(self.stats.last_wait_seconds * 1000),
+            "maxWaitMs": round(self.stats.max_wait_seconds * 1000),
+            "totalWaitMs": round(self.stats.total_wait_seconds * 1000),
+            "lastRunMs": round(self.stats.last_run_seconds * 1000),
+            "totalRunMs": round(self.stats.total_run_seconds * 1000),
+            "updatesSent": self.updates.sent,
+            "updatesMerged": self.updates.merged,
+            "updatesDropped": self.updates.dropped,
+            "backpressureWaits": self.updates.backpressure_waits,
+            "backpressureMs": round(self.updates.backpressure_seconds * 1000),
+        }
 
 
 class BloomAcpAgentLoop(AcpAgent):
@@ -96,6 +171,8 @@ class BloomAcpAgentLoop(AcpAgent):
     def __init__(self) -> None:
         self.sessions: dict[str, AcpSessionLoop] = {}
         self.client_capabilities = None
+        # Session setup reads the process cwd, so only one runs at a time.
+        self._setup_lock = asyncio.Lock()
 
     @override
     async def initialize(
@@ -150,10 +227,15 @@ class BloomAcpAgentLoop(AcpAgent):
 
         response = InitializeResponse(
             agent_capabilities=AgentCapabilities(
-                load_session=False,
+                load_session=True,
                 prompt_capabilities=PromptCapabilities(
                     audio=False, embedded_context=True, image=False
                 ),
+                session_capabilities=SessionCapabilities(
+                    fork=SessionForkCapabilities(),
+                    list=SessionListCapabilities(),
+                    resume=SessionResumeCapabilities(),
+                ),
             ),
             protocol_version=PROTOCOL_VERSION,
             agent_info=Implementation(
@@ -176,47 +258,126 @@ class BloomAcpAgentLoop(AcpAgent):
         mcp_servers: list[HttpMcpServer | SseMcpServer | McpServerStdio] | None = None,
         **kwargs: Any,
     ) -> NewSessionResponse:
-        load_dotenv_values()
-        os.chdir(cwd)
+        # Loading the config, starting MCP servers and the git calls behind the
+        # system prompt all block, so they run in a worker thread and leave the
+        # event loop to the sessions that are already answering prompts.
+        async with self._setup_lock:
+            self._enter_cwd(cwd)
+            agent_loop = await asyncio.to_thread(self._create_agent_loop)
+        session = self._register_session(agent_loop)
+
+        return NewSessionResponse(
+            session_id=session.id,
+            models=self._session_models(agent_loop),
+            modes=self._session_modes(agent_loop),
+        )
+
+    def _register_session(self, agent_loop: AgentLoop) -> AcpSessionLoop:
+        # The client keeps addressing the session by this id, so compaction must
+        # not replace it; the log it starts is found under the same id.
+        agent_loop.keep_session_id = True
+        session = AcpSessionLoop(id=agent_loop.session_id, agent_loop=agent_loop)
+        self.sessions[session.id] = session
+
+        if not agent_loop.auto_approve:
+            agent_loop.set_approval_callback(self._create_approval_callback(session.id))
+        return session
+
+    def _session_models(self, agent_loop: AgentLoop) -> SessionModelState:
+        return SessionModelState(
+            current_model_id=agent_loop.config.active_model,
+            available_models=[
+                ModelInfo(model_id=model.alias, name=model.display_name)
+                for model in agent_loop.config.models
+            ],
+        )
+
+    def _session_modes(self, agent_loop: AgentLoop) -> SessionModeState:
+        return SessionModeState(
+            current_mode_id=agent_loop.agent_profile.name,
+            available_modes=get_all_acp_session_modes(agent_loop.agent_manager),
+        )
 
+    def _load_config(self) -> BloomConfig:
         try:
             config = BloomConfig.load(disabled_tools=["ask_user_question"])
-            config.tool_paths.extend(self._get_acp_tool_overrides())
         except MissingAPIKeyError as e:
             raise RequestError.auth_required({
                 "message": "You must be authenticated before creating a new session"
             }) from e
+        config.tool_paths.extend(self._get_acp_tool_overrides())
+        return config
+
+    def _enter_cwd(self, cwd: str) -> None:
+        # The cwd belongs to the whole process and tools resolve relative paths
+        # against it, so this moves every session, not just the one being set
+        # up. Changing it on the loop thread at least keeps it fixed while any
+        # other loop callback runs, unlike a change from a worker thread.
+        os.chdir(cwd)
 
-        agent_loop = AgentLoop(
-            config=config, agent_name=BuiltinAgentName.DEFAULT, enable_streaming=True
+    def _create_agent_loop(self) -> AgentLoop:
+        load_dotenv_values()
+
+        return AgentLoop(
+            config=self._load_config(),
+            agent_name=BuiltinAgentName.DEFAULT,
+            enable_streaming=True,
         )
-        # NOTE: For now, we pin session.id to agent_loop.session_id right after init time.
-        # We should just use agent_loop.session_id everywhere, but it can still change during
-        # session lifetime (e.g. agent_loop.compact is called).
-        # We should refactor agent_loop.session_id to make it immutable in ACP context.
-        session = AcpSessionLoop(id=agent_loop.session_id, agent_loop=agent_loop)
-        self.sessions[session.id] = session
 
-        if not agent_loop.auto_approve:
-            agent_loop.set_approval_callback(
-                self._create_approval_callback(agent_loop.session_id)
-            )
+    def _open_saved_session(self, session_id: str) -> tuple[AgentLoop, SessionSummary]:
+        """Create an agent that carries on the saved session `session_id`.
+
+        Its history is not loaded yet; see `_load_history`.
+        """
+        agent_loop = self._create_agent_loop()
+        summary = self._find_saved_session(agent_loop, session_id)
+        agent_loop.session_id = summary.session_id
+        agent_loop.session_logger.resume_session(summary.session_dir)
+        return agent_loop, summary
+
+    def _find_saved_session(
+        self, agent_loop: AgentLoop, session_id: str
+    ) -> SessionSummary:
+        summary = SessionIndex(agent_loop.config.session_logging).find(session_id)
+        if summary is None:
+            raise RequestError.invalid_params({"session": "Not found"})
+        return summary
 
-        response = NewSessionResponse(
-            session_id=agent_loop.session_id,
-            models=SessionModelState(
-                current_model_id=agent_loop.config.active_model,
-                available_models=[
-                    ModelInfo(model_id=model.alias, name=model.display_name)
-                    for model in agent_loop.config.models
-                ],
-            ),
-            modes=SessionModeState(
-                current_mode_id=session.agent_loop.agent_profile.name,
-                available_modes=get_all_acp_session_modes(agent_loop.agent_manager),
-            ),
+    def _load_history(self, session: AcpSessionLoop, session_dir: Path) -> None:
+        """Start loading the saved history of `session` in a worker thread.
+
+        The session answers setup requests at once; prompts wait for the load.
+        If it fails, the waiting prompts get the error and the session is
+        dropped, so that loading it again retries instead of carrying on from
+        an empty history.
+        """
+
+        async def load() -> None:
+            try:
+                history, _ = await asyncio.to_thread(
+                    SessionLoader.load_session, session_dir
+                )
+            except Exception as e:
+                if self.sessions.get(session.id) is session:
+                    del self.sessions[session.id]
+                raise RequestError.internal_error({
+                    "session": f"Could not load its history: {e}"
+                }) from e
+            session.agent_loop.messages.extend(history)
+
+        session.history = asyncio.create_task(load())
+        # Mark the error as seen even when no prompt ever waits for it.
+        session.history.add_done_callback(
+            lambda task: task.cancelled() or task.exception()
         )
-        return response
+
+    async def _replay(self, session_id: str, messages: list[LLMMessage]) -> None:
+        # Don't start the replay with results whose tool call was cut off.
+        start = next(
+            (i for i, m in enumerate(messages) if m.role != Role.tool), len(messages)
+        )
+        for update in history_session_updates(messages[start:]):
+            await self.client.session_update(session_id=session_id, update=update)
 
     def _get_acp_tool_overrides(self) -> list[Path]:
         overrides = ["todo"]
@@ -299,7 +460,27 @@ class BloomAcpAgentLoop(AcpAgent):
         mcp_servers: list[HttpMcpServer | SseMcpServer | McpServerStdio] | None = None,
         **kwargs: Any,
     ) -> LoadSessionResponse | None:
-        raise NotImplementedError()
+        if (session := self.sessions.get(session_id)) is not None:
+            if session.history is not None:
+                await asyncio.shield(session.history)
+            tail = session.agent_loop.messages[1:][-REPLAY_TAIL_MESSAGES:]
+        else:
+            async with self._setup_lock:
+                self._enter_cwd(cwd)
+                agent_loop, summary = await asyncio.to_thread(
+                    self._open_saved_session, session_id
+                )
+                tail = await asyncio.to_thread(
+                    SessionLoader.load_tail, summary.session_dir, REPLAY_TAIL_MESSAGES
+                )
+            session = self._register_session(agent_loop)
+            self._load_history(session, summary.session_dir)
+
+        await self._replay(session.id, tail)
+        return LoadSessionResponse(
+            models=self._session_models(session.agent_loop),
+            modes=self._session_modes(session.agent_loop),
+        )
 
     @override
     async def set_session_mode(
@@ -331,12 +512,14 @@ class BloomAcpAgentLoop(AcpAgent):
         if model_id not in model_aliases:
             return None
 
-        BloomConfig.save_updates({"active_model": model_id})
+        def load_config() -> BloomConfig:
+            BloomConfig.save_updates({"active_model": model_id})
+            return BloomConfig.load(
+                tool_paths=session.agent_loop.config.tool_paths,
+                disabled_tools=["ask_user_question"],
+            )
 
-        new_config = BloomConfig.load(
-            tool_paths=session.agent_loop.config.tool_paths,
-            disabled_tools=["ask_user_question"],
-        )
+        new_config = await asyncio.to_thread(load_config)
 
         await session.agent_loop.reload_with_initial_messages(base_config=new_config)
 
@@ -346,36 +529,51 @@ class BloomAcpAgentLoop(AcpAgent):
     async def list_sessions(
         self, cursor: str | None = None, cwd: str | None = None, **kwargs: Any
     ) -> ListSessionsResponse:
-        raise NotImplementedError()
+        try:
+            offset = int(cursor) if cursor else 0
+        except ValueError as e:
+            raise RequestError.invalid_params({"cursor": "Invalid cursor"}) from e
+
+        def list_saved() -> list[SessionSummary]:
+            config = self._load_config()
+            return SessionIndex(config.session_logging).sessions(cwd=cwd)
+
+        summaries = await asyncio.to_thread(list_saved)
+        page = summaries[offset : offset + LIST_SESSIONS_PAGE_SIZE]
+        end = offset + len(page)
+        return ListSessionsResponse(
+            sessions=[
+                SessionInfo(
+                    session_id=summary.session_id,
+                    cwd=summary.cwd or "",
+                    title=summary.title,
+                    updated_at=summary.updated_at,
+                )
+                for summary in page
+            ],
+            next_cursor=str(end) if end < len(summaries) else None,
+        )
 
     @override
     async def prompt(
         self, prompt: list[ContentBlock], session_id: str, **kwargs: Any
     ) -> PromptResponse:
         session = self._get_session(session_id)
-
-        if session.task is not None:
-            raise RuntimeError(
-                "Concurrent prompts are not supported yet, wait for agent loop to finish"
-            )
-
         text_prompt = self._build_text_prompt(prompt)
 
         temp_user_message_id: str | None = kwargs.get("messageId")
 
-        async def agent_loop_task() -> None:
-            async for update in self._run_agent_loop(
-                session, text_prompt, temp_user_message_id
-            ):
-                await self.client.session_update(session_id=session.id, update=update)
-
         try:
-            session.task = asyncio.create_task(agent_loop_task())
-            await session.task
+            await asyncio.create_task(
+                self._run_prompt(session, text_prompt, temp_user_message_id)
+            )
 
         except asyncio.CancelledError:
             return PromptResponse(stop_reason="cancelled")
 
+        except RequestError:
+            raise
+
         except Exception as e:
             await self.client.session_update(
                 session_id=session_id,
@@ -387,11 +585,53 @@ class BloomAcpAgentLoop(AcpAgent):
 
             return PromptResponse(stop_reason="refusal")
 
-        finally:
-            session.task = None
-
         return PromptResponse(stop_reason="end_turn")
 
+    async def _run_prompt(
+        self, session: AcpSessionLoop, prompt: str, user_message_id: str | None
+    ) -> None:
+        """Answer `prompt` once the prompts sent to `session` before it are done.
+
+        Prompts to one session share its history, so they run one at a time in
+        the order they arrived; `asyncio.Lock` wakes its waiters first in, first
+        out. Prompts to different sessions don't wait for each other.
+        """
+        task = cast(asyncio.Task[None], asyncio.current_task())
+        queued_at = time.perf_counter()
+        session.queue.append(task)
+        try:
+            async with session.prompt_lock:
+                session.queue.remove(task)
+                session.task = task
+                started_at = time.perf_counter()
+                session.stats.record_wait(started_at - queued_at)
+                try:
+                    if session.history is not None:
+                        await asyncio.shield(session.history)
+                    await self._stream_updates(session, prompt, user_message_id)
+                finally:
+                    session.task = None
+                    session.stats.record_run(time.perf_counter() - started_at)
+        finally:
+            if task in session.queue:
+                session.queue.remove(task)
+
+    async def _stream_updates(
+        self, session: AcpSessionLoop, prompt: str, user_message_id: str | None
+    ) -> None:
+        async def send(update: SessionUpdate) -> None:
+            await self.client.session_update(session_id=session.id, update=update)
+
+        config = session.agent_loop.config.acp
+        async with SessionUpdateQueue(
+            send,
+            session.updates,
+            flush_interval=config.update_flush_interval,
+            max_bytes=config.update_buffer_bytes,
+        ) as updates:
+            async for update in self._run_agent_loop(session, prompt, user_message_id):
+                await updates.put(update)
+
     def _build_text_prompt(self, acp_prompt: list[ContentBlock]) -> str:
         text_prompt = ""
         for block in acp_prompt:
@@ -510,9 +750,11 @@ class BloomAcpAgentLoop(AcpAgent):
     @override
     async def cancel(self, session_id: str, **kwargs: Any) -> None:
         session = self._get_session(session_id)
-        if session.task and not session.task.done():
-            session.task.cancel()
-            session.task = None
+        # Prompts queued behind the running one were sent before the cancel, so
+        # they are cancelled with it.
+        for task in [*session.queue, session.task]:
+            if task is not None and not task.done():
+                task.cancel()
 
     @override
     async def fork_session(
@@ -522,7 +764,33 @@ class BloomAcpAgentLoop(AcpAgent):
         mcp_servers: list[HttpMcpServer | SseMcpServer | McpServerStdio] | None = None,
         **kwargs: Any,
     ) -> ForkSessionResponse:
-        raise NotImplementedError()
+        source = self.sessions.get(session_id)
+        async with self._setup_lock:
+            self._enter_cwd(cwd)
+            agent_loop = await asyncio.to_thread(self._create_agent_loop)
+
+        if source is None:
+            summary = await asyncio.to_thread(
+                self._find_saved_session, agent_loop, session_id
+            )
+            session = self._register_session(agent_loop)
+            self._load_history(session, summary.session_dir)
+        else:
+            session = self._register_session(agent_loop)
+            # Wait for the prompts already sent, so the fork doesn't start in
+            # the middle of a turn.
+            async with source.prompt_lock:
+                if source.history is not None:
+                    await asyncio.shield(source.history)
+                agent_loop.messages.extend(
+                    _share_messages(source.agent_loop.messages[1:])
+                )
+
+        return ForkSessionResponse(
+            session_id=session.id,
+            models=self._session_models(agent_loop),
+            modes=self._session_modes(agent_loop),
+        )
 
     @override
     async def resume_session(
@@ -532,11 +800,25 @@ class BloomAcpAgentLoop(AcpAgent):
         mcp_servers: list[HttpMcpServer | SseMcpServer | McpServerStdio] | None = None,
         **kwargs: Any,
     ) -> ResumeSessionResponse:
-        raise NotImplementedError()
+        if (session := self.sessions.get(session_id)) is None:
+            async with self._setup_lock:
+                self._enter_cwd(cwd)
+                agent_loop, summary = await asyncio.to_thread(
+                    self._open_saved_session, session_id
+                )
+            session = self._register_session(agent_loop)
+            self._load_history(session, summary.session_dir)
+
+        return ResumeSessionResponse(
+            models=self._session_models(session.agent_loop),
+            modes=self._session_modes(session.agent_loop),
+        )
 
     @override
     async def ext_method(self, method: str, params: dict) -> dict:
-        raise NotImplementedError()
+        if method == SESSION_STATS_METHOD:
+            return self._get_session(params.get("sessionId", "")).stats_snapshot()
+        raise RequestError.method_not_found(f"_{method}")
 
     @override
     async def ext_notification(self, method: str, params: dict) -> None:
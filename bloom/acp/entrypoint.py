@@ -8,7 +8,7 @@ import sys
 from bloom import __version__
 from bloom.core.config import BloomConfig
 from bloom.core.paths.config_paths import CONFIG_FILE, HISTORY_FILE, unlock_config_paths
-from bloom.core.utils import logger
+from bloom.core.utils import configure_logging, logger
 
 # Configure line buffering for subprocess communication
 sys.stdout.reconfigure(line_buffering=True)  # pyright: ignore[reportAttributeAccessIssue]
@@ -65,6 +65,7 @@ def handle_debug_mode() -> None:
 def main() -> None:
     handle_debug_mode()
     unlock_config_paths()
+    configure_logging()
 
     from bloom.acp.acp_agent_loop import run_acp_server
     from bloom.setup.onboarding import run_onboarding
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+import contextlib
+import time
+from types import TracebackType
+
+from acp.helpers import SessionUpdate
+from acp.schema import AgentMessageChunk, AgentThoughtChunk, TextContentBlock
+from pydantic import BaseModel
+
+
+class UpdateQueueStats(BaseModel):
+    sent: int = 0
+    merged: int = 0
+    dropped: int = 0
+    backpressure_waits: int = 0
+    backpressure_seconds: float = 0.0
+
+
+class _Pending:
+    __slots__ = ("parts", "size", "update")
+
+    def __init__(self, update: SessionUpdate, parts: list[str] | None) -> None:
+        self.update = update
+        # Text of the chunks merged into `update`, joined when it is sent.
+        self.parts = parts
+        self.size = sum(len(part.encode()) for part in parts) if parts else 0
+
+    def merge(self, update: SessionUpdate) -> bool:
+        if (
+            self.parts is None
+            or type(update) is not type(self.update)
+            or update.field_meta != self.update.field_meta
+        ):
+            return False
+        text = _text(update)
+        if text is None:
+            return False
+        self.parts.append(text)
+        self.size += len(text.encode())
+        return True
+
+    def build(self) -> SessionUpdate:
+        if self.parts is None or len(self.parts) == 1:
+            return self.update
+        return self.update.model_copy(
+            update={"content": TextContentBlock(type="text", text="".join(self.parts))}
+        )
+
+
+def _text(update: SessionUpdate) -> str | None:
+    if isinstance(update, AgentMessageChunk | AgentThoughtChunk) and isinstance(
+        update.content, TextContentBlock
+    ):
+        return update.content.text
+    return None
+
+
+class SessionUpdateQueue:
+    """Sends a prompt's session updates to the client from a background task.
+
+    The agent keeps streaming while the client handles earlier updates.
+    Consecutive text chunks of the same message are merged while they wait,
+    for up to `flush_interval` seconds after the first, so a client gets one
+    message per batch of deltas rather than one per delta. Once `max_bytes`
+    of text are waiting, `put` blocks until the client catches up.
+
+    Any other update is sent before `put` returns, after everything queued
+    ahead of it: tools talk to the client directly (permission requests,
+    terminals), and the client has to know about a tool call first.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[SessionUpdate], Awaitable[None]],
+        stats: UpdateQueueStats,
+        *,
+        flush_interval: float,
+        max_bytes: int,
+    ) -> None:
+        self._send = send
+        self._stats = stats
+        self._flush_interval = flush_interval
+        self._max_bytes = max_bytes
+        self._pending: deque[_Pending] = deque()
+        self._pending_bytes = 0
+        self._closing = False
+        self._sender: asyncio.Task[None] | None = None
+        self._ready = asyncio.Event()
+        self._flush_now = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._space = asyncio.Event()
+        self._space.set()
+
+    async def __aenter__(self) -> SessionUpdateQueue:
+        self._sender = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is not None and issubclass(exc_type, asyncio.CancelledError):
+            # The prompt was cancelled: the client doesn't wait for the rest.
+            self._stats.dropped += len(self._pending)
+            self._pending.clear()
+            if self._sender is not None:
+                self._sender.cancel()
+            return
+        self._closing = True
+        self._ready.set()
+        self._flush_now.set()
+        if self._sender is not None:
+            await self._sender
+
+    async def put(self, update: SessionUpdate) -> None:
+        self._raise_if_failed()
+        text = _text(update)
+        if text is not None and self._pending and self._pending[-1].merge(update):
+            self._stats.merged += 1
+            self._pending_bytes += len(text.encode())
+        else:
+            pending = _Pending(update, [text] if text is not None else None)
+            self._pending.append(pending)
+            self._pending_bytes += pending.size
+        self._idle.clear()
+        self._ready.set()
+
+        if text is None:
+            self._flush_now.set()
+            await self._idle.wait()
+        elif self._pending_bytes >= self._max_bytes:
+            self._space.clear()
+            self._stats.backpressure_waits += 1
+            started_at = time.perf_counter()
+            await self._space.wait()
+            self._stats.backpressure_seconds += time.perf_counter() - started_at
+        self._raise_if_failed()
+
+    def _raise_if_failed(self) -> None:
+        if self._sender is not None and self._sender.done():
+            if not self._sender.cancelled() and (e := self._sender.exception()):
+                raise e
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                await self._ready.wait()
+                if self._flush_interval > 0 and not self._flush_now.is_set():
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(
+                            self._flush_now.wait(), self._flush_interval
+                        )
+                while self._pending:
+                    pending = self._pending.popleft()
+                    self._pending_bytes -= pending.size
+                    if self._pending_bytes < self._max_bytes:
+                        self._space.set()
+                    await self._send(pending.build())
+                    self._stats.sent += 1
+                self._ready.clear()
+                self._flush_now.clear()
+                self._idle.set()
+                if self._closing:
+                    return
+        finally:
+            # Don't leave `put` waiting on a sender that has stopped.
+            self._idle.set()
+            self._space.set()
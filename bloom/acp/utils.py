@@ -3,17 +3,22 @@ from __future__ import annotations
 from enum import StrEnum
 from typing import TYPE_CHECKING, Literal, cast
 
+from acp.helpers import SessionUpdate
 from acp.schema import (
+    AgentMessageChunk,
+    AgentThoughtChunk,
     ContentToolCallContent,
     PermissionOption,
     SessionMode,
     TextContentBlock,
     ToolCallProgress,
     ToolCallStart,
+    UserMessageChunk,
 )
 
+from bloom.acp.tools.session_update import TOOL_KIND
 from bloom.core.agents.models import AgentProfile, AgentType
-from bloom.core.types import CompactEndEvent, CompactStartEvent
+from bloom.core.types import CompactEndEvent, CompactStartEvent, LLMMessage, Role
 from bloom.core.utils import compact_reduction_display
 
 if TYPE_CHECKING:
@@ -111,3 +116,73 @@ def create_compact_end_session_update(event: CompactEndEvent) -> ToolCallProgres
             )
         ],
     )
+
+
+def history_session_updates(messages: list[LLMMessage]) -> list[SessionUpdate]:
+    """Session updates that show saved messages to a client loading a session.
+
+    Tool calls are replayed as finished, with their saved output; results whose
+    call is not among `messages` are left out.
+    """
+    updates: list[SessionUpdate] = []
+    tool_call_ids: set[str] = set()
+    for message in messages:
+        meta = {"messageId": message.message_id} if message.message_id else None
+        if message.role == Role.user and message.content:
+            updates.append(
+                UserMessageChunk(
+                    session_update="user_message_chunk",
+                    content=TextContentBlock(type="text", text=message.content),
+                    field_meta=meta,
+                )
+            )
+        elif message.role == Role.assistant:
+            if message.reasoning_content:
+                updates.append(
+                    AgentThoughtChunk(
+                        session_update="agent_thought_chunk",
+                        content=TextContentBlock(
+                            type="text", text=message.reasoning_content
+                        ),
+                        field_meta=meta,
+                    )
+                )
+            if message.content:
+                updates.append(
+                    AgentMessageChunk(
+                        session_update="agent_message_chunk",
+                        content=TextContentBlock(type="text", text=message.content),
+                        field_meta=meta,
+                    )
+                )
+            for tool_call in message.tool_calls or []:
+                if not tool_call.id:
+                    continue
+                tool_call_ids.add(tool_call.id)
+                name = tool_call.function.name or ""
+                updates.append(
+                    ToolCallStart(
+                        session_update="tool_call",
+                        tool_call_id=tool_call.id,
+                        title=name,
+                        kind=TOOL_KIND.get(name, "other"),
+                        raw_input=tool_call.function.arguments,
+                    )
+                )
+        elif message.role == Role.tool and message.tool_call_id in tool_call_ids:
+            updates.append(
+                ToolCallProgress(
+                    session_update="tool_call_update",
+                    tool_call_id=message.tool_call_id,
+                    status="completed",
+                    content=[
+                        ContentToolCallContent(
+                            type="content",
+                            content=TextContentBlock(
+                                type="text", text=message.content or ""
+                            ),
+                        )
+                    ],
+                )
+            )
+    return updates
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import argparse
+from pathlib import Path
 import sys
+from typing import TYPE_CHECKING
 
 from rich import print as rprint
 
-from bloom.cli.textual_ui.app import run_textual_ui
-from bloom.core.agent_loop import AgentLoop
 from bloom.core.agents.models import BuiltinAgentName
 from bloom.core.config import (
     BloomConfig,
@@ -15,11 +15,12 @@ from bloom.core.config import (
     load_dotenv_values,
 )
 from bloom.core.paths.config_paths import CONFIG_FILE, HISTORY_FILE
-from bloom.core.programmatic import run_programmatic
 from bloom.core.session.session_loader import SessionLoader
 from bloom.core.types import LLMMessage, OutputFormat, Role
 from bloom.core.utils import ConversationLimitException, logger
-from bloom.setup.onboarding import run_onboarding
+
+if TYPE_CHECKING:
+    from bloom.core.agent_loop import AgentLoop
 
 
 def get_initial_agent_name(args: argparse.Namespace) -> str:
@@ -47,6 +48,8 @@ def load_config_or_exit() -> BloomConfig:
     try:
         return BloomConfig.load()
     except MissingAPIKeyError:
+        from bloom.setup.onboarding import run_onboarding
+
         run_onboarding()
         return BloomConfig.load()
     except MissingPromptFileError as e:
@@ -121,11 +124,53 @@ def _load_messages_from_previous_session(
     logger.info("Loaded %d messages from previous session", len(non_system_messages))
 
 
+def run_batch_cli(args: argparse.Namespace) -> None:
+    load_dotenv_values()
+    bootstrap_config_files()
+
+    from bloom.core.batch import (
+        DEFAULT_CONCURRENCY,
+        BatchStatus,
+        load_manifest,
+        run_batch,
+    )
+
+    try:
+        manifest = (
+            sys.stdin.read()
+            if args.manifest == "-"
+            else Path(args.manifest).read_text("utf-8")
+        )
+        items = load_manifest(manifest)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    config = load_config_or_exit()
+    if args.model:
+        config.active_model = args.model
+
+    try:
+        results = run_batch(
+            config,
+            items,
+            concurrency=args.concurrency or DEFAULT_CONCURRENCY,
+            max_turns=args.max_turns,
+            max_price=args.max_price,
+        )
+    except KeyboardInterrupt:
+        sys.exit(130)
+    failed = [r for r in results if r.status != BatchStatus.COMPLETED]
+    sys.exit(1 if failed else 0)
+
+
 def run_cli(args: argparse.Namespace) -> None:
     load_dotenv_values()
     bootstrap_config_files()
 
     if args.setup:
+        from bloom.setup.onboarding import run_onboarding
+
         run_onboarding()
         sys.exit(0)
 
@@ -149,6 +194,8 @@ def run_cli(args: argparse.Namespace) -> None:
                     "Error: No prompt provided for programmatic mode", file=sys.stderr
                 )
                 sys.exit(1)
+            from bloom.core.programmatic import run_programmatic
+
             output_format = OutputFormat(
                 args.output if hasattr(args, "output") else "text"
             )
@@ -162,6 +209,7 @@ def run_cli(args: argparse.Namespace) -> None:
                     output_format=output_format,
                     previous_messages=loaded_messages,
                     agent_name=initial_agent_name,
+                    profile=args.profile,
                 )
                 if final_response:
                     print(final_response)
@@ -173,6 +221,10 @@ def run_cli(args: argparse.Namespace) -> None:
                 print(f"Error: {e}", file=sys.stderr)
                 sys.exit(1)
         else:
+            # Textual and the widget tree are only needed for the interactive UI.
+            from bloom.cli.textual_ui.app import run_textual_ui
+            from bloom.core.agent_loop import AgentLoop
+
             agent_loop = AgentLoop(
                 config, agent_name=initial_agent_name, enable_streaming=True
             )
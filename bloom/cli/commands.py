@@ -9,6 +9,9 @@ class Command:
     description: str
     handler: str
     exits: bool = False
+    # The handler is passed whatever follows the alias, e.g. "start" in
+    # "/profile start".
+    takes_args: bool = False
 
 
 class CommandRegistry:
@@ -62,6 +65,12 @@ class CommandRegistry:
                 description="Display agent statistics",
                 handler="_show_status",
             ),
+            "profile": Command(
+                aliases=frozenset(["/profile"]),
+                description="Sample a CPU profile: `/profile start`, `/profile stop`",
+                handler="_toggle_profiler",
+                takes_args=True,
+            ),
         }
 
         for command in excluded_commands:
@@ -73,8 +82,16 @@ class CommandRegistry:
                 self._alias_map[alias] = cmd_name
 
     def find_command(self, user_input: str) -> Command | None:
-        cmd_name = self._alias_map.get(user_input.lower().strip())
-        return self.commands.get(cmd_name) if cmd_name else None
+        return match[0] if (match := self.parse(user_input)) else None
+
+    def parse(self, user_input: str) -> tuple[Command, str] | None:
+        """The command `user_input` invokes and the arguments it passes."""
+        alias, _, args = user_input.strip().partition(" ")
+        cmd_name = self._alias_map.get(alias.lower())
+        command = self.commands.get(cmd_name) if cmd_name else None
+        if command is None or (args.strip() and not command.takes_args):
+            return None
+        return command, args.strip()
 
     def get_help_text(self) -> str:
         lines: list[str] = [
@@ -11,10 +11,7 @@ from bloom import __version__
 from bloom.core.agents.models import BuiltinAgentName
 from bloom.core.paths.config_paths import unlock_config_paths
 from bloom.core.trusted_folders import has_trustable_content, trusted_folders_manager
-from bloom.setup.trusted_folders.trust_folder_dialog import (
-    TrustDialogQuitException,
-    ask_trust_folder,
-)
+from bloom.core.utils import configure_logging
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -89,6 +86,23 @@ def parse_arguments() -> argparse.Namespace:
         metavar="DIR",
         help="Change to this directory before running",
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print an import-time breakdown of startup for the selected mode "
+        "(interactive, or programmatic with -p) and exit.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Sample a CPU profile of the run (only applies in programmatic mode "
+        "with -p) and write it to the profiles log directory.",
+    )
+    parser.add_argument(
+        "--tool-timings",
+        action="store_true",
+        help="Print how long each tool file takes to discover and import, and exit.",
+    )
 
     continuation_group = parser.add_mutually_exclusive_group()
     continuation_group.add_argument(
@@ -106,6 +120,50 @@ def parse_arguments() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def parse_batch_arguments(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="bloom batch",
+        description="Run a JSONL manifest of prompts concurrently in programmatic "
+        "mode, streaming every message as JSONL tagged with its item id.",
+    )
+    parser.add_argument(
+        "manifest",
+        metavar="MANIFEST",
+        help='JSONL file with one item per line: {"prompt": ..., "id": ..., '
+        '"workdir": ..., "agent": ..., "max_turns": ..., '
+        '"max_price": ...}. Use - to read it from stdin.',
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        metavar="N",
+        help="Maximum number of agents running at once (default: 4).",
+    )
+    parser.add_argument(
+        "--max-turns",
+        type=int,
+        metavar="N",
+        help="Maximum number of assistant turns across the whole batch.",
+    )
+    parser.add_argument(
+        "--max-price",
+        type=float,
+        metavar="DOLLARS",
+        help="Maximum cost in dollars across the whole batch. Running items are "
+        "stopped and remaining ones skipped once it is exceeded.",
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        metavar="MODEL",
+        help="Model to use (e.g., glm, deepseek, qwen-coder)",
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency is not None and args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
+
+
 def check_and_resolve_trusted_folder() -> None:
     try:
         cwd = Path.cwd()
@@ -126,6 +184,11 @@ def check_and_resolve_trusted_folder() -> None:
     if is_folder_trusted is not None:
         return
 
+    from bloom.setup.trusted_folders.trust_folder_dialog import (
+        TrustDialogQuitException,
+        ask_trust_folder,
+    )
+
     try:
         is_folder_trusted = ask_trust_folder(cwd)
     except (KeyboardInterrupt, EOFError, TrustDialogQuitException):
@@ -141,8 +204,31 @@ def check_and_resolve_trusted_folder() -> None:
 
 
 def main() -> None:
+    if sys.argv[1:2] == ["batch"]:
+        batch_args = parse_batch_arguments(sys.argv[2:])
+        unlock_config_paths()
+        configure_logging()
+
+        from bloom.cli.cli import run_batch_cli
+
+        run_batch_cli(batch_args)
+        return
+
     args = parse_arguments()
 
+    if args.profile_startup:
+        from bloom.cli.startup_profile import run_startup_profile
+
+        run_startup_profile(interactive=args.prompt is None)
+        return
+
+    if args.tool_timings:
+        from bloom.cli.tool_timings import run_tool_timings
+
+        unlock_config_paths()
+        run_tool_timings()
+        return
+
     if args.workdir:
         workdir = args.workdir.expanduser().resolve()
         if not workdir.is_dir():
@@ -156,6 +242,7 @@ def main() -> None:
     if is_interactive:
         check_and_resolve_trusted_folder()
     unlock_config_paths()
+    configure_logging()
 
     from bloom.cli.cli import run_cli
 
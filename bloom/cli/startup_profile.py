@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+import re
+import subprocess
+import sys
+
+# Modules each CLI mode imports before it can do useful work.
+PROGRAMMATIC_MODULES = (
+    "bloom.cli.entrypoint",
+    "bloom.cli.cli",
+    "bloom.core.programmatic",
+)
+INTERACTIVE_MODULES = (*PROGRAMMATIC_MODULES, "bloom.cli.textual_ui.app")
+
+# Cold import budget for programmatic mode, enforced by the test suite.
+COLD_START_BUDGET_SECONDS = 1.5
+
+_IMPORTTIME_LINE = re.compile(
+    r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|"
+    r"(?P<indent>\s+)(?P<module>\S+)$"
+)
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.partition(".")[0]
+
+
+@dataclass(frozen=True)
+class StartupProfile:
+    modules: tuple[str, ...]
+    timings: list[ImportTiming]
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(t.cumulative_us for t in self.timings if t.depth == 0) / 1e6
+
+    def by_package(self) -> list[tuple[str, int]]:
+        totals: dict[str, int] = defaultdict(int)
+        for timing in self.timings:
+            totals[timing.package] += timing.self_us
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def slowest(self, count: int) -> list[ImportTiming]:
+        return sorted(self.timings, key=lambda t: t.cumulative_us, reverse=True)[:count]
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse the stderr of `python -X importtime`."""
+    timings: list[ImportTiming] = []
+    for line in output.splitlines():
+        if (match := _IMPORTTIME_LINE.match(line)) is None:
+            continue
+        timings.append(
+            ImportTiming(
+                module=match["module"],
+                self_us=int(match["self"]),
+                cumulative_us=int(match["cumulative"]),
+                depth=(len(match["indent"]) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def profile_imports(modules: tuple[str, ...]) -> StartupProfile:
+    """Import `modules` in a fresh interpreter and time every import.
+
+    A subprocess is the only way to measure a cold start: by the time the CLI
+    parses its arguments the current process has already imported half of it.
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{result.stderr}")
+    return StartupProfile(modules=modules, timings=parse_importtime(result.stderr))
+
+
+def format_profile(profile: StartupProfile, top: int = 15) -> str:
+    lines = [
+        f"Cold import of {', '.join(profile.modules)}: "
+        f"{profile.total_seconds * 1000:.0f} ms "
+        f"(budget {COLD_START_BUDGET_SECONDS * 1000:.0f} ms for programmatic mode)",
+        "",
+        "Self time by package:",
+    ]
+    lines.extend(
+        f"  {package:<32} {self_us / 1000:8.1f} ms"
+        for package, self_us in profile.by_package()[:top]
+    )
+    lines.extend(["", "Slowest imports (cumulative):"])
+    lines.extend(
+        f"  {timing.module:<48} {timing.cumulative_us / 1000:8.1f} ms"
+        for timing in profile.slowest(top)
+    )
+    return "\n".join(lines)
+
+
+def run_startup_profile(*, interactive: bool) -> None:
+    modules = INTERACTIVE_MODULES if interactive else PROGRAMMATIC_MODULES
+    print(format_profile(profile_imports(modules)))
@@ -1,11 +1,25 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import cache, lru_cache
+import time
+from typing import Any
+
+from markdown_it import MarkdownIt
+from markdown_it.token import Token as MarkdownToken
 from pygments.token import Token
 from textual.content import Content
 from textual.highlight import HighlightTheme, highlight
 from textual.widgets import Markdown
 from textual.widgets._markdown import MarkdownFence
 
+# Highlighted code blocks kept across widgets. Lexing dominates the cost of
+# rendering code-heavy answers, and history rebuilds and expanding a
+# collapsed message render the same code again.
+HIGHLIGHT_CACHE_SIZE = 128
+# A code block still being streamed is highlighted again at most this often.
+OPEN_FENCE_HIGHLIGHT_SECONDS = 0.25
+
 
 class AnsiHighlightTheme(HighlightTheme):
     STYLES = {
@@ -44,10 +58,47 @@ class AnsiHighlightTheme(HighlightTheme):
     }
 
 
+@lru_cache(maxsize=HIGHLIGHT_CACHE_SIZE)
+def _highlight(code: str, language: str) -> Content:
+    return highlight(code, language=language or None, theme=AnsiHighlightTheme)
+
+
+def _is_open_fence(token: MarkdownToken) -> bool:
+    """Whether a fence has no closing marker yet, i.e. is still streaming."""
+    if token.type != "fence" or token.map is None:
+        return False
+    start, end = token.map
+    return end - start - 1 <= len(token.content.splitlines())
+
+
+@dataclass(frozen=True)
+class _OpenFenceHighlight:
+    code: str
+    language: str
+    content: Content
+    at: float
+
+
 class AnsiMarkdownFence(MarkdownFence):
-    @classmethod
-    def highlight(cls, code: str, language: str) -> Content:
-        return highlight(code, language=language or None, theme=AnsiHighlightTheme)
+    def __init__(self, markdown: Markdown, token: MarkdownToken, code: str) -> None:
+        # Set before MarkdownFence.__init__, which calls highlight().
+        self._streaming_in: AnsiMarkdown | None = (
+            markdown
+            if isinstance(markdown, AnsiMarkdown) and _is_open_fence(token)
+            else None
+        )
+        super().__init__(markdown, token, code)
+
+    # An instance method, unlike MarkdownFence's: open fences depend on the block.
+    def highlight(self, code: str, language: str) -> Content:  # pyright: ignore[reportIncompatibleMethodOverride]
+        if self._streaming_in is not None:
+            return self._streaming_in.highlight_open_fence(code, language)
+        return _highlight(code, language)
+
+
+@cache
+def _shared_parser() -> MarkdownIt:
+    return MarkdownIt("gfm-like")
 
 
 class AnsiMarkdown(Markdown):
@@ -56,3 +107,36 @@ class AnsiMarkdown(Markdown):
         "fence": AnsiMarkdownFence,
         "code_block": AnsiMarkdownFence,
     }
+
+    def __init__(self, markdown: str | None = None, **kwargs: Any) -> None:
+        # Markdown builds a new parser for every update and streamed append.
+        kwargs.setdefault("parser_factory", _shared_parser)
+        super().__init__(markdown, **kwargs)
+        self._open_fence: _OpenFenceHighlight | None = None
+
+    def highlight_open_fence(self, code: str, language: str) -> Content:
+        """Highlight a code block that is still being streamed.
+
+        Lexing starts over from the top of the block, so highlighting it on
+        every frame costs time quadratic in its length. The last highlight is
+        reused for OPEN_FENCE_HIGHLIGHT_SECONDS instead, with the code that
+        arrived since shown plain until the next one.
+        """
+        now = time.monotonic()
+        last = self._open_fence
+        if (
+            last is not None
+            and last.language == language
+            and code.startswith(last.code)
+            and now - last.at < OPEN_FENCE_HIGHLIGHT_SECONDS
+        ):
+            rest = Content(code[len(last.code) :]).stylize_before("$text")
+            return last.content + rest
+        # Not cached: the block will look different on the next call.
+        content = highlight(code, language=language or None, theme=AnsiHighlightTheme)
+        # Counted from when the highlight is done, or one slower than the
+        # interval would make every later call highlight again.
+        self._open_fence = _OpenFenceHighlight(
+            code, language, content, time.monotonic()
+        )
+        return content
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable, Collection
 from enum import StrEnum, auto
+import inspect
 from pathlib import Path
 import subprocess
 import time
@@ -49,11 +51,14 @@ from bloom.cli.textual_ui.widgets.no_markup_static import NoMarkupStatic
 from bloom.cli.textual_ui.widgets.path_display import PathDisplay
 from bloom.cli.textual_ui.widgets.question_app import QuestionApp
 from bloom.cli.textual_ui.widgets.tools import ToolCallMessage, ToolResultMessage
+from bloom.cli.textual_ui.widgets.transcript import VirtualTranscript
 from bloom.cli.textual_ui.windowing import (
     HISTORY_RESUME_TAIL_MESSAGES,
     LOAD_MORE_BATCH_SIZE,
     HistoryLoadMoreManager,
     SessionWindowing,
+    archive_entries,
+    build_history_entries,
     build_history_widgets,
     create_resume_plan,
     non_system_history_messages,
@@ -76,14 +81,22 @@ from bloom.core.agent_loop import AgentLoop
 from bloom.core.agents import AgentProfile
 from bloom.core.autocompletion.path_prompt_adapter import render_path_prompt
 from bloom.core.config import BloomConfig
+from bloom.core.llm.rate_limit import RateLimiter, rate_limiters
 from bloom.core.paths.config_paths import HISTORY_FILE
+from bloom.core.profiler import SamplingProfiler
 from bloom.core.session.session_loader import SessionLoader
 from bloom.core.tools.base import ToolPermission
 from bloom.core.tools.builtins.ask_user_question import (
     AskUserQuestionArgs,
     AskUserQuestionResult,
 )
-from bloom.core.types import AgentStats, ApprovalResponse, LLMMessage, RateLimitError
+from bloom.core.types import (
+    AgentStats,
+    ApprovalResponse,
+    LLMMessage,
+    RateLimitError,
+    TurnTiming,
+)
 from bloom.core.utils import (
     CancellationReason,
     get_user_cancellation_message,
@@ -117,17 +130,29 @@ PRUNE_LOW_MARK = 1000
 PRUNE_HIGH_MARK = 1500
 
 
-async def prune_by_height(messages_area: Widget, low_mark: int, high_mark: int) -> bool:
-    """Remove older children to keep virtual height within bounds.
+def children_to_prune(
+    messages_area: Widget,
+    low_mark: int,
+    high_mark: int,
+    *,
+    keep: Collection[Widget] = (),
+) -> list[Widget]:
+    """Older children to remove to keep virtual height within bounds.
+
+    Children in `keep` are never selected and don't count towards the height.
     Implementation from https://github.com/batrachianai/toad/blob/a335b56c9015514d5f38654e3909aaa78850c510/src/toad/widgets/conversation.py#L1495
     """
-    height = messages_area.virtual_size.height
+    height = messages_area.virtual_size.height - sum(
+        child.outer_size.height for child in keep if child.parent is messages_area
+    )
     if height <= high_mark:
-        return False
+        return []
     prune_children: list[Widget] = []
     bottom_margin = 0
     prune_height = 0
     for child in messages_area.children:
+        if child in keep:
+            continue
         if not child.display:
             prune_children.append(child)
             continue
@@ -142,9 +167,7 @@ async def prune_by_height(messages_area: Widget, low_mark: int, high_mark: int)
         if height - prune_height <= low_mark:
             break
         prune_children.append(child)
-    if prune_children:
-        await messages_area.remove_children(prune_children)
-    return bool(prune_children)
+    return prune_children
 
 
 class BloomApp(App):  # noqa: PLR0904
@@ -185,10 +208,14 @@ class BloomApp(App):  # noqa: PLR0904
         self._loading_widget: LoadingWidget | None = None
         self._pending_approval: asyncio.Future | None = None
         self._pending_question: asyncio.Future | None = None
+        # Concurrent subagents share the callbacks below, but the bottom panel
+        # holds one approval or question at a time.
+        self._user_prompt_lock = asyncio.Lock()
 
         self.event_handler: EventHandler | None = None
 
         self.commands = CommandRegistry()
+        self._profiler: SamplingProfiler | None = None
 
         self._chat_input_container: ChatInputContainer | None = None
         self._current_bottom_app: BottomApp = BottomApp.Input
@@ -200,6 +227,8 @@ class BloomApp(App):  # noqa: PLR0904
         self._current_streaming_reasoning: ReasoningMessage | None = None
         self._windowing = SessionWindowing(load_more_batch_size=LOAD_MORE_BATCH_SIZE)
         self._load_more = HistoryLoadMoreManager()
+        # Pruned messages, kept as lightweight entries rather than widgets.
+        self._transcript: VirtualTranscript | None = None
         self._tool_call_map: dict[str, str] | None = None
         self._history_widget_indices: WeakKeyDictionary[Widget, int] = (
             WeakKeyDictionary()
@@ -210,6 +239,8 @@ class BloomApp(App):  # noqa: PLR0904
         self._banner_version = banner_version or CORE_VERSION
         self._initial_prompt = initial_prompt
         self._auto_scroll = True
+        # Scroll and prune callbacks already queued for the next refresh.
+        self._pending_refresh_callbacks: set[Callable[[], Any]] = set()
         self._last_escape_time: float | None = None
         self._banner: Banner | None = None
         self._cached_messages_area: Widget | None = None
@@ -430,13 +461,13 @@ class BloomApp(App):  # noqa: PLR0904
         )
 
     async def _handle_command(self, user_input: str) -> bool:
-        if command := self.commands.find_command(user_input):
+        if match := self.commands.parse(user_input):
+            command, args = match
             await self._mount_and_scroll(UserMessage(user_input))
             handler = getattr(self, command.handler)
-            if asyncio.iscoroutinefunction(handler):
-                await handler()
-            else:
-                handler()
+            result = handler(args) if command.takes_args else handler()
+            if asyncio.iscoroutine(result):
+                await result
             return True
         return False
 
@@ -583,30 +614,34 @@ class BloomApp(App):  # noqa: PLR0904
     async def _approval_callback(
         self, tool: str, args: BaseModel, tool_call_id: str
     ) -> tuple[ApprovalResponse, str | None]:
-        # Auto-approve only if parent is in auto-approve mode AND tool is enabled
-        # This ensures subagents respect the main agent's tool restrictions
-        if self.agent_loop and self.agent_loop.config.auto_approve:
-            if self._is_tool_enabled_in_main_agent(tool):
-                return (ApprovalResponse.YES, None)
-
-        self._pending_approval = asyncio.Future()
-        with paused_timer(self._loading_widget):
-            await self._switch_to_approval_app(tool, args)
-            result = await self._pending_approval
-
-        self._pending_approval = None
-        return result
+        async with self._user_prompt_lock:
+            # Auto-approve only if parent is in auto-approve mode AND tool is
+            # enabled. This ensures subagents respect the main agent's tool
+            # restrictions. Checked under the lock, since auto-approve may have
+            # been switched on while this request waited.
+            if self.agent_loop and self.agent_loop.config.auto_approve:
+                if self._is_tool_enabled_in_main_agent(tool):
+                    return (ApprovalResponse.YES, None)
+
+            self._pending_approval = asyncio.Future()
+            try:
+                with paused_timer(self._loading_widget):
+                    await self._switch_to_approval_app(tool, args)
+                    return await self._pending_approval
+            finally:
+                self._pending_approval = None
 
     async def _user_input_callback(self, args: BaseModel) -> BaseModel:
         question_args = cast(AskUserQuestionArgs, args)
 
-        self._pending_question = asyncio.Future()
-        with paused_timer(self._loading_widget):
-            await self._switch_to_question_app(question_args)
-            result = await self._pending_question
-
-        self._pending_question = None
-        return result
+        async with self._user_prompt_lock:
+            self._pending_question = asyncio.Future()
+            try:
+                with paused_timer(self._loading_widget):
+                    await self._switch_to_question_app(question_args)
+                    return await self._pending_question
+            finally:
+                self._pending_question = None
 
     async def _handle_agent_loop_turn(self, prompt: str) -> None:
         self._agent_running = True
@@ -702,10 +737,37 @@ class BloomApp(App):  # noqa: PLR0904
 - **Session Completion Tokens**: {stats.session_completion_tokens:,}
 - **Session Total LLM Tokens**: {stats.session_total_llm_tokens:,}
 - **Last Turn Tokens**: {stats.last_turn_total_tokens:,}
+- **Prompt Cache Hits**: {stats.cache_hit_ratio:.0%} ({stats.session_cached_tokens:,} tokens, ${stats.cache_savings:.4f} saved)
 - **Cost**: ${stats.session_cost:.4f}
 """
+        if stats.last_turn_timing is not None:
+            status_text += _turn_timing_text(stats.last_turn_timing)
+        status_text += _rate_limit_text(rate_limiters())
         await self._mount_and_scroll(UserCommandMessage(status_text))
 
+    async def _toggle_profiler(self, action: str) -> None:
+        running = self._profiler is not None and self._profiler.running
+        match action.lower():
+            case "start" if not running:
+                self._profiler = SamplingProfiler.from_config(self.config.profiling)
+                self._profiler.start()
+                message = "Profiling started. Run `/profile stop` to write the profile."
+            case "stop" if self._profiler is not None and running:
+                path = await asyncio.to_thread(self._profiler.stop)
+                message = (
+                    f"Profile written to `{path}` "
+                    f"({self._profiler.slow_callbacks} event loop stalls logged)."
+                )
+            case "start" | "stop":
+                message = f"Profiling is {'already' if running else 'not'} running."
+            case _:
+                message = "Usage: `/profile start` or `/profile stop`"
+        await self._mount_and_scroll(UserCommandMessage(message))
+
+    def on_unmount(self) -> None:
+        if self._profiler is not None and self._profiler.running:
+            self._profiler.stop()
+
     async def _show_config(self) -> None:
         """Switch to the configuration app in the bottom panel."""
         if self._current_bottom_app == BottomApp.Config:
@@ -741,6 +803,7 @@ class BloomApp(App):  # noqa: PLR0904
             await self._finalize_current_streaming_message()
             messages_area = self._cached_messages_area or self.query_one("#messages")
             await messages_area.remove_children()
+            self._transcript = None
 
             await messages_area.mount(UserMessage("/clear"))
             await self._mount_and_scroll(
@@ -991,20 +1054,24 @@ class BloomApp(App):  # noqa: PLR0904
             messages_area = self._cached_messages_area or self.query_one("#messages")
             if self._tool_call_map is None:
                 self._tool_call_map = {}
-            if self._load_more.widget:
-                before: Widget | int | None = None
-                after: Widget | None = self._load_more.widget
+            if self._transcript is not None and self._transcript.parent:
+                self._transcript.prepend(
+                    build_history_entries(
+                        batch.messages,
+                        self._tool_call_map,
+                        start_index=batch.start_index,
+                    )
+                )
             else:
-                before = 0
-                after = None
-            await self._mount_history_batch(
-                batch.messages,
-                messages_area,
-                self._tool_call_map,
-                start_index=batch.start_index,
-                before=before,
-                after=after,
-            )
+                after = self._load_more.widget
+                await self._mount_history_batch(
+                    batch.messages,
+                    messages_area,
+                    self._tool_call_map,
+                    start_index=batch.start_index,
+                    before=None if after else 0,
+                    after=after,
+                )
             if not self._windowing.has_backfill:
                 await self._load_more.hide()
             else:
@@ -1176,12 +1243,29 @@ class BloomApp(App):  # noqa: PLR0904
             is_tool_message = isinstance(widget, (ToolCallMessage, ToolResultMessage))
 
             if not is_tool_message:
-                self.call_after_refresh(self._scroll_to_bottom)
+                self._call_after_refresh_once(self._scroll_to_bottom)
 
         if result is not None:
-            self.call_after_refresh(self._try_prune)
+            self._call_after_refresh_once(self._try_prune)
         if was_at_bottom:
-            self.call_after_refresh(self._anchor_if_scrollable)
+            self._call_after_refresh_once(self._anchor_if_scrollable)
+
+    def _call_after_refresh_once(self, callback: Callable[[], Any]) -> None:
+        """Like `call_after_refresh`, but at most once per refresh per callback.
+
+        A fast stream mounts or appends many times between two frames; the
+        scroll, anchor and prune work only needs to run once after them.
+        """
+        if callback in self._pending_refresh_callbacks:
+            return
+        self._pending_refresh_callbacks.add(callback)
+
+        async def run() -> None:
+            self._pending_refresh_callbacks.discard(callback)
+            if inspect.isawaitable(result := callback()):
+                await result
+
+        self.call_after_refresh(run)
 
     def _is_scrolled_to_bottom(self, scroll_view: VerticalScroll) -> bool:
         try:
@@ -1198,13 +1282,38 @@ class BloomApp(App):  # noqa: PLR0904
             pass
 
     def _scroll_to_bottom_deferred(self) -> None:
-        self.call_after_refresh(self._scroll_to_bottom)
+        self._call_after_refresh_once(self._scroll_to_bottom)
 
     async def _try_prune(self) -> None:
         messages_area = self._cached_messages_area or self.query_one("#messages")
-        await prune_by_height(messages_area, PRUNE_LOW_MARK, PRUNE_HIGH_MARK)
-        if self._load_more.widget and not self._load_more.widget.parent:
-            self._load_more.widget = None
+        keep = [w for w in (self._load_more.widget, self._transcript) if w]
+        children = children_to_prune(
+            messages_area, PRUNE_LOW_MARK, PRUNE_HIGH_MARK, keep=keep
+        )
+        streaming = (self._current_streaming_message, self._current_streaming_reasoning)
+        for position, child in enumerate(children):
+            if child in streaming:
+                del children[position:]
+                break
+        if not children:
+            return
+
+        entries = archive_entries(children, self._history_widget_indices)
+        with self.batch_update():
+            transcript = await self._ensure_transcript(messages_area)
+            transcript.append(entries)
+            await messages_area.remove_children(children)
+
+    async def _ensure_transcript(self, messages_area: Widget) -> VirtualTranscript:
+        if self._transcript is not None and self._transcript.parent is messages_area:
+            return self._transcript
+        transcript = VirtualTranscript()
+        if self._load_more.widget and self._load_more.widget.parent is messages_area:
+            await messages_area.mount(transcript, after=self._load_more.widget)
+        else:
+            await messages_area.mount(transcript, before=0)
+        self._transcript = transcript
+        return transcript
 
     async def _refresh_windowing_from_history(self) -> None:
         if self._load_more.widget is None:
@@ -1215,6 +1324,7 @@ class BloomApp(App):  # noqa: PLR0904
             messages_children=list(messages_area.children),
             history_widget_indices=self._history_widget_indices,
             windowing=self._windowing,
+            archive=self._transcript,
         )
         self._tool_call_map = tool_call_map
         await self._load_more.set_visible(
@@ -1310,6 +1420,51 @@ class BloomApp(App):  # noqa: PLR0904
             self._chat_input_container.input_widget.set_app_focus(True)
 
 
+def _turn_timing_text(timing: TurnTiming) -> str:
+    def ms(seconds: float) -> str:
+        return f"{seconds * 1000:,.0f} ms"
+
+    lines = [
+        "",
+        "## Last Turn Timing",
+        "",
+        f"- **Total**: {ms(timing.total_seconds)}",
+        f"- **LLM Requests**: {timing.llm_requests}",
+        f"- **Time to First Token**: {ms(timing.time_to_first_token_seconds)}",
+        f"- **Streaming**: {ms(timing.streaming_seconds)}",
+        f"- **Token Gaps**: {ms(timing.mean_token_gap_seconds)} mean, "
+        f"{ms(timing.max_token_gap_seconds)} max",
+        f"- **Network Wait**: {ms(timing.network_wait_seconds)}",
+        f"- **Rate Limit Wait**: {ms(timing.queue_wait_seconds)}",
+        f"- **Request Building**: {ms(timing.request_build_seconds)}",
+        f"- **Tool Approval**: {ms(timing.approval_seconds)}",
+        f"- **Session I/O**: {ms(timing.session_io_seconds)}",
+        f"- **Middleware**: {ms(timing.middleware_seconds)}",
+    ]
+    lines.extend(
+        f"- **Tool `{name}`**: {ms(seconds)}"
+        for name, seconds in sorted(
+            timing.tool_seconds.items(), key=lambda item: item[1], reverse=True
+        )
+    )
+    return "\n".join(lines) + "\n"
+
+
+def _rate_limit_text(limiters: list[RateLimiter]) -> str:
+    lines = [
+        f"- **{limiter.name}**: {limiter.stats.requests:,} requests, "
+        f"{limiter.stats.queued:,} queued "
+        f"({limiter.stats.wait_seconds:,.1f}s total, "
+        f"{limiter.stats.max_wait_seconds:,.1f}s max), "
+        f"{limiter.stats.throttled:,} throttled"
+        for limiter in limiters
+        if limiter.stats.queued or limiter.stats.throttled
+    ]
+    if not lines:
+        return ""
+    return "\n".join(["", "## Rate Limits", "", *lines]) + "\n"
+
+
 def _print_session_resume_message(session_id: str | None) -> None:
     if not session_id:
         return
@@ -36,6 +36,9 @@ class EventHandler:
         self.scroll_callback = scroll_callback
         self.get_tools_collapsed = get_tools_collapsed
         self.current_tool_call: ToolCallMessage | None = None
+        # Calls still waiting for a result, by id; several can be in flight
+        # when tool calls from one message run concurrently.
+        self._open_tool_calls: dict[str, ToolCallMessage] = {}
         self.current_compact: CompactMessage | None = None
 
     async def handle_event(
@@ -95,22 +98,29 @@ class EventHandler:
             loading_widget.set_status(status_text)
 
         self.current_tool_call = tool_call
+        if event.tool_call_id:
+            self._open_tool_calls[event.tool_call_id] = tool_call
         await self.mount_callback(tool_call)
 
         return tool_call
 
     async def _handle_tool_result(self, event: ToolResultEvent) -> None:
         tools_collapsed = self.get_tools_collapsed()
-        tool_result = ToolResultMessage(
-            event, self.current_tool_call, collapsed=tools_collapsed
+        tool_call = self._open_tool_calls.pop(
+            event.tool_call_id or "", self.current_tool_call
         )
+        tool_result = ToolResultMessage(event, tool_call, collapsed=tools_collapsed)
         await self.mount_callback(tool_result)
 
-        self.current_tool_call = None
+        if tool_call is self.current_tool_call:
+            self.current_tool_call = None
 
     async def _handle_tool_stream(self, event: ToolStreamEvent) -> None:
-        if self.current_tool_call:
-            self.current_tool_call.set_stream_message(event.message)
+        tool_call = self._open_tool_calls.get(
+            event.tool_call_id or "", self.current_tool_call
+        )
+        if tool_call:
+            tool_call.set_stream_message(event.message)
 
     async def _handle_assistant_message(self, event: AssistantEvent) -> None:
         await self.mount_callback(AssistantMessage(event.content))
@@ -140,6 +150,9 @@ class EventHandler:
         if self.current_tool_call:
             self.current_tool_call.stop_spinning(success=success)
             self.current_tool_call = None
+        for tool_call in self._open_tool_calls.values():
+            tool_call.stop_spinning(success=success)
+        self._open_tool_calls.clear()
 
     def stop_current_compact(self) -> None:
         if self.current_compact:
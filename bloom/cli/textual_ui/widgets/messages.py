@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import time
 from typing import Any
 
 from textual.app import ComposeResult
 from textual.containers import Horizontal, Vertical
+from textual.timer import Timer
 from textual.widgets import Static
 from textual.widgets._markdown import MarkdownStream
 
 from bloom.cli.textual_ui.ansi_markdown import AnsiMarkdown as Markdown
 from bloom.cli.textual_ui.widgets.no_markup_static import NoMarkupStatic
 from bloom.cli.textual_ui.widgets.spinner import SpinnerMixin, SpinnerType
+from bloom.cli.textual_ui.widgets.transcript import EntryKind, TranscriptEntry
+
+# Streamed deltas reach the Markdown renderer at most once per frame, or as
+# soon as this many characters are waiting.
+STREAM_FRAME_SECONDS = 1 / 30
+STREAM_FLUSH_CHARS = 4096
+
+INTERRUPT_TEXT = "Interrupted · What should Bloom do instead?"
 
 
 class NonSelectableStatic(NoMarkupStatic):
@@ -47,6 +57,9 @@ class UserMessage(Static):
             if self._pending:
                 self.add_class("pending")
 
+    def to_transcript_entry(self, history_index: int | None = None) -> TranscriptEntry:
+        return TranscriptEntry(EntryKind.USER, self._content, history_index)
+
     async def set_pending(self, pending: bool) -> None:
         if pending == self._pending:
             return
@@ -67,6 +80,9 @@ class StreamingMessageBase(Static):
         self._markdown: Markdown | None = None
         self._stream: MarkdownStream | None = None
         self._content_initialized = False
+        self._pending = ""
+        self._last_flush = 0.0
+        self._flush_timer: Timer | None = None
 
     def _get_markdown(self) -> Markdown:
         if self._markdown is None:
@@ -85,9 +101,37 @@ class StreamingMessageBase(Static):
             return
 
         self._content += content
-        if self._should_write_content():
-            stream = self._ensure_stream()
-            await stream.write(content)
+        if not self._should_write_content():
+            return
+
+        self._pending += content
+        wait = self._last_flush + STREAM_FRAME_SECONDS - time.monotonic()
+        if wait <= 0 or len(self._pending) >= STREAM_FLUSH_CHARS:
+            await self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = self.set_timer(wait, self._flush_on_timer)
+
+    async def flush(self) -> None:
+        """Write any coalesced deltas to the Markdown stream now."""
+        self._cancel_flush_timer()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, ""
+        self._last_flush = time.monotonic()
+        await self._ensure_stream().write(pending)
+
+    async def _flush_on_timer(self) -> None:
+        self._flush_timer = None
+        await self.flush()
+
+    def _cancel_flush_timer(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
+            self._flush_timer = None
+
+    def _discard_pending(self) -> None:
+        self._cancel_flush_timer()
+        self._pending = ""
 
     async def write_initial_content(self) -> None:
         if self._content_initialized:
@@ -97,6 +141,7 @@ class StreamingMessageBase(Static):
             await stream.write(self._content)
 
     async def stop_stream(self) -> None:
+        await self.flush()
         if self._stream is None:
             return
 
@@ -119,6 +164,9 @@ class AssistantMessage(StreamingMessageBase):
         self._markdown = markdown
         yield markdown
 
+    def to_transcript_entry(self, history_index: int | None = None) -> TranscriptEntry:
+        return TranscriptEntry(EntryKind.ASSISTANT, self._content, history_index)
+
 
 class ReasoningMessage(SpinnerMixin, StreamingMessageBase):
     SPINNER_TYPE = SpinnerType.PULSE
@@ -173,6 +221,8 @@ class ReasoningMessage(SpinnerMixin, StreamingMessageBase):
             return
 
         self.collapsed = collapsed
+        # Expanding rewrites the whole content below; collapsing hides it.
+        self._discard_pending()
         if self._triangle_widget:
             self._triangle_widget.update("▶" if collapsed else "▼")
         if self._markdown:
@@ -185,6 +235,9 @@ class ReasoningMessage(SpinnerMixin, StreamingMessageBase):
                 stream = self._ensure_stream()
                 await stream.write(self._content)
 
+    def to_transcript_entry(self, history_index: int | None = None) -> TranscriptEntry:
+        return TranscriptEntry(EntryKind.REASONING, self._content, history_index)
+
 
 class UserCommandMessage(Static):
     def __init__(self, content: str) -> None:
@@ -198,6 +251,9 @@ class UserCommandMessage(Static):
             with Vertical(classes="user-command-content"):
                 yield Markdown(self._content)
 
+    def to_transcript_entry(self, history_index: int | None = None) -> TranscriptEntry:
+        return TranscriptEntry(EntryKind.NOTICE, self._content, history_index, gap=0)
+
 
 class WhatsNewMessage(Static):
     def __init__(self, content: str) -> None:
@@ -208,6 +264,10 @@ class WhatsNewMessage(Static):
     def compose(self) -> ComposeResult:
         yield Markdown(self._content)
 
+    def to_transcript_entry(self, history_index: int | None = None) -> TranscriptEntry:
+        gap = 1 if self.has_class("after-history") else 0
+        return TranscriptEntry(EntryKind.NOTICE, self._content, history_index, gap)
+
 
 class InterruptMessage(Static):
     def __init__(self) -> None:
@@ -217,10 +277,10 @@ class InterruptMessage(Static):
     def compose(self) -> ComposeResult:
         with Horizontal(classes="interrupt-container"):
             yield ExpandingBorder(classes="interrupt-border")
-            yield NoMarkupStatic(
-                "Interrupted · What should Bloom do instead?",
-                classes="interrupt-content",
-            )
+            yield NoMarkupStatic(INTERRUPT_TEXT, classes="interrupt-content")
+
+    def to_transcript_entry(self, history_index: int | None = None) -> TranscriptEntry:
+        return TranscriptEntry(EntryKind.OUTPUT, INTERRUPT_TEXT, history_index, gap=0)
 
 
 class BashOutputMessage(Static):
@@ -242,6 +302,10 @@ class BashOutputMessage(Static):
             yield ExpandingBorder(classes="bash-output-border")
             yield NoMarkupStatic(self._output, classes="bash-output")
 
+    def to_transcript_entry(self, history_index: int | None = None) -> TranscriptEntry:
+        text = f"$ {self._command}\n{self._output}".rstrip("\n")
+        return TranscriptEntry(EntryKind.OUTPUT, text, history_index)
+
 
 class ErrorMessage(Static):
     def __init__(self, error: str, collapsed: bool = False) -> None:
@@ -262,6 +326,10 @@ class ErrorMessage(Static):
     def set_collapsed(self, collapsed: bool) -> None:
         pass
 
+    def to_transcript_entry(self, history_index: int | None = None) -> TranscriptEntry:
+        text = f"Error: {self._error}"
+        return TranscriptEntry(EntryKind.ERROR, text, history_index, gap=0)
+
 
 class WarningMessage(Static):
     def __init__(self, message: str, show_border: bool = True) -> None:
@@ -275,3 +343,6 @@ class WarningMessage(Static):
             if self._show_border:
                 yield ExpandingBorder(classes="warning-border")
             yield NoMarkupStatic(self._message, classes="warning-content")
+
+    def to_transcript_entry(self, history_index: int | None = None) -> TranscriptEntry:
+        return TranscriptEntry(EntryKind.OUTPUT, self._message, history_index, gap=0)
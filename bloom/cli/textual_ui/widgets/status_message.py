@@ -9,6 +9,7 @@ from textual.widgets import Static
 from bloom.cli.textual_ui.widgets.messages import NonSelectableStatic
 from bloom.cli.textual_ui.widgets.no_markup_static import NoMarkupStatic
 from bloom.cli.textual_ui.widgets.spinner import SpinnerMixin, SpinnerType
+from bloom.cli.textual_ui.widgets.transcript import EntryKind, TranscriptEntry
 
 
 class StatusMessage(SpinnerMixin, NoMarkupStatic):
@@ -67,6 +68,14 @@ class StatusMessage(SpinnerMixin, NoMarkupStatic):
     def get_content(self) -> str:
         return self._initial_text
 
+    def _status_line(self) -> str:
+        if self._is_spinning:
+            return self.get_content()
+        return f"{'✓' if self.success else '✕'} {self.get_content()}"
+
+    def to_transcript_entry(self, history_index: int | None = None) -> TranscriptEntry:
+        return TranscriptEntry(EntryKind.OUTPUT, self._status_line(), history_index)
+
     def stop_spinning(self, success: bool = True) -> None:
         self._is_spinning = False
         self.success = success
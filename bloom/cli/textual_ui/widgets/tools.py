@@ -8,6 +8,7 @@ from bloom.cli.textual_ui.widgets.messages import ExpandingBorder, NonSelectable
 from bloom.cli.textual_ui.widgets.no_markup_static import NoMarkupStatic
 from bloom.cli.textual_ui.widgets.status_message import StatusMessage
 from bloom.cli.textual_ui.widgets.tool_widgets import get_result_widget
+from bloom.cli.textual_ui.widgets.transcript import EntryKind, TranscriptEntry
 from bloom.core.tools.ui import ToolUIDataAdapter
 from bloom.core.types import ToolCallEvent, ToolResultEvent
 
@@ -23,6 +24,7 @@ class ToolCallMessage(StatusMessage):
         self._tool_name = tool_name or (event.tool_name if event else "unknown")
         self._is_history = event is None
         self._stream_widget: NoMarkupStatic | None = None
+        self._result_text: str | None = None
 
         super().__init__()
         self.add_class("tool-call")
@@ -71,9 +73,17 @@ class ToolCallMessage(StatusMessage):
         super().stop_spinning(success)
 
     def set_result_text(self, text: str) -> None:
+        self._result_text = text
         if self._text_widget:
             self._text_widget.update(text)
 
+    def to_transcript_entry(self, history_index: int | None = None) -> TranscriptEntry:
+        text = self._status_line()
+        if self._result_text is not None:
+            text = f"{'✓' if self.success else '✕'} {self._result_text}"
+        gap = 0 if self.has_class("no-gap") else 1
+        return TranscriptEntry(EntryKind.TOOL_CALL, text, history_index, gap)
+
 
 class ToolResultMessage(Static):
     def __init__(
@@ -196,6 +206,20 @@ class ToolResultMessage(Static):
         self.collapsed = collapsed
         await self._render_result()
 
+    def to_transcript_entry(
+        self, history_index: int | None = None
+    ) -> TranscriptEntry | None:
+        # A successful result is summarised on its call line already.
+        if self._event is None or not (self._event.error or self._event.skipped):
+            return None
+        if self._event.error:
+            text = f"Error: {self._event.error}"
+            kind = EntryKind.ERROR
+        else:
+            text = f"Skipped: {self._event.skip_reason or 'User skipped'}"
+            kind = EntryKind.TOOL_RESULT
+        return TranscriptEntry(kind, text, history_index, gap=0)
+
     async def toggle_collapsed(self) -> None:
         self.collapsed = not self.collapsed
         await self._render_result()
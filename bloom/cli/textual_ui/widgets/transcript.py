@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import StrEnum, auto
+from itertools import accumulate, islice, pairwise
+import math
+from typing import ClassVar
+
+from rich.console import RenderableType
+from rich.markdown import Markdown
+from rich.style import Style
+from rich.text import Text
+from textual.geometry import Size
+from textual.strip import Strip
+from textual.widget import Widget
+
+# Rendered lines are kept for this many entries; heights are kept for all.
+RENDER_CACHE_SIZE = 256
+# Entries within this many lines of the one being painted are rendered too,
+# so their real heights are known before they scroll into view.
+OVERSCAN_LINES = 40
+
+
+class EntryKind(StrEnum):
+    USER = auto()
+    ASSISTANT = auto()
+    REASONING = auto()
+    TOOL_CALL = auto()
+    TOOL_RESULT = auto()
+    NOTICE = auto()
+    OUTPUT = auto()
+    ERROR = auto()
+
+
+HISTORY_ENTRY_KINDS = frozenset({
+    EntryKind.USER,
+    EntryKind.ASSISTANT,
+    EntryKind.REASONING,
+    EntryKind.TOOL_CALL,
+    EntryKind.TOOL_RESULT,
+})
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptEntry:
+    kind: EntryKind
+    text: str
+    history_index: int | None = None
+    # Blank lines above the entry, matching the widget's top margin.
+    gap: int = 1
+
+    @property
+    def key(self) -> int:
+        return hash((self.kind, self.text))
+
+
+class VirtualTranscript(Widget):
+    """Older transcript entries, painted a line at a time.
+
+    Messages pruned from the live chat (and history loaded on top of them)
+    end up here instead of being dropped. Only lines inside the viewport are
+    painted, one widget stands in for any number of messages, and rendered
+    lines are cached per entry content, width and theme, so scrolling back
+    through a long session neither mounts widgets nor re-parses Markdown.
+
+    Line offsets are only rebuilt in full when the width changes; appending,
+    prepending and correcting an estimated height update them in place.
+    """
+
+    DEFAULT_CSS = """
+    VirtualTranscript {
+        width: 100%;
+        height: auto;
+    }
+    """
+
+    COMPONENT_CLASSES: ClassVar[set[str]] = {
+        "transcript--user",
+        "transcript--muted",
+        "transcript--error",
+    }
+
+    def __init__(self, *, cache_size: int = RENDER_CACHE_SIZE) -> None:
+        super().__init__()
+        self._entries: list[TranscriptEntry] = []
+        self._cache_size = cache_size
+        self._strips: OrderedDict[tuple[int, int, str], list[Strip]] = OrderedDict()
+        self._exact_heights: dict[tuple[int, int], int] = {}
+        self._layout_width = 0
+        self._offsets: list[int] = [0]
+        # Real content heights found while painting, by entry index, applied
+        # to the offsets before the next frame.
+        self._corrections: dict[int, int] = {}
+        self._reflow_pending = False
+
+    @property
+    def entries(self) -> list[TranscriptEntry]:
+        return list(self._entries)
+
+    @property
+    def history_indices(self) -> list[int]:
+        return [e.history_index for e in self._entries if e.history_index is not None]
+
+    @property
+    def history_entry_count(self) -> int:
+        return sum(e.kind in HISTORY_ENTRY_KINDS for e in self._entries)
+
+    def append(self, entries: Iterable[TranscriptEntry]) -> None:
+        added = list(entries)
+        self._entries.extend(added)
+        if self._layout_width:
+            totals = accumulate(self._heights(added), initial=self._offsets[-1])
+            self._offsets.extend(islice(totals, 1, None))
+        self.refresh(layout=True)
+
+    def prepend(self, entries: Iterable[TranscriptEntry]) -> None:
+        added = list(entries)
+        self._entries[:0] = added
+        self._corrections = {
+            index + len(added): height for index, height in self._corrections.items()
+        }
+        if self._layout_width:
+            head = list(accumulate(self._heights(added), initial=0))
+            shift = head.pop()
+            self._offsets = head + [offset + shift for offset in self._offsets]
+        self.refresh(layout=True)
+
+    def _heights(self, entries: Iterable[TranscriptEntry]) -> Iterable[int]:
+        width = self._layout_width
+        return (entry.gap + self._content_height(entry, width) for entry in entries)
+
+    def _ensure_layout(self, width: int) -> None:
+        if width == self._layout_width:
+            return
+        self._layout_width = width
+        self._corrections.clear()
+        self._exact_heights = {
+            key: height
+            for key, height in self._exact_heights.items()
+            if key[1] == width
+        }
+        self._offsets = list(accumulate(self._heights(self._entries), initial=0))
+
+    def _content_height(self, entry: TranscriptEntry, width: int) -> int:
+        if (height := self._exact_heights.get((entry.key, width))) is not None:
+            return height
+        # Estimate until the entry is first rendered; the layout is corrected
+        # on the next frame once the real height is known.
+        lines = entry.text.splitlines() or [""]
+        return sum(max(1, math.ceil(len(line) / max(width, 1))) for line in lines)
+
+    def get_content_height(self, container: Size, viewport: Size, width: int) -> int:
+        self._ensure_layout(width)
+        return self._offsets[-1]
+
+    def render_line(self, y: int) -> Strip:
+        width = self.size.width
+        self._ensure_layout(width)
+        if not self._entries or y >= self._offsets[-1]:
+            return Strip.blank(width, self.rich_style)
+
+        index = bisect_right(self._offsets, y) - 1
+        strips = self._render_entry(index, width)
+        line = y - self._offsets[index] - self._entries[index].gap
+        if 0 <= line < len(strips):
+            return strips[line]
+        return Strip.blank(width, self.rich_style)
+
+    def _render_entry(self, index: int, width: int) -> list[Strip]:
+        entry = self._entries[index]
+        key = (entry.key, width, self.app.theme)
+        if (strips := self._strips.get(key)) is not None:
+            self._strips.move_to_end(key)
+            return strips
+
+        strips = self._cache_strips(index, key)
+        self._warm_neighbours(index, width)
+        return strips
+
+    def _warm_neighbours(self, index: int, width: int) -> None:
+        top = self._offsets[index] - OVERSCAN_LINES
+        bottom = self._offsets[index + 1] + OVERSCAN_LINES
+        first = max(bisect_right(self._offsets, top) - 1, 0)
+        last = min(bisect_right(self._offsets, bottom), len(self._entries))
+        for neighbour in range(first, last):
+            key = (self._entries[neighbour].key, width, self.app.theme)
+            if key not in self._strips:
+                self._cache_strips(neighbour, key)
+
+    def _cache_strips(self, index: int, key: tuple[int, int, str]) -> list[Strip]:
+        entry = self._entries[index]
+        entry_key, width, _ = key
+        strips = self._render_strips(entry, width)
+        self._strips[key] = strips
+        while len(self._strips) > self._cache_size:
+            self._strips.popitem(last=False)
+
+        self._exact_heights[entry_key, width] = len(strips)
+        estimated = self._offsets[index + 1] - self._offsets[index] - entry.gap
+        if len(strips) != estimated and width == self._layout_width:
+            # Offsets must stay put while this frame is painted; fix them
+            # before the next one.
+            self._corrections[index] = len(strips)
+            if not self._reflow_pending:
+                self._reflow_pending = True
+                self.call_after_refresh(self._reflow)
+        return strips
+
+    def _reflow(self) -> None:
+        self._reflow_pending = False
+        if not self._corrections:
+            return
+        # Only the offsets after the first corrected entry move.
+        start = min(self._corrections)
+        offsets = self._offsets
+        heights = [b - a for a, b in pairwise(offsets[start:])]
+        for index, height in self._corrections.items():
+            heights[index - start] = self._entries[index].gap + height
+        self._corrections.clear()
+        totals = accumulate(heights, initial=offsets[start])
+        offsets[start + 1 :] = islice(totals, 1, None)
+        self.refresh(layout=True)
+
+    def _render_strips(self, entry: TranscriptEntry, width: int) -> list[Strip]:
+        console = self.app.console
+        options = console.options.update_width(width)
+        lines = console.render_lines(self._renderable(entry), options, pad=True)
+        base = self.rich_style
+        return [Strip(line, width).apply_style(base) for line in lines]
+
+    def _renderable(self, entry: TranscriptEntry) -> RenderableType:
+        match entry.kind:
+            case EntryKind.USER:
+                style = self._style("transcript--user")
+                return Text.assemble(("┃ ", style), (entry.text, style))
+            case EntryKind.ASSISTANT | EntryKind.NOTICE:
+                return Markdown(entry.text)
+            case EntryKind.REASONING:
+                return Text("▶ Thought", style=self._style("transcript--muted"))
+            case EntryKind.ERROR:
+                return Text(entry.text, style=self._style("transcript--error"))
+            case _:
+                return Text(entry.text, style=self._style("transcript--muted"))
+
+    def _style(self, component: str) -> Style:
+        return self.get_component_rich_style(component, partial=True)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from bloom.cli.textual_ui.windowing.history import (
+    archive_entries,
+    build_history_entries,
     build_history_widgets,
     non_system_history_messages,
 )
@@ -21,6 +23,8 @@ __all__ = [
     "LOAD_MORE_BATCH_SIZE",
     "HistoryLoadMoreManager",
     "SessionWindowing",
+    "archive_entries",
+    "build_history_entries",
     "build_history_widgets",
     "create_resume_plan",
     "non_system_history_messages",
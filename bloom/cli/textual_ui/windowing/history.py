@@ -6,10 +6,18 @@ from textual.widget import Widget
 
 from bloom.cli.textual_ui.widgets.messages import (
     AssistantMessage,
+    BashOutputMessage,
+    ErrorMessage,
+    InterruptMessage,
     ReasoningMessage,
+    UserCommandMessage,
     UserMessage,
+    WarningMessage,
+    WhatsNewMessage,
 )
+from bloom.cli.textual_ui.widgets.status_message import StatusMessage
 from bloom.cli.textual_ui.widgets.tools import ToolCallMessage, ToolResultMessage
+from bloom.cli.textual_ui.widgets.transcript import EntryKind, TranscriptEntry
 from bloom.core.types import LLMMessage, Role
 
 
@@ -75,6 +83,80 @@ def build_history_widgets(
     return widgets
 
 
+def build_history_entries(
+    batch: list[LLMMessage], tool_call_map: dict[str, str], *, start_index: int
+) -> list[TranscriptEntry]:
+    """Transcript entries for `batch`, as `build_history_widgets` would show it."""
+    entries: list[TranscriptEntry] = []
+    after_tool = False
+
+    for offset, msg in enumerate(batch):
+        history_index = start_index + offset
+        match msg.role:
+            case Role.user:
+                if msg.content:
+                    entries.append(
+                        TranscriptEntry(EntryKind.USER, msg.content, history_index)
+                    )
+                    after_tool = False
+
+            case Role.assistant:
+                if msg.content:
+                    entries.append(
+                        TranscriptEntry(EntryKind.ASSISTANT, msg.content, history_index)
+                    )
+                    after_tool = False
+
+                for tool_call in msg.tool_calls or []:
+                    tool_name = tool_call.function.name or "unknown"
+                    if tool_call.id:
+                        tool_call_map[tool_call.id] = tool_name
+                    entries.append(
+                        TranscriptEntry(
+                            EntryKind.TOOL_CALL,
+                            f"✓ {tool_name}",
+                            history_index,
+                            gap=0 if after_tool else 1,
+                        )
+                    )
+                    after_tool = True
+
+            case Role.tool:
+                # History results render hidden; only their spacing shows.
+                after_tool = True
+
+    return entries
+
+
+_ARCHIVABLE_WIDGETS = (
+    UserMessage,
+    AssistantMessage,
+    ReasoningMessage,
+    UserCommandMessage,
+    WhatsNewMessage,
+    InterruptMessage,
+    BashOutputMessage,
+    ErrorMessage,
+    WarningMessage,
+    StatusMessage,
+    ToolResultMessage,
+)
+
+
+def archive_entries(
+    widgets: list[Widget], history_widget_indices: WeakKeyDictionary[Widget, int]
+) -> list[TranscriptEntry]:
+    """Transcript entries standing in for `widgets` once they are unmounted."""
+    entries: list[TranscriptEntry] = []
+    for widget in widgets:
+        if not widget.display or not isinstance(widget, _ARCHIVABLE_WIDGETS):
+            continue
+        entry = widget.to_transcript_entry(history_widget_indices.get(widget))
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
+
 def split_history_tail(
     history_messages: list[LLMMessage], tail_size: int
 ) -> tuple[list[LLMMessage], list[LLMMessage], int]:
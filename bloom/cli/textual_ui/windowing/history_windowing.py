@@ -6,6 +6,7 @@ from weakref import WeakKeyDictionary
 from textual.widget import Widget
 
 from bloom.cli.textual_ui.widgets.messages import WhatsNewMessage
+from bloom.cli.textual_ui.widgets.transcript import VirtualTranscript
 from bloom.cli.textual_ui.windowing.history import (
     build_tool_call_map,
     split_history_tail,
@@ -57,12 +58,16 @@ def sync_backfill_state(
     messages_children: list[Widget],
     history_widget_indices: WeakKeyDictionary[Widget, int],
     windowing: SessionWindowing,
+    archive: VirtualTranscript | None = None,
 ) -> tuple[bool, dict[str, str] | None]:
     if not history_messages:
         windowing.reset()
         return False, None
     visible_indices = visible_history_indices(messages_children, history_widget_indices)
     visible_history_widgets = visible_history_widgets_count(messages_children)
+    if archive is not None and archive in messages_children:
+        visible_indices += archive.history_indices
+        visible_history_widgets += archive.history_entry_count
     has_backfill = windowing.recompute_backfill(
         history_messages,
         visible_indices=visible_indices,
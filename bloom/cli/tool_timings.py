@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from bloom.core.tools.discovery import ToolFileTiming
+
+
+def _search_paths() -> list[Path]:
+    from bloom.core.config import BloomConfig
+    from bloom.core.tools.manager import ToolManager
+
+    try:
+        config = BloomConfig.load()
+    except Exception:
+        # Timings don't need a working provider, only the configured tool paths.
+        config = BloomConfig.model_construct()
+    return ToolManager._compute_search_paths(config)
+
+
+def format_tool_timings(timings: list[ToolFileTiming], top: int = 25) -> str:
+    total = sum(t.seconds for t in timings)
+    imported = [t for t in timings if t.imported]
+    lines = [
+        f"Tool discovery: {len(timings)} files, {len(imported)} imported, "
+        f"{total * 1000:.0f} ms",
+        "",
+    ]
+    for timing in sorted(timings, key=lambda t: t.seconds, reverse=True)[:top]:
+        tools = ", ".join(timing.tools) or "-"
+        note = "" if timing.imported else " (already imported)"
+        lines.append(
+            f"  {timing.seconds * 1000:8.1f} ms  {timing.path}  [{tools}]{note}"
+        )
+    return "\n".join(lines)
+
+
+def run_tool_timings() -> None:
+    from bloom.core.tools.manager import ToolManager
+
+    print(format_tool_timings(ToolManager.discovery_timings(_search_paths())))
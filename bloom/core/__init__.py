@@ -1,5 +1,18 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
 __all__ = ["run_programmatic"]
 
-from bloom.core.programmatic import run_programmatic
+if TYPE_CHECKING:
+    from bloom.core.programmatic import run_programmatic
+
+
+def __getattr__(name: str) -> Any:
+    # Resolved on first use so importing any `bloom.core` submodule doesn't
+    # drag in the agent loop, MCP and every builtin tool.
+    if name == "run_programmatic":
+        from bloom.core.programmatic import run_programmatic
+
+        return run_programmatic
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
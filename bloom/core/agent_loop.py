@@ -1,19 +1,30 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import AsyncGenerator, Callable
+from collections.abc import AsyncGenerator, Callable, Mapping
 from enum import StrEnum, auto
 from http import HTTPStatus
-from threading import Thread
+from logging import getLogger
+from pathlib import Path
 import time
 from typing import cast
 from uuid import uuid4
 
 from pydantic import BaseModel
 
+from bloom.core import tracing
 from bloom.core.agents.manager import AgentManager
 from bloom.core.agents.models import AgentProfile, BuiltinAgentName
-from bloom.core.config import BloomConfig
+from bloom.core.agents.subagents import SubagentBudget, SubagentPool
+from bloom.core.compaction import (
+    COMPACTION_PREFETCH_RATIO,
+    CompactionPlan,
+    RollingCompactor,
+    SummaryCache,
+    make_summary_message,
+)
+from bloom.core.config import BloomConfig, SessionLoggingConfig
+from bloom.core.history import HistoryOptimizer
 from bloom.core.llm.backend.factory import BACKEND_FACTORY
 from bloom.core.llm.exceptions import BackendError
 from bloom.core.llm.format import (
@@ -21,6 +32,16 @@ from bloom.core.llm.format import (
     ResolvedMessage,
     ResolvedToolCall,
 )
+from bloom.core.llm.rate_limit import (
+    RateLimitExceeded,
+    RequestPriority,
+    request_priority,
+)
+from bloom.core.llm.tokens import (
+    DEFAULT_CHARS_PER_TOKEN,
+    CharRatioTokenizer,
+    TokenEstimator,
+)
 from bloom.core.llm.types import BackendLike
 from bloom.core.middleware import (
     AutoCompactMiddleware,
@@ -34,11 +55,14 @@ from bloom.core.middleware import (
     ResetReason,
     TurnLimitMiddleware,
 )
-from bloom.core.prompts import UtilityPrompt
+from bloom.core.paths.global_paths import COMPACTION_CACHE_DIR
 from bloom.core.session.session_logger import SessionLogger
-from bloom.core.session.session_migration import migrate_sessions_entrypoint
+from bloom.core.session.session_migration import start_session_migration
 from bloom.core.skills.manager import SkillManager
-from bloom.core.system_prompt import get_universal_system_prompt
+from bloom.core.system_prompt import (
+    get_project_context_prompt,
+    get_universal_system_prompt,
+)
 from bloom.core.tools.base import (
     BaseTool,
     BaseToolConfig,
@@ -48,12 +72,18 @@ from bloom.core.tools.base import (
     ToolPermissionError,
 )
 from bloom.core.tools.manager import ToolManager
+from bloom.core.tools.speculation import (
+    SpeculativeOutcome,
+    SpeculativeToolExecutor,
+    ToolCallDeltaParser,
+)
 from bloom.core.types import (
     AgentStats,
     ApprovalCallback,
     ApprovalResponse,
     AssistantEvent,
     AsyncApprovalCallback,
+    AvailableTool,
     BaseEvent,
     CompactEndEvent,
     CompactStartEvent,
@@ -63,7 +93,9 @@ from bloom.core.types import (
     RateLimitError,
     ReasoningEvent,
     Role,
+    StreamAccumulator,
     SyncApprovalCallback,
+    ToolCall,
     ToolCallEvent,
     ToolResultEvent,
     ToolStreamEvent,
@@ -102,7 +134,12 @@ class AgentLoopLLMResponseError(AgentLoopError):
     """Raised when LLM response is malformed or missing expected data."""
 
 
+logger = getLogger("bloom")
+
+
 def _should_raise_rate_limit_error(e: Exception) -> bool:
+    if isinstance(e, RateLimitExceeded):
+        return True
     return isinstance(e, BackendError) and e.status == HTTPStatus.TOO_MANY_REQUESTS
 
 
@@ -116,6 +153,8 @@ class AgentLoop:
         max_price: float | None = None,
         backend: BackendLike | None = None,
         enable_streaming: bool = False,
+        parent: AgentLoop | None = None,
+        tool_catalog: Mapping[str, type[BaseTool]] | None = None,
     ) -> None:
         self._base_config = config
         self._max_turns = max_turns
@@ -124,22 +163,49 @@ class AgentLoop:
         self.agent_manager = AgentManager(
             lambda: self._base_config, initial_agent=agent_name
         )
-        self.tool_manager = ToolManager(lambda: self.config)
+        # Subagents share the parent's tool classes, backend client and
+        # project-context snapshot instead of rebuilding them.
+        if tool_catalog is None and parent is not None:
+            tool_catalog = parent.tool_manager.catalog
+        self.tool_manager = ToolManager(lambda: self.config, catalog=tool_catalog)
         self.skill_manager = SkillManager(lambda: self.config)
         self.format_handler = APIToolFormatHandler()
 
+        if backend is None and parent is not None:
+            backend = parent.backend
         self.backend_factory = lambda: backend or self._select_backend()
         self.backend = self.backend_factory()
+        self.subagent_pool = SubagentPool(self._spawn_subagent)
+        # The provider's rate limit is shared, so the user's turn goes first.
+        self._request_priority = (
+            RequestPriority.SUBAGENT
+            if parent is not None
+            else RequestPriority.INTERACTIVE
+        )
+
+        self.token_estimator = self._build_token_estimator()
+        # Number of leading messages covered by stats.context_tokens; anything
+        # after it is estimated locally before the next request is sent.
+        self._context_accounted_upto: int | None = None
+
+        self.compactor = self._build_compactor()
+        self._compaction_prefetch: asyncio.Task[str] | None = None
+        self.history_optimizer = HistoryOptimizer(self.config.history)
 
         self.message_observer = message_observer
         self._last_observed_message_index: int = 0
         self.enable_streaming = enable_streaming
+        self._speculation: SpeculativeToolExecutor | None = None
         self.middleware_pipeline = MiddlewarePipeline()
         self._setup_middleware()
 
-        system_prompt = get_universal_system_prompt(
-            self.tool_manager, self.config, self.skill_manager, self.agent_manager
+        self._project_context: str | None = (
+            parent._project_context if parent is not None else None
         )
+        # Reminders from middleware, sent after the history on the next request
+        # only, so earlier messages stay byte-identical for prompt caching.
+        self._pending_injections: list[str] = []
+        system_prompt = self._build_system_prompt(reuse_project_context=True)
         self.messages = [LLMMessage(role=Role.system, content=system_prompt)]
 
         if self.message_observer:
@@ -151,6 +217,7 @@ class AgentLoop:
             active_model = config.get_active_model()
             self.stats.input_price_per_million = active_model.input_price
             self.stats.output_price_per_million = active_model.output_price
+            self.stats.cached_input_price_per_million = active_model.cached_input_price
         except ValueError:
             pass
 
@@ -158,16 +225,42 @@ class AgentLoop:
         self.user_input_callback: UserInputCallback | None = None
 
         self.session_id = str(uuid4())
+        # Set by clients that address the session by its id (ACP), so that
+        # compaction and clearing start a new log under the same id.
+        self.keep_session_id = False
 
         self.session_logger = SessionLogger(config.session_logging, self.session_id)
 
-        thread = Thread(
-            target=migrate_sessions_entrypoint,
-            args=(config.session_logging,),
-            daemon=True,
-            name="migrate_sessions",
+        if parent is None:  # Subagents don't log sessions.
+            start_session_migration(config.session_logging)
+
+    @classmethod
+    def for_subagent(
+        cls,
+        base_config: BloomConfig,
+        agent_name: str,
+        budget: SubagentBudget,
+        *,
+        parent: AgentLoop | None = None,
+    ) -> AgentLoop:
+        """A subagent running on its own copy of `base_config`, without logging."""
+        # Deep: a profile without overrides uses the config as given, and the
+        # subagent must not share the parent's mutable tool settings.
+        config = base_config.model_copy(
+            update={"session_logging": SessionLoggingConfig(enabled=False)}, deep=True
+        )
+        return cls(
+            config,
+            agent_name=agent_name,
+            max_turns=budget.max_turns,
+            max_price=budget.max_price,
+            parent=parent,
+        )
+
+    def _spawn_subagent(self, agent_name: str, budget: SubagentBudget) -> AgentLoop:
+        return AgentLoop.for_subagent(
+            self._base_config, agent_name, budget, parent=self
         )
-        thread.start()
 
     @property
     def agent_profile(self) -> AgentProfile:
@@ -201,20 +294,105 @@ class AgentLoop:
         timeout = self.config.api_timeout
         return BACKEND_FACTORY[provider.backend](provider=provider, timeout=timeout)
 
+    def _build_system_prompt(self, *, reuse_project_context: bool = False) -> str:
+        """Build the system prompt, optionally keeping the project context snapshot.
+
+        The project context embeds git status and the directory tree, which
+        change as the agent works; regenerating it mid-conversation would
+        invalidate the provider's cached prompt prefix.
+        """
+        if self.config.include_project_context and (
+            self._project_context is None or not reuse_project_context
+        ):
+            self._project_context = get_project_context_prompt(self.config)
+        return get_universal_system_prompt(
+            self.tool_manager,
+            self.config,
+            self.skill_manager,
+            self.agent_manager,
+            project_context=self._project_context,
+        )
+
+    def _build_token_estimator(self) -> TokenEstimator:
+        try:
+            return TokenEstimator.for_model(self.config.get_active_model())
+        except ValueError:
+            return TokenEstimator(CharRatioTokenizer(DEFAULT_CHARS_PER_TOKEN))
+
+    def _build_compactor(self) -> RollingCompactor:
+        # Summaries are only persisted when the user already keeps session logs.
+        cache_dir = (
+            COMPACTION_CACHE_DIR.path if self.config.session_logging.enabled else None
+        )
+        return RollingCompactor(
+            estimator=lambda: self.token_estimator,
+            summarize=self._summarize_for_compaction,
+            cache=SummaryCache(cache_dir),
+            segment_tokens=self.config.compaction_segment_tokens,
+        )
+
+    def _keep_recent_budget(self) -> int:
+        budget = self.config.compaction_keep_recent_tokens
+        if (limit := self.config.effective_context_limit) > 0:
+            budget = min(budget, limit // 4)
+        return budget
+
+    def _optimize_history(self) -> None:
+        changed = self.history_optimizer.optimize(self.messages)
+        if not changed or self._context_accounted_upto is None:
+            return
+
+        saved = sum(
+            self.token_estimator.estimate([self.history_optimizer.restore(message)])
+            - self.token_estimator.estimate([message])
+            for message in changed
+        )
+        self.stats.context_tokens = max(0, self.stats.context_tokens - saved)
+
+    def _account_pending_context(self) -> None:
+        """Fold a local estimate of not-yet-billed messages into context_tokens.
+
+        This lets middleware react to a large tool result or user message before
+        the request carrying it is sent, instead of one turn later.
+        """
+        start = self._context_accounted_upto
+        if start is None:
+            if self.stats.context_tokens:
+                self._context_accounted_upto = len(self.messages)
+                return
+            start = 0
+
+        if start >= len(self.messages):
+            return
+
+        pending = self.token_estimator.estimate(self.messages[start:])
+        self._context_accounted_upto = len(self.messages)
+        if pending:
+            self.stats.context_tokens += pending
+
+    def _record_reported_context(
+        self, sent_count: int, tools: list[AvailableTool], usage: LLMUsage
+    ) -> None:
+        self.token_estimator.calibrate(
+            self.messages[:sent_count], tools, usage.prompt_tokens
+        )
+        self._context_accounted_upto = len(self.messages)
+
     def add_message(self, message: LLMMessage) -> None:
         self.messages.append(message)
 
-    async def _save_messages(self) -> None:
+    async def _save_messages(self, *, update_metadata: bool = False) -> None:
         await self.session_logger.save_interaction(
             self.messages,
             self.stats,
             self._base_config,
             self.tool_manager,
             self.agent_profile,
+            update_metadata=update_metadata,
         )
 
-    async def _flush_new_messages(self) -> None:
-        await self._save_messages()
+    async def _flush_new_messages(self, *, update_metadata: bool = False) -> None:
+        await self._save_messages(update_metadata=update_metadata)
 
         if not self.message_observer:
             return
@@ -230,6 +408,7 @@ class AgentLoop:
         self._clean_message_history()
         async for event in self._conversation_loop(msg):
             yield event
+        self._maybe_prefetch_compaction()
 
     def _setup_middleware(self) -> None:
         """Configure middleware pipeline for this conversation."""
@@ -263,7 +442,9 @@ class AgentLoop:
                 )
 
             case MiddlewareAction.INJECT_MESSAGE:
-                if result.message and len(self.messages) > 0:
+                if result.message and self.config.stable_prompt_prefix:
+                    self._pending_injections.append(result.message)
+                elif result.message and len(self.messages) > 0:
                     last_msg = self.messages[-1]
                     if last_msg.content:
                         last_msg.content += f"\n\n{result.message}"
@@ -312,12 +493,17 @@ class AgentLoop:
 
         yield UserMessageEvent(content=user_msg, message_id=user_message.message_id)
 
+        tracer = tracing.TurnTracer()
+        previous_tracer = tracing.activate(tracer)
         try:
             should_break_loop = False
             while not should_break_loop:
-                result = await self.middleware_pipeline.run_before_turn(
-                    self._get_context()
-                )
+                self._optimize_history()
+                self._account_pending_context()
+                with tracing.span("middleware", hook="before_turn"):
+                    result = await self.middleware_pipeline.run_before_turn(
+                        self._get_context()
+                    )
                 async for event in self._handle_middleware_result(result):
                     yield event
 
@@ -338,9 +524,10 @@ class AgentLoop:
                 if user_cancelled:
                     return
 
-                after_result = await self.middleware_pipeline.run_after_turn(
-                    self._get_context()
-                )
+                with tracing.span("middleware", hook="after_turn"):
+                    after_result = await self.middleware_pipeline.run_after_turn(
+                        self._get_context()
+                    )
                 async for event in self._handle_middleware_result(after_result):
                     yield event
 
@@ -348,27 +535,44 @@ class AgentLoop:
                     return
 
         finally:
-            await self._flush_new_messages()
+            self.stats.last_turn_timing = tracer.timing()
+            await self._flush_new_messages(update_metadata=True)
+            tracing.activate(previous_tracer)
+            await self._export_trace(tracer)
+
+    async def _export_trace(self, tracer: tracing.TurnTracer) -> None:
+        if not self.config.tracing.export_file:
+            return
+        path = Path(self.config.tracing.export_file).expanduser()
+        try:
+            await asyncio.to_thread(tracing.export, tracer, path)
+        except OSError as e:
+            logger.warning("Failed to export trace to %s: %s", path, e)
 
     async def _perform_llm_turn(self) -> AsyncGenerator[BaseEvent, None]:
-        if self.enable_streaming:
-            async for event in self._stream_assistant_events():
-                yield event
-        else:
-            assistant_event = await self._get_assistant_event()
-            if assistant_event.content:
-                yield assistant_event
+        try:
+            if self.enable_streaming:
+                async for event in self._stream_assistant_events():
+                    yield event
+            else:
+                assistant_event = await self._get_assistant_event()
+                if assistant_event.content:
+                    yield assistant_event
 
-        last_message = self.messages[-1]
+            last_message = self.messages[-1]
 
-        parsed = self.format_handler.parse_message(last_message)
-        resolved = self.format_handler.resolve_tool_calls(parsed, self.tool_manager)
+            parsed = self.format_handler.parse_message(last_message)
+            resolved = self.format_handler.resolve_tool_calls(parsed, self.tool_manager)
 
-        if not resolved.tool_calls and not resolved.failed_calls:
-            return
+            if not resolved.tool_calls and not resolved.failed_calls:
+                return
 
-        async for event in self._handle_tool_calls(resolved):
-            yield event
+            async for event in self._handle_tool_calls(resolved):
+                yield event
+        finally:
+            if self._speculation is not None:
+                await self._speculation.discard()
+                self._speculation = None
 
     async def _stream_assistant_events(
         self,
@@ -449,119 +653,262 @@ class AgentLoop:
                 )
             )
 
-        for tool_call in resolved.tool_calls:
-            yield ToolCallEvent(
-                tool_name=tool_call.tool_name,
-                tool_class=tool_call.tool_class,
-                args=tool_call.validated_args,
-                tool_call_id=tool_call.call_id,
-            )
-
-            try:
-                tool_instance = self.tool_manager.get(tool_call.tool_name)
-            except Exception as exc:
-                error_msg = f"Error getting tool '{tool_call.tool_name}': {exc}"
-                yield ToolResultEvent(
+        for batch in self._batch_tool_calls(resolved.tool_calls):
+            approved: list[
+                tuple[BaseTool, ResolvedToolCall, SpeculativeOutcome | None]
+            ] = []
+            for tool_call in batch:
+                yield ToolCallEvent(
                     tool_name=tool_call.tool_name,
                     tool_class=tool_call.tool_class,
-                    error=error_msg,
+                    args=tool_call.validated_args,
                     tool_call_id=tool_call.call_id,
                 )
-                self._append_tool_response(tool_call, error_msg)
-                continue
 
-            decision = await self._should_execute_tool(
-                tool_instance, tool_call.validated_args, tool_call.call_id
-            )
-
-            if decision.verdict == ToolExecutionResponse.SKIP:
-                self.stats.tool_calls_rejected += 1
-                skip_reason = decision.feedback or str(
-                    get_user_cancellation_message(
-                        CancellationReason.TOOL_SKIPPED, tool_call.tool_name
+                try:
+                    tool_instance = self.tool_manager.get(tool_call.tool_name)
+                except Exception as exc:
+                    error_msg = f"Error getting tool '{tool_call.tool_name}': {exc}"
+                    yield ToolResultEvent(
+                        tool_name=tool_call.tool_name,
+                        tool_class=tool_call.tool_class,
+                        error=error_msg,
+                        tool_call_id=tool_call.call_id,
                     )
-                )
+                    self._append_tool_response(tool_call, error_msg)
+                    continue
 
-                yield ToolResultEvent(
-                    tool_name=tool_call.tool_name,
-                    tool_class=tool_call.tool_class,
-                    skipped=True,
-                    skip_reason=skip_reason,
-                    tool_call_id=tool_call.call_id,
+                decision, speculative = await self._decide_tool_execution(
+                    tool_instance, tool_call
                 )
-                self._append_tool_response(tool_call, skip_reason)
-                continue
 
-            self.stats.tool_calls_agreed += 1
-
-            try:
-                start_time = time.perf_counter()
-                result_model = None
+                if decision.verdict == ToolExecutionResponse.SKIP:
+                    self.stats.tool_calls_rejected += 1
+                    skip_reason = decision.feedback or str(
+                        get_user_cancellation_message(
+                            CancellationReason.TOOL_SKIPPED, tool_call.tool_name
+                        )
+                    )
 
-                async for item in tool_instance.invoke(
-                    ctx=InvokeContext(
+                    yield ToolResultEvent(
+                        tool_name=tool_call.tool_name,
+                        tool_class=tool_call.tool_class,
+                        skipped=True,
+                        skip_reason=skip_reason,
                         tool_call_id=tool_call.call_id,
-                        approval_callback=self.approval_callback,
-                        agent_manager=self.agent_manager,
-                        user_input_callback=self.user_input_callback,
-                    ),
-                    **tool_call.args_dict,
+                    )
+                    self._append_tool_response(tool_call, skip_reason)
+                    continue
+
+                self.stats.tool_calls_agreed += 1
+                approved.append((tool_instance, tool_call, speculative))
+
+            if len(approved) > 1:
+                async for event in self._run_tool_calls_concurrently(approved):
+                    yield event
+                continue
+
+            for tool_instance, tool_call, speculative in approved:
+                async for event in self._run_tool_call(
+                    tool_instance, tool_call, speculative
                 ):
-                    if isinstance(item, ToolStreamEvent):
-                        yield item
-                    else:
-                        result_model = item
+                    yield event
 
-                duration = time.perf_counter() - start_time
+    def _batch_tool_calls(
+        self, tool_calls: list[ResolvedToolCall]
+    ) -> list[list[ResolvedToolCall]]:
+        """Group consecutive calls to a tool that allows concurrent runs.
+
+        Calls are still approved one at a time in order; only execution of an
+        approved batch overlaps.
+        """
+        batches: list[list[ResolvedToolCall]] = []
+        for tool_call in tool_calls:
+            if (
+                batches
+                and batches[-1][0].tool_name == tool_call.tool_name
+                and self._max_concurrency(tool_call.tool_name) > 1
+            ):
+                batches[-1].append(tool_call)
+            else:
+                batches.append([tool_call])
+        return batches
 
-                if result_model is None:
-                    raise ToolError("Tool did not yield a result")
+    def _max_concurrency(self, tool_name: str) -> int:
+        try:
+            return self.tool_manager.get(tool_name).max_concurrency
+        except Exception:
+            return 1
 
-                text = "\n".join(
-                    f"{k}: {v}" for k, v in result_model.model_dump().items()
-                )
-                self._append_tool_response(tool_call, text)
+    async def _run_tool_calls_concurrently(
+        self,
+        approved: list[tuple[BaseTool, ResolvedToolCall, SpeculativeOutcome | None]],
+    ) -> AsyncGenerator[ToolResultEvent | ToolStreamEvent]:
+        """Run approved calls side by side, yielding events as they arrive.
+
+        Tool responses are appended to the history in completion order; each
+        one carries its call id, so providers match them up regardless.
+        """
+        limit = asyncio.Semaphore(approved[0][0].max_concurrency)
+        events: asyncio.Queue[ToolResultEvent | ToolStreamEvent | None] = (
+            asyncio.Queue()
+        )
 
-                yield ToolResultEvent(
-                    tool_name=tool_call.tool_name,
-                    tool_class=tool_call.tool_class,
-                    result=result_model,
-                    duration=duration,
-                    tool_call_id=tool_call.call_id,
-                )
+        async def run(
+            tool: BaseTool,
+            tool_call: ResolvedToolCall,
+            speculative: SpeculativeOutcome | None,
+        ) -> None:
+            try:
+                async with limit:
+                    async for event in self._run_tool_call(
+                        tool, tool_call, speculative
+                    ):
+                        events.put_nowait(event)
+            finally:
+                events.put_nowait(None)
+
+        tasks = [
+            asyncio.create_task(run(*call), name=f"tool-{call[1].tool_name}")
+            for call in approved
+        ]
+        try:
+            running = len(tasks)
+            while running:
+                if (event := await events.get()) is None:
+                    running -= 1
+                else:
+                    yield event
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_tool_call(
+        self,
+        tool_instance: BaseTool,
+        tool_call: ResolvedToolCall,
+        speculative: SpeculativeOutcome | None,
+    ) -> AsyncGenerator[ToolResultEvent | ToolStreamEvent]:
+        try:
+            start_time = time.perf_counter()
+            result_model = None
 
-                self.stats.tool_calls_succeeded += 1
+            async for item in self._invoke_tool(tool_instance, tool_call, speculative):
+                if isinstance(item, ToolStreamEvent):
+                    yield item
+                else:
+                    result_model = item
 
-            except asyncio.CancelledError:
-                cancel = str(
-                    get_user_cancellation_message(CancellationReason.TOOL_INTERRUPTED)
-                )
-                yield ToolResultEvent(
-                    tool_name=tool_call.tool_name,
-                    tool_class=tool_call.tool_class,
-                    error=cancel,
-                    tool_call_id=tool_call.call_id,
+            duration = (
+                speculative.duration
+                if speculative is not None
+                else time.perf_counter() - start_time
+            )
+            if tracer := tracing.current():
+                end_ns = time.perf_counter_ns()
+                tracer.record(
+                    "tool",
+                    end_ns - int(duration * 1e9),
+                    end_ns,
+                    tool=tool_call.tool_name,
+                    speculative=speculative is not None,
                 )
-                self._append_tool_response(tool_call, cancel)
-                raise
 
-            except (ToolError, ToolPermissionError) as exc:
-                error_msg = f"<{TOOL_ERROR_TAG}>{tool_instance.get_name()} failed: {exc}</{TOOL_ERROR_TAG}>"
+            if result_model is None:
+                raise ToolError("Tool did not yield a result")
 
-                yield ToolResultEvent(
-                    tool_name=tool_call.tool_name,
-                    tool_class=tool_call.tool_class,
-                    error=error_msg,
-                    tool_call_id=tool_call.call_id,
-                )
+            text = "\n".join(f"{k}: {v}" for k, v in result_model.model_dump().items())
+            self._append_tool_response(tool_call, text)
 
-                if isinstance(exc, ToolPermissionError):
-                    self.stats.tool_calls_agreed -= 1
-                    self.stats.tool_calls_rejected += 1
-                else:
-                    self.stats.tool_calls_failed += 1
-                self._append_tool_response(tool_call, error_msg)
-                continue
+            yield ToolResultEvent(
+                tool_name=tool_call.tool_name,
+                tool_class=tool_call.tool_class,
+                result=result_model,
+                duration=duration,
+                tool_call_id=tool_call.call_id,
+            )
+
+            self.stats.tool_calls_succeeded += 1
+
+        except asyncio.CancelledError:
+            cancel = str(
+                get_user_cancellation_message(CancellationReason.TOOL_INTERRUPTED)
+            )
+            yield ToolResultEvent(
+                tool_name=tool_call.tool_name,
+                tool_class=tool_call.tool_class,
+                error=cancel,
+                tool_call_id=tool_call.call_id,
+            )
+            self._append_tool_response(tool_call, cancel)
+            raise
+
+        except (ToolError, ToolPermissionError) as exc:
+            error_msg = f"<{TOOL_ERROR_TAG}>{tool_instance.get_name()} failed: {exc}</{TOOL_ERROR_TAG}>"
+
+            yield ToolResultEvent(
+                tool_name=tool_call.tool_name,
+                tool_class=tool_call.tool_class,
+                error=error_msg,
+                tool_call_id=tool_call.call_id,
+            )
+
+            if isinstance(exc, ToolPermissionError):
+                self.stats.tool_calls_agreed -= 1
+                self.stats.tool_calls_rejected += 1
+            else:
+                self.stats.tool_calls_failed += 1
+            self._append_tool_response(tool_call, error_msg)
+
+    async def _invoke_tool(
+        self,
+        tool: BaseTool,
+        tool_call: ResolvedToolCall,
+        speculative: SpeculativeOutcome | None,
+    ) -> AsyncGenerator[ToolStreamEvent | BaseModel]:
+        if speculative is None:
+            async for item in tool.invoke(
+                ctx=self._make_invoke_context(tool_call.call_id), **tool_call.args_dict
+            ):
+                yield item
+            return
+
+        for stream_event in speculative.stream_events:
+            yield stream_event
+        if speculative.error is not None:
+            raise speculative.error
+        if speculative.result is not None:
+            yield speculative.result
+
+    def _make_invoke_context(self, tool_call_id: str) -> InvokeContext:
+        return InvokeContext(
+            tool_call_id=tool_call_id,
+            approval_callback=self.approval_callback,
+            agent_manager=self.agent_manager,
+            user_input_callback=self.user_input_callback,
+            subagent_pool=self.subagent_pool,
+        )
+
+    async def _decide_tool_execution(
+        self, tool: BaseTool, tool_call: ResolvedToolCall
+    ) -> tuple[ToolDecision, SpeculativeOutcome | None]:
+        if self._speculation is not None and (
+            speculative := await self._speculation.claim(tool_call)
+        ):
+            return ToolDecision(verdict=ToolExecutionResponse.EXECUTE), speculative
+
+        decision = await self._should_execute_tool(
+            tool, tool_call.validated_args, tool_call.call_id
+        )
+        return decision, None
+
+    def _can_speculate(self, tool: BaseTool, args: BaseModel) -> bool:
+        decision = self._get_decision_without_approval(tool, args)
+        return (
+            decision is not None and decision.verdict == ToolExecutionResponse.EXECUTE
+        )
 
     def _append_tool_response(self, tool_call: ResolvedToolCall, text: str) -> None:
         self.messages.append(
@@ -579,19 +926,28 @@ class AgentLoop:
 
         try:
             start_time = time.perf_counter()
-            result = await self.backend.complete(
-                model=active_model,
-                messages=self.messages,
-                temperature=active_model.temperature,
-                tools=available_tools,
-                tool_choice=tool_choice,
-                extra_headers={
-                    "user-agent": get_user_agent(provider.backend),
-                    "x-affinity": self.session_id,
-                },
-                max_tokens=max_tokens,
-            )
+            with request_priority(self._request_priority):
+                result = await self.backend.complete(
+                    model=active_model,
+                    messages=self._request_messages(),
+                    temperature=active_model.temperature,
+                    tools=available_tools,
+                    tool_choice=tool_choice,
+                    extra_headers={
+                        "user-agent": get_user_agent(provider.backend),
+                        "x-affinity": self.session_id,
+                    },
+                    max_tokens=max_tokens,
+                )
             end_time = time.perf_counter()
+            self._pending_injections.clear()
+            if tracer := tracing.current():
+                tracer.record(
+                    "llm.request",
+                    int(start_time * 1e9),
+                    int(end_time * 1e9),
+                    model=active_model.name,
+                )
 
             if result.usage is None:
                 raise AgentLoopLLMResponseError(
@@ -602,7 +958,9 @@ class AgentLoop:
             processed_message = self.format_handler.process_api_response_message(
                 result.message
             )
+            sent_count = len(self.messages)
             self.messages.append(processed_message)
+            self._record_reported_context(sent_count, available_tools, result.usage)
             return LLMChunk(message=processed_message, usage=result.usage)
 
         except Exception as e:
@@ -613,6 +971,49 @@ class AgentLoop:
                 f"API error from {provider.name} (model: {active_model.name}): {e}"
             ) from e
 
+    async def _summarize_for_compaction(self, request: list[LLMMessage]) -> str:
+        active_model = self.config.get_active_model()
+        provider = self.config.get_provider_for_model(active_model)
+        available_tools = self.format_handler.get_available_tools(self.tool_manager)
+
+        try:
+            # Summaries wait behind the requests of live turns.
+            with request_priority(RequestPriority.BACKGROUND):
+                result = await self.backend.complete(
+                    model=active_model,
+                    messages=request,
+                    temperature=active_model.temperature,
+                    tools=available_tools,
+                    tool_choice=self.format_handler.get_tool_choice(),
+                    extra_headers={
+                        "user-agent": get_user_agent(provider.backend),
+                        "x-affinity": self.session_id,
+                    },
+                    max_tokens=None,
+                )
+        except Exception as e:
+            if _should_raise_rate_limit_error(e):
+                raise RateLimitError(provider.name, active_model.name) from e
+
+            raise RuntimeError(
+                f"API error from {provider.name} (model: {active_model.name}): {e}"
+            ) from e
+
+        if result.usage is None:
+            raise AgentLoopLLMResponseError(
+                "Usage data missing in compaction summary response"
+            )
+        # Summaries may run in the background between turns, so they only add
+        # to the session totals and leave the live context figures alone. The
+        # step is counted once per compaction, by `compact`.
+        self.stats.session_prompt_tokens += result.usage.prompt_tokens
+        self.stats.session_completion_tokens += result.usage.completion_tokens
+        self.stats.session_cached_tokens += result.usage.cached_tokens
+        self.token_estimator.calibrate(
+            request, available_tools, result.usage.prompt_tokens
+        )
+        return result.message.content or ""
+
     async def _chat_streaming(
         self, max_tokens: int | None = None
     ) -> AsyncGenerator[LLMChunk]:
@@ -621,38 +1022,75 @@ class AgentLoop:
 
         available_tools = self.format_handler.get_available_tools(self.tool_manager)
         tool_choice = self.format_handler.get_tool_choice()
+
+        tool_call_parser: ToolCallDeltaParser | None = None
+        if self.config.speculative_tool_execution:
+            tool_call_parser = ToolCallDeltaParser()
+            self._speculation = SpeculativeToolExecutor(
+                tool_manager=self.tool_manager,
+                format_handler=self.format_handler,
+                can_speculate=self._can_speculate,
+                context_factory=self._make_invoke_context,
+            )
+
+        tracer = tracing.current()
         try:
             start_time = time.perf_counter()
+            first_chunk_time: float | None = None
             usage = LLMUsage()
-            chunk_agg = LLMChunk(message=LLMMessage(role=Role.assistant))
-            async for chunk in self.backend.complete_streaming(
-                model=active_model,
-                messages=self.messages,
-                temperature=active_model.temperature,
-                tools=available_tools,
-                tool_choice=tool_choice,
-                extra_headers={
-                    "user-agent": get_user_agent(provider.backend),
-                    "x-affinity": self.session_id,
-                },
-                max_tokens=max_tokens,
-            ):
-                processed_message = self.format_handler.process_api_response_message(
-                    chunk.message
-                )
-                processed_chunk = LLMChunk(message=processed_message, usage=chunk.usage)
-                chunk_agg += processed_chunk
-                usage += chunk.usage or LLMUsage()
-                yield processed_chunk
+            accumulator = StreamAccumulator()
+            with request_priority(self._request_priority):
+                async for chunk in self.backend.complete_streaming(
+                    model=active_model,
+                    messages=self._request_messages(),
+                    temperature=active_model.temperature,
+                    tools=available_tools,
+                    tool_choice=tool_choice,
+                    extra_headers={
+                        "user-agent": get_user_agent(provider.backend),
+                        "x-affinity": self.session_id,
+                    },
+                    max_tokens=max_tokens,
+                ):
+                    if first_chunk_time is None:
+                        first_chunk_time = time.perf_counter()
+                    if tracer is not None:
+                        tracer.token()
+                    processed_message = (
+                        self.format_handler.process_api_response_message(chunk.message)
+                    )
+                    processed_message.message_id = accumulator.message_id
+                    processed_chunk = LLMChunk(
+                        message=processed_message, usage=chunk.usage
+                    )
+                    accumulator.add(processed_chunk)
+                    if tool_call_parser is not None:
+                        self._speculate(tool_call_parser, processed_message.tool_calls)
+                    usage += chunk.usage or LLMUsage()
+                    yield processed_chunk
             end_time = time.perf_counter()
+            self._pending_injections.clear()
+            if tracer is not None:
+                tracer.end_stream()
+                first_chunk_time = first_chunk_time or end_time
+                tracer.record(
+                    "llm.request",
+                    int(start_time * 1e9),
+                    int(end_time * 1e9),
+                    model=active_model.name,
+                    time_to_first_token_seconds=first_chunk_time - start_time,
+                    streaming_seconds=end_time - first_chunk_time,
+                )
 
-            if chunk_agg.usage is None:
+            if accumulator.usage is None:
                 raise AgentLoopLLMResponseError(
                     "Usage data missing in final chunk of streamed completion"
                 )
             self._update_stats(usage=usage, time_seconds=end_time - start_time)
 
-            self.messages.append(chunk_agg.message)
+            sent_count = len(self.messages)
+            self.messages.append(accumulator.build().message)
+            self._record_reported_context(sent_count, available_tools, usage)
 
         except Exception as e:
             if _should_raise_rate_limit_error(e):
@@ -662,12 +1100,32 @@ class AgentLoop:
                 f"API error from {provider.name} (model: {active_model.name}): {e}"
             ) from e
 
+    def _speculate(
+        self, parser: ToolCallDeltaParser, tool_calls: list[ToolCall] | None
+    ) -> None:
+        if self._speculation is None:
+            return
+        for parsed_call in parser.feed(tool_calls):
+            self._speculation.submit(parsed_call)
+
+    def _request_messages(self) -> list[LLMMessage]:
+        # The reminders are cleared once a request succeeds, so a failed one
+        # sends them again rather than losing them.
+        if not self._pending_injections:
+            return self.messages
+        reminder = LLMMessage(
+            role=Role.user, content="\n\n".join(self._pending_injections)
+        )
+        return [*self.messages, reminder]
+
     def _update_stats(self, usage: LLMUsage, time_seconds: float) -> None:
         self.stats.last_turn_duration = time_seconds
         self.stats.last_turn_prompt_tokens = usage.prompt_tokens
         self.stats.last_turn_completion_tokens = usage.completion_tokens
+        self.stats.last_turn_cached_tokens = usage.cached_tokens
         self.stats.session_prompt_tokens += usage.prompt_tokens
         self.stats.session_completion_tokens += usage.completion_tokens
+        self.stats.session_cached_tokens += usage.cached_tokens
         self.stats.context_tokens = usage.prompt_tokens + usage.completion_tokens
         if time_seconds > 0 and usage.completion_tokens > 0:
             self.stats.tokens_per_second = usage.completion_tokens / time_seconds
@@ -675,6 +1133,14 @@ class AgentLoop:
     async def _should_execute_tool(
         self, tool: BaseTool, args: BaseModel, tool_call_id: str
     ) -> ToolDecision:
+        if (decision := self._get_decision_without_approval(tool, args)) is not None:
+            return decision
+        with tracing.span("tool.approval", tool=tool.get_name()):
+            return await self._ask_approval(tool.get_name(), args, tool_call_id)
+
+    def _get_decision_without_approval(
+        self, tool: BaseTool, args: BaseModel
+    ) -> ToolDecision | None:
         if self.auto_approve:
             return ToolDecision(verdict=ToolExecutionResponse.EXECUTE)
 
@@ -700,7 +1166,7 @@ class AgentLoop:
                 feedback=f"Tool '{tool_name}' is permanently disabled",
             )
 
-        return await self._ask_approval(tool_name, args, tool_call_id)
+        return None
 
     async def _ask_approval(
         self, tool_name: str, args: BaseModel, tool_call_id: str
@@ -787,7 +1253,8 @@ class AgentLoop:
             self.messages.append(empty_assistant_msg)
 
     def _reset_session(self) -> None:
-        self.session_id = str(uuid4())
+        if not self.keep_session_id:
+            self.session_id = str(uuid4())
         self.session_logger.reset_session(self.session_id)
 
     def set_approval_callback(self, callback: ApprovalCallback) -> None:
@@ -805,14 +1272,20 @@ class AgentLoop:
             self.agent_profile,
         )
         self.messages = self.messages[:1]
+        if self._compaction_prefetch is not None:
+            self._compaction_prefetch.cancel()
+            self._compaction_prefetch = None
 
         self.stats = AgentStats()
         self.stats.trigger_listeners()
+        self._context_accounted_upto = None
 
         try:
             active_model = self.config.get_active_model()
             self.stats.update_pricing(
-                active_model.input_price, active_model.output_price
+                active_model.input_price,
+                active_model.output_price,
+                active_model.cached_input_price,
             )
         except ValueError:
             pass
@@ -833,32 +1306,18 @@ class AgentLoop:
                 self.agent_profile,
             )
 
-            summary_request = UtilityPrompt.COMPACT.read()
-            self.messages.append(LLMMessage(role=Role.user, content=summary_request))
+            await self._finish_compaction_prefetch()
+            plan = self.compactor.plan(self.messages[1:], self._keep_recent_budget())
+            summary_content = await self.compactor.summarize(self.messages[0], plan)
             self.stats.steps += 1
 
-            summary_result = await self._chat()
-            if summary_result.usage is None:
-                raise AgentLoopLLMResponseError(
-                    "Usage data missing in compaction summary response"
-                )
-            summary_content = summary_result.message.content or ""
-
-            system_message = self.messages[0]
-            summary_message = LLMMessage(role=Role.user, content=summary_content)
-            self.messages = [system_message, summary_message]
-
-            active_model = self.config.get_active_model()
-            provider = self.config.get_provider_for_model(active_model)
+            self._replace_compacted_history(summary_content, plan)
 
-            actual_context_tokens = await self.backend.count_tokens(
-                model=active_model,
-                messages=self.messages,
-                tools=self.format_handler.get_available_tools(self.tool_manager),
-                extra_headers={"user-agent": get_user_agent(provider.backend)},
+            self.stats.context_tokens = self.token_estimator.estimate(
+                self.messages,
+                self.format_handler.get_available_tools(self.tool_manager),
             )
-
-            self.stats.context_tokens = actual_context_tokens
+            self._context_accounted_upto = len(self.messages)
 
             self._reset_session()
             await self.session_logger.save_interaction(
@@ -883,6 +1342,52 @@ class AgentLoop:
             )
             raise
 
+    def _replace_compacted_history(
+        self, summary_content: str, plan: CompactionPlan
+    ) -> None:
+        recent_start = len(self.messages) - len(plan.recent)
+        self.messages = [
+            self.messages[0],
+            make_summary_message(summary_content),
+            *plan.recent,
+        ]
+        # Messages kept verbatim keep their observed state; the summary is new.
+        if self._last_observed_message_index > recent_start:
+            self._last_observed_message_index += 2 - recent_start
+        else:
+            self._last_observed_message_index = min(
+                self._last_observed_message_index, 1
+            )
+
+    def _maybe_prefetch_compaction(self) -> None:
+        limit = self.config.effective_context_limit
+        if (
+            not self.config.compaction_prefetch
+            or limit <= 0
+            or self._compaction_prefetch is not None
+            or self.stats.context_tokens < limit * COMPACTION_PREFETCH_RATIO
+        ):
+            return
+
+        plan = self.compactor.plan(self.messages[1:], self._keep_recent_budget())
+        # The newest old segment can still grow before compaction actually
+        # happens, so only the segments that are already final are prepared.
+        plan.segments = plan.segments[:-1]
+        if not plan.segments:
+            return
+        self._compaction_prefetch = asyncio.create_task(
+            self.compactor.summarize(self.messages[0], plan), name="compaction-prefetch"
+        )
+
+    async def _finish_compaction_prefetch(self) -> None:
+        task, self._compaction_prefetch = self._compaction_prefetch, None
+        if task is None:
+            return
+        try:
+            await task
+        except Exception as e:
+            logger.warning("Background compaction failed: %s", e)
+
     async def switch_agent(self, agent_name: str) -> None:
         if agent_name == self.agent_profile.name:
             return
@@ -914,23 +1419,31 @@ class AgentLoop:
             self.agent_manager.invalidate_config()
 
         self.backend = self.backend_factory()
+        self.subagent_pool.clear()
 
         if max_turns is not None:
             self._max_turns = max_turns
         if max_price is not None:
             self._max_price = max_price
 
+        self.token_estimator = self._build_token_estimator()
+        self.compactor = self._build_compactor()
+        self.history_optimizer = HistoryOptimizer(
+            self.config.history, self.history_optimizer.blobs
+        )
+
         self.tool_manager = ToolManager(lambda: self.config)
         self.skill_manager = SkillManager(lambda: self.config)
 
-        new_system_prompt = get_universal_system_prompt(
-            self.tool_manager, self.config, self.skill_manager, self.agent_manager
+        history = [msg for msg in self.messages if msg.role != Role.system]
+        new_system_prompt = self._build_system_prompt(
+            reuse_project_context=self.config.stable_prompt_prefix and bool(history)
         )
+        system_message = self.messages[0]
+        if system_message.content != new_system_prompt:
+            system_message = LLMMessage(role=Role.system, content=new_system_prompt)
 
-        self.messages = [
-            LLMMessage(role=Role.system, content=new_system_prompt),
-            *[msg for msg in self.messages if msg.role != Role.system],
-        ]
+        self.messages = [system_message, *history]
 
         if len(self.messages) == 1:
             self.stats.reset_context_state()
@@ -938,7 +1451,9 @@ class AgentLoop:
         try:
             active_model = self.config.get_active_model()
             self.stats.update_pricing(
-                active_model.input_price, active_model.output_price
+                active_model.input_price,
+                active_model.output_price,
+                active_model.cached_input_price,
             )
         except ValueError:
             pass
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from bloom.core.agents.manager import AgentManager
+from typing import TYPE_CHECKING, Any
+
 from bloom.core.agents.models import (
     ACCEPT_EDITS,
     AUTO_APPROVE,
@@ -15,6 +16,9 @@ from bloom.core.agents.models import (
     BuiltinAgentName,
 )
 
+if TYPE_CHECKING:
+    from bloom.core.agents.manager import AgentManager
+
 __all__ = [
     "ACCEPT_EDITS",
     "AUTO_APPROVE",
@@ -29,3 +33,12 @@ __all__ = [
     "AgentType",
     "BuiltinAgentName",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # The manager pulls in config and tool loading; `models` alone is cheap.
+    if name == "AgentManager":
+        from bloom.core.agents.manager import AgentManager
+
+        return AgentManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -51,6 +51,11 @@ class AgentManager:
     def _config(self) -> BloomConfig:
         return self._config_getter()
 
+    @property
+    def base_config(self) -> BloomConfig:
+        """The loaded config, before the active profile's overrides."""
+        return self._config
+
     @property
     def available_agents(self) -> dict[str, AgentProfile]:
         if self._config.enabled_agents:
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bloom.core.agent_loop import AgentLoop
+
+logger = getLogger("bloom")
+
+DEFAULT_MAX_IDLE_PER_PROFILE = 2
+
+
+@dataclass(frozen=True)
+class SubagentBudget:
+    max_turns: int | None = None
+    max_price: float | None = None
+
+
+type SubagentFactory = Callable[[str, SubagentBudget], AgentLoop]
+
+
+class SubagentPool:
+    """Keeps finished subagent loops warm so the next `task` call can reuse them.
+
+    Building an `AgentLoop` means discovering tools, agents and skills and
+    rendering a system prompt. A leased loop is reset with `clear_history` when
+    it is returned, which keeps all of that and drops only the conversation.
+    Loops are pooled per (profile, budget); concurrent leases for the same
+    profile each get their own loop.
+    """
+
+    def __init__(
+        self,
+        factory: SubagentFactory,
+        max_idle_per_profile: int = DEFAULT_MAX_IDLE_PER_PROFILE,
+    ) -> None:
+        self._factory = factory
+        self._max_idle = max_idle_per_profile
+        self._idle: dict[tuple[str, SubagentBudget], list[AgentLoop]] = {}
+
+    @asynccontextmanager
+    async def lease(
+        self, agent_name: str, budget: SubagentBudget | None = None
+    ) -> AsyncGenerator[AgentLoop]:
+        key = (agent_name, budget or SubagentBudget())
+        idle = self._idle.setdefault(key, [])
+        loop = idle.pop() if idle else self._factory(*key)
+
+        yield loop
+        # Not reached when the body raised: a loop interrupted mid-turn may
+        # hold half-finished tool calls, so it is dropped instead of reused.
+        await self._release(key, loop)
+
+    async def _release(self, key: tuple[str, SubagentBudget], loop: AgentLoop) -> None:
+        idle = self._idle.setdefault(key, [])
+        if len(idle) >= self._max_idle:
+            return
+        try:
+            await loop.clear_history()
+        except Exception as e:
+            logger.warning("Failed to reset subagent %s: %s", key[0], e)
+            return
+        idle.append(loop)
+
+    def clear(self) -> None:
+        self._idle.clear()
+
+    def idle_count(self, agent_name: str | None = None) -> int:
+        return sum(
+            len(loops)
+            for (name, _), loops in self._idle.items()
+            if agent_name is None or name == agent_name
+        )
@@ -0,0 +1,287 @@
+"""Run a manifest of programmatic prompts in one process.
+
+Each line of a manifest is a JSON object with a `prompt` and optionally an
+`id`, a `workdir`, an `agent` and per-item `max_turns`/`max_price`. The items
+share the loaded config, one backend (and its connection pool) per provider
+and, per working directory, the discovered tool classes, so startup is paid
+once for the whole batch rather than once per prompt.
+
+Tools resolve paths against the process's working directory, so only items
+with the same `workdir` run concurrently; working directories are taken one
+after another, in order of first appearance.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from contextlib import AsyncExitStack
+from enum import StrEnum, auto
+from logging import getLogger
+import os
+from pathlib import Path
+import sys
+from typing import TextIO
+
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+from bloom.core.agent_loop import AgentLoop
+from bloom.core.agents.manager import AgentManager
+from bloom.core.agents.models import BuiltinAgentName
+from bloom.core.config import BloomConfig
+from bloom.core.llm.backend.factory import BACKEND_FACTORY
+from bloom.core.llm.types import BackendLike
+from bloom.core.middleware import (
+    ConversationContext,
+    MiddlewareAction,
+    MiddlewareResult,
+    ResetReason,
+)
+from bloom.core.output_formatters import StreamingJsonOutputFormatter
+from bloom.core.tools.base import BaseTool
+from bloom.core.types import AssistantEvent
+
+logger = getLogger("bloom")
+
+DEFAULT_CONCURRENCY = 4
+
+
+class BatchItem(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    prompt: str
+    id: str = ""  # Defaults to the manifest line number
+    workdir: Path | None = None  # Relative to the directory bloom runs in
+    agent: str = BuiltinAgentName.AUTO_APPROVE
+    max_turns: int | None = None
+    max_price: float | None = None
+
+
+class BatchStatus(StrEnum):
+    COMPLETED = auto()
+    STOPPED = auto()  # By a turn or price limit
+    FAILED = auto()
+    SKIPPED = auto()  # The batch budget ran out before the item started
+
+
+class BatchResult(BaseModel):
+    id: str
+    status: BatchStatus
+    error: str | None = None
+    steps: int = 0
+    cost: float = 0.0
+
+
+def load_manifest(text: str) -> list[BatchItem]:
+    items: list[BatchItem] = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            item = BatchItem.model_validate_json(line)
+        except ValidationError as e:
+            raise ValueError(f"Invalid manifest line {number}: {e}") from e
+        items.append(item if item.id else item.model_copy(update={"id": str(number)}))
+
+    ids = [item.id for item in items]
+    if duplicates := sorted({i for i in ids if ids.count(i) > 1}):
+        raise ValueError(f"Duplicate manifest ids: {', '.join(duplicates)}")
+    return items
+
+
+class BatchBudget:
+    """Turn and price limits shared by every agent loop of a batch."""
+
+    def __init__(
+        self, max_turns: int | None = None, max_price: float | None = None
+    ) -> None:
+        self.max_turns = max_turns
+        self.max_price = max_price
+        self.turns = 0
+        self._loops: list[AgentLoop] = []
+
+    def track(self, agent_loop: AgentLoop) -> None:
+        self._loops.append(agent_loop)
+
+    @property
+    def cost(self) -> float:
+        return sum(agent_loop.stats.session_cost for agent_loop in self._loops)
+
+    def exhausted(self) -> str | None:
+        if self.max_turns is not None and self.turns >= self.max_turns:
+            return f"Batch turn limit of {self.max_turns} reached"
+        if self.max_price is not None and (cost := self.cost) > self.max_price:
+            return f"Batch price limit exceeded: ${cost:.4f} > ${self.max_price:.2f}"
+        return None
+
+
+class BatchBudgetMiddleware:
+    def __init__(self, budget: BatchBudget) -> None:
+        self.budget = budget
+
+    async def before_turn(self, context: ConversationContext) -> MiddlewareResult:
+        if reason := self.budget.exhausted():
+            return MiddlewareResult(action=MiddlewareAction.STOP, reason=reason)
+        self.budget.turns += 1
+        return MiddlewareResult()
+
+    async def after_turn(self, context: ConversationContext) -> MiddlewareResult:
+        return MiddlewareResult()
+
+    def reset(self, reset_reason: ResetReason = ResetReason.STOP) -> None:
+        pass
+
+
+class BatchRunner:
+    """Runs manifest items concurrently, streaming their messages as JSONL.
+
+    Every message record carries a `batch_item` id; each item ends with a
+    `{"batch_item": ..., "result": {...}}` record.
+    """
+
+    def __init__(
+        self,
+        config: BloomConfig,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_turns: int | None = None,
+        max_price: float | None = None,
+        stream: TextIO = sys.stdout,
+    ) -> None:
+        self.config = config
+        self.budget = BatchBudget(max_turns, max_price)
+        self._concurrency = concurrency
+        self._stream = stream
+        self._backends: dict[str, BackendLike] = {}
+        self._catalogs: dict[Path, Mapping[str, type[BaseTool]]] = {}
+
+    async def run(self, items: list[BatchItem]) -> list[BatchResult]:
+        start_dir = Path.cwd()
+        groups: dict[Path, list[BatchItem]] = {}
+        for item in items:
+            workdir = (start_dir / (item.workdir or ".")).expanduser().resolve()
+            groups.setdefault(workdir, []).append(item)
+
+        results: dict[str, BatchResult] = {}
+        semaphore = asyncio.Semaphore(self._concurrency)
+        async with AsyncExitStack() as stack:
+
+            async def run_limited(item: BatchItem) -> None:
+                async with semaphore:
+                    results[item.id] = await self._run_item(item, stack)
+
+            try:
+                for workdir, group in groups.items():
+                    if not workdir.is_dir():
+                        error = f"Not a directory: {workdir}"
+                        results.update(
+                            (item.id, self._fail(item, error)) for item in group
+                        )
+                        continue
+                    os.chdir(workdir)
+                    await asyncio.gather(*(run_limited(item) for item in group))
+            finally:
+                os.chdir(start_dir)
+        return [results[item.id] for item in items]
+
+    async def _run_item(self, item: BatchItem, stack: AsyncExitStack) -> BatchResult:
+        if reason := self.budget.exhausted():
+            return self._finish(
+                item, BatchResult(id=item.id, status=BatchStatus.SKIPPED, error=reason)
+            )
+
+        formatter = StreamingJsonOutputFormatter(
+            self._stream, fields={"batch_item": item.id}
+        )
+        try:
+            backend = await self._backend_for(item.agent, stack)
+            # Building a loop renders the system prompt and may scan for tools.
+            agent_loop = await asyncio.to_thread(
+                self._build_loop, item, backend, formatter
+            )
+        except Exception as e:
+            return self._fail(item, str(e))
+
+        self.budget.track(agent_loop)
+        status, error = BatchStatus.COMPLETED, None
+        logger.info("USER [%s]: %s", item.id, item.prompt)
+        try:
+            async for event in agent_loop.act(item.prompt):
+                if isinstance(event, AssistantEvent) and event.stopped_by_middleware:
+                    status, error = BatchStatus.STOPPED, event.content
+        except Exception as e:
+            logger.warning("Batch item %s failed: %s", item.id, e)
+            status, error = BatchStatus.FAILED, str(e)
+
+        return self._finish(
+            item,
+            BatchResult(
+                id=item.id,
+                status=status,
+                error=error,
+                steps=agent_loop.stats.steps,
+                cost=agent_loop.stats.session_cost,
+            ),
+            formatter,
+        )
+
+    def _fail(self, item: BatchItem, error: str) -> BatchResult:
+        return self._finish(
+            item, BatchResult(id=item.id, status=BatchStatus.FAILED, error=error)
+        )
+
+    def _finish(
+        self,
+        item: BatchItem,
+        result: BatchResult,
+        formatter: StreamingJsonOutputFormatter | None = None,
+    ) -> BatchResult:
+        formatter = formatter or StreamingJsonOutputFormatter(
+            self._stream, fields={"batch_item": item.id}
+        )
+        formatter.write_record({"result": result.model_dump(mode="json")})
+        return result
+
+    async def _backend_for(self, agent_name: str, stack: AsyncExitStack) -> BackendLike:
+        config = AgentManager(lambda: self.config, initial_agent=agent_name).config
+        provider = config.get_provider_for_model(config.get_active_model())
+        if (backend := self._backends.get(provider.name)) is None:
+            backend = BACKEND_FACTORY[provider.backend](
+                provider=provider, timeout=config.api_timeout
+            )
+            self._backends[provider.name] = await stack.enter_async_context(backend)
+        return backend
+
+    def _build_loop(
+        self,
+        item: BatchItem,
+        backend: BackendLike,
+        formatter: StreamingJsonOutputFormatter,
+    ) -> AgentLoop:
+        workdir = Path.cwd()
+        agent_loop = AgentLoop(
+            self.config,
+            agent_name=item.agent,
+            message_observer=formatter.on_message_added,
+            max_turns=item.max_turns,
+            max_price=item.max_price,
+            backend=backend,
+            tool_catalog=self._catalogs.get(workdir),
+        )
+        self._catalogs.setdefault(workdir, agent_loop.tool_manager.catalog)
+        agent_loop.middleware_pipeline.add(BatchBudgetMiddleware(self.budget))
+        return agent_loop
+
+
+def run_batch(
+    config: BloomConfig,
+    items: list[BatchItem],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_turns: int | None = None,
+    max_price: float | None = None,
+) -> list[BatchResult]:
+    runner = BatchRunner(
+        config, concurrency=concurrency, max_turns=max_turns, max_price=max_price
+    )
+    return asyncio.run(runner.run(items))
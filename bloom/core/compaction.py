@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import hashlib
+import json
+from logging import getLogger
+import os
+from pathlib import Path
+import tempfile
+
+from bloom.core.llm.tokens import TokenEstimator
+from bloom.core.prompts import UtilityPrompt
+from bloom.core.types import LLMMessage, Role
+
+logger = getLogger("bloom")
+
+COMPACTION_SUMMARY_TAG = "conversation_summary"
+
+# Start summarizing old segments in the background once the context reaches
+# this fraction of the compaction threshold (when prefetching is enabled).
+COMPACTION_PREFETCH_RATIO = 0.8
+
+# Number of cached segment summaries kept on disk before the oldest are pruned.
+SUMMARY_CACHE_MAX_ENTRIES = 512
+
+
+def make_summary_message(summary: str) -> LLMMessage:
+    return LLMMessage(
+        role=Role.user,
+        content=f"<{COMPACTION_SUMMARY_TAG}>\n{summary}\n</{COMPACTION_SUMMARY_TAG}>",
+    )
+
+
+def is_summary_message(message: LLMMessage) -> bool:
+    return message.role == Role.user and (message.content or "").startswith(
+        f"<{COMPACTION_SUMMARY_TAG}>"
+    )
+
+
+def _starts_turn(message: LLMMessage) -> bool:
+    return message.role == Role.user and not is_summary_message(message)
+
+
+def segment_key(previous: LLMMessage | None, segment: list[LLMMessage]) -> str:
+    """Content hash of a summarization step, stable across sessions and resumes."""
+    payload = [
+        m.model_dump(
+            include={"role", "content", "tool_calls", "name", "tool_call_id"},
+            exclude_none=True,
+        )
+        for m in ([previous] if previous else []) + segment
+    ]
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    )
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """Segment summaries keyed by `segment_key`, kept in memory and on disk."""
+
+    def __init__(
+        self, directory: Path | None, max_entries: int = SUMMARY_CACHE_MAX_ENTRIES
+    ) -> None:
+        self._directory = directory
+        self._max_entries = max_entries
+        self._memory: dict[str, str] = {}
+
+    def _path(self, key: str) -> Path | None:
+        if self._directory is None:
+            return None
+        return self._directory / f"{key}.md"
+
+    def get(self, key: str) -> str | None:
+        if (summary := self._memory.get(key)) is not None:
+            return summary
+        if (path := self._path(key)) is None:
+            return None
+        try:
+            summary = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        self._memory[key] = summary
+        return summary
+
+    def put(self, key: str, summary: str) -> None:
+        self._memory[key] = summary
+        if (path := self._path(key)) is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(summary)
+            os.replace(tmp, path)
+            self._prune(path.parent)
+        except OSError as e:
+            logger.warning("Failed to cache compaction summary: %s", e)
+
+    def _prune(self, directory: Path) -> None:
+        entries = sorted(directory.glob("*.md"), key=lambda p: p.stat().st_mtime)
+        for stale in entries[: max(0, len(entries) - self._max_entries)]:
+            stale.unlink(missing_ok=True)
+
+
+@dataclass
+class CompactionPlan:
+    previous_summary: LLMMessage | None = None
+    segments: list[list[LLMMessage]] = field(default_factory=list)
+    recent: list[LLMMessage] = field(default_factory=list)
+
+
+class RollingCompactor:
+    """Summarizes the oldest part of a conversation one segment at a time.
+
+    The history after the system prompt is cut at user-turn boundaries into
+    segments of roughly `segment_tokens`, while the newest turns that fit in
+    `keep_recent_tokens` are kept verbatim. Each segment is folded into the
+    running summary with one bounded request, and every step is cached by
+    content hash so re-compacting the same history (e.g. after a resume or a
+    background prefetch) costs nothing.
+    """
+
+    def __init__(
+        self,
+        *,
+        estimator: Callable[[], TokenEstimator],
+        summarize: Callable[[list[LLMMessage]], Awaitable[str]],
+        cache: SummaryCache,
+        segment_tokens: int,
+    ) -> None:
+        self._estimator = estimator
+        self._summarize = summarize
+        self._cache = cache
+        self._segment_tokens = segment_tokens
+
+    def plan(self, body: list[LLMMessage], keep_recent_tokens: int) -> CompactionPlan:
+        plan = CompactionPlan()
+        if body and is_summary_message(body[0]):
+            plan.previous_summary, body = body[0], body[1:]
+
+        split = self._recent_start(body, keep_recent_tokens)
+        if split == 0:
+            # Nothing is old enough to fold away: the caller asked to compact,
+            # so the whole conversation becomes a single segment.
+            split = len(body)
+
+        plan.recent = body[split:]
+        plan.segments = self._split_segments(body[:split])
+        return plan
+
+    def _recent_start(self, body: list[LLMMessage], budget: int) -> int:
+        estimator = self._estimator()
+        used = 0
+        start = len(body)
+        for index in range(len(body) - 1, -1, -1):
+            used += estimator.estimate([body[index]])
+            if used > budget:
+                break
+            if _starts_turn(body[index]):
+                start = index
+        return start
+
+    def _split_segments(self, old: list[LLMMessage]) -> list[list[LLMMessage]]:
+        estimator = self._estimator()
+        segments: list[list[LLMMessage]] = []
+        current: list[LLMMessage] = []
+        current_tokens = 0
+        for message in old:
+            if (
+                current
+                and _starts_turn(message)
+                and current_tokens >= self._segment_tokens
+            ):
+                segments.append(current)
+                current, current_tokens = [], 0
+            current.append(message)
+            # Raw counts keep segment boundaries stable while calibration moves,
+            # which is what lets later compactions hit the summary cache.
+            current_tokens += estimator.raw_count([message])
+        if current:
+            segments.append(current)
+        return segments
+
+    async def summarize(self, system: LLMMessage, plan: CompactionPlan) -> str:
+        """Fold every planned segment into the running summary."""
+        running = plan.previous_summary
+        summary = ""
+        for segment in plan.segments:
+            key = segment_key(running, segment)
+            if (cached := self._cache.get(key)) is None:
+                request = [system, *([running] if running else []), *segment]
+                request.append(
+                    LLMMessage(role=Role.user, content=UtilityPrompt.COMPACT.read())
+                )
+                cached = await self._summarize(request)
+                if cached:
+                    self._cache.put(key, cached)
+            summary = cached
+            running = make_summary_message(summary)
+
+        if running is not None and not plan.segments:
+            return _unwrap_summary(running)
+        return summary
+
+
+def _unwrap_summary(message: LLMMessage) -> str:
+    content = message.content or ""
+    open_tag = f"<{COMPACTION_SUMMARY_TAG}>\n"
+    close_tag = f"\n</{COMPACTION_SUMMARY_TAG}>"
+    return content.removeprefix(open_tag).removesuffix(close_tag)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from collections.abc import MutableMapping
+from dataclasses import dataclass
 from enum import StrEnum, auto
 import os
 from pathlib import Path
 import re
 import shlex
+import tempfile
 import tomllib
 from typing import Annotated, Any, Literal
 
@@ -20,10 +22,12 @@ from pydantic_settings import (
 )
 import tomli_w
 
+from bloom.core.llm.tokens import DEFAULT_CHARS_PER_TOKEN
 from bloom.core.paths.config_paths import CONFIG_DIR, CONFIG_FILE, PROMPTS_DIR
 from bloom.core.paths.global_paths import (
     GLOBAL_ENV_FILE,
     GLOBAL_PROMPTS_DIR,
+    MODELS_CACHE_FILE,
     SESSION_LOG_DIR,
 )
 from bloom.core.prompts import SystemPrompt
@@ -97,6 +101,41 @@ class TomlFileSettingsSource(PydanticBaseSettingsSource):
         return self.toml_data
 
 
+def _file_signature(path: Path) -> tuple[str, int, int]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return str(path), -1, -1
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+def _load_sources_signature() -> tuple[Any, ...]:
+    """Everything outside the process that `BloomConfig.load` depends on."""
+    return (
+        _file_signature(CONFIG_FILE.path),
+        _file_signature(GLOBAL_ENV_FILE.path),
+        _file_signature(MODELS_CACHE_FILE.path),
+        tuple(
+            sorted(
+                item
+                for item in os.environ.items()
+                if item[0].upper().startswith("BLOOM_")
+            )
+        ),
+    )
+
+
+@dataclass
+class _CachedLoad:
+    sources: tuple[Any, ...]
+    overrides: frozenset[str]
+    config: BloomConfig
+
+
+# Keyed by config class and overrides; see `BloomConfig.load`.
+_load_cache: dict[tuple[type, str], _CachedLoad] = {}
+
+
 class ProjectContextConfig(BaseSettings):
     max_chars: int = 40_000
     default_commit_count: int = 5
@@ -108,6 +147,27 @@ class ProjectContextConfig(BaseSettings):
     timeout_seconds: float = 2.0
 
 
+class HistoryConfig(BaseSettings):
+    dedupe_file_reads: bool = True
+    elide_tool_output_after_turns: int = 20  # 0 disables age-based elision
+    elide_min_chars: int = 2_000
+    elided_preview_chars: int = 200
+
+
+class AcpConfig(BaseSettings):
+    update_flush_interval: float = 0.02  # Seconds to gather text deltas, 0 = none
+    update_buffer_bytes: int = 64 * 1024  # Text buffered before the agent waits
+
+
+class TracingConfig(BaseSettings):
+    export_file: str = ""  # Append each turn's spans as OTLP/JSON, "" = off
+
+
+class ProfilingConfig(BaseSettings):
+    sample_interval_ms: float = 5.0
+    slow_callback_ms: float = 100.0  # Log event loop stalls longer than this, 0 = off
+
+
 class SessionLoggingConfig(BaseSettings):
     save_dir: str = ""
     session_prefix: str = "session"
@@ -241,7 +301,10 @@ class ModelConfig(BaseModel):
     temperature: float = 0.2
     input_price: float = 0.0  # Price per million input tokens
     output_price: float = 0.0  # Price per million output tokens
+    cached_input_price: float = 0.0  # Per million cached input tokens, 0 = unknown
     context_length: int = 0  # 0 = unknown, use auto_compact_threshold fallback
+    tokenizer: str = "chars"  # Local token estimator, see bloom.core.llm.tokens
+    chars_per_token: float = DEFAULT_CHARS_PER_TOKEN  # Refined from reported usage
 
     @model_validator(mode="before")
     @classmethod
@@ -286,6 +349,9 @@ class BloomConfig(BaseSettings):
     autocopy_to_clipboard: bool = True
     displayed_workdir: str = ""
     auto_compact_threshold: int = 200_000
+    compaction_keep_recent_tokens: int = 20_000
+    compaction_segment_tokens: int = 30_000
+    compaction_prefetch: bool = False
     context_warnings: bool = False
     auto_approve: bool = False
     system_prompt_id: str = "cli"
@@ -296,6 +362,8 @@ class BloomConfig(BaseSettings):
     enable_update_checks: bool = True
     enable_auto_update: bool = True
     api_timeout: float = 720.0
+    speculative_tool_execution: bool = True
+    stable_prompt_prefix: bool = True
 
     providers: list[ProviderConfig] = Field(
         default_factory=lambda: list(DEFAULT_PROVIDERS)
@@ -304,6 +372,10 @@ class BloomConfig(BaseSettings):
 
     project_context: ProjectContextConfig = Field(default_factory=ProjectContextConfig)
     session_logging: SessionLoggingConfig = Field(default_factory=SessionLoggingConfig)
+    history: HistoryConfig = Field(default_factory=HistoryConfig)
+    acp: AcpConfig = Field(default_factory=AcpConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
+    profiling: ProfilingConfig = Field(default_factory=ProfilingConfig)
     tools: dict[str, BaseToolConfig] = Field(default_factory=dict)
     tool_paths: list[Path] = Field(
         default_factory=list,
@@ -543,11 +615,19 @@ class BloomConfig(BaseSettings):
         cls.dump_config(
             to_jsonable_python(current_config, exclude_none=True, fallback=str)
         )
+        cls._apply_to_load_cache(updates)
 
     @classmethod
     def dump_config(cls, config: dict[str, Any]) -> None:
-        with CONFIG_FILE.path.open("wb") as f:
-            tomli_w.dump(config, f)
+        path = CONFIG_FILE.path
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".toml.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                tomli_w.dump(config, f)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
 
     @classmethod
     def _migrate(cls) -> None:
@@ -555,11 +635,58 @@ class BloomConfig(BaseSettings):
 
     @classmethod
     def load(cls, **overrides: Any) -> BloomConfig:
+        """Load the config from TOML, BLOOM_* env vars and `overrides`.
+
+        Results are cached per process until the config file, the global .env,
+        the discovered model list or a BLOOM_* variable changes. Each call
+        returns its own copy, so callers are free to mutate it.
+        """
+        key = (cls, repr(sorted(overrides.items())))
+        sources = _load_sources_signature()
+        cached = _load_cache.get(key)
+        if cached is not None and cached.sources == sources:
+            return cached.config.model_copy(deep=True)
+
         cls._migrate()
         config = cls(**(overrides or {}))
         config._merge_discovered_models()
+        _load_cache[key] = _CachedLoad(
+            sources=sources,
+            overrides=frozenset(overrides),
+            config=config.model_copy(deep=True),
+        )
         return config
 
+    @classmethod
+    def _apply_to_load_cache(cls, updates: dict[str, Any]) -> None:
+        """Carry a saved update into cached configs instead of reloading them.
+
+        Only plain top-level values are patched; dicts and lists are merged by
+        `save_updates`, so entries touched by those are dropped and reloaded.
+        """
+        sources = _load_sources_signature()
+        for key, cached in list(_load_cache.items()):
+            if key[0] is not cls:
+                continue
+            config = cached.config.model_copy(deep=True)
+            try:
+                for name, value in updates.items():
+                    if name not in cls.model_fields or name in cached.overrides:
+                        continue  # Ignored, or shadowed by a load() override.
+                    if f"BLOOM_{name}".upper() in map(str.upper, os.environ):
+                        continue  # Shadowed by the environment.
+                    if isinstance(value, dict | list):
+                        raise ValueError(f"{name} is merged, not replaced")
+                    config.__pydantic_validator__.validate_assignment(
+                        config, name, value
+                    )
+            except (ValueError, RuntimeError):
+                del _load_cache[key]
+                continue
+            _load_cache[key] = _CachedLoad(
+                sources=sources, overrides=cached.overrides, config=config
+            )
+
     def _merge_discovered_models(self) -> None:
         """Merge dynamically discovered models from Pollinations v1 API."""
         try:
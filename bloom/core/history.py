@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+import re
+from typing import TYPE_CHECKING
+
+from bloom.core.types import LLMMessage, Role
+
+if TYPE_CHECKING:
+    from bloom.core.config import HistoryConfig
+
+ELIDED_OUTPUT_TAG = "elided_output"
+
+_ELIDED_REF_PATTERN = re.compile(
+    rf'^<{ELIDED_OUTPUT_TAG} ref="(sha256:[0-9a-f]{{64}})">'
+)
+_READ_FILE_TOOL = "read_file"
+_READ_FILE_PATH_PREFIX = "path: "
+
+
+class BlobStore:
+    """Content-addressed store for tool output that was elided from history."""
+
+    def __init__(self) -> None:
+        self._blobs: dict[str, str] = {}
+
+    def put(self, content: str) -> str:
+        ref = f"sha256:{hashlib.sha256(content.encode('utf-8')).hexdigest()}"
+        self._blobs.setdefault(ref, content)
+        return ref
+
+    def get(self, ref: str) -> str | None:
+        return self._blobs.get(ref)
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+
+@dataclass(frozen=True)
+class _FileRead:
+    path: str
+    mtime_ns: int
+    offset: int
+    limit: int | None
+
+
+def is_elided(message: LLMMessage) -> bool:
+    return _ELIDED_REF_PATTERN.match(message.content or "") is not None
+
+
+class HistoryOptimizer:
+    """Shrinks tool output in the conversation before it is re-sent.
+
+    Two rewrites are applied in place, and both are stable once made so the
+    request prefix stays cacheable:
+
+    - a `read_file` result is replaced by a short reference when the same
+      range of the same file, at the same mtime, was read again later;
+    - tool output older than `elide_tool_output_after_turns` assistant turns
+      is cut down to a preview.
+
+    The original text goes to a content-addressed `BlobStore` and can be put
+    back with `restore`.
+    """
+
+    def __init__(self, config: HistoryConfig, blobs: BlobStore | None = None) -> None:
+        self.config = config
+        self.blobs = blobs or BlobStore()
+        # mtimes are captured the first time a read result is seen, which is
+        # right after the read happened, so later edits don't alias with it.
+        self._reads: dict[str, _FileRead | None] = {}
+
+    def optimize(self, messages: list[LLMMessage]) -> list[LLMMessage]:
+        """Rewrite stale tool output and return the messages that changed."""
+        read_args = self._read_file_args(messages)
+        changed: list[LLMMessage] = []
+
+        if self.config.dedupe_file_reads:
+            latest: dict[_FileRead, int] = {}
+            for index, message in enumerate(messages):
+                if (read := self._file_read(message, read_args)) is not None:
+                    latest[read] = index
+            for index, message in enumerate(messages):
+                read = self._file_read(message, read_args)
+                if read is not None and latest[read] != index:
+                    self._elide(
+                        message,
+                        f"{read.path} was read again later with identical "
+                        "content; see the newer result.",
+                    )
+                    changed.append(message)
+
+        if (max_age := self.config.elide_tool_output_after_turns) > 0:
+            turns_after = 0
+            for message in reversed(messages):
+                if message.role == Role.assistant:
+                    turns_after += 1
+                elif (
+                    message.role == Role.tool
+                    and turns_after >= max_age
+                    and not is_elided(message)
+                    and len(message.content or "") >= self.config.elide_min_chars
+                ):
+                    self._elide_with_preview(message, turns_after)
+                    changed.append(message)
+
+        return changed
+
+    def restore(self, message: LLMMessage) -> LLMMessage:
+        """Return `message` with elided tool output put back, if it is known."""
+        match = _ELIDED_REF_PATTERN.match(message.content or "")
+        if match is None or (original := self.blobs.get(match.group(1))) is None:
+            return message
+        return message.model_copy(update={"content": original})
+
+    def _elide(self, message: LLMMessage, note: str) -> None:
+        ref = self.blobs.put(message.content or "")
+        message.content = (
+            f'<{ELIDED_OUTPUT_TAG} ref="{ref}">{note}</{ELIDED_OUTPUT_TAG}>'
+        )
+
+    def _elide_with_preview(self, message: LLMMessage, age: int) -> None:
+        content = message.content or ""
+        preview = content[: self.config.elided_preview_chars]
+        self._elide(
+            message,
+            f"Output from {age} turns ago was shortened ({len(content)} chars). "
+            f"Run the tool again if you need it in full. Preview:\n{preview}",
+        )
+
+    @staticmethod
+    def _read_file_args(messages: list[LLMMessage]) -> dict[str, dict]:
+        args: dict[str, dict] = {}
+        for message in messages:
+            if message.role != Role.assistant:
+                continue
+            for tc in message.tool_calls or ():
+                if tc.function.name != _READ_FILE_TOOL or not tc.id:
+                    continue
+                try:
+                    parsed = json.loads(tc.function.arguments or "{}")
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(parsed, dict):
+                    args[tc.id] = parsed
+        return args
+
+    def _file_read(
+        self, message: LLMMessage, read_args: dict[str, dict]
+    ) -> _FileRead | None:
+        call_id = message.tool_call_id
+        if (
+            message.role != Role.tool
+            or message.name != _READ_FILE_TOOL
+            or call_id is None
+            or call_id not in read_args
+            or is_elided(message)
+        ):
+            return None
+
+        if call_id not in self._reads:
+            self._reads[call_id] = self._capture_read(message, read_args[call_id])
+        return self._reads[call_id]
+
+    @staticmethod
+    def _capture_read(message: LLMMessage, args: dict) -> _FileRead | None:
+        first_line = (message.content or "").partition("\n")[0]
+        if not first_line.startswith(_READ_FILE_PATH_PREFIX):
+            return None  # The read failed or was skipped.
+        path = first_line.removeprefix(_READ_FILE_PATH_PREFIX)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return _FileRead(
+            path=path,
+            mtime_ns=mtime_ns,
+            offset=args.get("offset", 0),
+            limit=args.get("limit"),
+        )
@@ -3,12 +3,15 @@ from __future__ import annotations
 from collections.abc import AsyncGenerator, Callable
 import json
 import os
+import time
 import types
 from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple, Protocol, TypeVar
 
 import httpx
 
+from bloom.core import tracing
 from bloom.core.llm.exceptions import BackendErrorBuilder
+from bloom.core.llm.rate_limit import get_rate_limiter
 from bloom.core.types import (
     AvailableTool,
     LLMChunk,
@@ -67,6 +70,51 @@ def register_adapter(
     return decorator
 
 
+def _cached_prompt_tokens(usage: dict[str, Any]) -> int:
+    # OpenAI-style details first, then the DeepSeek and Anthropic-style spellings
+    # that OpenAI-compatible gateways pass through.
+    details = usage.get("prompt_tokens_details") or {}
+    return (
+        details.get("cached_tokens")
+        or usage.get("prompt_cache_hit_tokens")
+        or usage.get("cache_read_input_tokens")
+        or 0
+    )
+
+
+# Frozen, so every chunk without usage can share it.
+_NO_USAGE = LLMUsage()
+# Copied for each text delta; the accumulated message gets the real id.
+_TEXT_DELTA = LLMMessage(role=Role.assistant, content="", message_id=None)
+
+
+def _parse_delta(delta: dict[str, Any]) -> LLMMessage:
+    """Build the message for one streamed delta.
+
+    Most deltas carry a few characters of answer or reasoning text. Validating
+    each of those, and minting a `message_id` for it, was most of the cost of
+    decoding a stream, so they are copied from `_TEXT_DELTA` instead. Anything
+    else (tool calls, another role, content parts) is validated as before.
+    """
+    content = delta.get("content", "")
+    reasoning = delta.get("reasoning_content")
+    is_text = (
+        delta.get("role", Role.assistant) == Role.assistant
+        and isinstance(content, str | None)
+        and isinstance(reasoning, str | None)
+    )
+    has_tool_fields = (
+        delta.get("tool_calls") is not None
+        or delta.get("name") is not None
+        or delta.get("tool_call_id") is not None
+    )
+    if not is_text or has_tool_fields:
+        return LLMMessage.model_validate(delta)
+    return _TEXT_DELTA.model_copy(
+        update={"content": content, "reasoning_content": reasoning}
+    )
+
+
 @register_adapter(BACKEND_ADAPTERS, "openai")
 class OpenAIAdapter(APIAdapter):
     endpoint: ClassVar[str] = "/chat/completions"
@@ -164,7 +212,7 @@ class OpenAIAdapter(APIAdapter):
                 return LLMMessage.model_validate(msg_dict)
             if "delta" in choice:
                 msg_dict = self._reasoning_from_api(choice["delta"], field_name)
-                return LLMMessage.model_validate(msg_dict)
+                return _parse_delta(msg_dict)
             raise ValueError("Invalid response data: missing message or delta")
 
         if "message" in data:
@@ -172,7 +220,7 @@ class OpenAIAdapter(APIAdapter):
             return LLMMessage.model_validate(msg_dict)
         if "delta" in data:
             msg_dict = self._reasoning_from_api(data["delta"], field_name)
-            return LLMMessage.model_validate(msg_dict)
+            return _parse_delta(msg_dict)
 
         return None
 
@@ -181,13 +229,15 @@ class OpenAIAdapter(APIAdapter):
     ) -> LLMChunk:
         message = self._parse_message(data, provider.reasoning_field_name)
         if message is None:
-            message = LLMMessage(role=Role.assistant, content="")
-
-        usage_data = data.get("usage") or {}
-        usage = LLMUsage(
-            prompt_tokens=usage_data.get("prompt_tokens", 0),
-            completion_tokens=usage_data.get("completion_tokens", 0),
-        )
+            message = _TEXT_DELTA.model_copy()
+
+        usage = _NO_USAGE
+        if usage_data := data.get("usage"):
+            usage = LLMUsage(
+                prompt_tokens=usage_data.get("prompt_tokens", 0),
+                completion_tokens=usage_data.get("completion_tokens", 0),
+                cached_tokens=_cached_prompt_tokens(usage_data),
+            )
 
         return LLMChunk(message=message, usage=usage)
 
@@ -209,6 +259,7 @@ class GenericBackend:
         self._owns_client = client is None
         self._provider = provider
         self._timeout = timeout
+        self._rate_limiter = get_rate_limiter(provider.name, provider.api_base)
 
     async def __aenter__(self) -> GenericBackend:
         if self._client is None:
@@ -257,17 +308,18 @@ class GenericBackend:
         api_style = getattr(self._provider, "api_style", "openai")
         adapter = BACKEND_ADAPTERS[api_style]
 
-        endpoint, headers, body = adapter.prepare_request(
-            model_name=model.name,
-            messages=messages,
-            temperature=temperature,
-            tools=tools,
-            max_tokens=max_tokens,
-            tool_choice=tool_choice,
-            enable_streaming=False,
-            provider=self._provider,
-            api_key=api_key,
-        )
+        with tracing.span("llm.request.build"):
+            endpoint, headers, body = adapter.prepare_request(
+                model_name=model.name,
+                messages=messages,
+                temperature=temperature,
+                tools=tools,
+                max_tokens=max_tokens,
+                tool_choice=tool_choice,
+                enable_streaming=False,
+                provider=self._provider,
+                api_key=api_key,
+            )
 
         if extra_headers:
             headers.update(extra_headers)
@@ -322,17 +374,18 @@ class GenericBackend:
         api_style = getattr(self._provider, "api_style", "openai")
         adapter = BACKEND_ADAPTERS[api_style]
 
-        endpoint, headers, body = adapter.prepare_request(
-            model_name=model.name,
-            messages=messages,
-            temperature=temperature,
-            tools=tools,
-            max_tokens=max_tokens,
-            tool_choice=tool_choice,
-            enable_streaming=True,
-            provider=self._provider,
-            api_key=api_key,
-        )
+        with tracing.span("llm.request.build"):
+            endpoint, headers, body = adapter.prepare_request(
+                model_name=model.name,
+                messages=messages,
+                temperature=temperature,
+                tools=tools,
+                max_tokens=max_tokens,
+                tool_choice=tool_choice,
+                enable_streaming=True,
+                provider=self._provider,
+                api_key=api_key,
+            )
 
         if extra_headers:
             headers.update(extra_headers)
@@ -376,7 +429,12 @@ class GenericBackend:
         self, url: str, data: bytes, headers: dict[str, str]
     ) -> HTTPResponse:
         client = self._get_client()
+        await self._rate_limiter.acquire()
+        started_ns = time.perf_counter_ns()
         response = await client.post(url, content=data, headers=headers)
+        if tracer := tracing.current():
+            tracer.add_network_wait(time.perf_counter_ns() - started_ns)
+        self._rate_limiter.observe(response.status_code, response.headers)
         response.raise_for_status()
 
         response_headers = dict(response.headers.items())
@@ -388,11 +446,20 @@ class GenericBackend:
         self, url: str, data: bytes, headers: dict[str, str]
     ) -> AsyncGenerator[dict[str, Any]]:
         client = self._get_client()
+        await self._rate_limiter.acquire()
+        # Time spent waiting on the server, not on whoever consumes the chunks.
+        tracer = tracing.current()
+        waiting_since = time.perf_counter_ns()
         async with client.stream(
             method="POST", url=url, content=data, headers=headers
         ) as response:
+            self._rate_limiter.observe(response.status_code, response.headers)
             response.raise_for_status()
             async for line in response.aiter_lines():
+                if tracer is not None:
+                    now = time.perf_counter_ns()
+                    tracer.add_network_wait(now - waiting_since)
+                    waiting_since = now
                 if line.strip() == "":
                     continue
 
@@ -412,6 +479,7 @@ class GenericBackend:
                 if value == "[DONE]":
                     return
                 yield json.loads(value.strip())
+                waiting_since = time.perf_counter_ns()
 
     async def count_tokens(
         self,
@@ -76,6 +76,16 @@ class APIToolFormatHandler:
         return "auto"
 
     def process_api_response_message(self, message: Any) -> LLMMessage:
+        if (
+            isinstance(message, LLMMessage)
+            and not message.tool_calls
+            and message.name is None
+            and message.tool_call_id is None
+        ):
+            # Already validated by the backend, and text deltas arrive once per
+            # token, so don't build and validate a second copy.
+            return message
+
         clean_message = {
             "role": message.role,
             "content": message.content,
@@ -4,35 +4,41 @@ import json
 import logging
 import os
 from pathlib import Path
+import tempfile
+from threading import Lock, Thread
 import time
 from typing import Any
 
 import httpx
 
 from bloom.core.config import ModelConfig
+from bloom.core.paths.global_paths import MODELS_CACHE_FILE
 
 logger = logging.getLogger(__name__)
 
 MODELS_API_URL = "https://gen.pollinations.ai/text/models"
 CACHE_TTL_SECONDS = 3600  # 1 hour
 
+_refresh_lock = Lock()
+_refresh_thread: Thread | None = None
 
-def _get_cache_path() -> Path:
-    from bloom.core.paths.global_paths import BLOOM_HOME
 
-    return BLOOM_HOME.path / "models_cache.json"
+def _get_cache_path() -> Path:
+    return MODELS_CACHE_FILE.path
 
 
-def _load_cache() -> list[dict[str, Any]] | None:
+def _load_cache() -> tuple[list[dict[str, Any]], float] | None:
+    """Return the cached models and their age in seconds, however old."""
     cache_path = _get_cache_path()
     if not cache_path.exists():
         return None
     try:
         data = json.loads(cache_path.read_text())
-        if time.time() - data.get("timestamp", 0) > CACHE_TTL_SECONDS:
+        models = data["models"]
+        if not isinstance(models, list):
             return None
-        return data.get("models")
-    except (json.JSONDecodeError, OSError, KeyError):
+        return models, time.time() - data.get("timestamp", 0)
+    except (json.JSONDecodeError, OSError, KeyError, TypeError):
         return None
 
 
@@ -40,18 +46,16 @@ def _save_cache(models: list[dict[str, Any]]) -> None:
     cache_path = _get_cache_path()
     try:
         cache_path.parent.mkdir(parents=True, exist_ok=True)
-        cache_path.write_text(json.dumps({"timestamp": time.time(), "models": models}))
+        # Readers in other processes must never see a half-written file.
+        fd, tmp = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": time.time(), "models": models}, f)
+        os.replace(tmp, cache_path)
     except OSError:
         pass
 
 
-def fetch_models(*, force_refresh: bool = False) -> list[dict[str, Any]]:
-    """Fetch available models from Pollinations /text/models API, with caching."""
-    if not force_refresh:
-        cached = _load_cache()
-        if cached is not None:
-            return cached
-
+def _download_models() -> list[dict[str, Any]] | None:
     try:
         api_key = os.getenv("POLLINATIONS_API_KEY", "")
         headers = {}
@@ -69,10 +73,38 @@ def fetch_models(*, force_refresh: bool = False) -> list[dict[str, Any]]:
         return models
     except (httpx.HTTPError, json.JSONDecodeError) as e:
         logger.warning("Failed to fetch models from Pollinations API: %s", e)
-        cached = _load_cache()
-        if cached is not None:
-            return cached
-        return []
+        return None
+
+
+def refresh_models_in_background() -> Thread:
+    """Start refreshing the model cache unless a refresh is already running."""
+    global _refresh_thread
+    with _refresh_lock:
+        if _refresh_thread is None or not _refresh_thread.is_alive():
+            _refresh_thread = Thread(
+                target=_download_models, daemon=True, name="refresh_models"
+            )
+            _refresh_thread.start()
+        return _refresh_thread
+
+
+def fetch_models(*, force_refresh: bool = False) -> list[dict[str, Any]]:
+    """Fetch available models from Pollinations /text/models API, with caching.
+
+    An expired cache is still returned straight away while a background
+    thread refreshes it, so only the very first run waits on the network.
+    """
+    cached = _load_cache()
+    if not force_refresh and cached is not None:
+        models, age = cached
+        if age > CACHE_TTL_SECONDS:
+            refresh_models_in_background()
+        return models
+
+    models = _download_models()
+    if models is not None:
+        return models
+    return cached[0] if cached is not None else []
 
 
 def to_model_configs(
@@ -88,6 +120,7 @@ def to_model_configs(
         pricing = m.get("pricing", {})
         input_price = pricing.get("promptTextTokens", 0.0) * 1_000_000
         output_price = pricing.get("completionTextTokens", 0.0) * 1_000_000
+        cached_price = pricing.get("promptCachedTokens", 0.0) * 1_000_000
         context_length = m.get("context_window") or 0
         configs.append(
             ModelConfig(
@@ -97,6 +130,7 @@ def to_model_configs(
                 description=description,
                 input_price=input_price,
                 output_price=output_price,
+                cached_input_price=cached_price,
                 context_length=int(context_length),
             )
         )
@@ -0,0 +1,266 @@
+"""Client-side rate limiting for LLM providers.
+
+Every request to a provider first takes a token from that provider's
+`RateLimiter`. The limiter starts out unlimited and learns the provider's
+limits from the `x-ratelimit-*` headers of its responses: the request limit
+and the time until it resets give the refill rate of a token bucket, and an
+exhausted token budget or a `Retry-After` holds every request until the
+provider is ready again. Waiting requests are served in priority order, so
+the user's own turn goes ahead of subagents, and subagents ahead of
+background compaction.
+
+Limiters are shared per provider by everything in the process (subagents,
+batch items), since that is the scope the provider enforces limits in.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+import heapq
+from http import HTTPStatus
+import itertools
+import math
+import random
+import re
+import time
+
+from pydantic import BaseModel
+
+from bloom.core import tracing
+from bloom.core.utils import utc_now
+
+# Longer waits fail the request instead: the quota is likely gone for the day.
+MAX_RETRY_AFTER_SECONDS = 60.0
+RETRY_AFTER_JITTER = 0.2
+# Shorter waits are just the cost of taking the lock, not queueing.
+_QUEUED_AFTER_SECONDS = 0.001
+_RETRYABLE_STATUSES = {HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE}
+
+_DURATION_PART = re.compile(r"(?P<value>\d+(?:\.\d+)?)(?P<unit>ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class RequestPriority(IntEnum):
+    INTERACTIVE = 0
+    SUBAGENT = 1
+    BACKGROUND = 2
+
+
+_priority: ContextVar[RequestPriority] = ContextVar(
+    "bloom_request_priority", default=RequestPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Generator[None]:
+    """Send the requests made in the block with `priority`."""
+    previous = _priority.get()
+    _priority.set(priority)
+    try:
+        yield
+    finally:
+        # Not `reset`: a streaming request may be closed from another context.
+        _priority.set(previous)
+
+
+class RateLimitStats(BaseModel):
+    requests: int = 0
+    queued: int = 0  # Requests that had to wait for the limiter
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    throttled: int = 0  # 429 responses
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, provider: str, wait_seconds: float) -> None:
+        super().__init__(
+            f"{provider} asked to wait {wait_seconds:.0f}s before the next request"
+        )
+        self.provider = provider
+        self.wait_seconds = wait_seconds
+
+
+def parse_duration(value: str) -> float | None:
+    """Seconds in a header like `1.5`, `20ms` or `6m0s`."""
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    parts = list(_DURATION_PART.finditer(value))
+    if not parts or "".join(part[0] for part in parts) != value:
+        return None
+    return sum(float(part["value"]) * _UNIT_SECONDS[part["unit"]] for part in parts)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    if (ms := headers.get("retry-after-ms")) is not None:
+        try:
+            return max(float(ms) / 1000, 0.0)
+        except ValueError:
+            pass
+    if (value := headers.get("retry-after")) is None:
+        return None
+    if (seconds := parse_duration(value)) is not None:
+        return seconds
+    try:
+        return max((parsedate_to_datetime(value) - utc_now()).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> int | None:
+    try:
+        return int(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+class RateLimiter:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.stats = RateLimitStats()
+        # Unlimited until a response says otherwise.
+        self._capacity = math.inf
+        self._tokens = math.inf
+        self._refill_per_second = 0.0
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiting: list[tuple[RequestPriority, int]] = []
+        self._sequence = itertools.count()
+        self._condition = asyncio.Condition()
+        self._condition_loop: asyncio.AbstractEventLoop | None = None
+
+    async def acquire(self) -> None:
+        """Wait for the provider to take another request."""
+        loop = asyncio.get_running_loop()
+        if self._condition_loop is not loop:
+            # Limiters outlive event loops (one per `asyncio.run`); the
+            # learned limits carry over, the queue can't.
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+            self._waiting.clear()
+        priority = _priority.get()
+        entry = (priority, next(self._sequence))
+        started = time.monotonic()
+        started_ns = time.perf_counter_ns()
+        async with self._condition:
+            heapq.heappush(self._waiting, entry)
+            try:
+                await self._wait_turn(entry)
+                self._take()
+            finally:
+                self._remove(entry)
+                self._condition.notify_all()
+
+        waited = time.monotonic() - started
+        self.stats.requests += 1
+        if waited > _QUEUED_AFTER_SECONDS:
+            self.stats.queued += 1
+            self.stats.wait_seconds += waited
+            self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, waited)
+            if tracer := tracing.current():
+                tracer.record(
+                    "llm.queue",
+                    started_ns,
+                    time.perf_counter_ns(),
+                    provider=self.name,
+                    priority=priority.name.lower(),
+                )
+
+    async def _wait_turn(self, entry: tuple[RequestPriority, int]) -> None:
+        while True:
+            timeout = None
+            if self._waiting[0] == entry:
+                if (delay := self._delay()) <= 0:
+                    return
+                if delay > MAX_RETRY_AFTER_SECONDS:
+                    raise RateLimitExceeded(self.name, delay)
+                timeout = delay
+            try:
+                await asyncio.wait_for(self._condition.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    def _remove(self, entry: tuple[RequestPriority, int]) -> None:
+        if self._waiting and self._waiting[0] == entry:
+            heapq.heappop(self._waiting)
+        elif entry in self._waiting:
+            self._waiting.remove(entry)
+            heapq.heapify(self._waiting)
+
+    def _refill(self, now: float) -> None:
+        if self._refill_per_second > 0:
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._refilled_at) * self._refill_per_second,
+            )
+        self._refilled_at = now
+
+    def _delay(self) -> float:
+        now = time.monotonic()
+        self._refill(now)
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._tokens >= 1:
+            return 0.0
+        if self._refill_per_second <= 0:
+            return 0.0  # Nothing tells us when the bucket refills.
+        return (1 - self._tokens) / self._refill_per_second
+
+    def _take(self) -> None:
+        if self._tokens >= 1:
+            self._tokens -= 1
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Learn the provider's limits from a response."""
+        now = time.monotonic()
+        self._refill(now)
+
+        limit = _header_int(headers, "x-ratelimit-limit-requests")
+        remaining = _header_int(headers, "x-ratelimit-remaining-requests")
+        reset = parse_duration(headers.get("x-ratelimit-reset-requests", ""))
+        if limit is not None and remaining is not None:
+            self._capacity = float(limit)
+            self._tokens = float(min(remaining, limit))
+            if reset:
+                self._refill_per_second = max(limit - remaining, 1) / reset
+
+        # The token budget can't be planned for without knowing request sizes,
+        # but once it is spent nothing gets through until it resets.
+        if _header_int(headers, "x-ratelimit-remaining-tokens") == 0:
+            tokens_reset = parse_duration(headers.get("x-ratelimit-reset-tokens", ""))
+            if tokens_reset:
+                self._block(now + tokens_reset)
+
+        if status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            self.stats.throttled += 1
+            self._tokens = min(self._tokens, 0.0)
+        if (retry_after := parse_retry_after(headers)) is not None and (
+            status_code in _RETRYABLE_STATUSES
+        ):
+            # Jitter, so requests held back together don't return together.
+            jitter = 1 + random.uniform(0, RETRY_AFTER_JITTER)
+            self._block(now + retry_after * jitter)
+
+    def _block(self, until: float) -> None:
+        self._blocked_until = max(self._blocked_until, until)
+
+
+_limiters: dict[tuple[str, str], RateLimiter] = {}
+
+
+def get_rate_limiter(name: str, api_base: str) -> RateLimiter:
+    key = (name, api_base)
+    if (limiter := _limiters.get(key)) is None:
+        limiter = _limiters[key] = RateLimiter(name)
+    return limiter
+
+
+def rate_limiters() -> list[RateLimiter]:
+    return list(_limiters.values())
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+import json
+import math
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from bloom.core.config import ModelConfig
+    from bloom.core.types import AvailableTool, LLMMessage
+
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# Approximate per-message framing cost (role markers, separators) that
+# chat templates add on top of the message text itself.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Weight given to the newest observation when refining the calibration factor
+# from provider-reported prompt token counts.
+CALIBRATION_SMOOTHING = 0.5
+
+
+class Tokenizer(Protocol):
+    @property
+    def cache_key(self) -> Hashable: ...
+
+    def count(self, text: str) -> int: ...
+
+
+TOKENIZERS: dict[str, Callable[[ModelConfig], Tokenizer]] = {}
+
+
+def register_tokenizer(
+    name: str,
+) -> Callable[[Callable[[ModelConfig], Tokenizer]], Callable[[ModelConfig], Tokenizer]]:
+    def decorator(
+        factory: Callable[[ModelConfig], Tokenizer],
+    ) -> Callable[[ModelConfig], Tokenizer]:
+        TOKENIZERS[name] = factory
+        return factory
+
+    return decorator
+
+
+class CharRatioTokenizer:
+    """Estimates tokens from character count using a fixed chars-per-token ratio."""
+
+    def __init__(self, chars_per_token: float) -> None:
+        if chars_per_token <= 0:
+            raise ValueError("chars_per_token must be positive")
+        self.chars_per_token = chars_per_token
+
+    @property
+    def cache_key(self) -> Hashable:
+        return ("chars", self.chars_per_token)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return math.ceil(len(text) / self.chars_per_token)
+
+
+@register_tokenizer("chars")
+def _chars_tokenizer(model: ModelConfig) -> Tokenizer:
+    return CharRatioTokenizer(model.chars_per_token)
+
+
+def _message_fingerprint(message: LLMMessage) -> Hashable:
+    # str hashes are cached by the interpreter, so this stays cheap for
+    # long messages that are fingerprinted on every request.
+    return (
+        message.role,
+        hash(message.content),
+        hash(message.reasoning_content),
+        tuple(
+            (tc.id, tc.function.name, hash(tc.function.arguments))
+            for tc in message.tool_calls or ()
+        ),
+    )
+
+
+class TokenEstimator:
+    """Local prompt-size estimate for a model, without calling the provider.
+
+    Raw counts come from the model's tokenizer and are cached per message.
+    A calibration factor learned from the provider's reported usage then
+    scales the raw count towards what the provider actually bills.
+    """
+
+    def __init__(self, tokenizer: Tokenizer, calibration: float = 1.0) -> None:
+        self._tokenizer = tokenizer
+        self.calibration = calibration
+        self._calibrated = False
+        self._tools_cache: tuple[tuple[str, ...], int] | None = None
+
+    @classmethod
+    def for_model(cls, model: ModelConfig) -> TokenEstimator:
+        try:
+            factory = TOKENIZERS[model.tokenizer]
+        except KeyError as e:
+            raise ValueError(
+                f"Unknown tokenizer '{model.tokenizer}' for model '{model.name}'. "
+                f"Available: {', '.join(TOKENIZERS)}"
+            ) from e
+        return cls(factory(model))
+
+    def message_tokens(self, message: LLMMessage) -> int:
+        key = (self._tokenizer.cache_key, _message_fingerprint(message))
+        if (cached := message.cached_token_count(key)) is not None:
+            return cached
+
+        count = MESSAGE_OVERHEAD_TOKENS
+        count += self._tokenizer.count(message.content or "")
+        count += self._tokenizer.count(message.reasoning_content or "")
+        for tc in message.tool_calls or ():
+            count += self._tokenizer.count(tc.function.name or "")
+            count += self._tokenizer.count(tc.function.arguments or "")
+        message.cache_token_count(key, count)
+        return count
+
+    def tools_tokens(self, tools: list[AvailableTool] | None) -> int:
+        if not tools:
+            return 0
+        names = tuple(tool.function.name for tool in tools)
+        if self._tools_cache is not None and self._tools_cache[0] == names:
+            return self._tools_cache[1]
+
+        serialized = json.dumps(
+            [tool.model_dump(exclude_none=True) for tool in tools], ensure_ascii=False
+        )
+        count = self._tokenizer.count(serialized)
+        self._tools_cache = (names, count)
+        return count
+
+    def raw_count(
+        self, messages: list[LLMMessage], tools: list[AvailableTool] | None = None
+    ) -> int:
+        return sum(self.message_tokens(m) for m in messages) + self.tools_tokens(tools)
+
+    def estimate(
+        self, messages: list[LLMMessage], tools: list[AvailableTool] | None = None
+    ) -> int:
+        return round(self.raw_count(messages, tools) * self.calibration)
+
+    def calibrate(
+        self,
+        messages: list[LLMMessage],
+        tools: list[AvailableTool] | None,
+        prompt_tokens: int,
+    ) -> None:
+        """Refine the calibration factor from a provider-reported prompt size."""
+        raw = self.raw_count(messages, tools)
+        if raw <= 0 or prompt_tokens <= 0:
+            return
+
+        observed = prompt_tokens / raw
+        if not self._calibrated:
+            self.calibration = observed
+            self._calibrated = True
+            return
+        self.calibration += CALIBRATION_SMOOTHING * (observed - self.calibration)
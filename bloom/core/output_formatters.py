@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 import json
 import sys
-from typing import TextIO
+from typing import Any, TextIO
 
 from bloom.core.types import AssistantEvent, BaseEvent, LLMMessage, OutputFormat
 
@@ -60,9 +61,20 @@ class JsonOutputFormatter(OutputFormatter):
 
 
 class StreamingJsonOutputFormatter(OutputFormatter):
+    def __init__(
+        self, stream: TextIO = sys.stdout, *, fields: Mapping[str, Any] | None = None
+    ) -> None:
+        super().__init__(stream)
+        # Added to every record, e.g. to tell apart the items of a batch.
+        self.fields = dict(fields or {})
+
     def on_message_added(self, message: LLMMessage) -> None:
-        json.dump(message.model_dump(mode="json"), self.stream, ensure_ascii=False)
-        self.stream.write("\n")
+        self.write_record(message.model_dump(mode="json"))
+
+    def write_record(self, record: Mapping[str, Any]) -> None:
+        # One write per record, so records from concurrent agents don't mix.
+        line = json.dumps({**self.fields, **record}, ensure_ascii=False)
+        self.stream.write(line + "\n")
         self.stream.flush()
 
     def on_event(self, event: BaseEvent) -> None:
@@ -33,8 +33,14 @@ GLOBAL_SKILLS_DIR = GlobalPath(lambda: BLOOM_HOME.path / "skills")
 GLOBAL_AGENTS_DIR = GlobalPath(lambda: BLOOM_HOME.path / "agents")
 GLOBAL_PROMPTS_DIR = GlobalPath(lambda: BLOOM_HOME.path / "prompts")
 SESSION_LOG_DIR = GlobalPath(lambda: BLOOM_HOME.path / "logs" / "session")
+COMPACTION_CACHE_DIR = GlobalPath(lambda: BLOOM_HOME.path / "cache" / "compaction")
+MODELS_CACHE_FILE = GlobalPath(lambda: BLOOM_HOME.path / "models_cache.json")
+TOOL_DISCOVERY_CACHE_FILE = GlobalPath(
+    lambda: BLOOM_HOME.path / "cache" / "tool_discovery.json"
+)
 TRUSTED_FOLDERS_FILE = GlobalPath(lambda: BLOOM_HOME.path / "trusted_folders.toml")
 LOG_DIR = GlobalPath(lambda: BLOOM_HOME.path / "logs")
+PROFILE_DIR = GlobalPath(lambda: BLOOM_HOME.path / "logs" / "profiles")
 LOG_FILE = GlobalPath(lambda: BLOOM_HOME.path / "bloom.log")
 
 DEFAULT_TOOL_DIR = GlobalPath(lambda: BLOOM_ROOT / "core" / "tools" / "builtins")
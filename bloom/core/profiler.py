@@ -0,0 +1,165 @@
+"""A sampling profiler for live sessions.
+
+A daemon thread samples the stack of every thread (the event loop, the file
+indexer and its watcher, tool workers) at a fixed interval and counts each
+distinct stack. `stop` writes the counts in the collapsed-stack format read
+by flamegraph.pl and speedscope.
+
+While it runs, the same thread watches the event loop: it schedules a
+heartbeat on the loop and, when the heartbeat is late by more than the
+slow-callback threshold, logs the stack of whatever is blocking the loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import TYPE_CHECKING
+
+from bloom.core.paths.global_paths import PROFILE_DIR
+
+if TYPE_CHECKING:
+    from bloom.core.config import ProfilingConfig
+
+logger = getLogger("bloom")
+
+
+class ProfilerError(Exception):
+    pass
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def _collapse(frame: FrameType | None) -> tuple[str, ...]:
+    labels: list[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+class SamplingProfiler:
+    def __init__(
+        self, output_dir: Path, *, interval: float = 0.005, slow_callback: float = 0.1
+    ) -> None:
+        self.output_dir = output_dir
+        self.interval = interval
+        self.slow_callback = slow_callback  # Seconds; 0 disables the detector
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self.slow_callbacks = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started_at = datetime.now()
+        # Heartbeat state, written by the loop and read by the sampler.
+        self._heartbeat_sent: float | None = None
+        self._stall_reported = False
+
+    @classmethod
+    def from_config(cls, config: ProfilingConfig) -> SamplingProfiler:
+        return cls(
+            PROFILE_DIR.path,
+            interval=config.sample_interval_ms / 1000,
+            slow_callback=config.slow_callback_ms / 1000,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Start sampling; call from the event loop thread, if there is one."""
+        if self._thread is not None:
+            raise ProfilerError("Profiler is already running")
+        try:
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+        except RuntimeError:
+            self._loop = None
+        self.samples.clear()
+        self.slow_callbacks = 0
+        self._started_at = datetime.now()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="bloom-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> Path:
+        """Stop sampling and write the profile, returning its path."""
+        if self._thread is None:
+            raise ProfilerError("Profiler is not running")
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._heartbeat_sent = None
+        return self.write()
+
+    def write(self) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = (
+            self.output_dir
+            / f"profile_{self._started_at.strftime('%Y%m%d_%H%M%S')}.collapsed"
+        )
+        lines = [";".join(stack) + f" {count}" for stack, count in self.samples.items()]
+        path.write_text("\n".join(lines) + "\n" if lines else "", encoding="utf-8")
+        return path
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            frames = sys._current_frames()
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                name = names.get(thread_id, f"thread-{thread_id}")
+                self.samples[(name, *_collapse(frame))] += 1
+            if self._loop is not None and self.slow_callback > 0:
+                self._watch_loop(self._loop, frames)
+
+    def _watch_loop(
+        self, loop: asyncio.AbstractEventLoop, frames: dict[int, FrameType]
+    ) -> None:
+        sent = self._heartbeat_sent
+        if sent is None:
+            self._heartbeat_sent = time.perf_counter()
+            try:
+                loop.call_soon_threadsafe(self._heartbeat)
+            except RuntimeError:  # The loop has closed.
+                self._loop = None
+            return
+        blocked = time.perf_counter() - sent
+        if blocked <= self.slow_callback or self._stall_reported:
+            return
+        self._stall_reported = True
+        self.slow_callbacks += 1
+        frame = frames.get(self._loop_thread_id or 0)
+        stack = "".join(traceback.format_stack(frame)) if frame else ""
+        logger.warning(
+            "Event loop blocked for over %.0f ms in:\n%s", blocked * 1000, stack
+        )
+
+    def _heartbeat(self) -> None:
+        sent, stalled = self._heartbeat_sent, self._stall_reported
+        # Clear the heartbeat first, or the sampler could see a stale one.
+        self._heartbeat_sent = None
+        self._stall_reported = False
+        if sent is not None and stalled:
+            logger.warning(
+                "Event loop was blocked for %.0f ms",
+                (time.perf_counter() - sent) * 1000,
+            )
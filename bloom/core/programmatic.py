@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import sys
 
 from bloom.core.agent_loop import AgentLoop
 from bloom.core.agents.models import BuiltinAgentName
 from bloom.core.config import BloomConfig
 from bloom.core.output_formatters import create_formatter
+from bloom.core.profiler import SamplingProfiler
 from bloom.core.types import AssistantEvent, LLMMessage, OutputFormat, Role
 from bloom.core.utils import ConversationLimitException, logger
 
@@ -18,6 +20,7 @@ def run_programmatic(
     output_format: OutputFormat = OutputFormat.TEXT,
     previous_messages: list[LLMMessage] | None = None,
     agent_name: str = BuiltinAgentName.AUTO_APPROVE,
+    profile: bool = False,
 ) -> str | None:
     formatter = create_formatter(output_format)
 
@@ -32,6 +35,17 @@ def run_programmatic(
     logger.info("USER: %s", prompt)
 
     async def _async_run() -> str | None:
+        if not profile:
+            return await _run_agent()
+        profiler = SamplingProfiler.from_config(config.profiling)
+        profiler.start()
+        try:
+            return await _run_agent()
+        finally:
+            path = profiler.stop()
+            print(f"Profile written to {path}", file=sys.stderr)
+
+    async def _run_agent() -> str | None:
         if previous_messages:
             non_system_messages = [
                 msg for msg in previous_messages if not (msg.role == Role.system)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+from logging import getLogger
+import os
+from pathlib import Path
+import tempfile
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+from bloom.core.session.session_logger import MESSAGES_FILENAME, METADATA_FILENAME
+
+if TYPE_CHECKING:
+    from bloom.core.config import SessionLoggingConfig
+
+logger = getLogger("bloom")
+
+INDEX_FILENAME = ".session-index.json"
+_INDEX_VERSION = 1
+
+
+class SessionSummary(BaseModel):
+    session_id: str
+    session_dir: Path
+    cwd: str | None = None
+    title: str | None = None
+    updated_at: str | None = None
+
+
+def _summarize(session_dir: Path) -> dict[str, Any] | None:
+    try:
+        with (session_dir / METADATA_FILENAME).open(
+            encoding="utf-8", errors="ignore"
+        ) as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(metadata, dict) or not metadata.get("session_id"):
+        return None
+    environment = metadata.get("environment") or {}
+    return {
+        "session_id": metadata["session_id"],
+        "cwd": environment.get("working_directory"),
+        "title": metadata.get("title"),
+        "updated_at": metadata.get("end_time") or metadata.get("start_time"),
+    }
+
+
+class SessionIndex:
+    """Summaries of the saved sessions, kept in the save dir next to them.
+
+    Listing sessions needs a few fields from each `meta.json`, which also holds
+    the whole config and every tool schema. The index keeps those fields with
+    the file's (mtime, size), so a listing reads only the sessions saved since
+    the last one and a `stat` per session for the rest.
+    """
+
+    def __init__(self, config: SessionLoggingConfig) -> None:
+        self._save_dir = Path(config.save_dir)
+        self._prefix = f"{config.session_prefix}_"
+        self._path = self._save_dir / INDEX_FILENAME
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != _INDEX_VERSION:
+            return
+        self._entries = data.get("sessions", {})
+
+    def sessions(self, cwd: str | None = None) -> list[SessionSummary]:
+        """Sessions in the save dir, most recently updated first.
+
+        A session that kept its id through compaction has a directory per log;
+        only the latest one is listed.
+        """
+        entries, dirty = {}, False
+        for session_dir in self._session_dirs():
+            try:
+                meta = (session_dir / METADATA_FILENAME).stat()
+                if (session_dir / MESSAGES_FILENAME).stat().st_size == 0:
+                    continue
+            except OSError:
+                continue
+            signature = [meta.st_mtime_ns, meta.st_size]
+            entry = self._entries.get(session_dir.name)
+            if entry is None or entry["signature"] != signature:
+                if (summary := _summarize(session_dir)) is None:
+                    continue
+                entry = {"signature": signature, **summary}
+                dirty = True
+            entries[session_dir.name] = entry
+
+        if dirty or entries.keys() != self._entries.keys():
+            self._entries = entries
+            self._save()
+
+        summaries = [
+            SessionSummary(
+                session_id=entry["session_id"],
+                session_dir=self._save_dir / name,
+                cwd=entry["cwd"],
+                title=entry["title"],
+                updated_at=entry["updated_at"],
+            )
+            for name, entry in entries.items()
+            if cwd is None or entry["cwd"] == cwd
+        ]
+        summaries.sort(key=lambda s: s.updated_at or "", reverse=True)
+        latest = {s.session_id: s for s in reversed(summaries)}
+        return [s for s in summaries if latest[s.session_id] is s]
+
+    def find(self, session_id: str) -> SessionSummary | None:
+        return next((s for s in self.sessions() if s.session_id == session_id), None)
+
+    def _session_dirs(self) -> list[Path]:
+        try:
+            with os.scandir(self._save_dir) as entries:
+                return [
+                    Path(entry.path)
+                    for entry in entries
+                    if entry.name.startswith(self._prefix) and entry.is_dir()
+                ]
+        except OSError:
+            return []
+
+    def _save(self) -> None:
+        data = {"version": _INDEX_VERSION, "sessions": self._entries}
+        try:
+            # `SessionLogger.cleanup_tmp_files` removes a `.json.tmp` left behind.
+            fd, tmp = tempfile.mkstemp(dir=self._save_dir, suffix=".json.tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self._path)
+        except OSError as e:
+            logger.debug("Could not write session index: %s", e)
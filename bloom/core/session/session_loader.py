@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -10,6 +11,8 @@ from bloom.core.types import LLMMessage
 if TYPE_CHECKING:
     from bloom.core.config import SessionLoggingConfig
 
+TAIL_BLOCK_SIZE = 64 * 1024
+
 
 class SessionLoader:
     @staticmethod
@@ -106,6 +109,46 @@ class SessionLoader:
         short_id = session_id[:8]
         return list(save_dir.glob(f"{config.session_prefix}_*_{short_id}"))
 
+    @staticmethod
+    def load_tail(filepath: Path, limit: int) -> list[LLMMessage]:
+        """Load the last `limit` non-system messages of a session.
+
+        The messages file is read backwards in blocks until enough lines have
+        been seen, so the cost depends on `limit` rather than on the length of
+        the session.
+        """
+        messages_filepath = filepath / MESSAGES_FILENAME
+        lines: list[bytes] = []
+        try:
+            with messages_filepath.open("rb") as f:
+                end = f.seek(0, os.SEEK_END)
+                tail = b""
+                while end > 0 and len(lines) <= limit:
+                    start = max(0, end - TAIL_BLOCK_SIZE)
+                    f.seek(start)
+                    tail = f.read(end - start) + tail
+                    end = start
+                    lines = tail.splitlines()
+        except OSError as e:
+            raise ValueError(
+                f"Error reading session messages at {filepath}: {e}"
+            ) from e
+
+        if end > 0:
+            # The first line may have been cut by the block boundary.
+            lines = lines[1:]
+        try:
+            data = [json.loads(line) for line in lines[-limit:] if line.strip()]
+        except json.JSONDecodeError as e:
+            raise ValueError(
+                f"Session messages contain invalid JSON (may have been corrupted): "
+                f"{filepath}\nDetails: {e}"
+            ) from e
+
+        return [
+            LLMMessage.model_validate(msg) for msg in data if msg["role"] != "system"
+        ]
+
     @staticmethod
     def load_session(filepath: Path) -> tuple[list[LLMMessage], dict[str, Any]]:
         # Load session messages from MESSAGES_FILENAME
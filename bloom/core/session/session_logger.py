@@ -10,6 +10,7 @@ from typing import TYPE_CHECKING, Any
 
 from anyio import NamedTemporaryFile, Path as AsyncPath
 
+from bloom.core import tracing
 from bloom.core.types import AgentStats, LLMMessage, Role, SessionMetadata
 from bloom.core.utils import is_windows, utc_now
 
@@ -201,19 +202,50 @@ class SessionLogger:
         base_config: BloomConfig,
         tool_manager: ToolManager,
         agent_profile: AgentProfile,
+        *,
+        update_metadata: bool = False,
     ) -> None:
+        """Append new messages and rewrite the metadata.
+
+        Without new messages nothing is written unless `update_metadata` is
+        set, e.g. to record stats gathered after the last message.
+        """
         if not self.enabled or self.session_dir is None:
             return
 
         if self.session_metadata is None:
             return
 
+        with tracing.span("session.save"):
+            await self._save_interaction(
+                messages,
+                stats,
+                base_config,
+                tool_manager,
+                agent_profile,
+                self.session_dir,
+                self.session_metadata,
+                update_metadata=update_metadata,
+            )
+
+    async def _save_interaction(
+        self,
+        messages: list[LLMMessage],
+        stats: AgentStats,
+        base_config: BloomConfig,
+        tool_manager: ToolManager,
+        agent_profile: AgentProfile,
+        session_dir: Path,
+        session_metadata: SessionMetadata,
+        *,
+        update_metadata: bool,
+    ) -> None:
         # If the session directory does not exist, create it
         try:
-            self.session_dir.mkdir(parents=True, exist_ok=True)
+            session_dir.mkdir(parents=True, exist_ok=True)
         except OSError as e:
             raise RuntimeError(
-                f"Failed to create session directory at {self.session_dir}: {type(e).__name__}: {e}"
+                f"Failed to create session directory at {session_dir}: {type(e).__name__}: {e}"
             ) from e
 
         # Read old metadata and get total_messages
@@ -236,12 +268,12 @@ class SessionLogger:
             # Append new messages
             new_messages = non_system_messages[old_total_messages:]
 
-            if len(new_messages) == 0:
+            if new_messages:
+                messages_data = [m.model_dump(exclude_none=True) for m in new_messages]
+                await SessionLogger.persist_messages(messages_data, session_dir)
+            elif not update_metadata:
                 return
 
-            messages_data = [m.model_dump(exclude_none=True) for m in new_messages]
-            await SessionLogger.persist_messages(messages_data, self.session_dir)
-
             # If message update succeeded, write metadata
             tools_available = [
                 {
@@ -264,7 +296,7 @@ class SessionLogger:
             total_messages = len(non_system_messages)
 
             metadata_dump = {
-                **self.session_metadata.model_dump(),
+                **session_metadata.model_dump(),
                 "end_time": utc_now().isoformat(),
                 "stats": stats.model_dump(),
                 "title": title,
@@ -278,11 +310,9 @@ class SessionLogger:
                 "system_prompt": system_prompt,
             }
 
-            await SessionLogger.persist_metadata(metadata_dump, self.session_dir)
+            await SessionLogger.persist_metadata(metadata_dump, session_dir)
         except Exception as e:
-            raise RuntimeError(
-                f"Failed to save session to {self.session_dir}: {e}"
-            ) from e
+            raise RuntimeError(f"Failed to save session to {session_dir}: {e}") from e
         finally:
             self.cleanup_tmp_files()
 
@@ -293,9 +323,35 @@ class SessionLogger:
 
         self.session_id = session_id
         self.session_start_time = utc_now().isoformat()
-        self.session_dir = self.save_folder
+        # A session that keeps its id gets a new directory too; within the
+        # same second the name would be the one just left, so number it.
+        folder = self.save_folder
+        stem = folder.name.removesuffix(f"_{self.session_id[:8]}")
+        session_dir, attempt = folder, 1
+        while session_dir.exists():
+            attempt += 1
+            session_dir = folder.with_name(f"{stem}-{attempt}_{self.session_id[:8]}")
+        self.session_dir = session_dir
         self.session_metadata = self._initialize_session_metadata()
 
+    def resume_session(self, session_dir: Path) -> None:
+        """Keep logging into an existing session directory.
+
+        Only messages past the `total_messages` already recorded there are
+        appended, so the agent's history has to start with the saved one.
+        """
+        if not self.enabled:
+            return
+
+        with (session_dir / METADATA_FILENAME).open(
+            encoding="utf-8", errors="ignore"
+        ) as f:
+            metadata = SessionMetadata.model_validate(json.load(f))
+        self.session_id = metadata.session_id
+        self.session_start_time = metadata.start_time
+        self.session_dir = session_dir
+        self.session_metadata = metadata
+
     def cleanup_tmp_files(self) -> None:
         """Delete temporary files created more than 5 minutes ago"""
         if not self.enabled or not self.save_dir:
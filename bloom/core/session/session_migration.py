@@ -1,26 +1,61 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable
 import json
+from logging import getLogger
 from pathlib import Path
+import queue
+import threading
 
 from bloom.core.config import SessionLoggingConfig
 from bloom.core.session.session_logger import SessionLogger
 
+logger = getLogger("bloom")
 
-def migrate_sessions_entrypoint(session_config: SessionLoggingConfig) -> int:
-    return asyncio.run(migrate_sessions(session_config))
+# Bump when a new migration step is added; save dirs whose marker holds an
+# older version are scanned again.
+MIGRATION_VERSION = 1
+MIGRATION_MARKER = ".migration-version"
 
+type MigrationProgress = Callable[[int, int], None]
 
-async def migrate_sessions(session_config: SessionLoggingConfig) -> int:
+_jobs: queue.SimpleQueue[tuple[SessionLoggingConfig, threading.Event]] = (
+    queue.SimpleQueue()
+)
+_scheduled: dict[Path, threading.Event] = {}
+_worker_lock = threading.Lock()
+_worker: threading.Thread | None = None
+
+
+def is_migrated(save_dir: str | Path) -> bool:
+    try:
+        version = (Path(save_dir) / MIGRATION_MARKER).read_text().strip()
+        return int(version) >= MIGRATION_VERSION
+    except (OSError, ValueError):
+        return False
+
+
+def _mark_migrated(save_dir: Path) -> None:
+    try:
+        (save_dir / MIGRATION_MARKER).write_text(f"{MIGRATION_VERSION}\n")
+    except OSError as e:
+        logger.warning("Could not record session migration in %s: %s", save_dir, e)
+
+
+async def migrate_sessions(
+    session_config: SessionLoggingConfig, on_progress: MigrationProgress | None = None
+) -> int:
     """Helper for migrating session data from singular JSON files to the format introduced in Bloom 2.0 with per-session folders with split metadata and message files."""
     save_dir = session_config.save_dir
-    if not save_dir or not session_config.enabled:
+    if not save_dir or not session_config.enabled or is_migrated(save_dir):
+        return 0
+    if not Path(save_dir).is_dir():
         return 0
 
     successful_migrations = 0
     session_files = list(Path(save_dir).glob(f"{session_config.session_prefix}_*.json"))
-    for session_file in session_files:
+    for done, session_file in enumerate(session_files, start=1):
         try:
             with open(session_file) as f:
                 session_data = f.read()
@@ -35,7 +70,58 @@ async def migrate_sessions(session_config: SessionLoggingConfig) -> int:
             await SessionLogger.persist_messages(messages, session_dir)
             session_file.unlink()
             successful_migrations += 1
-        except Exception:
-            continue
+        except Exception as e:
+            logger.warning("Could not migrate session %s: %s", session_file, e)
+        if on_progress:
+            on_progress(done, len(session_files))
 
+    # Files that failed once (corrupt JSON, a clashing folder) would fail on
+    # every start too, so the marker is written regardless.
+    _mark_migrated(Path(save_dir))
     return successful_migrations
+
+
+def _log_progress(done: int, total: int) -> None:
+    logger.info("Migrated %d/%d legacy session files", done, total)
+
+
+def _run_worker() -> None:
+    # One event loop for the life of the worker instead of one per job.
+    with asyncio.Runner() as runner:
+        while True:
+            session_config, finished = _jobs.get()
+            try:
+                runner.run(migrate_sessions(session_config, _log_progress))
+            except Exception as e:
+                logger.warning("Session migration failed: %s", e)
+            finally:
+                finished.set()
+
+
+def start_session_migration(session_config: SessionLoggingConfig) -> threading.Event:
+    """Schedule migration of `session_config.save_dir` on the shared worker.
+
+    Each save dir is scheduled at most once per process and skipped entirely
+    once its marker file is current. The returned event is set when the
+    migration has finished (immediately if there is nothing to do).
+    """
+    global _worker
+
+    save_dir = session_config.save_dir
+    if not save_dir or not session_config.enabled or is_migrated(save_dir):
+        finished = threading.Event()
+        finished.set()
+        return finished
+
+    key = Path(save_dir).resolve()
+    with _worker_lock:
+        if (finished := _scheduled.get(key)) is not None:
+            return finished
+        finished = _scheduled[key] = threading.Event()
+        _jobs.put((session_config, finished))
+        if _worker is None:
+            _worker = threading.Thread(
+                target=_run_worker, daemon=True, name="migrate_sessions"
+            )
+            _worker.start()
+    return finished
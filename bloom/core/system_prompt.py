@@ -412,12 +412,35 @@ def _get_available_subagents_section(agent_manager: AgentManager) -> str:
     return "\n".join(lines)
 
 
+def get_project_context_prompt(config: BloomConfig) -> str:
+    is_dangerous, reason = is_dangerous_directory()
+    if is_dangerous:
+        template = UtilityPrompt.DANGEROUS_DIRECTORY.read()
+        context = template.format(reason=reason.lower(), abs_path=Path(".").resolve())
+    else:
+        context = ProjectContextProvider(
+            config=config.project_context, root_path=Path.cwd()
+        ).get_full_context()
+
+    sections = [context]
+    project_doc = _load_project_doc(Path.cwd(), config.project_context.max_doc_bytes)
+    if project_doc.strip():
+        sections.append(project_doc)
+    return "\n\n".join(sections)
+
+
 def get_universal_system_prompt(
     tool_manager: ToolManager,
     config: BloomConfig,
     skill_manager: SkillManager,
     agent_manager: AgentManager,
+    project_context: str | None = None,
 ) -> str:
+    """Build the system prompt.
+
+    `project_context` reuses a previously generated project context section
+    instead of scanning the working directory and git state again.
+    """
     sections = [config.system_prompt]
 
     if config.include_commit_signature:
@@ -448,23 +471,8 @@ def get_universal_system_prompt(
             sections.append(subagents_section)
 
     if config.include_project_context:
-        is_dangerous, reason = is_dangerous_directory()
-        if is_dangerous:
-            template = UtilityPrompt.DANGEROUS_DIRECTORY.read()
-            context = template.format(
-                reason=reason.lower(), abs_path=Path(".").resolve()
-            )
-        else:
-            context = ProjectContextProvider(
-                config=config.project_context, root_path=Path.cwd()
-            ).get_full_context()
-
-        sections.append(context)
-
-        project_doc = _load_project_doc(
-            Path.cwd(), config.project_context.max_doc_bytes
-        )
-        if project_doc.strip():
-            sections.append(project_doc)
+        if project_context is None:
+            project_context = get_project_context_prompt(config)
+        sections.append(project_context)
 
     return "\n\n".join(sections)
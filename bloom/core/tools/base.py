@@ -27,6 +27,7 @@ from bloom.core.types import ToolStreamEvent
 
 if TYPE_CHECKING:
     from bloom.core.agents.manager import AgentManager
+    from bloom.core.agents.subagents import SubagentPool
     from bloom.core.types import ApprovalCallback, UserInputCallback
 
 ARGS_COUNT = 4
@@ -40,6 +41,7 @@ class InvokeContext:
     approval_callback: ApprovalCallback | None = field(default=None)
     agent_manager: AgentManager | None = field(default=None)
     user_input_callback: UserInputCallback | None = field(default=None)
+    subagent_pool: SubagentPool | None = field(default=None)
 
 
 class ToolError(Exception):
@@ -115,10 +117,19 @@ class BaseTool[
 
     prompt_path: ClassVar[Path] | None = None
 
+    # Read-only tools have no side effects, so they may be started speculatively
+    # while the model is still streaming the rest of its response.
+    read_only: ClassVar[bool] = False
+
     def __init__(self, config: ToolConfig, state: ToolState) -> None:
         self.config = config
         self.state = state
 
+    @property
+    def max_concurrency(self) -> int:
+        """How many calls to this tool from one assistant message may run at once."""
+        return 1
+
     @abstractmethod
     async def run(
         self, args: ToolArgs, ctx: InvokeContext | None = None
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from typing import ClassVar
 
 from pydantic import BaseModel, Field
 
 from bloom.core.agent_loop import AgentLoop
+from bloom.core.agents.manager import AgentManager
 from bloom.core.agents.models import AgentType
-from bloom.core.config import BloomConfig, SessionLoggingConfig
+from bloom.core.agents.subagents import SubagentBudget
 from bloom.core.tools.base import (
     BaseTool,
     BaseToolConfig,
@@ -47,6 +49,15 @@ class TaskResult(BaseModel):
 
 class TaskToolConfig(BaseToolConfig):
     permission: ToolPermission = ToolPermission.ASK
+    max_concurrent: int = Field(
+        default=4, ge=1, description="Task calls from one message that run at once."
+    )
+    max_turns: int | None = Field(
+        default=None, description="Turn budget for each subagent run."
+    )
+    max_price: float | None = Field(
+        default=None, description="Cost budget in dollars for each subagent run."
+    )
 
 
 class Task(
@@ -107,14 +118,27 @@ class Task(
                 f"This is a security constraint to prevent recursive spawning."
             )
 
-        base_config = BloomConfig.load(
-            session_logging=SessionLoggingConfig(enabled=False)
+        budget = SubagentBudget(
+            max_turns=self.config.max_turns, max_price=self.config.max_price
         )
-        subagent_loop = AgentLoop(config=base_config, agent_name=args.agent)
-
-        if ctx and ctx.approval_callback:
-            subagent_loop.set_approval_callback(ctx.approval_callback)
-
+        lease = (
+            ctx.subagent_pool.lease(args.agent, budget)
+            if ctx.subagent_pool is not None
+            else _standalone_subagent(agent_manager, args.agent, budget)
+        )
+        async with lease as subagent_loop:
+            if ctx.approval_callback:
+                subagent_loop.set_approval_callback(ctx.approval_callback)
+            async for item in self._run_subagent(subagent_loop, args, ctx):
+                yield item
+
+    @property
+    def max_concurrency(self) -> int:
+        return self.config.max_concurrent
+
+    async def _run_subagent(
+        self, subagent_loop: AgentLoop, args: TaskArgs, ctx: InvokeContext
+    ) -> AsyncGenerator[ToolStreamEvent | TaskResult, None]:
         accumulated_response: list[str] = []
         completed = True
         try:
@@ -152,3 +176,13 @@ class Task(
             turns_used=turns_used,
             completed=completed,
         )
+
+
+@asynccontextmanager
+async def _standalone_subagent(
+    agent_manager: AgentManager, agent_name: str, budget: SubagentBudget
+) -> AsyncGenerator[AgentLoop]:
+    """A one-off subagent, for callers that don't provide a subagent pool."""
+    # Reuse the parent's loaded config instead of re-reading TOML, .env and
+    # the model list.
+    yield AgentLoop.for_subagent(agent_manager.base_config, agent_name, budget)
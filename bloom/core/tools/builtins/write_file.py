@@ -17,6 +17,7 @@ from bloom.core.tools.base import (
 )
 from bloom.core.tools.ui import ToolCallDisplay, ToolResultDisplay, ToolUIData
 from bloom.core.types import ToolCallEvent, ToolResultEvent, ToolStreamEvent
+from bloom.core.utils import glob_matches
 
 
 class WriteFileArgs(BaseModel):
@@ -79,20 +80,16 @@ class WriteFile(
         return "Writing file"
 
     def check_allowlist_denylist(self, args: WriteFileArgs) -> ToolPermission | None:
-        import fnmatch
-
         file_path = Path(args.path).expanduser()
         if not file_path.is_absolute():
             file_path = Path.cwd() / file_path
         file_str = str(file_path)
 
-        for pattern in self.config.denylist:
-            if fnmatch.fnmatch(file_str, pattern):
-                return ToolPermission.NEVER
+        if glob_matches(file_str, self.config.denylist):
+            return ToolPermission.NEVER
 
-        for pattern in self.config.allowlist:
-            if fnmatch.fnmatch(file_str, pattern):
-                return ToolPermission.ALWAYS
+        if glob_matches(file_str, self.config.allowlist):
+            return ToolPermission.ALWAYS
 
         return None
 
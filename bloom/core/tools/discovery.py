@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+import json
+from logging import getLogger
+import os
+from pathlib import Path
+import stat
+import tempfile
+import threading
+from typing import Any
+
+from bloom.core.paths.global_paths import TOOL_DISCOVERY_CACHE_FILE
+
+logger = getLogger("bloom")
+
+_INDEX_VERSION = 1
+
+type FileSignature = tuple[int, int]
+
+
+def file_signature(path: Path) -> FileSignature | None:
+    """(mtime, size) of a regular file, or None if it isn't one."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+@dataclass(frozen=True)
+class ToolFileTiming:
+    path: Path
+    seconds: float
+    tools: tuple[str, ...]
+    imported: bool
+
+
+def _scandir(directory: Path) -> list[os.DirEntry[str]]:
+    try:
+        with os.scandir(directory) as entries:
+            return list(entries)
+    except OSError:
+        return []
+
+
+class DiscoveryIndex:
+    """On-disk record of what the tool search paths contained last time.
+
+    Directory listings are keyed by the directory's mtime, which changes
+    whenever an entry is added, removed or renamed, so an unchanged tree is
+    walked with one `stat` per directory and file instead of a listing.
+    Files are keyed by (mtime, size) and remember which tool classes they
+    exported; files that exported none are not imported again.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._dirs: dict[str, dict[str, Any]] = {}
+        self._files: dict[str, dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != _INDEX_VERSION:
+            return
+        self._dirs = data.get("dirs", {})
+        self._files = data.get("files", {})
+
+    def iter_py_files(self, base: Path) -> Iterator[Path]:
+        """Yield every `*.py` file below `base`, like `base.rglob("*.py")`."""
+        seen: set[tuple[int, int]] = set()
+        stack = [base]
+        while stack:
+            directory = stack.pop()
+            try:
+                st = directory.stat()
+            except OSError:
+                continue
+            if not stat.S_ISDIR(st.st_mode) or (st.st_dev, st.st_ino) in seen:
+                continue
+            seen.add((st.st_dev, st.st_ino))
+
+            listing = self._dirs.get(str(directory))
+            if listing is None or listing["mtime_ns"] != st.st_mtime_ns:
+                listing = self._scan_dir(directory, st.st_mtime_ns)
+            yield from (directory / name for name in listing["files"])
+            stack.extend(directory / name for name in reversed(listing["subdirs"]))
+
+    def _scan_dir(self, directory: Path, mtime_ns: int) -> dict[str, Any]:
+        files: list[str] = []
+        subdirs: list[str] = []
+        for entry in _scandir(directory):
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir and entry.name != "__pycache__":
+                subdirs.append(entry.name)
+            elif not is_dir and entry.name.endswith(".py"):
+                files.append(entry.name)
+        listing = {
+            "mtime_ns": mtime_ns,
+            "files": sorted(files),
+            "subdirs": sorted(subdirs),
+        }
+        with self._lock:
+            self._dirs[str(directory)] = listing
+            self._dirty = True
+        return listing
+
+    def exported_tools(self, path: Path, signature: FileSignature) -> list[str] | None:
+        """Tool class names `path` exported, or None if it changed or is new."""
+        entry = self._files.get(str(path))
+        if entry is None or (entry["mtime_ns"], entry["size"]) != signature:
+            return None
+        return entry["tools"]
+
+    def record(self, path: Path, signature: FileSignature, tools: list[str]) -> None:
+        mtime_ns, size = signature
+        entry = {"mtime_ns": mtime_ns, "size": size, "tools": tools}
+        with self._lock:
+            if self._files.get(str(path)) != entry:
+                self._files[str(path)] = entry
+                self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": _INDEX_VERSION, "dirs": self._dirs, "files": self._files}
+            self._dirty = False
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self._path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self._path)
+        except OSError as e:
+            logger.debug("Could not write tool discovery index: %s", e)
+
+
+_indexes: dict[Path, DiscoveryIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_discovery_index() -> DiscoveryIndex:
+    path = TOOL_DISCOVERY_CACHE_FILE.path
+    with _indexes_lock:
+        if (index := _indexes.get(path)) is None:
+            index = _indexes[path] = DiscoveryIndex(path)
+        return index
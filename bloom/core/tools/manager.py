@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Iterator, Mapping
 import hashlib
 import importlib.util
 import inspect
@@ -8,11 +8,21 @@ from logging import getLogger
 from pathlib import Path
 import re
 import sys
+import time
+from types import ModuleType
 from typing import TYPE_CHECKING, Any
 
+from bloom.core import tracing
 from bloom.core.paths.config_paths import resolve_local_tools_dir
 from bloom.core.paths.global_paths import DEFAULT_TOOL_DIR, GLOBAL_TOOLS_DIR
 from bloom.core.tools.base import BaseTool, BaseToolConfig
+from bloom.core.tools.discovery import (
+    DiscoveryIndex,
+    FileSignature,
+    ToolFileTiming,
+    file_signature,
+    get_discovery_index,
+)
 from bloom.core.tools.mcp import (
     RemoteTool,
     create_mcp_http_proxy_tool_class,
@@ -62,6 +72,18 @@ def _compute_module_name(path: Path) -> str:
     return f"bloom_tools_discovered_{stem}_{path_hash}"
 
 
+# Tool classes per discovered file, reused while the file is unchanged so that
+# every AgentLoop, reload and subagent doesn't rescan module namespaces.
+_loaded_tool_classes: dict[Path, tuple[FileSignature, tuple[type[BaseTool], ...]]] = {}
+
+
+def _override_fingerprint(overrides: BaseToolConfig | None) -> Any:
+    if overrides is None:
+        return None
+    values = {**overrides.__dict__, **(overrides.__pydantic_extra__ or {})}
+    return {k: tuple(v) if isinstance(v, list) else v for k, v in values.items()}
+
+
 class NoSuchToolError(Exception):
     """Exception raised when a tool is not found."""
 
@@ -73,16 +95,36 @@ class ToolManager:
     should have its own ToolManager instance.
     """
 
-    def __init__(self, config_getter: Callable[[], BloomConfig]) -> None:
+    def __init__(
+        self,
+        config_getter: Callable[[], BloomConfig],
+        *,
+        catalog: Mapping[str, type[BaseTool]] | None = None,
+    ) -> None:
         self._config_getter = config_getter
         self._instances: dict[str, BaseTool] = {}
+        # Resolved configs are only valid for the BloomConfig object they were
+        # built from; the agent manager swaps that object on profile switches
+        # and reloads.
+        self._resolved_configs: dict[str, tuple[Any, BaseToolConfig]] = {}
+        self._resolved_for: BloomConfig | None = None
         self._search_paths: list[Path] = self._compute_search_paths(self._config)
 
-        self._available: dict[str, type[BaseTool]] = {
+        if catalog is not None:
+            # Tool classes another manager already discovered; skips the
+            # filesystem scan and MCP handshakes.
+            self._available: dict[str, type[BaseTool]] = dict(catalog)
+            return
+        self._available = {
             cls.get_name(): cls for cls in self._iter_tool_classes(self._search_paths)
         }
         self._integrate_mcp()
 
+    @property
+    def catalog(self) -> Mapping[str, type[BaseTool]]:
+        """Every discovered tool class, before enabled/disabled filtering."""
+        return self._available
+
     @property
     def _config(self) -> BloomConfig:
         return self._config_getter()
@@ -113,39 +155,36 @@ class ToolManager:
 
         Note: if a search path is not a directory, it is treated as a single tool file.
         """
-        for base in search_paths:
-            if not base.is_dir() and base.name.endswith(".py"):
-                if tools := ToolManager._load_tools_from_file(base):
-                    for tool in tools:
-                        yield tool
+        index = get_discovery_index()
+        try:
+            for base in search_paths:
+                if not base.is_dir() and base.name.endswith(".py"):
+                    if tools := ToolManager._load_tools_from_file(base, index):
+                        yield from tools
 
-            for path in base.rglob("*.py"):
-                if tools := ToolManager._load_tools_from_file(path):
-                    for tool in tools:
-                        yield tool
+                for path in index.iter_py_files(base):
+                    if tools := ToolManager._load_tools_from_file(path, index):
+                        yield from tools
+        finally:
+            index.save()
 
     @staticmethod
-    def _load_tools_from_file(file_path: Path) -> list[type[BaseTool]] | None:
-        if not file_path.is_file():
+    def _load_tools_from_file(
+        file_path: Path, index: DiscoveryIndex | None = None
+    ) -> list[type[BaseTool]] | None:
+        if file_path.name.startswith("_"):
             return
-        name = file_path.name
-        if name.startswith("_"):
+        if (signature := file_signature(file_path)) is None:
             return
 
-        module_name = _compute_module_name(file_path)
+        cached = _loaded_tool_classes.get(file_path)
+        if cached is not None and cached[0] == signature:
+            return list(cached[1])
+        if index is not None and index.exported_tools(file_path, signature) == []:
+            return []
 
-        if module_name in sys.modules:
-            module = sys.modules[module_name]
-        else:
-            spec = importlib.util.spec_from_file_location(module_name, file_path)
-            if spec is None or spec.loader is None:
-                return
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            try:
-                spec.loader.exec_module(module)
-            except Exception:
-                return
+        if (module := ToolManager._import_tool_module(file_path)) is None:
+            return
 
         tools = []
         for tool_obj in vars(module).values():
@@ -156,8 +195,58 @@ class ToolManager:
             if inspect.isabstract(tool_obj):
                 continue
             tools.append(tool_obj)
+
+        _loaded_tool_classes[file_path] = (signature, tuple(tools))
+        if index is not None:
+            index.record(file_path, signature, [tool.__name__ for tool in tools])
         return tools
 
+    @staticmethod
+    def _import_tool_module(file_path: Path) -> ModuleType | None:
+        module_name = _compute_module_name(file_path)
+
+        if module_name in sys.modules:
+            return sys.modules[module_name]
+
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        if spec is None or spec.loader is None:
+            return None
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            return None
+        return module
+
+    @staticmethod
+    def discovery_timings(search_paths: list[Path]) -> list[ToolFileTiming]:
+        """Load every candidate tool file without the discovery index, timing each."""
+        index = get_discovery_index()
+        paths = [
+            path
+            for base in search_paths
+            for path in (
+                [base]
+                if not base.is_dir() and base.name.endswith(".py")
+                else index.iter_py_files(base)
+            )
+        ]
+        timings: list[ToolFileTiming] = []
+        for path in paths:
+            imported = _compute_module_name(path) not in sys.modules
+            start = time.perf_counter()
+            tools = ToolManager._load_tools_from_file(path) or []
+            timings.append(
+                ToolFileTiming(
+                    path=path,
+                    seconds=time.perf_counter() - start,
+                    tools=tuple(tool.get_name() for tool in tools),
+                    imported=imported,
+                )
+            )
+        return timings
+
     @staticmethod
     def discover_tool_defaults(
         search_paths: list[Path] | None = None,
@@ -298,6 +387,30 @@ class ToolManager:
         return added
 
     def get_tool_config(self, tool_name: str) -> BaseToolConfig:
+        """Return the tool's defaults merged with the user's overrides.
+
+        Memoized per tool until its overrides change, the config object is
+        replaced, or `invalidate_tool` / `reset_all` drop the entry.
+        """
+        config = self._config
+        if config is not self._resolved_for:
+            self._resolved_configs.clear()
+            self._resolved_for = config
+
+        # Approval callbacks edit `config.tools[name]` in place, so the entry
+        # is checked against a cheap snapshot of the override's fields.
+        fingerprint = _override_fingerprint(config.tools.get(tool_name))
+        cached = self._resolved_configs.get(tool_name)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        resolved = self._resolve_tool_config(tool_name, config)
+        self._resolved_configs[tool_name] = (fingerprint, resolved)
+        return resolved
+
+    def _resolve_tool_config(
+        self, tool_name: str, config: BloomConfig
+    ) -> BaseToolConfig:
         tool_class = self._available.get(tool_name)
 
         if tool_class:
@@ -307,7 +420,7 @@ class ToolManager:
             config_class = BaseToolConfig
             default_config = BaseToolConfig()
 
-        user_overrides = self._config.tools.get(tool_name)
+        user_overrides = config.tools.get(tool_name)
         if user_overrides is None:
             merged_dict = default_config.model_dump()
         else:
@@ -330,12 +443,15 @@ class ToolManager:
             )
 
         tool_class = self._available[tool_name]
-        tool_config = self.get_tool_config(tool_name)
-        self._instances[tool_name] = tool_class.from_config(tool_config)
+        with tracing.span("tool.load", tool=tool_name):
+            tool_config = self.get_tool_config(tool_name)
+            self._instances[tool_name] = tool_class.from_config(tool_config)
         return self._instances[tool_name]
 
     def reset_all(self) -> None:
         self._instances.clear()
+        self._resolved_configs.clear()
 
     def invalidate_tool(self, tool_name: str) -> None:
         self._instances.pop(tool_name, None)
+        self._resolved_configs.pop(tool_name, None)
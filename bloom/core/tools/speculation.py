@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import json
+from logging import getLogger
+import time
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+from bloom.core.llm.format import ParsedMessage, ParsedToolCall, ResolvedToolCall
+from bloom.core.types import ToolCall, ToolStreamEvent
+
+if TYPE_CHECKING:
+    from bloom.core.llm.format import APIToolFormatHandler
+    from bloom.core.tools.base import BaseTool, InvokeContext
+    from bloom.core.tools.manager import ToolManager
+
+logger = getLogger("bloom")
+
+
+@dataclass
+class _PendingToolCall:
+    call_id: str = ""
+    name: str = ""
+    arguments: list[str] = field(default_factory=list)
+
+
+class ToolCallDeltaParser:
+    """Incrementally assembles streamed tool-call deltas, keyed by their index.
+
+    `feed` returns the calls whose arguments just became a complete JSON object,
+    so callers can act on a tool call before the rest of the stream has arrived.
+    Calls are returned in index order: a call completed ahead of an earlier one
+    is held back until that one completes too.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[int, _PendingToolCall] = {}
+        self._next_index = 0
+
+    def feed(self, tool_calls: list[ToolCall] | None) -> list[ParsedToolCall]:
+        if not tool_calls:
+            return []
+
+        for tc in tool_calls:
+            if tc.index is None:
+                continue
+            pending = self._pending.setdefault(tc.index, _PendingToolCall())
+            if tc.id and not pending.call_id:
+                pending.call_id = tc.id
+            if tc.function.name and not pending.name:
+                pending.name = tc.function.name
+            if tc.function.arguments:
+                pending.arguments.append(tc.function.arguments)
+
+        completed: list[ParsedToolCall] = []
+        while (pending := self._pending.get(self._next_index)) is not None:
+            if (parsed := self._try_complete(pending)) is None:
+                break
+            completed.append(parsed)
+            self._next_index += 1
+        return completed
+
+    @staticmethod
+    def _try_complete(pending: _PendingToolCall) -> ParsedToolCall | None:
+        if not pending.call_id or not pending.name:
+            return None
+
+        raw = "".join(pending.arguments).strip()
+        if not raw.endswith("}"):
+            return None
+        try:
+            args = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(args, dict):
+            return None
+
+        return ParsedToolCall(
+            tool_name=pending.name, raw_args=args, call_id=pending.call_id
+        )
+
+
+@dataclass
+class SpeculativeOutcome:
+    tool_call: ResolvedToolCall
+    stream_events: list[ToolStreamEvent] = field(default_factory=list)
+    result: BaseModel | None = None
+    error: Exception | None = None
+    duration: float = 0.0
+
+
+class SpeculativeToolExecutor:
+    """Runs read-only tool calls while the model is still generating.
+
+    Results are only handed out through `claim` when the final assistant message
+    contains the exact same call; anything left unclaimed is cancelled and dropped.
+    Calls must be submitted in message order. Speculation stops at the first
+    call that may change state, since later reads could depend on it.
+    """
+
+    def __init__(
+        self,
+        *,
+        tool_manager: ToolManager,
+        format_handler: APIToolFormatHandler,
+        can_speculate: Callable[[BaseTool, BaseModel], bool],
+        context_factory: Callable[[str], InvokeContext],
+    ) -> None:
+        self._tool_manager = tool_manager
+        self._format_handler = format_handler
+        self._can_speculate = can_speculate
+        self._context_factory = context_factory
+        self._tasks: dict[str, asyncio.Task[SpeculativeOutcome]] = {}
+        self._halted = False
+
+    def submit(self, parsed: ParsedToolCall) -> bool:
+        if self._halted or parsed.call_id in self._tasks:
+            return False
+
+        resolved = self._format_handler.resolve_tool_calls(
+            ParsedMessage(tool_calls=[parsed]), self._tool_manager
+        )
+        if not resolved.tool_calls:
+            return self._halt()
+        tool_call = resolved.tool_calls[0]
+        try:
+            tool = self._tool_manager.get(tool_call.tool_name)
+        except Exception:
+            return self._halt()
+        if not tool.read_only:
+            return self._halt()
+        if not self._can_speculate(tool, tool_call.validated_args):
+            return False
+
+        self._tasks[tool_call.call_id] = asyncio.create_task(
+            self._run(tool, tool_call), name=f"speculative-{tool_call.tool_name}"
+        )
+        return True
+
+    def _halt(self) -> bool:
+        # Later calls may depend on this one; one that didn't resolve could be
+        # a write too.
+        self._halted = True
+        return False
+
+    async def _run(
+        self, tool: BaseTool, tool_call: ResolvedToolCall
+    ) -> SpeculativeOutcome:
+        outcome = SpeculativeOutcome(tool_call=tool_call)
+        start_time = time.perf_counter()
+        try:
+            async for item in tool.invoke(
+                ctx=self._context_factory(tool_call.call_id), **tool_call.args_dict
+            ):
+                if isinstance(item, ToolStreamEvent):
+                    outcome.stream_events.append(item)
+                else:
+                    outcome.result = item
+        except Exception as exc:
+            outcome.error = exc
+        outcome.duration = time.perf_counter() - start_time
+        return outcome
+
+    async def claim(self, tool_call: ResolvedToolCall) -> SpeculativeOutcome | None:
+        task = self._tasks.pop(tool_call.call_id, None)
+        if task is None:
+            return None
+
+        outcome = await task
+        if (
+            outcome.tool_call.tool_name != tool_call.tool_name
+            or outcome.tool_call.args_dict != tool_call.args_dict
+        ):
+            logger.debug(
+                "Discarding speculative result for %s: call changed", tool_call.call_id
+            )
+            return None
+        return outcome
+
+    async def discard(self) -> None:
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        results: list[Any] = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(
+                result, asyncio.CancelledError
+            ):
+                logger.debug("Speculative tool run failed: %s", result)
@@ -0,0 +1,232 @@
+"""Spans for the hot path of an agent turn.
+
+`AgentLoop.act` starts a `TurnTracer` and makes it current for the turn. Code
+on the hot path (the backend, tools, session logging) opens spans with
+`span()`, which costs a context-variable lookup when no turn is being traced.
+At the end of the turn the spans are folded into a `TurnTiming`, and can be
+appended to a file as OTLP/JSON.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+from bloom.core.types import TurnTiming
+
+SERVICE_NAME = "bloom"
+
+_tracer: ContextVar[TurnTracer | None] = ContextVar("bloom_tracer", default=None)
+# The innermost open span, with the tracer it belongs to: a subagent's turn
+# runs inside one of its parent's spans but is traced on its own.
+_parent: ContextVar[tuple[TurnTracer, str] | None] = ContextVar(
+    "bloom_span", default=None
+)
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class TurnTracer:
+    """Spans and stream counters for one user turn."""
+
+    def __init__(self) -> None:
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+        # perf_counter is monotonic but has no epoch; OTLP wants wall time.
+        self._epoch_ns = time.time_ns() - time.perf_counter_ns()
+        self._started_ns = time.perf_counter_ns()
+        self.root_id = os.urandom(8).hex()
+        self._network_wait_ns = 0
+        self._token_gaps = 0
+        self._token_gap_total_ns = 0
+        self._token_gap_max_ns = 0
+        self._last_token_ns: int | None = None
+
+    def record(self, name: str, start_ns: int, end_ns: int, **attributes: Any) -> None:
+        """Add a span timed by the caller, e.g. one that spans `yield`s."""
+        self.spans.append(
+            Span(
+                name,
+                os.urandom(8).hex(),
+                self._parent_id(),
+                start_ns,
+                end_ns,
+                attributes,
+            )
+        )
+
+    def _parent_id(self) -> str:
+        parent = _parent.get()
+        return parent[1] if parent is not None and parent[0] is self else self.root_id
+
+    def add_network_wait(self, nanoseconds: int) -> None:
+        self._network_wait_ns += nanoseconds
+
+    def token(self) -> None:
+        """Mark the arrival of a streamed delta."""
+        now = time.perf_counter_ns()
+        if self._last_token_ns is not None:
+            gap = now - self._last_token_ns
+            self._token_gaps += 1
+            self._token_gap_total_ns += gap
+            self._token_gap_max_ns = max(self._token_gap_max_ns, gap)
+        self._last_token_ns = now
+
+    def end_stream(self) -> None:
+        # The wait for the next request's first token isn't a gap between tokens.
+        self._last_token_ns = None
+
+    def timing(self) -> TurnTiming:
+        timing = TurnTiming(
+            total_seconds=(time.perf_counter_ns() - self._started_ns) / 1e9,
+            network_wait_seconds=self._network_wait_ns / 1e9,
+            max_token_gap_seconds=self._token_gap_max_ns / 1e9,
+            mean_token_gap_seconds=(
+                self._token_gap_total_ns / self._token_gaps / 1e9
+                if self._token_gaps
+                else 0.0
+            ),
+        )
+        for span in self.spans:
+            match span.name:
+                case "llm.request":
+                    timing.llm_requests += 1
+                    timing.streaming_seconds += span.attributes.get(
+                        "streaming_seconds", 0.0
+                    )
+                    if timing.llm_requests == 1:
+                        timing.time_to_first_token_seconds = span.attributes.get(
+                            "time_to_first_token_seconds", span.seconds
+                        )
+                case "llm.request.build":
+                    timing.request_build_seconds += span.seconds
+                case "llm.queue":
+                    timing.queue_wait_seconds += span.seconds
+                case "tool":
+                    name = span.attributes.get("tool", "unknown")
+                    timing.tool_seconds[name] = (
+                        timing.tool_seconds.get(name, 0.0) + span.seconds
+                    )
+                case "tool.approval":
+                    timing.approval_seconds += span.seconds
+                case "session.save":
+                    timing.session_io_seconds += span.seconds
+                case "middleware":
+                    timing.middleware_seconds += span.seconds
+        return timing
+
+    def to_otlp(self) -> dict[str, Any]:
+        """The turn as an OTLP/JSON `ExportTraceServiceRequest`."""
+        root = Span(
+            "agent.turn", self.root_id, None, self._started_ns, time.perf_counter_ns()
+        )
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_attribute("service.name", SERVICE_NAME)]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [
+                                self._otlp_span(span) for span in [root, *self.spans]
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def _otlp_span(self, span: Span) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self._epoch_ns + span.start_ns),
+            "endTimeUnixNano": str(self._epoch_ns + span.end_ns),
+            "attributes": [_attribute(k, v) for k, v in span.attributes.items()],
+        }
+        if span.parent_id is not None:
+            data["parentSpanId"] = span.parent_id
+        return data
+
+
+def _attribute(key: str, value: Any) -> dict[str, Any]:
+    match value:
+        case bool():
+            typed = {"boolValue": value}
+        case int():
+            typed = {"intValue": str(value)}
+        case float():
+            typed = {"doubleValue": value}
+        case _:
+            typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def current() -> TurnTracer | None:
+    return _tracer.get()
+
+
+def activate(tracer: TurnTracer | None) -> TurnTracer | None:
+    """Make `tracer` current and return the one it replaces.
+
+    Restore the previous one by activating it again: a subagent traces its
+    own turns in the middle of its parent's.
+    """
+    previous = _tracer.get()
+    _tracer.set(tracer)
+    return previous
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Generator[None]:
+    """Time the block as a child of the enclosing span.
+
+    Don't `yield` from an async generator inside the block; time those
+    regions with `TurnTracer.record` instead.
+    """
+    tracer = _tracer.get()
+    if tracer is None:
+        yield
+        return
+    span_id = os.urandom(8).hex()
+    parent_id = tracer._parent_id()
+    token = _parent.set((tracer, span_id))
+    start_ns = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end_ns = time.perf_counter_ns()
+        _parent.reset(token)
+        tracer.spans.append(
+            Span(name, span_id, parent_id, start_ns, end_ns, attributes)
+        )
+
+
+def export(tracer: TurnTracer, path: Path) -> None:
+    """Append the turn to `path` as one line of OTLP/JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(tracer.to_otlp(), separators=(",", ":")) + "\n")
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC
 from collections import OrderedDict
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Hashable
 import copy
 from enum import StrEnum, auto
 from typing import TYPE_CHECKING, Annotated, Any, Literal
@@ -24,10 +24,33 @@ from pydantic import (
 )
 
 
+class TurnTiming(BaseModel):
+    """Where the time of a user turn went; see `bloom.core.tracing`.
+
+    Tool times are summed per tool, so tools run side by side can add up to
+    more than the turn.
+    """
+
+    total_seconds: float = 0.0
+    llm_requests: int = 0
+    request_build_seconds: float = 0.0
+    time_to_first_token_seconds: float = 0.0  # Of the turn's first request
+    streaming_seconds: float = 0.0
+    network_wait_seconds: float = 0.0
+    queue_wait_seconds: float = 0.0  # Held back by the client-side rate limiter
+    mean_token_gap_seconds: float = 0.0
+    max_token_gap_seconds: float = 0.0
+    tool_seconds: dict[str, float] = Field(default_factory=dict)
+    approval_seconds: float = 0.0
+    session_io_seconds: float = 0.0
+    middleware_seconds: float = 0.0
+
+
 class AgentStats(BaseModel):
     steps: int = 0
     session_prompt_tokens: int = 0
     session_completion_tokens: int = 0
+    session_cached_tokens: int = 0
     tool_calls_agreed: int = 0
     tool_calls_rejected: int = 0
     tool_calls_failed: int = 0
@@ -37,11 +60,14 @@ class AgentStats(BaseModel):
 
     last_turn_prompt_tokens: int = 0
     last_turn_completion_tokens: int = 0
+    last_turn_cached_tokens: int = 0
     last_turn_duration: float = 0.0
     tokens_per_second: float = 0.0
+    last_turn_timing: TurnTiming | None = None
 
     input_price_per_million: float = 0.0
     output_price_per_million: float = 0.0
+    cached_input_price_per_million: float = 0.0
 
     _listeners: dict[str, Callable[[AgentStats], None]] = PrivateAttr(
         default_factory=dict
@@ -71,13 +97,30 @@ class AgentStats(BaseModel):
     def last_turn_total_tokens(self) -> int:
         return self.last_turn_prompt_tokens + self.last_turn_completion_tokens
 
+    @computed_field
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of session prompt tokens the provider served from its cache."""
+        if self.session_prompt_tokens <= 0:
+            return 0.0
+        return self.session_cached_tokens / self.session_prompt_tokens
+
+    @computed_field
+    @property
+    def cache_savings(self) -> float:
+        """Dollars saved by prompt caching, when the model has a cached-input price."""
+        if self.cached_input_price_per_million <= 0:
+            return 0.0
+        discount = self.input_price_per_million - self.cached_input_price_per_million
+        return (self.session_cached_tokens / 1_000_000) * max(0.0, discount)
+
     @computed_field
     @property
     def session_cost(self) -> float:
         """Calculate the total session cost in dollars based on token usage and pricing.
 
-        NOTE: This is a rough estimate and is worst-case scenario.
-        The actual cost may be lower due to prompt caching.
+        NOTE: This is a rough estimate. Cached prompt tokens are only discounted
+        when the model declares a cached-input price.
         If the model changes mid-session, this uses current pricing for all tokens.
         """
         input_cost = (
@@ -86,9 +129,11 @@ class AgentStats(BaseModel):
         output_cost = (
             self.session_completion_tokens / 1_000_000
         ) * self.output_price_per_million
-        return input_cost + output_cost
+        return input_cost + output_cost - self.cache_savings
 
-    def update_pricing(self, input_price: float, output_price: float) -> None:
+    def update_pricing(
+        self, input_price: float, output_price: float, cached_input_price: float = 0.0
+    ) -> None:
         """Update pricing info when model changes.
 
         NOTE: session_cost will be recalculated using new pricing for all
@@ -98,6 +143,7 @@ class AgentStats(BaseModel):
         """
         self.input_price_per_million = input_price
         self.output_price_per_million = output_price
+        self.cached_input_price_per_million = cached_input_price
 
     def reset_context_state(self) -> None:
         """Reset context-related fields while preserving cumulative session stats.
@@ -108,6 +154,7 @@ class AgentStats(BaseModel):
         self.context_tokens = 0
         self.last_turn_prompt_tokens = 0
         self.last_turn_completion_tokens = 0
+        self.last_turn_cached_tokens = 0
         self.last_turn_duration = 0.0
         self.tokens_per_second = 0.0
 
@@ -196,6 +243,8 @@ class LLMMessage(BaseModel):
     tool_call_id: str | None = None
     message_id: str | None = None
 
+    _token_count: tuple[Hashable, int] | None = PrivateAttr(default=None)
+
     @model_validator(mode="before")
     @classmethod
     def _from_any(cls, v: Any) -> dict[str, Any] | Any:
@@ -217,6 +266,15 @@ class LLMMessage(BaseModel):
             or (str(uuid4()) if role != "tool" else None),
         }
 
+    def cached_token_count(self, key: Hashable) -> int | None:
+        """Return the token count cached for `key`, if the message is unchanged."""
+        if self._token_count is None or self._token_count[0] != key:
+            return None
+        return self._token_count[1]
+
+    def cache_token_count(self, key: Hashable, count: int) -> None:
+        self._token_count = (key, count)
+
     def __add__(self, other: LLMMessage) -> LLMMessage:
         """Careful: this is not commutative!"""
         if self.role != other.role:
@@ -274,11 +332,13 @@ class LLMUsage(BaseModel):
     model_config = ConfigDict(frozen=True)
     prompt_tokens: int = 0
     completion_tokens: int = 0
+    cached_tokens: int = 0  # Part of prompt_tokens served from the provider cache
 
     def __add__(self, other: LLMUsage) -> LLMUsage:
         return LLMUsage(
             prompt_tokens=self.prompt_tokens + other.prompt_tokens,
             completion_tokens=self.completion_tokens + other.completion_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
         )
 
 
@@ -295,6 +355,105 @@ class LLMChunk(BaseModel):
         return LLMChunk(message=self.message + other.message, usage=new_usage)
 
 
+class _ToolCallParts:
+    __slots__ = ("arguments", "call_id", "call_type", "first_arguments", "name")
+
+    def __init__(self, tool_call: ToolCall) -> None:
+        self.call_id = tool_call.id
+        self.call_type = tool_call.type
+        self.name = tool_call.function.name
+        self.first_arguments = tool_call.function.arguments
+        self.arguments: list[str] = []
+
+    def to_tool_call(self, index: int) -> ToolCall:
+        arguments = self.first_arguments
+        if self.arguments:
+            arguments = (arguments or "") + "".join(self.arguments)
+        return ToolCall(
+            id=self.call_id,
+            index=index,
+            type=self.call_type,
+            function=FunctionCall(name=self.name, arguments=arguments),
+        )
+
+
+class StreamAccumulator:
+    """Collects the chunks of a streamed completion into one `LLMChunk`.
+
+    The result is the same as summing the chunks with `+`. Summing copies the
+    text so far and every tool call on each delta, which is quadratic in the
+    length of the answer. Here the deltas are kept as parts and joined once
+    in `build`.
+    """
+
+    def __init__(self, role: Role = Role.assistant) -> None:
+        self._role = role
+        self._name: str | None = None
+        self._tool_call_id: str | None = None
+        self._message_id = str(uuid4())
+        self._content: list[str] = []
+        self._reasoning: list[str] = []
+        self._tool_calls: dict[int, _ToolCallParts] = {}
+        self._usage: LLMUsage | None = None
+
+    @property
+    def message_id(self) -> str:
+        return self._message_id
+
+    @property
+    def usage(self) -> LLMUsage | None:
+        return self._usage
+
+    def add(self, chunk: LLMChunk) -> None:
+        message = chunk.message
+        if message.role != self._role:
+            raise ValueError("Can't accumulate messages with different roles")
+        if message.name != self._name:
+            raise ValueError("Can't accumulate messages with different names")
+        if message.tool_call_id != self._tool_call_id:
+            raise ValueError("Can't accumulate messages with different tool_call_ids")
+
+        if message.content:
+            self._content.append(message.content)
+        if message.reasoning_content:
+            self._reasoning.append(message.reasoning_content)
+        for tc in message.tool_calls or []:
+            self._add_tool_call(tc)
+        if chunk.usage is not None:
+            self._usage = (
+                chunk.usage if self._usage is None else self._usage + chunk.usage
+            )
+
+    def _add_tool_call(self, tc: ToolCall) -> None:
+        if tc.index is None:
+            raise ValueError("Tool call chunk missing index")
+        parts = self._tool_calls.get(tc.index)
+        if parts is None:
+            self._tool_calls[tc.index] = _ToolCallParts(tc)
+            return
+        new_name = tc.function.name
+        if parts.name and new_name and parts.name != new_name:
+            raise ValueError("Can't accumulate messages with different tool call names")
+        if new_name and not parts.name:
+            parts.name = new_name
+        parts.arguments.append(tc.function.arguments or "")
+
+    def build(self) -> LLMChunk:
+        tool_calls = [
+            parts.to_tool_call(index) for index, parts in self._tool_calls.items()
+        ]
+        message = LLMMessage(
+            role=self._role,
+            content="".join(self._content) or None,
+            reasoning_content="".join(self._reasoning) or None,
+            tool_calls=tool_calls or None,
+            name=self._name,
+            tool_call_id=self._tool_call_id,
+            message_id=self._message_id,
+        )
+        return LLMChunk(message=message, usage=self._usage)
+
+
 class BaseEvent(BaseModel, ABC):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -5,9 +5,10 @@ from collections.abc import AsyncGenerator, Awaitable, Callable, Coroutine
 import concurrent.futures
 from datetime import UTC, datetime
 from enum import Enum, auto
-from fnmatch import fnmatch
+from fnmatch import translate
 import functools
 import logging
+import os
 from pathlib import Path
 import re
 import sys
@@ -137,15 +138,22 @@ def is_dangerous_directory(path: Path | str = ".") -> tuple[bool, str]:
     return False, ""
 
 
-LOG_DIR.path.mkdir(parents=True, exist_ok=True)
+logger = logging.getLogger("bloom")
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s %(message)s",
-    handlers=[logging.FileHandler(LOG_FILE.path, "a", "utf-8")],
-)
 
-logger = logging.getLogger("bloom")
+@functools.cache
+def configure_logging() -> None:
+    """Send log records to the bloom log file.
+
+    Called once by the entrypoints rather than at import time, so importing
+    bloom as a library doesn't create directories or open files.
+    """
+    LOG_DIR.path.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+        handlers=[logging.FileHandler(LOG_FILE.path, "a", "utf-8")],
+    )
 
 
 def get_user_agent(backend: Backend) -> str:
@@ -274,11 +282,22 @@ def is_windows() -> bool:
 
 
 @functools.lru_cache(maxsize=256)
-def _compile_icase(expr: str) -> re.Pattern[str] | None:
-    try:
-        return re.compile(expr, re.IGNORECASE)
-    except re.error:
-        return None
+def _compile_name_patterns(
+    patterns: tuple[str, ...],
+) -> tuple[tuple[re.Pattern[str], ...], tuple[re.Pattern[str], ...]]:
+    globs: list[re.Pattern[str]] = []
+    regexes: list[re.Pattern[str]] = []
+    for raw in patterns:
+        if not (p := (raw or "").strip()):
+            continue
+        if p.startswith("re:"):
+            try:
+                regexes.append(re.compile(p.removeprefix("re:"), re.IGNORECASE))
+            except re.error:
+                continue
+        else:
+            globs.append(re.compile(translate(p.lower())))
+    return tuple(globs), tuple(regexes)
 
 
 def name_matches(name: str, patterns: list[str]) -> bool:
@@ -287,20 +306,26 @@ def name_matches(name: str, patterns: list[str]) -> bool:
     Supports two forms (case-insensitive):
     - Glob wildcards using fnmatch (e.g., 'serena_*')
     - Regex when prefixed with 're:' (e.g., 're:serena.*')
+
+    Each distinct pattern list is compiled once and reused.
     """
+    globs, regexes = _compile_name_patterns(tuple(patterns))
     n = name.lower()
-    for raw in patterns:
-        if not (p := (raw or "").strip()):
-            continue
+    return any(rx.match(n) for rx in globs) or any(rx.fullmatch(name) for rx in regexes)
 
-        if p.startswith("re:"):
-            rx = _compile_icase(p.removeprefix("re:"))
-            if rx is not None and rx.fullmatch(name) is not None:
-                return True
-        elif fnmatch(n, p.lower()):
-            return True
 
-    return False
+@functools.lru_cache(maxsize=256)
+def _compile_globs(patterns: tuple[str, ...]) -> re.Pattern[str] | None:
+    if not patterns:
+        return None
+    return re.compile("|".join(translate(os.path.normcase(p)) for p in patterns))
+
+
+def glob_matches(path: str, patterns: list[str]) -> bool:
+    """`fnmatch` against several patterns at once, compiled once per list."""
+    if (rx := _compile_globs(tuple(patterns))) is None:
+        return False
+    return rx.match(os.path.normcase(path)) is not None
 
 
 class AsyncExecutor:
@@ -0,0 +1,481 @@
+"""Replay an LLM transcript through `AgentLoop` with real tools and report timings.
+
+Usage:
+    uv run scripts/bench_agent.py [--transcript FILE] [--rounds 3] [--speed 1.0]
+        [--files 200] [--json OUT]
+    uv run scripts/bench_agent.py --save-transcript FILE
+
+Runs fully offline. The agent talks to a `GenericBackend` whose HTTP transport
+replays the transcript's streamed chunks with their recorded delays, so request
+building, SSE parsing, tool calls and session logging all run as they do
+against a provider. Tools work on a synthetic repo in a temp dir, and
+BLOOM_HOME points at another, so nothing from the user's setup is read.
+
+A transcript is JSON: `{"prompts": [...], "responses": [[{"delay": s, "data":
+{...}}, ...], ...]}`. Each prompt is one agent turn; each model request takes
+the next response, whose `data` items are OpenAI-style stream chunks sent
+`delay` seconds apart (scaled by --speed, 0 to skip the waits). The built-in
+transcript greps, reads, edits and tests a module of the synthetic repo;
+--save-transcript writes it out as a starting point for recorded ones.
+
+Reported per round: turn latency, tool time, request building and stream
+parsing time, session log I/O time, events per second and the process memory
+high-water mark. --json writes every round plus medians for trend tracking.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+import functools
+import json
+import os
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+if TYPE_CHECKING:
+    from bloom.core.agent_loop import AgentLoop
+
+TOOL_ARGUMENT_PIECE = 16
+ANSWER_WORDS = 300
+DELTA_SECONDS = 0.002
+MODULE_WITH_BUG = 3
+
+
+def _chunk(delta: dict[str, Any], delay: float = DELTA_SECONDS) -> dict[str, Any]:
+    return {
+        "delay": delay,
+        "data": {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion.chunk",
+            "model": "bench",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+        },
+    }
+
+
+def _usage(prompt_tokens: int, completion_tokens: int) -> dict[str, Any]:
+    return {
+        "delay": 0.0,
+        "data": {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion.chunk",
+            "model": "bench",
+            "choices": [],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+            },
+        },
+    }
+
+
+def _response(
+    text: str, *, reasoning: str = "", tool: tuple[str, dict[str, Any]] | None = None
+) -> list[dict[str, Any]]:
+    chunks = [_chunk({"role": "assistant", "content": ""}, delay=0.2)]
+    chunks += [_chunk({"reasoning_content": f"{w} "}) for w in reasoning.split()]
+    chunks += [_chunk({"content": f"{w} "}) for w in text.split()]
+    if tool is not None:
+        name, arguments = tool
+        encoded = json.dumps(arguments)
+        pieces = [
+            encoded[i : i + TOOL_ARGUMENT_PIECE]
+            for i in range(0, len(encoded), TOOL_ARGUMENT_PIECE)
+        ]
+        call_id = f"call_{name}_{len(encoded)}"
+        chunks.append(
+            _chunk({
+                "tool_calls": [
+                    {
+                        "index": 0,
+                        "id": call_id,
+                        "type": "function",
+                        "function": {"name": name, "arguments": ""},
+                    }
+                ]
+            })
+        )
+        chunks += [
+            _chunk({"tool_calls": [{"index": 0, "function": {"arguments": piece}}]})
+            for piece in pieces
+        ]
+    chunks.append(_usage(2_000, len(chunks)))
+    return chunks
+
+
+def builtin_transcript() -> dict[str, Any]:
+    module = f"pkg/module_{MODULE_WITH_BUG}.py"
+    answer = " ".join(f"word{i % 50}" for i in range(ANSWER_WORDS))
+    return {
+        "prompts": [
+            f"`window` in {module} drops the last item. Fix it and run the tests.",
+            "Summarize what the module does.",
+        ],
+        "responses": [
+            _response(
+                "Let me find where `window` is defined.",
+                reasoning="The user reports an off-by-one. " * 10,
+                tool=("grep", {"pattern": "def window", "path": "."}),
+            ),
+            _response(
+                "Found it, reading the module.", tool=("read_file", {"path": module})
+            ),
+            _response(
+                "The slice stops one item early; fixing it.",
+                tool=(
+                    "search_replace",
+                    {
+                        "file_path": module,
+                        "content": "<<<<<<< SEARCH\n"
+                        "    return items[start : end - 1]\n"
+                        "=======\n"
+                        "    return items[start:end]\n"
+                        ">>>>>>> REPLACE",
+                    },
+                ),
+            ),
+            _response(
+                "Running the tests.",
+                tool=("bash", {"command": "python -m unittest discover -q -s tests"}),
+            ),
+            _response(f"Fixed and the tests pass. {answer}"),
+            _response("Reading it again.", tool=("read_file", {"path": module})),
+            _response(f"The module slices and sums lists. {answer}"),
+        ],
+    }
+
+
+MODULE_SOURCE = '''"""Helpers for slicing and summing lists, part {index}."""
+
+
+def window(items: list[int], start: int, end: int) -> list[int]:
+    """Items from `start` up to, not including, `end`."""
+    return items[start : end{bug}]
+
+
+def total_{index}(items: list[int]) -> int:
+    return sum(window(items, 0, len(items)))
+'''
+
+TEST_SOURCE = """import unittest
+
+from pkg.module_{index} import total_{index}, window
+
+
+class WindowTest(unittest.TestCase):
+    def test_window_keeps_the_last_item(self) -> None:
+        self.assertEqual(window([1, 2, 3], 0, 3), [1, 2, 3])
+
+    def test_total(self) -> None:
+        self.assertEqual(total_{index}([1, 2, 3]), 6)
+"""
+
+
+def build_repo(root: Path, files: int) -> None:
+    (root / "pkg").mkdir(parents=True)
+    (root / "tests").mkdir()
+    (root / "pkg" / "__init__.py").write_text("")
+    (root / "tests" / "__init__.py").write_text("")
+    (root / "README.md").write_text("# Synthetic repo\n\nList helpers.\n")
+    for index in range(files):
+        bug = " - 1" if index == MODULE_WITH_BUG else ""
+        (root / "pkg" / f"module_{index}.py").write_text(
+            MODULE_SOURCE.format(index=index, bug=bug)
+        )
+    (root / "tests" / f"test_module_{MODULE_WITH_BUG}.py").write_text(
+        TEST_SOURCE.format(index=MODULE_WITH_BUG)
+    )
+
+
+class _ReplayStream(httpx.AsyncByteStream):
+    def __init__(self, lines: list[tuple[float, bytes]]) -> None:
+        self._lines = lines
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for delay, line in self._lines:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield line
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Answers each streamed completion request with the next response."""
+
+    def __init__(self, responses: list[list[dict[str, Any]]], speed: float) -> None:
+        # Encoded up front so the replay itself isn't timed as agent work.
+        self._responses = [
+            [
+                (
+                    chunk["delay"] * speed,
+                    f"data: {json.dumps(chunk['data'])}\n\n".encode(),
+                )
+                for chunk in response
+            ]
+            + [(0.0, b"data: [DONE]\n\n")]
+            for response in responses
+        ]
+        self.requests = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(await request.aread())
+        if not body.get("stream"):
+            raise RuntimeError("The replay backend only serves streamed completions")
+        if self.requests >= len(self._responses):
+            raise RuntimeError(
+                f"The transcript has no response left for request {self.requests + 1}"
+            )
+        lines = self._responses[self.requests]
+        self.requests += 1
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            stream=_ReplayStream(lines),
+        )
+
+
+class Timers:
+    """Wall time spent in wrapped functions, by label."""
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {}
+
+    def wrap(self, owner: Any, name: str, label: str) -> None:
+        original = getattr(owner, name)
+        if asyncio.iscoroutinefunction(original):
+
+            @functools.wraps(original)
+            async def timed_async(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    self._add(label, time.perf_counter() - start)
+
+            setattr(owner, name, timed_async)
+        else:
+
+            @functools.wraps(original)
+            def timed(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self._add(label, time.perf_counter() - start)
+
+            setattr(owner, name, timed)
+
+    def _add(self, label: str, seconds: float) -> None:
+        self.seconds[label] = self.seconds.get(label, 0.0) + seconds
+
+
+def max_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def build_agent(
+    home: Path, transcript: dict[str, Any], speed: float
+) -> tuple[AgentLoop, ReplayTransport]:
+    from bloom.core.agent_loop import AgentLoop
+    from bloom.core.agents.models import BuiltinAgentName
+    from bloom.core.config import (
+        BloomConfig,
+        ModelConfig,
+        ProviderConfig,
+        SessionLoggingConfig,
+    )
+    from bloom.core.llm.backend.generic import GenericBackend
+
+    provider = ProviderConfig(name="replay", api_base="http://replay.invalid")
+    config = BloomConfig(
+        active_model="bench",
+        providers=[provider],
+        models=[ModelConfig(name="bench", provider="replay", alias="bench")],
+        session_logging=SessionLoggingConfig(save_dir=str(home / "sessions")),
+        enable_update_checks=False,
+        enable_auto_update=False,
+    )
+    transport = ReplayTransport(transcript["responses"], speed)
+    backend = GenericBackend(
+        client=httpx.AsyncClient(transport=transport), provider=provider
+    )
+    agent_loop = AgentLoop(
+        config,
+        agent_name=BuiltinAgentName.AUTO_APPROVE,
+        backend=backend,
+        enable_streaming=True,
+    )
+    return agent_loop, transport
+
+
+async def play(agent_loop: AgentLoop, prompts: list[str]) -> dict[str, Any]:
+    from bloom.core.types import ToolResultEvent
+
+    turns, events, tool_seconds, tool_errors = [], 0, 0.0, 0
+    started_at = time.perf_counter()
+    for prompt in prompts:
+        turn_start = time.perf_counter()
+        async for event in agent_loop.act(prompt):
+            events += 1
+            if isinstance(event, ToolResultEvent):
+                tool_seconds += event.duration or 0.0
+                tool_errors += event.error is not None
+        turns.append(time.perf_counter() - turn_start)
+    wall = time.perf_counter() - started_at
+    return {
+        "wall_seconds": wall,
+        "turn_seconds": turns,
+        "events": events,
+        "events_per_second": events / wall,
+        "tool_seconds": tool_seconds,
+        "tool_errors": tool_errors,
+    }
+
+
+async def run_round(
+    home: Path, transcript: dict[str, Any], files: int, speed: float, timers: Timers
+) -> dict[str, Any]:
+    cwd = Path.cwd()
+    with tempfile.TemporaryDirectory(prefix="bloom-bench-repo-") as repo:
+        build_repo(Path(repo), files)
+        os.chdir(repo)
+        try:
+            agent_loop, transport = build_agent(home, transcript, speed)
+            timers.seconds.clear()
+            result = await play(agent_loop, transcript["prompts"])
+        finally:
+            os.chdir(cwd)
+
+    return {
+        **result,
+        "requests": transport.requests,
+        "request_build_seconds": timers.seconds.get("request_build", 0.0),
+        "stream_parse_seconds": timers.seconds.get("stream_parse", 0.0),
+        "session_io_seconds": timers.seconds.get("session_io", 0.0),
+        "max_rss_mb": max_rss_mb(),
+    }
+
+
+def install_timers() -> Timers:
+    from bloom.core.llm.backend.generic import OpenAIAdapter
+    from bloom.core.session.session_logger import SessionLogger
+
+    timers = Timers()
+    timers.wrap(OpenAIAdapter, "prepare_request", "request_build")
+    timers.wrap(OpenAIAdapter, "parse_response", "stream_parse")
+    timers.wrap(SessionLogger, "save_interaction", "session_io")
+    return timers
+
+
+def summarize(rounds: list[dict[str, Any]]) -> dict[str, Any]:
+    summary: dict[str, Any] = {}
+    for key, value in rounds[0].items():
+        if isinstance(value, int | float):
+            summary[key] = statistics.median(r[key] for r in rounds)
+    summary["turn_seconds"] = [
+        statistics.median(turns)
+        for turns in zip(*(r["turn_seconds"] for r in rounds), strict=True)
+    ]
+    return summary
+
+
+def report(label: str, result: dict[str, Any]) -> str:
+    turns = ", ".join(f"{t * 1000:.0f}" for t in result["turn_seconds"])
+    rss = result["max_rss_mb"]
+    return (
+        f"  {label:<7} wall {result['wall_seconds'] * 1000:7.0f} ms  "
+        f"turns [{turns}] ms  tools {result['tool_seconds'] * 1000:6.1f} ms  "
+        f"request {result['request_build_seconds'] * 1000:6.1f} ms  "
+        f"parse {result['stream_parse_seconds'] * 1000:6.1f} ms  "
+        f"session {result['session_io_seconds'] * 1000:6.1f} ms  "
+        f"{result['events_per_second']:7.0f} events/s"
+        + (f"  rss {rss:.0f} MB" if rss is not None else "")
+    )
+
+
+def run_rounds(
+    home: Path, transcript: dict[str, Any], args: argparse.Namespace
+) -> list[dict[str, Any]]:
+    # Before anything from bloom is imported, so no user config or trust list
+    # is read.
+    os.environ["BLOOM_HOME"] = str(home)
+    from bloom.core.paths.config_paths import unlock_config_paths
+
+    unlock_config_paths()
+    timers = install_timers()
+    rounds = []
+    for index in range(args.rounds):
+        result = asyncio.run(
+            run_round(home, transcript, args.files, args.speed, timers)
+        )
+        rounds.append(result)
+        print(report(f"#{index + 1}", result))
+        if result["requests"] != len(transcript["responses"]):
+            print(
+                f"  warning: the agent made {result['requests']} requests, "
+                f"the transcript has {len(transcript['responses'])} responses"
+            )
+        if result["tool_errors"]:
+            print(f"  warning: {result['tool_errors']} tool calls failed")
+    return rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transcript", type=Path)
+    parser.add_argument("--save-transcript", type=Path)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--json", type=Path)
+    args = parser.parse_args()
+
+    if args.save_transcript:
+        args.save_transcript.write_text(json.dumps(builtin_transcript(), indent=2))
+        return
+
+    transcript = (
+        json.loads(args.transcript.read_text(encoding="utf-8"))
+        if args.transcript
+        else builtin_transcript()
+    )
+    print(
+        f"{len(transcript['prompts'])} turns, {len(transcript['responses'])} "
+        f"responses, {args.files} files, speed {args.speed}"
+    )
+    with tempfile.TemporaryDirectory(prefix="bloom-bench-home-") as home:
+        rounds = run_rounds(Path(home), transcript, args)
+
+    summary = summarize(rounds)
+    print(report("median", summary))
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {
+                    "transcript": str(args.transcript or "builtin"),
+                    "files": args.files,
+                    "speed": args.speed,
+                    "python": sys.version.split()[0],
+                    "rounds": rounds,
+                    "summary": summary,
+                },
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Stream a long, code-heavy answer into the TUI and report Markdown CPU time.
+
+Usage:
+    uv run scripts/bench_markdown_render.py [--blocks 6] [--lines 120]
+
+The answer alternates prose with Python code blocks and is streamed in
+4-character deltas, then rendered again from history as a finished message.
+Each pass runs once with the cached, incremental highlighting in
+`ansi_markdown` and once with Textual's stock behaviour, which builds a new
+parser per append and lexes every code block again on every frame.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Generator
+from contextlib import contextmanager, nullcontext
+import time
+
+from textual.app import App, ComposeResult
+from textual.content import Content
+from textual.highlight import highlight
+from textual.widgets._markdown import MarkdownFence
+
+from bloom.cli.textual_ui import ansi_markdown
+from bloom.cli.textual_ui.ansi_markdown import AnsiHighlightTheme, AnsiMarkdownFence
+from bloom.cli.textual_ui.widgets.messages import AssistantMessage
+
+DELTA_CHARS = 4
+BURST = 8
+
+
+def code_heavy_answer(blocks: int, lines: int) -> str:
+    parts = []
+    for block in range(blocks):
+        code = "\n".join(
+            f"def step_{block}_{i}(value: int) -> int:\n"
+            f'    """Step {i}."""\n'
+            f"    return value * {i} + {block}  # scale"
+            for i in range(lines // 3)
+        )
+        parts.append(f"Part {block} of the change:\n\n```python\n{code}\n```\n")
+    return "\n".join(parts)
+
+
+@contextmanager
+def stock_markdown() -> Generator[None]:
+    fence_init = AnsiMarkdownFence.__init__
+    fence_highlight = AnsiMarkdownFence.__dict__["highlight"]
+    parser = ansi_markdown._shared_parser
+
+    def uncached(cls: type, code: str, language: str) -> Content:
+        return highlight(code, language=language or None, theme=AnsiHighlightTheme)
+
+    AnsiMarkdownFence.__init__ = MarkdownFence.__init__  # type: ignore[method-assign]
+    AnsiMarkdownFence.highlight = classmethod(uncached)  # type: ignore[method-assign]
+    ansi_markdown._shared_parser = lambda: ansi_markdown.MarkdownIt("gfm-like")  # type: ignore[assignment]
+    try:
+        yield
+    finally:
+        AnsiMarkdownFence.__init__ = fence_init  # type: ignore[method-assign]
+        AnsiMarkdownFence.highlight = fence_highlight  # type: ignore[method-assign]
+        ansi_markdown._shared_parser = parser
+
+
+class StreamApp(App):
+    def compose(self) -> ComposeResult:
+        yield AssistantMessage("")
+
+
+class HistoryApp(App):
+    def __init__(self, text: str) -> None:
+        super().__init__()
+        self._text = text
+
+    def compose(self) -> ComposeResult:
+        yield AssistantMessage(self._text)
+
+
+async def stream(deltas: list[str]) -> float:
+    app = StreamApp()
+    async with app.run_test() as pilot:
+        message = app.query_one(AssistantMessage)
+        start = time.process_time()
+        for index, delta in enumerate(deltas):
+            await message.append_content(delta)
+            if (index + 1) % BURST == 0:
+                await asyncio.sleep(BURST / 1000)
+        await message.stop_stream()
+        await pilot.pause()
+        return time.process_time() - start
+
+
+async def rebuild(text: str, times: int = 3) -> float:
+    start = time.process_time()
+    for _ in range(times):
+        app = HistoryApp(text)
+        async with app.run_test() as pilot:
+            await pilot.pause()
+    return time.process_time() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=6)
+    parser.add_argument("--lines", type=int, default=120)
+    args = parser.parse_args()
+
+    text = code_heavy_answer(args.blocks, args.lines)
+    deltas = [text[i : i + DELTA_CHARS] for i in range(0, len(text), DELTA_CHARS)]
+    print(f"{len(text)} chars, {args.blocks} code blocks, {len(deltas)} deltas")
+
+    for label, context in (("cached", nullcontext), ("stock", stock_markdown)):
+        ansi_markdown._highlight.cache_clear()
+        with context():
+            streamed = asyncio.run(stream(deltas))
+            rebuilt = asyncio.run(rebuild(text))
+        print(
+            f"  {label:<7} stream cpu {streamed:6.2f} s  rebuild x3 cpu {rebuilt:6.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
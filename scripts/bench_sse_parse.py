@@ -0,0 +1,133 @@
+"""Decode a streamed completion the way `AgentLoop` does and report chunks/s.
+
+Usage:
+    uv run scripts/bench_sse_parse.py [--chunks 20000] [--rounds 5]
+
+The stream is OpenAI-style SSE: reasoning deltas, then answer text, then a
+tool call, then a usage-only chunk. Every `data:` line goes through
+`OpenAIAdapter.parse_response`, `process_api_response_message` and a
+`StreamAccumulator`, as in `AgentLoop._chat_streaming`. The `validated` pass
+repeats that with a full `LLMMessage.model_validate` per delta, which is what
+both steps did before text-only deltas got a fast path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any
+
+from bloom.core.config import ProviderConfig
+from bloom.core.llm.backend.generic import OpenAIAdapter
+from bloom.core.llm.format import APIToolFormatHandler
+from bloom.core.types import LLMChunk, LLMMessage, LLMUsage, StreamAccumulator
+
+REASONING_SHARE = 4
+TOOL_CALL_SHARE = 8
+
+
+def _line(delta: dict[str, Any], usage: dict[str, int] | None = None) -> str:
+    data: dict[str, Any] = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 1,
+        "model": "bench",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+    }
+    if usage is not None:
+        data["choices"] = []
+        data["usage"] = usage
+    return f"data: {json.dumps(data)}"
+
+
+def sse_lines(chunks: int) -> list[str]:
+    reasoning = chunks // REASONING_SHARE
+    tool_call = chunks // TOOL_CALL_SHARE
+    lines = [_line({"role": "assistant", "content": ""})]
+    lines += [_line({"reasoning_content": "hmm "}) for _ in range(reasoning)]
+    lines += [
+        _line({"content": "word "}) for _ in range(chunks - reasoning - tool_call)
+    ]
+    lines.append(
+        _line({
+            "tool_calls": [
+                {
+                    "index": 0,
+                    "id": "call_1",
+                    "type": "function",
+                    "function": {"name": "write_file", "arguments": ""},
+                }
+            ]
+        })
+    )
+    lines += [
+        _line({"tool_calls": [{"index": 0, "function": {"arguments": f'"{i}\\n'}}]})
+        for i in range(tool_call - 1)
+    ]
+    lines.append(_line({}, usage={"prompt_tokens": 1000, "completion_tokens": chunks}))
+    return lines
+
+
+def decode(lines: list[str], provider: ProviderConfig) -> LLMChunk:
+    adapter = OpenAIAdapter()
+    handler = APIToolFormatHandler()
+    accumulator = StreamAccumulator()
+    for line in lines:
+        chunk = adapter.parse_response(json.loads(line[6:]), provider)
+        message = handler.process_api_response_message(chunk.message)
+        message.message_id = accumulator.message_id
+        accumulator.add(LLMChunk(message=message, usage=chunk.usage))
+    return accumulator.build()
+
+
+def decode_validated(lines: list[str], provider: ProviderConfig) -> LLMChunk:
+    accumulator = StreamAccumulator()
+    for line in lines:
+        data = json.loads(line[6:])
+        delta = data["choices"][0]["delta"] if data["choices"] else {}
+        message = LLMMessage.model_validate(delta)
+        clean = LLMMessage.model_validate({
+            "role": message.role,
+            "content": message.content,
+            "reasoning_content": message.reasoning_content,
+            "tool_calls": [tc.model_dump() for tc in message.tool_calls]
+            if message.tool_calls
+            else None,
+        })
+        usage = LLMUsage(**{
+            key: value
+            for key, value in (data.get("usage") or {}).items()
+            if key in LLMUsage.model_fields
+        })
+        accumulator.add(LLMChunk(message=clean, usage=usage))
+    return accumulator.build()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    lines = sse_lines(args.chunks)
+    provider = ProviderConfig(name="bench", api_base="http://bench")
+    print(f"{len(lines)} SSE lines, best of {args.rounds}")
+    results = {}
+    for label, run in (("validated", decode_validated), ("current", decode)):
+        best = float("inf")
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            results[label] = run(lines, provider)
+            best = min(best, time.perf_counter() - start)
+        print(f"  {label:<10} {best:7.3f} s  {len(lines) / best:10,.0f} chunks/s")
+
+    validated, current = results.values()
+    assert validated.message.content == current.message.content
+    assert validated.message.reasoning_content == current.message.reasoning_content
+    assert validated.message.tool_calls == current.message.tool_calls
+    assert validated.usage == current.usage
+
+
+if __name__ == "__main__":
+    main()
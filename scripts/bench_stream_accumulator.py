@@ -0,0 +1,90 @@
+"""Replay a long streamed completion through both chunk accumulators.
+
+Usage:
+    uv run scripts/bench_stream_accumulator.py [--chunks 20000]
+
+The stream is mostly answer text, followed by a tool call whose arguments
+arrive in small pieces, like a model writing a file. It is accumulated once by
+summing `LLMChunk`s with `+` and once with `StreamAccumulator`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from bloom.core.types import (
+    FunctionCall,
+    LLMChunk,
+    LLMMessage,
+    LLMUsage,
+    Role,
+    StreamAccumulator,
+    ToolCall,
+)
+
+DELTA = "word "
+TOOL_CALL_SHARE = 4
+
+
+def replay_stream(chunks: int) -> list[LLMChunk]:
+    text_chunks = chunks - chunks // TOOL_CALL_SHARE
+    stream = [
+        LLMChunk(message=LLMMessage(role=Role.assistant, content=DELTA))
+        for _ in range(text_chunks)
+    ]
+    for i in range(chunks - text_chunks):
+        call = ToolCall(
+            id="call_1" if i == 0 else None,
+            index=0,
+            function=FunctionCall(
+                name="write_file" if i == 0 else None, arguments=f'"line {i}\\n'
+            ),
+        )
+        stream.append(
+            LLMChunk(message=LLMMessage(role=Role.assistant, tool_calls=[call]))
+        )
+    stream.append(
+        LLMChunk(
+            message=LLMMessage(role=Role.assistant),
+            usage=LLMUsage(prompt_tokens=1000, completion_tokens=chunks),
+        )
+    )
+    return stream
+
+
+def sum_chunks(stream: list[LLMChunk]) -> LLMChunk:
+    total = LLMChunk(message=LLMMessage(role=Role.assistant))
+    for chunk in stream:
+        total += chunk
+    return total
+
+
+def accumulate(stream: list[LLMChunk]) -> LLMChunk:
+    accumulator = StreamAccumulator()
+    for chunk in stream:
+        accumulator.add(chunk)
+    return accumulator.build()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=20_000)
+    args = parser.parse_args()
+
+    stream = replay_stream(args.chunks)
+    print(f"{len(stream)} chunks")
+    results = {}
+    for label, run in (("LLMChunk +", sum_chunks), ("accumulator", accumulate)):
+        start = time.perf_counter()
+        results[label] = run(stream)
+        print(f"  {label:<12} {time.perf_counter() - start:8.3f} s")
+
+    added, accumulated = results.values()
+    assert added.message.content == accumulated.message.content
+    assert added.message.tool_calls == accumulated.message.tool_calls
+    assert added.usage == accumulated.usage
+
+
+if __name__ == "__main__":
+    main()
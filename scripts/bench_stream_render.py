@@ -0,0 +1,68 @@
+"""Replay a fast assistant stream into the TUI and report renderer CPU time.
+
+Usage:
+    uv run scripts/bench_stream_render.py [--tokens-per-second 400] [--file README.md]
+
+The file is split into 4-character deltas (roughly one token each) and fed to
+an `AssistantMessage` at the given rate, once with frame coalescing and once
+writing every delta straight to the Markdown stream.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import time
+
+from textual.app import App, ComposeResult
+
+from bloom.cli.textual_ui.widgets import messages
+from bloom.cli.textual_ui.widgets.messages import AssistantMessage
+
+DELTA_CHARS = 4
+# asyncio can't time single sub-millisecond sleeps, so deltas arrive in bursts.
+BURST = 8
+
+
+class StreamApp(App):
+    def compose(self) -> ComposeResult:
+        yield AssistantMessage("")
+
+
+async def replay(deltas: list[str], tokens_per_second: float) -> tuple[float, float]:
+    app = StreamApp()
+    interval = 1 / tokens_per_second
+    async with app.run_test() as pilot:
+        message = app.query_one(AssistantMessage)
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        for index, delta in enumerate(deltas):
+            await message.append_content(delta)
+            if (index + 1) % BURST == 0:
+                await asyncio.sleep(interval * BURST)
+        await message.stop_stream()
+        await pilot.pause()
+        return time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--file", type=Path, default=Path("README.md"))
+    args = parser.parse_args()
+
+    text = args.file.read_text(encoding="utf-8")
+    deltas = [text[i : i + DELTA_CHARS] for i in range(0, len(text), DELTA_CHARS)]
+    print(f"{len(deltas)} deltas at {args.tokens_per_second:.0f} tokens/s")
+
+    for label, frame_seconds in (
+        ("coalesced", messages.STREAM_FRAME_SECONDS),
+        ("per-delta", 0.0),
+    ):
+        messages.STREAM_FRAME_SECONDS = frame_seconds
+        cpu, wall = asyncio.run(replay(deltas, args.tokens_per_second))
+        print(f"  {label:<10} cpu {cpu:6.2f} s  wall {wall:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
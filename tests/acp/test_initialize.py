@@ -6,6 +6,10 @@ from acp.schema import (
     ClientCapabilities,
     Implementation,
     PromptCapabilities,
+    SessionCapabilities,
+    SessionForkCapabilities,
+    SessionListCapabilities,
+    SessionResumeCapabilities,
 )
 import pytest
 
@@ -19,10 +23,15 @@ class TestACPInitialize:
 
         assert response.protocol_version == PROTOCOL_VERSION
         assert response.agent_capabilities == AgentCapabilities(
-            load_session=False,
+            load_session=True,
             prompt_capabilities=PromptCapabilities(
                 audio=False, embedded_context=True, image=False
             ),
+            session_capabilities=SessionCapabilities(
+                fork=SessionForkCapabilities(),
+                list=SessionListCapabilities(),
+                resume=SessionResumeCapabilities(),
+            ),
         )
         assert response.agent_info == Implementation(
             name="@ilm-alan/bloom-cli", title="Bloom", version="0.1.2"
@@ -42,10 +51,15 @@ class TestACPInitialize:
 
         assert response.protocol_version == PROTOCOL_VERSION
         assert response.agent_capabilities == AgentCapabilities(
-            load_session=False,
+            load_session=True,
             prompt_capabilities=PromptCapabilities(
                 audio=False, embedded_context=True, image=False
             ),
+            session_capabilities=SessionCapabilities(
+                fork=SessionForkCapabilities(),
+                list=SessionListCapabilities(),
+                resume=SessionResumeCapabilities(),
+            ),
         )
         assert response.agent_info == Implementation(
             name="@ilm-alan/bloom-cli", title="Bloom", version="0.1.2"
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+import os
+from pathlib import Path
+import threading
+
+from acp import PROTOCOL_VERSION, RequestError
+from acp.schema import TextContentBlock
+import pytest
+
+from bloom.acp.acp_agent_loop import (
+    SESSION_STATS_METHOD,
+    AcpSessionLoop,
+    BloomAcpAgentLoop,
+)
+from bloom.core.types import LLMChunk, Role
+from tests.mock.utils import mock_llm_chunk
+from tests.stubs.fake_backend import FakeBackend
+
+
+class GatedBackend(FakeBackend):
+    """Streams each answer only once `release` is set."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.release = asyncio.Event()
+        self.started = asyncio.Event()
+
+    async def complete_streaming(self, **kwargs) -> AsyncGenerator[LLMChunk]:
+        self.started.set()
+        await self.release.wait()
+        async for chunk in super().complete_streaming(**kwargs):
+            yield chunk
+
+
+@pytest.fixture
+def backend() -> GatedBackend:
+    return GatedBackend([
+        [mock_llm_chunk(content="First answer")],
+        [mock_llm_chunk(content="Second answer")],
+    ])
+
+
+async def _new_session(acp_agent_loop: BloomAcpAgentLoop) -> AcpSessionLoop:
+    await acp_agent_loop.initialize(protocol_version=PROTOCOL_VERSION)
+    response = await acp_agent_loop.new_session(cwd=str(Path.cwd()), mcp_servers=[])
+    return acp_agent_loop.sessions[response.session_id]
+
+
+def _prompt(acp_agent_loop: BloomAcpAgentLoop, session_id: str, text: str):
+    return asyncio.create_task(
+        acp_agent_loop.prompt(
+            session_id=session_id, prompt=[TextContentBlock(type="text", text=text)]
+        )
+    )
+
+
+async def _wait_for_queue(session: AcpSessionLoop, depth: int) -> None:
+    while len(session.queue) != depth:
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_prompts_to_one_session_run_in_order(
+    acp_agent_loop: BloomAcpAgentLoop, backend: GatedBackend
+) -> None:
+    session = await _new_session(acp_agent_loop)
+
+    first = _prompt(acp_agent_loop, session.id, "First prompt")
+    await backend.started.wait()
+    second = _prompt(acp_agent_loop, session.id, "Second prompt")
+    await _wait_for_queue(session, 1)
+
+    stats = await acp_agent_loop.ext_method(
+        SESSION_STATS_METHOD, {"sessionId": session.id}
+    )
+    assert stats["running"] is True
+    assert stats["queueDepth"] == 1
+
+    backend.release.set()
+    responses = await asyncio.gather(first, second)
+
+    assert [r.stop_reason for r in responses] == ["end_turn", "end_turn"]
+    assert [
+        (msg.role, msg.content)
+        for msg in session.agent_loop.messages
+        if msg.role != Role.system
+    ] == [
+        (Role.user, "First prompt"),
+        (Role.assistant, "First answer"),
+        (Role.user, "Second prompt"),
+        (Role.assistant, "Second answer"),
+    ]
+    stats = session.stats_snapshot()
+    assert (stats["running"], stats["queueDepth"], stats["completedPrompts"]) == (
+        False,
+        0,
+        2,
+    )
+    assert session.stats.max_wait_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_also_cancels_queued_prompts(
+    acp_agent_loop: BloomAcpAgentLoop, backend: GatedBackend
+) -> None:
+    session = await _new_session(acp_agent_loop)
+
+    first = _prompt(acp_agent_loop, session.id, "First prompt")
+    await backend.started.wait()
+    second = _prompt(acp_agent_loop, session.id, "Second prompt")
+    await _wait_for_queue(session, 1)
+
+    await acp_agent_loop.cancel(session_id=session.id)
+    responses = await asyncio.gather(first, second)
+
+    assert [r.stop_reason for r in responses] == ["cancelled", "cancelled"]
+    assert session.task is None
+    assert session.queue == []
+    assert not session.prompt_lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_set_up_off_the_event_loop(
+    acp_agent_loop: BloomAcpAgentLoop, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    setup_threads: list[int] = []
+    chdir_threads: list[int] = []
+    create_agent_loop = acp_agent_loop._create_agent_loop
+    chdir = os.chdir
+
+    def record_thread():
+        setup_threads.append(threading.get_ident())
+        return create_agent_loop()
+
+    def record_chdir(path: str) -> None:
+        chdir_threads.append(threading.get_ident())
+        chdir(path)
+
+    acp_agent_loop._create_agent_loop = record_thread  # type: ignore[method-assign]
+    monkeypatch.setattr("bloom.acp.acp_agent_loop.os.chdir", record_chdir)
+    await _new_session(acp_agent_loop)
+
+    assert setup_threads
+    assert threading.get_ident() not in setup_threads
+    # The cwd is the whole process's, so it only changes on the loop thread.
+    assert chdir_threads == [threading.get_ident()]
+
+
+@pytest.mark.asyncio
+async def test_unknown_extension_methods_are_rejected(
+    acp_agent_loop: BloomAcpAgentLoop,
+) -> None:
+    with pytest.raises(RequestError):
+        await acp_agent_loop.ext_method("bloom/unknown", {})
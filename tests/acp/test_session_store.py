@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from acp import PROTOCOL_VERSION, RequestError
+from acp.schema import AgentMessageChunk, TextContentBlock, UserMessageChunk
+import pytest
+
+from bloom.acp.acp_agent_loop import BloomAcpAgentLoop
+from bloom.core.types import Role
+from tests.acp.conftest import _create_acp_agent
+from tests.mock.utils import mock_llm_chunk
+from tests.stubs.fake_backend import FakeBackend
+from tests.stubs.fake_client import FakeClient
+
+
+@pytest.fixture
+def backend() -> FakeBackend:
+    return FakeBackend([
+        [mock_llm_chunk(content="First answer")],
+        [mock_llm_chunk(content="Second answer")],
+    ])
+
+
+async def _saved_session(acp_agent_loop: BloomAcpAgentLoop) -> str:
+    await acp_agent_loop.initialize(protocol_version=PROTOCOL_VERSION)
+    response = await acp_agent_loop.new_session(cwd=str(Path.cwd()), mcp_servers=[])
+    await acp_agent_loop.prompt(
+        session_id=response.session_id,
+        prompt=[TextContentBlock(type="text", text="First prompt")],
+    )
+    return response.session_id
+
+
+def _history(acp_agent_loop: BloomAcpAgentLoop, session_id: str):
+    return [
+        (msg.role, msg.content)
+        for msg in acp_agent_loop.sessions[session_id].agent_loop.messages
+        if msg.role != Role.system
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_returns_saved_sessions(
+    acp_agent_loop: BloomAcpAgentLoop,
+) -> None:
+    session_id = await _saved_session(acp_agent_loop)
+
+    response = await _create_acp_agent().list_sessions(cwd=str(Path.cwd()))
+
+    assert [s.session_id for s in response.sessions] == [session_id]
+    assert response.sessions[0].cwd == str(Path.cwd())
+    assert response.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_rejects_invalid_cursor(
+    acp_agent_loop: BloomAcpAgentLoop,
+) -> None:
+    with pytest.raises(RequestError):
+        await acp_agent_loop.list_sessions(cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_load_session_replays_history_and_continues_it(
+    acp_agent_loop: BloomAcpAgentLoop,
+) -> None:
+    session_id = await _saved_session(acp_agent_loop)
+    agent = _create_acp_agent()
+    client = agent.client
+    assert isinstance(client, FakeClient)
+
+    await agent.load_session(cwd=str(Path.cwd()), session_id=session_id)
+
+    assert [
+        (type(n.update), n.update.content.text) for n in client._session_updates
+    ] == [(UserMessageChunk, "First prompt"), (AgentMessageChunk, "First answer")]
+
+    await agent.prompt(
+        session_id=session_id,
+        prompt=[TextContentBlock(type="text", text="Second prompt")],
+    )
+    assert _history(agent, session_id) == [
+        (Role.user, "First prompt"),
+        (Role.assistant, "First answer"),
+        (Role.user, "Second prompt"),
+        (Role.assistant, "Second answer"),
+    ]
+    sessions = (await agent.list_sessions()).sessions
+    assert [s.session_id for s in sessions] == [session_id]
+
+
+@pytest.mark.asyncio
+async def test_resume_session_loads_history_without_replaying_it(
+    acp_agent_loop: BloomAcpAgentLoop,
+) -> None:
+    session_id = await _saved_session(acp_agent_loop)
+    agent = _create_acp_agent()
+
+    await agent.resume_session(cwd=str(Path.cwd()), session_id=session_id)
+    session = agent.sessions[session_id]
+    assert session.history is not None
+    await session.history
+
+    client = agent.client
+    assert isinstance(client, FakeClient)
+    assert client._session_updates == []
+    assert _history(agent, session_id) == [
+        (Role.user, "First prompt"),
+        (Role.assistant, "First answer"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_compacted_session_is_loaded_by_its_original_id(
+    acp_agent_loop: BloomAcpAgentLoop,
+) -> None:
+    session_id = await _saved_session(acp_agent_loop)
+    agent_loop = acp_agent_loop.sessions[session_id].agent_loop
+    first_log = agent_loop.session_logger.session_dir
+
+    await agent_loop.compact()
+
+    assert agent_loop.session_id == session_id
+    assert agent_loop.session_logger.session_dir != first_log
+    compacted = _history(acp_agent_loop, session_id)
+    agent = _create_acp_agent()
+    await agent.resume_session(cwd=str(Path.cwd()), session_id=session_id)
+    session = agent.sessions[session_id]
+    assert session.history is not None
+    await session.history
+
+    assert _history(agent, session_id) == compacted
+    sessions = (await agent.list_sessions()).sessions
+    assert [s.session_id for s in sessions] == [session_id]
+
+
+@pytest.mark.asyncio
+async def test_unknown_sessions_cannot_be_loaded(
+    acp_agent_loop: BloomAcpAgentLoop,
+) -> None:
+    with pytest.raises(RequestError):
+        await acp_agent_loop.load_session(cwd=str(Path.cwd()), session_id="unknown")
+
+
+@pytest.mark.asyncio
+async def test_fork_of_live_session_shares_history_until_it_diverges(
+    acp_agent_loop: BloomAcpAgentLoop,
+) -> None:
+    session_id = await _saved_session(acp_agent_loop)
+
+    response = await acp_agent_loop.fork_session(
+        cwd=str(Path.cwd()), session_id=session_id
+    )
+
+    source = acp_agent_loop.sessions[session_id].agent_loop.messages
+    fork = acp_agent_loop.sessions[response.session_id].agent_loop.messages
+    assert response.session_id != session_id
+    assert _history(acp_agent_loop, response.session_id) == _history(
+        acp_agent_loop, session_id
+    )
+    assert fork[1] is not source[1]
+    assert fork[1].content is source[1].content
+
+    await acp_agent_loop.prompt(
+        session_id=response.session_id,
+        prompt=[TextContentBlock(type="text", text="Second prompt")],
+    )
+    assert len(_history(acp_agent_loop, response.session_id)) == 4
+    assert len(_history(acp_agent_loop, session_id)) == 2
+
+
+@pytest.mark.asyncio
+async def test_fork_of_saved_session_loads_its_history(
+    acp_agent_loop: BloomAcpAgentLoop,
+) -> None:
+    session_id = await _saved_session(acp_agent_loop)
+    agent = _create_acp_agent()
+
+    response = await agent.fork_session(cwd=str(Path.cwd()), session_id=session_id)
+    session = agent.sessions[response.session_id]
+    assert session.history is not None
+    await session.history
+
+    assert response.session_id != session_id
+    assert _history(agent, response.session_id) == [
+        (Role.user, "First prompt"),
+        (Role.assistant, "First answer"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_session_with_corrupt_history_is_dropped_after_the_load_fails(
+    acp_agent_loop: BloomAcpAgentLoop,
+) -> None:
+    session_id = await _saved_session(acp_agent_loop)
+    session_dir = acp_agent_loop.sessions[
+        session_id
+    ].agent_loop.session_logger.session_dir
+    assert session_dir is not None
+    messages_file = session_dir / "messages.jsonl"
+    messages_file.write_text("{not json\n" + messages_file.read_text())
+    agent = _create_acp_agent()
+
+    await agent.resume_session(cwd=str(Path.cwd()), session_id=session_id)
+    with pytest.raises(RequestError, match="Internal error"):
+        await agent.prompt(
+            session_id=session_id,
+            prompt=[TextContentBlock(type="text", text="Second prompt")],
+        )
+
+    assert session_id not in agent.sessions
+    with pytest.raises(RequestError, match="Invalid params"):
+        await agent.prompt(
+            session_id=session_id,
+            prompt=[TextContentBlock(type="text", text="Third prompt")],
+        )
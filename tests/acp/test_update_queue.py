@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from acp import PROTOCOL_VERSION
+from acp.helpers import SessionUpdate
+from acp.schema import (
+    AgentMessageChunk,
+    AgentThoughtChunk,
+    TextContentBlock,
+    ToolCallStart,
+)
+import pytest
+
+from bloom.acp.acp_agent_loop import SESSION_STATS_METHOD, BloomAcpAgentLoop
+from bloom.acp.update_queue import SessionUpdateQueue, UpdateQueueStats
+from tests.mock.utils import mock_llm_chunk
+from tests.stubs.fake_backend import FakeBackend
+from tests.stubs.fake_client import FakeClient
+
+
+class SlowClient:
+    """Records updates, each send waiting for `release` once it is cleared."""
+
+    def __init__(self) -> None:
+        self.sent: list[SessionUpdate] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def send(self, update: SessionUpdate) -> None:
+        await self.release.wait()
+        self.sent.append(update)
+
+
+def _message(text: str, message_id: str = "m1") -> AgentMessageChunk:
+    return AgentMessageChunk(
+        session_update="agent_message_chunk",
+        content=TextContentBlock(type="text", text=text),
+        field_meta={"messageId": message_id},
+    )
+
+
+def _thought(text: str) -> AgentThoughtChunk:
+    return AgentThoughtChunk(
+        session_update="agent_thought_chunk",
+        content=TextContentBlock(type="text", text=text),
+        field_meta={"messageId": "m1"},
+    )
+
+
+def _tool_call() -> ToolCallStart:
+    return ToolCallStart(session_update="tool_call", tool_call_id="t1", title="bash")
+
+
+def _texts(updates: list[SessionUpdate]) -> list[tuple[str, str]]:
+    return [
+        (
+            update.session_update,
+            update.content.text
+            if isinstance(update, AgentMessageChunk | AgentThoughtChunk)
+            and isinstance(update.content, TextContentBlock)
+            else "",
+        )
+        for update in updates
+    ]
+
+
+def _queue(
+    client: SlowClient,
+    stats: UpdateQueueStats,
+    *,
+    flush_interval: float = 0.0,
+    max_bytes: int = 1024,
+) -> SessionUpdateQueue:
+    return SessionUpdateQueue(
+        client.send, stats, flush_interval=flush_interval, max_bytes=max_bytes
+    )
+
+
+@pytest.mark.asyncio
+async def test_text_chunks_are_merged_while_the_client_is_busy() -> None:
+    client, stats = SlowClient(), UpdateQueueStats()
+    client.release.clear()
+
+    async with _queue(client, stats) as updates:
+        await updates.put(_message("a"))
+        await asyncio.sleep(0)
+        for update in (_message("b"), _message("c"), _thought("d"), _message("e")):
+            await updates.put(update)
+        await updates.put(_message("f", message_id="m2"))
+        client.release.set()
+
+    assert _texts(client.sent) == [
+        ("agent_message_chunk", "a"),
+        ("agent_message_chunk", "bc"),
+        ("agent_thought_chunk", "d"),
+        ("agent_message_chunk", "e"),
+        ("agent_message_chunk", "f"),
+    ]
+    assert client.sent[1].field_meta == {"messageId": "m1"}
+    assert (stats.sent, stats.merged, stats.dropped) == (5, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_text_chunks_within_the_flush_interval_are_merged() -> None:
+    client, stats = SlowClient(), UpdateQueueStats()
+
+    async with _queue(client, stats, flush_interval=60) as updates:
+        for text in "abc":
+            await updates.put(_message(text))
+
+    assert _texts(client.sent) == [("agent_message_chunk", "abc")]
+    assert stats.merged == 2
+
+
+@pytest.mark.asyncio
+async def test_other_updates_are_sent_before_put_returns() -> None:
+    client, stats = SlowClient(), UpdateQueueStats()
+
+    async with _queue(client, stats, flush_interval=60) as updates:
+        await updates.put(_message("a"))
+        await updates.put(_tool_call())
+
+        assert _texts(client.sent) == [("agent_message_chunk", "a"), ("tool_call", "")]
+
+
+@pytest.mark.asyncio
+async def test_put_waits_for_the_client_once_the_buffer_is_full() -> None:
+    client, stats = SlowClient(), UpdateQueueStats()
+    client.release.clear()
+
+    async with _queue(client, stats, max_bytes=4) as updates:
+        await updates.put(_message("a"))
+        await asyncio.sleep(0)
+        await updates.put(_message("bb"))
+        full = asyncio.create_task(updates.put(_message("cc")))
+        await asyncio.sleep(0.01)
+        assert not full.done()
+
+        client.release.set()
+        await full
+
+    assert _texts(client.sent) == [
+        ("agent_message_chunk", "a"),
+        ("agent_message_chunk", "bbcc"),
+    ]
+    assert stats.backpressure_waits == 1
+    assert stats.backpressure_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_prompt_drops_pending_updates() -> None:
+    client, stats = SlowClient(), UpdateQueueStats()
+    client.release.clear()
+
+    async def stream() -> None:
+        async with _queue(client, stats) as updates:
+            await updates.put(_message("a"))
+            await asyncio.sleep(0)
+            await updates.put(_message("b", message_id="m2"))
+            await asyncio.sleep(60)
+
+    task = asyncio.create_task(stream())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert client.sent == []
+    assert stats.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_client_errors_reach_the_agent() -> None:
+    stats = UpdateQueueStats()
+
+    async def fail(update: SessionUpdate) -> None:
+        raise ConnectionError("client went away")
+
+    with pytest.raises(ConnectionError):
+        async with SessionUpdateQueue(
+            fail, stats, flush_interval=0, max_bytes=1024
+        ) as updates:
+            await updates.put(_tool_call())
+
+
+@pytest.fixture
+def backend() -> FakeBackend:
+    return FakeBackend([
+        mock_llm_chunk(content="Hello"),
+        mock_llm_chunk(content=", "),
+        mock_llm_chunk(content="world"),
+    ])
+
+
+@pytest.mark.asyncio
+async def test_prompt_updates_go_through_the_queue(
+    acp_agent_loop: BloomAcpAgentLoop,
+) -> None:
+    await acp_agent_loop.initialize(protocol_version=PROTOCOL_VERSION)
+    session = await acp_agent_loop.new_session(cwd=str(Path.cwd()), mcp_servers=[])
+    client = acp_agent_loop.client
+    assert isinstance(client, FakeClient)
+
+    await acp_agent_loop.prompt(
+        session_id=session.session_id, prompt=[TextContentBlock(type="text", text="Hi")]
+    )
+
+    answer = [
+        n.update.content.text
+        for n in client._session_updates
+        if isinstance(n.update, AgentMessageChunk)
+        and isinstance(n.update.content, TextContentBlock)
+    ]
+    assert "".join(answer) == "Hello, world"
+    stats = await acp_agent_loop.ext_method(
+        SESSION_STATS_METHOD, {"sessionId": session.session_id}
+    )
+    assert stats["updatesSent"] == len(client._session_updates)
+    assert stats["updatesDropped"] == 0
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from bloom.core.config import ProviderConfig
+from bloom.core.llm.backend.generic import OpenAIAdapter
+from bloom.core.llm.format import APIToolFormatHandler
+from bloom.core.types import LLMMessage, LLMUsage
+
+PROVIDER = ProviderConfig(name="test", api_base="http://test")
+
+
+def _stream_chunk(delta: dict[str, Any]) -> dict[str, Any]:
+    return {"id": "chatcmpl-1", "choices": [{"index": 0, "delta": delta}]}
+
+
+@pytest.mark.parametrize(
+    "delta",
+    [
+        {"role": "assistant", "content": ""},
+        {"content": "Hello"},
+        {"content": None},
+        {},
+        {"reasoning_content": "hmm", "content": None},
+        {"content": [{"type": "text", "text": "a"}, {"type": "text", "text": "b"}]},
+        {
+            "tool_calls": [
+                {"index": 0, "id": "c1", "function": {"name": "grep", "arguments": ""}}
+            ]
+        },
+    ],
+)
+def test_stream_deltas_parse_like_validated_messages(delta: dict[str, Any]) -> None:
+    chunk = OpenAIAdapter().parse_response(_stream_chunk(dict(delta)), PROVIDER)
+
+    expected = LLMMessage.model_validate(dict(delta))
+    assert chunk.message.model_dump(exclude={"message_id"}) == expected.model_dump(
+        exclude={"message_id"}
+    )
+    assert chunk.usage == LLMUsage()
+
+
+def test_text_deltas_are_independent_copies() -> None:
+    adapter = OpenAIAdapter()
+    first = adapter.parse_response(_stream_chunk({"content": "a"}), PROVIDER).message
+    first.message_id = "stamped"
+    second = adapter.parse_response(_stream_chunk({"content": "b"}), PROVIDER).message
+
+    assert first is not second
+    assert (second.content, second.message_id) == ("b", None)
+
+
+def test_custom_reasoning_field_takes_the_fast_path_too() -> None:
+    provider = PROVIDER.model_copy(update={"reasoning_field_name": "reasoning"})
+
+    chunk = OpenAIAdapter().parse_response(
+        _stream_chunk({"reasoning": "hmm"}), provider
+    )
+
+    assert chunk.message.reasoning_content == "hmm"
+
+
+def test_usage_only_chunk_reports_usage() -> None:
+    data = {
+        "choices": [],
+        "usage": {
+            "prompt_tokens": 10,
+            "completion_tokens": 2,
+            "prompt_tokens_details": {"cached_tokens": 4},
+        },
+    }
+
+    chunk = OpenAIAdapter().parse_response(data, PROVIDER)
+
+    assert chunk.message.content == ""
+    assert chunk.usage == LLMUsage(
+        prompt_tokens=10, completion_tokens=2, cached_tokens=4
+    )
+
+
+def test_clean_messages_are_not_revalidated() -> None:
+    handler = APIToolFormatHandler()
+    message = LLMMessage.model_validate({"content": "hi"})
+    named = LLMMessage.model_validate({"content": "hi", "name": "x"})
+
+    assert handler.process_api_response_message(message) is message
+    processed = handler.process_api_response_message(named)
+    assert processed is not named
+    assert processed.name is None
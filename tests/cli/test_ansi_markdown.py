@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from markdown_it import MarkdownIt
+import pytest
+from textual.app import App, ComposeResult
+
+from bloom.cli.textual_ui import ansi_markdown
+from bloom.cli.textual_ui.ansi_markdown import (
+    AnsiMarkdown,
+    AnsiMarkdownFence,
+    _highlight,
+    _is_open_fence,
+)
+from bloom.cli.textual_ui.widgets.messages import AssistantMessage
+
+CODE = "\n".join(f"def f{i}(x):\n    return x * {i}  # times {i}" for i in range(40))
+
+
+def _fence_token(source: str):
+    return next(t for t in MarkdownIt("gfm-like").parse(source) if t.type == "fence")
+
+
+@pytest.mark.parametrize(
+    ("source", "is_open"),
+    [
+        ("```py\na = 1\nb = 2", True),
+        ("```py\na = 1\nb = 2\n", True),
+        ("text\n\n```py\na = 1\n\nb", True),
+        ("```py\n", True),
+        ("```py\na = 1\n```", False),
+        ("```py\n```\nafter", False),
+        ("~~~\nx\n~~~\n", False),
+    ],
+)
+def test_open_fences_are_told_apart_from_closed_ones(
+    source: str, is_open: bool
+) -> None:
+    assert _is_open_fence(_fence_token(source)) is is_open
+
+
+def test_open_fence_reuses_its_last_highlight_for_a_while(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[str] = []
+    original = ansi_markdown.highlight
+
+    def counting(code: str, **kwargs):
+        calls.append(code)
+        return original(code, **kwargs)
+
+    monkeypatch.setattr(ansi_markdown, "highlight", counting)
+    markdown = AnsiMarkdown()
+    head, tail = CODE[:200], CODE[200:260]
+
+    first = markdown.highlight_open_fence(head, "python")
+    second = markdown.highlight_open_fence(head + tail, "python")
+
+    assert calls == [head]
+    assert second.plain == head + tail
+    assert second.spans[: len(first.spans)] == first.spans
+
+    monkeypatch.setattr(ansi_markdown, "OPEN_FENCE_HIGHLIGHT_SECONDS", 0)
+    markdown.highlight_open_fence(head + tail, "python")
+    assert calls == [head, head + tail]
+
+
+class StreamApp(App):
+    def compose(self) -> ComposeResult:
+        yield AssistantMessage("")
+
+
+@pytest.mark.asyncio
+async def test_streamed_code_ends_up_fully_highlighted() -> None:
+    text = f"Here it is:\n\n```python\n{CODE}\n```\n\nDone."
+    app = StreamApp()
+
+    async with app.run_test() as pilot:
+        message = app.query_one(AssistantMessage)
+        for i in range(0, len(text), 7):
+            await message.append_content(text[i : i + 7])
+        await message.stop_stream()
+        await pilot.pause()
+
+        fence = message.query_one(AnsiMarkdownFence)
+        expected = _highlight(CODE, "python")
+        assert fence._highlighted_code.plain == expected.plain
+        assert fence._highlighted_code.spans == expected.spans
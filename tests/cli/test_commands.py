@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from bloom.cli.commands import CommandRegistry
+
+
+def test_commands_match_their_aliases_only() -> None:
+    registry = CommandRegistry()
+
+    assert (match := registry.parse(" /STATUS ")) is not None
+    assert match[0].handler == "_show_status"
+    assert registry.parse("/status please") is None
+    assert registry.parse("/statusbar") is None
+
+
+def test_commands_with_args_receive_them() -> None:
+    registry = CommandRegistry()
+
+    assert (match := registry.parse("/profile  start ")) is not None
+    command, args = match
+    assert command.handler == "_toggle_profiler"
+    assert args == "start"
+    assert registry.find_command("/profile stop") is command
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from bloom.cli.startup_profile import (
+    COLD_START_BUDGET_SECONDS,
+    PROGRAMMATIC_MODULES,
+    parse_importtime,
+    profile_imports,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:        80 |        300 |     bloom.core.types
+import time:       400 |        700 |   bloom.core
+import time:        50 |        870 | bloom
+"""
+
+
+def test_parse_importtime_reads_depth_and_times() -> None:
+    timings = parse_importtime(IMPORTTIME_OUTPUT)
+
+    assert [t.module for t in timings] == [
+        "_io",
+        "bloom.core.types",
+        "bloom.core",
+        "bloom",
+    ]
+    assert timings[1].self_us == 80
+    assert timings[1].cumulative_us == 300
+    assert [t.depth for t in timings] == [1, 2, 1, 0]
+    assert timings[1].package == "bloom"
+
+
+def test_programmatic_mode_does_not_import_textual_or_mcp() -> None:
+    code = (
+        "import sys; "
+        + "; ".join(f"import {module}" for module in PROGRAMMATIC_MODULES)
+        + "; print(sorted({'textual', 'mcp'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+@pytest.mark.perf
+def test_programmatic_cold_start_is_within_budget() -> None:
+    profile = profile_imports(PROGRAMMATIC_MODULES)
+
+    assert profile.timings
+    assert profile.total_seconds < COLD_START_BUDGET_SECONDS, (
+        f"Cold start took {profile.total_seconds:.2f}s, over the "
+        f"{COLD_START_BUDGET_SECONDS:.2f}s budget. "
+        "Run `bloom --profile-startup -p` to see which imports regressed."
+    )
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+
+from pydantic import BaseModel
+import pytest
+
+from bloom.cli.textual_ui.app import BloomApp
+from bloom.cli.textual_ui.widgets.approval_app import ApprovalApp
+from bloom.core.types import ApprovalResponse
+from tests.conftest import build_test_agent_loop
+
+
+class _Args(BaseModel):
+    path: str
+
+
+@pytest.mark.asyncio
+async def test_concurrent_approvals_are_asked_one_at_a_time() -> None:
+    app = BloomApp(agent_loop=build_test_agent_loop())
+    shown: list[str] = []
+
+    async def show(tool: str, args: BaseModel) -> None:
+        shown.append(tool)
+
+    app._switch_to_approval_app = show  # type: ignore[method-assign]
+
+    async with app.run_test() as pilot:
+        first = asyncio.create_task(
+            app._approval_callback("write_file", _Args(path="a"), "call_1")
+        )
+        second = asyncio.create_task(
+            app._approval_callback("bash", _Args(path="b"), "call_2")
+        )
+        await pilot.pause()
+        assert shown == ["write_file"]
+
+        await app.on_approval_app_approval_granted(
+            ApprovalApp.ApprovalGranted("write_file", _Args(path="a"))
+        )
+        assert await first == (ApprovalResponse.YES, None)
+        await pilot.pause()
+        assert shown == ["write_file", "bash"]
+
+        await app.on_approval_app_approval_rejected(
+            ApprovalApp.ApprovalRejected("bash", _Args(path="b"))
+        )
+        response, feedback = await second
+
+    assert response == ApprovalResponse.NO
+    assert feedback
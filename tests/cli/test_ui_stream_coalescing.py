@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import pytest
+from textual.app import App, ComposeResult
+
+from bloom.cli.textual_ui.app import BloomApp
+from bloom.cli.textual_ui.widgets.messages import STREAM_FLUSH_CHARS, AssistantMessage
+from bloom.core.config import BloomConfig, SessionLoggingConfig
+from tests.conftest import build_test_agent_loop
+
+
+class StreamApp(App):
+    def compose(self) -> ComposeResult:
+        yield AssistantMessage("")
+
+
+async def _record_writes(message: AssistantMessage) -> list[str]:
+    writes: list[str] = []
+    stream = message._ensure_stream()
+    original = stream.write
+
+    async def write(text: str) -> None:
+        writes.append(text)
+        await original(text)
+
+    stream.write = write  # type: ignore[method-assign]
+    return writes
+
+
+@pytest.mark.asyncio
+async def test_fast_deltas_are_coalesced_into_few_writes() -> None:
+    deltas = [f"word{i} " for i in range(300)]
+    app = StreamApp()
+
+    async with app.run_test() as pilot:
+        message = app.query_one(AssistantMessage)
+        writes = await _record_writes(message)
+        for delta in deltas:
+            await message.append_content(delta)
+        await message.stop_stream()
+        await pilot.pause()
+
+    assert "".join(writes) == "".join(deltas)
+    assert len(writes) < 10
+
+
+@pytest.mark.asyncio
+async def test_large_backlog_is_flushed_without_waiting_for_a_frame() -> None:
+    app = StreamApp()
+
+    async with app.run_test():
+        message = app.query_one(AssistantMessage)
+        writes = await _record_writes(message)
+        await message.append_content("warm up")
+        await message.append_content("x" * STREAM_FLUSH_CHARS)
+
+        assert writes == ["warm up", "x" * STREAM_FLUSH_CHARS]
+
+
+@pytest.mark.asyncio
+async def test_pending_deltas_are_written_by_the_frame_timer() -> None:
+    app = StreamApp()
+
+    async with app.run_test() as pilot:
+        message = app.query_one(AssistantMessage)
+        writes = await _record_writes(message)
+        await message.append_content("a")
+        await message.append_content("b")
+        assert writes == ["a"]
+
+        await pilot.pause(0.1)
+
+        assert writes == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_callbacks_are_deduplicated_until_they_run() -> None:
+    config = BloomConfig(
+        session_logging=SessionLoggingConfig(enabled=False), enable_update_checks=False
+    )
+    app = BloomApp(agent_loop=build_test_agent_loop(config=config))
+    calls: list[int] = []
+
+    def callback() -> None:
+        calls.append(1)
+
+    async with app.run_test() as pilot:
+        for _ in range(5):
+            app._call_after_refresh_once(callback)
+        await pilot.pause()
+        assert calls == [1]
+
+        app._call_after_refresh_once(callback)
+        await pilot.pause()
+        assert calls == [1, 1]
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from textual.app import App, ComposeResult
+from textual.containers import VerticalScroll
+
+from bloom.cli.textual_ui.app import PRUNE_HIGH_MARK, BloomApp
+from bloom.cli.textual_ui.widgets.load_more import (
+    HistoryLoadMoreMessage,
+    HistoryLoadMoreRequested,
+)
+from bloom.cli.textual_ui.widgets.messages import UserMessage
+from bloom.cli.textual_ui.widgets.transcript import (
+    EntryKind,
+    TranscriptEntry,
+    VirtualTranscript,
+)
+from bloom.cli.textual_ui.windowing import (
+    HISTORY_RESUME_TAIL_MESSAGES,
+    LOAD_MORE_BATCH_SIZE,
+    build_history_entries,
+)
+from bloom.core.config import BloomConfig, SessionLoggingConfig
+from bloom.core.types import FunctionCall, LLMMessage, Role, ToolCall
+from tests.conftest import build_test_agent_loop
+
+
+@pytest.fixture
+def bloom_config() -> BloomConfig:
+    return BloomConfig(
+        session_logging=SessionLoggingConfig(enabled=False), enable_update_checks=False
+    )
+
+
+async def _wait_until(pause, predicate, timeout: float = 5.0) -> None:
+    start = time.monotonic()
+    while (time.monotonic() - start) < timeout:
+        if predicate():
+            return
+        await pause(0.02)
+    raise AssertionError("Condition was not met within the timeout")
+
+
+class TranscriptApp(App):
+    def compose(self) -> ComposeResult:
+        with VerticalScroll():
+            yield VirtualTranscript()
+
+
+def _count_renders(transcript: VirtualTranscript) -> list[TranscriptEntry]:
+    rendered: list[TranscriptEntry] = []
+    original = transcript._render_strips
+
+    def render(entry, width):
+        rendered.append(entry)
+        return original(entry, width)
+
+    transcript._render_strips = render  # type: ignore[method-assign]
+    return rendered
+
+
+@pytest.mark.asyncio
+async def test_only_entries_near_the_viewport_are_rendered() -> None:
+    app = TranscriptApp()
+
+    async with app.run_test(size=(80, 24)) as pilot:
+        transcript = app.query_one(VirtualTranscript)
+        rendered = _count_renders(transcript)
+        transcript.append(
+            TranscriptEntry(EntryKind.ASSISTANT, f"**reply {i}**\n\nsome text")
+            for i in range(2000)
+        )
+        await pilot.pause()
+        await pilot.pause()
+
+        assert rendered
+        assert len(rendered) < 50
+        assert transcript.virtual_size.height >= 2000 * 3
+
+        rendered.clear()
+        transcript.refresh()
+        await pilot.pause()
+        assert rendered == []
+
+
+@pytest.mark.asyncio
+async def test_estimated_heights_are_corrected_once_rendered() -> None:
+    app = TranscriptApp()
+    markdown = "# Title\n\n- one\n- two\n\n```\ncode\n```"
+
+    async with app.run_test(size=(80, 24)) as pilot:
+        transcript = app.query_one(VirtualTranscript)
+        transcript.append([TranscriptEntry(EntryKind.ASSISTANT, markdown)])
+        await pilot.pause()
+        await pilot.pause()
+
+        strips = transcript._render_strips(transcript.entries[0], 80)
+        assert transcript.virtual_size.height == 1 + len(strips)
+
+
+@pytest.mark.asyncio
+async def test_offsets_are_updated_without_re_estimating_old_entries() -> None:
+    app = TranscriptApp()
+    markdown = "# Title\n\n- one\n- two"
+
+    async with app.run_test(size=(80, 24)) as pilot:
+        transcript = app.query_one(VirtualTranscript)
+        transcript.append(
+            TranscriptEntry(EntryKind.ASSISTANT, f"{markdown} {i}") for i in range(500)
+        )
+        await pilot.pause()
+        await pilot.pause()
+
+        estimated: list[TranscriptEntry] = []
+        original = transcript._content_height
+
+        def content_height(entry, width):
+            estimated.append(entry)
+            return original(entry, width)
+
+        transcript._content_height = content_height  # type: ignore[method-assign]
+        transcript.append([TranscriptEntry(EntryKind.NOTICE, "tail")])
+        transcript.prepend([TranscriptEntry(EntryKind.USER, "head")])
+        transcript.scroll_end(animate=False)
+        await pilot.pause()
+        await pilot.pause()
+
+        assert len(estimated) == 2
+        incremental = list(transcript._offsets)
+        width = transcript._layout_width
+        transcript._layout_width = 0
+        transcript._ensure_layout(width)
+        assert transcript._offsets == incremental
+
+
+@pytest.mark.asyncio
+async def test_theme_change_renders_entries_again() -> None:
+    app = TranscriptApp()
+
+    async with app.run_test(size=(80, 24)) as pilot:
+        transcript = app.query_one(VirtualTranscript)
+        transcript.append([TranscriptEntry(EntryKind.USER, "hello")])
+        await pilot.pause()
+        rendered = _count_renders(transcript)
+
+        app.theme = "textual-light"
+        await pilot.pause()
+
+        assert [entry.text for entry in rendered] == ["hello"]
+
+
+def test_history_entries_match_history_widget_spacing() -> None:
+    tool_call = ToolCall(id="c1", function=FunctionCall(name="grep", arguments="{}"))
+    messages = [
+        LLMMessage(role=Role.user, content="find it"),
+        LLMMessage(role=Role.assistant, content="Looking", tool_calls=[tool_call]),
+        LLMMessage(role=Role.tool, content="match", tool_call_id="c1"),
+        LLMMessage(role=Role.assistant, tool_calls=[tool_call]),
+    ]
+    tool_call_map: dict[str, str] = {}
+
+    entries = build_history_entries(messages, tool_call_map, start_index=5)
+
+    assert [(e.kind, e.history_index, e.gap) for e in entries] == [
+        (EntryKind.USER, 5, 1),
+        (EntryKind.ASSISTANT, 6, 1),
+        (EntryKind.TOOL_CALL, 6, 1),
+        (EntryKind.TOOL_CALL, 8, 0),
+    ]
+    assert tool_call_map == {"c1": "grep"}
+
+
+@pytest.mark.asyncio
+async def test_pruned_messages_are_kept_in_the_transcript(
+    bloom_config: BloomConfig,
+) -> None:
+    agent_loop = build_test_agent_loop(config=bloom_config, enable_streaming=False)
+    app = BloomApp(agent_loop=agent_loop)
+    body = "\n".join(["line"] * 60)
+
+    async with app.run_test() as pilot:
+        for i in range(30):
+            await app._mount_and_scroll(UserMessage(f"message {i}\n{body}"))
+        await _wait_until(pilot.pause, lambda: app._transcript is not None)
+        await pilot.pause()
+
+        transcript = app.query_one(VirtualTranscript)
+        live = len(app.query(UserMessage))
+        assert live < 30
+        assert len(transcript.entries) + live == 30
+        assert transcript.entries[0].text.startswith("message 0\n")
+        messages_area = app.query_one("#messages")
+        assert messages_area.children[0] is transcript
+        assert messages_area.virtual_size.height > PRUNE_HIGH_MARK
+
+
+@pytest.mark.asyncio
+async def test_load_more_fills_the_transcript_once_it_exists(
+    bloom_config: BloomConfig,
+) -> None:
+    agent_loop = build_test_agent_loop(config=bloom_config, enable_streaming=False)
+    agent_loop.messages.extend([
+        LLMMessage(role=Role.user, content=f"msg-{idx}") for idx in range(40)
+    ])
+    app = BloomApp(agent_loop=agent_loop)
+
+    async with app.run_test() as pilot:
+        await _wait_until(
+            pilot.pause, lambda: len(app.query(HistoryLoadMoreMessage)) == 1
+        )
+        messages_area = app.query_one("#messages")
+        transcript = await app._ensure_transcript(messages_area)
+        assert messages_area.children[1] is transcript
+
+        app.post_message(HistoryLoadMoreRequested())
+        await _wait_until(pilot.pause, lambda: bool(transcript.entries))
+
+        backfill = 40 - HISTORY_RESUME_TAIL_MESSAGES
+        first = backfill - LOAD_MORE_BATCH_SIZE
+        assert [e.text for e in transcript.entries] == [
+            f"msg-{idx}" for idx in range(first, backfill)
+        ]
+        assert transcript.history_indices == list(range(first, backfill))
+        assert len(app.query(UserMessage)) == HISTORY_RESUME_TAIL_MESSAGES
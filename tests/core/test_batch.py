@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from bloom.core.batch import BatchItem, BatchRunner, BatchStatus, load_manifest
+from bloom.core.config import Backend, BloomConfig
+from tests.conftest import build_test_bloom_config
+from tests.mock.mock_backend_factory import mock_backend_factory
+from tests.mock.utils import mock_llm_chunk
+from tests.stubs.fake_backend import FakeBackend
+
+
+def _config() -> BloomConfig:
+    return build_test_bloom_config(
+        system_prompt_id="tests",
+        include_project_context=False,
+        include_prompt_detail=False,
+        include_model_info=False,
+        include_commit_signature=False,
+    )
+
+
+def _records(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_manifest_items_default_to_their_line_number() -> None:
+    items = load_manifest(
+        '{"prompt": "first"}\n\n{"prompt": "second", "id": "b", "workdir": "sub"}\n'
+    )
+
+    assert [(item.id, item.prompt) for item in items] == [
+        ("1", "first"),
+        ("b", "second"),
+    ]
+    assert items[1].workdir == Path("sub")
+
+
+@pytest.mark.parametrize(
+    ("manifest", "error"),
+    [
+        ('{"prompt": "ok"}\n{"text": "unknown key"}', "line 2"),
+        ('{"prompt": "a", "id": "x"}\n{"prompt": "b", "id": "x"}', "Duplicate"),
+    ],
+)
+def test_invalid_manifests_are_rejected(manifest: str, error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        load_manifest(manifest)
+
+
+@pytest.mark.asyncio
+async def test_items_share_a_backend_and_stream_tagged_records() -> None:
+    backends: list[FakeBackend] = []
+
+    def factory(provider, **kwargs) -> FakeBackend:
+        backends.append(
+            FakeBackend([
+                [mock_llm_chunk(content="Answer one")],
+                [mock_llm_chunk(content="Answer two")],
+            ])
+        )
+        return backends[-1]
+
+    stream = io.StringIO()
+    with mock_backend_factory(Backend.GENERIC, factory):
+        results = await BatchRunner(_config(), stream=stream).run([
+            BatchItem(id="a", prompt="First"),
+            BatchItem(id="b", prompt="Second"),
+        ])
+
+    assert [(r.id, r.status) for r in results] == [
+        ("a", BatchStatus.COMPLETED),
+        ("b", BatchStatus.COMPLETED),
+    ]
+    assert len(backends) == 1
+    records = _records(stream)
+    for item_id in "ab":
+        item_records = [r for r in records if r["batch_item"] == item_id]
+        assert [r.get("role") for r in item_records] == [
+            "system",
+            "user",
+            "assistant",
+            None,
+        ]
+        assert item_records[-1]["result"]["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_batch_budget_skips_items_once_spent(tmp_path: Path) -> None:
+    stream = io.StringIO()
+    with mock_backend_factory(
+        Backend.GENERIC,
+        lambda provider, **kwargs: FakeBackend([mock_llm_chunk(content="Done")]),
+    ):
+        runner = BatchRunner(_config(), concurrency=1, max_turns=1, stream=stream)
+        results = await runner.run([
+            BatchItem(id="a", prompt="First"),
+            BatchItem(id="b", prompt="Second"),
+            BatchItem(id="c", prompt="Elsewhere", workdir=tmp_path / "missing"),
+        ])
+
+    assert [(r.id, r.status) for r in results] == [
+        ("a", BatchStatus.COMPLETED),
+        ("b", BatchStatus.SKIPPED),
+        ("c", BatchStatus.FAILED),
+    ]
+    assert results[1].error == "Batch turn limit of 1 reached"
+    assert [r["batch_item"] for r in _records(stream) if "role" not in r] == [
+        "a",
+        "b",
+        "c",
+    ]
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from bloom.core.compaction import SummaryCache, is_summary_message, segment_key
+from bloom.core.config import BloomConfig, SessionLoggingConfig
+from bloom.core.types import LLMMessage, Role
+from tests.conftest import build_test_agent_loop, build_test_bloom_config
+from tests.mock.utils import mock_llm_chunk
+from tests.stubs.fake_backend import FakeBackend
+
+
+def make_config(**overrides: Any) -> BloomConfig:
+    kwargs: dict[str, Any] = {
+        "system_prompt_id": "tests",
+        "include_project_context": False,
+        "include_prompt_detail": False,
+        "auto_compact_threshold": 0,
+        "compaction_keep_recent_tokens": 60,
+        "compaction_segment_tokens": 100,
+    }
+    return build_test_bloom_config(**(kwargs | overrides))
+
+
+def turns(count: int) -> list[LLMMessage]:
+    messages: list[LLMMessage] = []
+    for i in range(count):
+        messages.append(LLMMessage(role=Role.user, content=f"question {i}"))
+        messages.append(LLMMessage(role=Role.assistant, content=f"{i}" * 160))
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_compact_keeps_recent_turns_and_summarizes_old_segments() -> None:
+    backend = FakeBackend([
+        [mock_llm_chunk(content="summary of 0-1")],
+        [mock_llm_chunk(content="summary of 0-2")],
+    ])
+    agent = build_test_agent_loop(config=make_config(), backend=backend)
+    history = turns(4)
+    agent.messages.extend(history)
+
+    summary = await agent.compact()
+
+    assert summary == "summary of 0-2"
+    # Two segments were summarized, but it is one step of the turn budget.
+    assert agent.stats.steps == 1
+    assert agent.messages[0].role == Role.system
+    assert is_summary_message(agent.messages[1])
+    assert "summary of 0-2" in (agent.messages[1].content or "")
+    assert agent.messages[2:] == history[-2:]
+
+    first_request, second_request = backend._requests_messages
+    assert [m.content for m in first_request[1:5]] == [m.content for m in history[:4]]
+    # The second segment is folded into the first segment's summary.
+    assert "summary of 0-1" in (second_request[1].content or "")
+    assert second_request[2].content == "question 2"
+
+
+@pytest.mark.asyncio
+async def test_recompaction_only_summarizes_new_segments() -> None:
+    backend = FakeBackend([
+        [mock_llm_chunk(content="first")],
+        [mock_llm_chunk(content="second")],
+    ])
+    agent = build_test_agent_loop(
+        config=make_config(compaction_segment_tokens=1000), backend=backend
+    )
+    agent.messages.extend(turns(3))
+    await agent.compact()
+    assert len(backend._requests_messages) == 1
+
+    agent.messages.extend(turns(2))
+    await agent.compact()
+
+    assert len(backend._requests_messages) == 2
+    request = backend._requests_messages[1]
+    assert "first" in (request[1].content or "")
+    assert request[2].content == "question 2"
+    assert "second" in (agent.messages[1].content or "")
+
+
+@pytest.mark.asyncio
+async def test_compact_without_old_turns_summarizes_everything() -> None:
+    backend = FakeBackend([[mock_llm_chunk(content="all of it")]])
+    agent = build_test_agent_loop(
+        config=make_config(compaction_keep_recent_tokens=10_000), backend=backend
+    )
+    agent.messages.extend(turns(2))
+
+    await agent.compact()
+
+    assert len(agent.messages) == 2
+    assert "all of it" in (agent.messages[1].content or "")
+
+
+@pytest.mark.asyncio
+async def test_cached_summaries_are_reused_by_a_resumed_session() -> None:
+    cfg = make_config(session_logging=SessionLoggingConfig(enabled=True))
+    history = turns(4)
+
+    first_backend = FakeBackend([
+        [mock_llm_chunk(content="s1")],
+        [mock_llm_chunk(content="s2")],
+    ])
+    first = build_test_agent_loop(config=cfg, backend=first_backend)
+    first.messages.extend(m.model_copy() for m in history)
+    await first.compact()
+
+    resumed_backend = FakeBackend([])
+    resumed = build_test_agent_loop(config=cfg, backend=resumed_backend)
+    resumed.messages.extend(m.model_copy() for m in history)
+    summary = await resumed.compact()
+
+    assert summary == "s2"
+    assert resumed_backend._requests_messages == []
+
+
+@pytest.mark.asyncio
+async def test_prefetch_prepares_final_segments_between_turns() -> None:
+    backend = FakeBackend(
+        [[mock_llm_chunk(content="answer", prompt_tokens=900)]]
+        + [
+            [mock_llm_chunk(content=f"summary {i}", prompt_tokens=900)]
+            for i in range(10)
+        ]
+    )
+    agent = build_test_agent_loop(
+        config=make_config(
+            auto_compact_threshold=1000,
+            compaction_segment_tokens=20,
+            compaction_prefetch=True,
+        ),
+        backend=backend,
+    )
+    agent.messages.extend(turns(6))
+
+    [_ async for _ in agent.act("next")]
+    assert agent._compaction_prefetch is not None
+    await agent._compaction_prefetch
+    requests_after_prefetch = len(backend._requests_messages)
+    assert requests_after_prefetch > 1
+    # The turn took two steps (the user message and one LLM call); the
+    # prefetched summaries don't use up the turn budget.
+    assert agent.stats.steps == 2
+
+    await agent.compact()
+
+    assert agent.stats.steps == 3
+
+    # Only the newest old segment was left for compaction itself.
+    assert len(backend._requests_messages) == requests_after_prefetch + 1
+    last_prefetched = f"summary {requests_after_prefetch - 2}"
+    assert last_prefetched in (backend._requests_messages[-1][1].content or "")
+
+
+def test_summary_cache_persists_to_disk(tmp_path: Path) -> None:
+    key = segment_key(None, [LLMMessage(role=Role.user, content="hi")])
+    SummaryCache(tmp_path).put(key, "summary")
+
+    assert SummaryCache(tmp_path).get(key) == "summary"
+    assert SummaryCache(None).get(key) is None
+
+
+def test_summary_cache_prunes_oldest_entries(tmp_path: Path) -> None:
+    cache = SummaryCache(tmp_path, max_entries=2)
+    for i in range(3):
+        cache.put(f"key{i}", f"summary {i}")
+
+    assert len(list(tmp_path.glob("*.md"))) == 2
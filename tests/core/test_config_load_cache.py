@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+
+import pytest
+
+from bloom.core.config import BloomConfig, TomlFileSettingsSource
+from bloom.core.paths.config_paths import CONFIG_FILE
+from bloom.core.paths.global_paths import MODELS_CACHE_FILE
+
+
+@pytest.fixture(autouse=True)
+def offline_model_list() -> None:
+    MODELS_CACHE_FILE.path.parent.mkdir(parents=True, exist_ok=True)
+    MODELS_CACHE_FILE.path.write_text(
+        json.dumps({"timestamp": time.time(), "models": []})
+    )
+
+
+@pytest.fixture
+def toml_reads(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    reads: list[int] = []
+    original = TomlFileSettingsSource._load_toml
+
+    def counting_load(self: TomlFileSettingsSource) -> dict:
+        reads.append(1)
+        return original(self)
+
+    monkeypatch.setattr(TomlFileSettingsSource, "_load_toml", counting_load)
+    return reads
+
+
+def write_config(text: str) -> None:
+    path = CONFIG_FILE.path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    previous = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text, encoding="utf-8")
+    # Make sure the change is visible even on coarse mtime filesystems.
+    os.utime(path, ns=(previous + 1_000_000_000, previous + 1_000_000_000))
+
+
+def test_load_is_cached_until_the_config_file_changes(toml_reads: list[int]) -> None:
+    write_config('textual_theme = "first"\n')
+
+    assert BloomConfig.load().textual_theme == "first"
+    assert BloomConfig.load().textual_theme == "first"
+    assert len(toml_reads) == 1
+
+    write_config('textual_theme = "second"\n')
+
+    assert BloomConfig.load().textual_theme == "second"
+    assert len(toml_reads) == 2
+
+
+def test_overrides_and_env_are_part_of_the_cache_key(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    write_config('textual_theme = "file"\n')
+
+    assert BloomConfig.load(textual_theme="override").textual_theme == "override"
+    assert BloomConfig.load().textual_theme == "file"
+
+    monkeypatch.setenv("BLOOM_TEXTUAL_THEME", "env")
+    assert BloomConfig.load().textual_theme == "env"
+
+
+def test_loaded_configs_do_not_share_state() -> None:
+    write_config("")
+
+    first = BloomConfig.load()
+    first.enabled_tools.append("bash")
+    first.active_model = "changed"
+
+    second = BloomConfig.load()
+    assert second.enabled_tools == []
+    assert second.active_model != "changed"
+
+
+def test_save_updates_refreshes_the_cache_in_place(toml_reads: list[int]) -> None:
+    write_config('textual_theme = "first"\n')
+    BloomConfig.load()
+
+    BloomConfig.save_updates({"textual_theme": "saved"})
+    reads_after_save = len(toml_reads)
+
+    assert BloomConfig.load().textual_theme == "saved"
+    assert len(toml_reads) == reads_after_save
+    assert 'textual_theme = "saved"' in CONFIG_FILE.path.read_text()
+    assert list(CONFIG_FILE.path.parent.glob("*.tmp")) == []
+
+
+def test_save_updates_with_merged_values_reloads(toml_reads: list[int]) -> None:
+    write_config("")
+    BloomConfig.load()
+
+    BloomConfig.save_updates({"disabled_tools": ["bash"]})
+    reads_after_save = len(toml_reads)
+
+    assert BloomConfig.load().disabled_tools == ["bash"]
+    assert len(toml_reads) == reads_after_save + 1
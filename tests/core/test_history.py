@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from bloom.core.config import HistoryConfig
+from bloom.core.history import HistoryOptimizer, is_elided
+from bloom.core.tools.base import BaseToolConfig, ToolPermission
+from bloom.core.types import FunctionCall, LLMMessage, Role, ToolCall
+from tests.conftest import build_test_agent_loop, build_test_bloom_config
+from tests.mock.utils import mock_llm_chunk
+from tests.stubs.fake_backend import FakeBackend
+
+
+def read_call(call_id: str, path: Path) -> ToolCall:
+    return ToolCall(
+        id=call_id,
+        index=0,
+        function=FunctionCall(
+            name="read_file", arguments=json.dumps({"path": str(path)})
+        ),
+    )
+
+
+def read_turn(call_id: str, path: Path) -> list[LLMMessage]:
+    return [
+        LLMMessage(role=Role.assistant, tool_calls=[read_call(call_id, path)]),
+        LLMMessage(
+            role=Role.tool,
+            name="read_file",
+            tool_call_id=call_id,
+            content=f"path: {path}\ncontent: {path.read_text()}\nlines_read: 1",
+        ),
+    ]
+
+
+@pytest.fixture
+def sample_file(tmp_working_directory: Path) -> Path:
+    path = tmp_working_directory / "module.py"
+    path.write_text("print('hello')\n", encoding="utf-8")
+    return path
+
+
+def test_superseded_read_is_replaced_by_reference(sample_file: Path) -> None:
+    optimizer = HistoryOptimizer(HistoryConfig())
+    messages = read_turn("a", sample_file) + read_turn("b", sample_file)
+    original = messages[1].content
+
+    changed = optimizer.optimize(messages)
+
+    assert changed == [messages[1]]
+    assert is_elided(messages[1])
+    assert str(sample_file) in (messages[1].content or "")
+    assert not is_elided(messages[3])
+    assert optimizer.restore(messages[1]).content == original
+
+
+def test_reads_of_a_modified_file_are_kept(sample_file: Path) -> None:
+    optimizer = HistoryOptimizer(HistoryConfig())
+    messages = read_turn("a", sample_file)
+    optimizer.optimize(messages)
+
+    sample_file.write_text("print('changed')\n", encoding="utf-8")
+    stat = sample_file.stat()
+    os.utime(sample_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    messages += read_turn("b", sample_file)
+
+    assert optimizer.optimize(messages) == []
+    assert not is_elided(messages[1])
+
+
+def test_old_large_tool_output_is_shortened_to_a_preview() -> None:
+    optimizer = HistoryOptimizer(
+        HistoryConfig(
+            elide_tool_output_after_turns=2,
+            elide_min_chars=100,
+            elided_preview_chars=10,
+        )
+    )
+    big = LLMMessage(role=Role.tool, name="grep", tool_call_id="g", content="x" * 500)
+    small = LLMMessage(role=Role.tool, name="grep", tool_call_id="s", content="tiny")
+    messages = [
+        big,
+        small,
+        LLMMessage(role=Role.assistant, content="one"),
+        LLMMessage(role=Role.assistant, content="two"),
+    ]
+
+    changed = optimizer.optimize(messages)
+
+    assert changed == [big]
+    assert "x" * 10 in (big.content or "")
+    assert len(big.content or "") < 500
+    assert small.content == "tiny"
+    assert optimizer.restore(big).content == "x" * 500
+    assert optimizer.optimize(messages) == []
+
+
+def test_elision_can_be_disabled(sample_file: Path) -> None:
+    optimizer = HistoryOptimizer(
+        HistoryConfig(dedupe_file_reads=False, elide_tool_output_after_turns=0)
+    )
+    messages = read_turn("a", sample_file) + read_turn("b", sample_file)
+
+    assert optimizer.optimize(messages) == []
+
+
+@pytest.mark.asyncio
+async def test_agent_sends_reference_for_repeated_file_reads(sample_file: Path) -> None:
+    backend = FakeBackend([
+        [mock_llm_chunk(content="", tool_calls=[read_call("a", sample_file)])],
+        [mock_llm_chunk(content="", tool_calls=[read_call("b", sample_file)])],
+        [mock_llm_chunk(content="Done.")],
+    ])
+    config = build_test_bloom_config(
+        system_prompt_id="tests",
+        include_project_context=False,
+        include_prompt_detail=False,
+        auto_compact_threshold=0,
+        enabled_tools=["read_file"],
+        tools={"read_file": BaseToolConfig(permission=ToolPermission.ALWAYS)},
+    )
+    agent = build_test_agent_loop(config=config, backend=backend)
+
+    [_ async for _ in agent.act("Read it twice.")]
+
+    last_request = backend._requests_messages[-1]
+    tool_messages = [m for m in last_request if m.role == Role.tool]
+    assert len(tool_messages) == 2
+    assert is_elided(tool_messages[0])
+    assert "print('hello')" in (tool_messages[1].content or "")
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+import time
+
+import httpx
+import pytest
+import respx
+
+from bloom.core.llm import model_discovery
+from bloom.core.llm.model_discovery import (
+    CACHE_TTL_SECONDS,
+    MODELS_API_URL,
+    fetch_models,
+)
+
+FRESH_MODELS = [{"name": "fresh"}]
+STALE_MODELS = [{"name": "stale"}]
+
+
+def write_cache(models: list[dict], age: float) -> None:
+    path = model_discovery._get_cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"timestamp": time.time() - age, "models": models}))
+
+
+def join_refresh() -> None:
+    if (thread := model_discovery._refresh_thread) is not None:
+        thread.join(timeout=5)
+
+
+@pytest.fixture
+def models_api():
+    with respx.mock(assert_all_called=False) as mock:
+        route = mock.get(MODELS_API_URL).mock(
+            return_value=httpx.Response(200, json={"data": FRESH_MODELS})
+        )
+        yield route
+
+
+def test_fresh_cache_is_served_without_network(models_api: respx.Route) -> None:
+    write_cache(STALE_MODELS, age=0)
+
+    assert fetch_models() == STALE_MODELS
+    assert not models_api.called
+
+
+def test_stale_cache_is_served_while_refreshing(models_api: respx.Route) -> None:
+    write_cache(STALE_MODELS, age=CACHE_TTL_SECONDS + 1)
+
+    assert fetch_models() == STALE_MODELS
+    join_refresh()
+
+    assert models_api.called
+    assert fetch_models() == FRESH_MODELS
+
+
+def test_missing_cache_is_fetched_synchronously(models_api: respx.Route) -> None:
+    assert fetch_models() == FRESH_MODELS
+    assert json.loads(model_discovery._get_cache_path().read_text())["models"] == (
+        FRESH_MODELS
+    )
+    assert list(model_discovery._get_cache_path().parent.glob("*.tmp")) == []
+
+
+def test_failed_refresh_falls_back_to_stale_cache(models_api: respx.Route) -> None:
+    models_api.mock(return_value=httpx.Response(500))
+    write_cache(STALE_MODELS, age=CACHE_TTL_SECONDS + 1)
+
+    assert fetch_models(force_refresh=True) == STALE_MODELS
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+import threading
+import time
+
+import pytest
+
+from bloom.core.profiler import ProfilerError, SamplingProfiler
+
+
+def _spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def _block_the_loop() -> None:
+    time.sleep(0.2)
+
+
+def test_profile_counts_stacks_of_named_threads(tmp_path: Path) -> None:
+    profiler = SamplingProfiler(tmp_path, interval=0.001)
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin, args=(stop,), name="file-indexer_0")
+    worker.start()
+    try:
+        profiler.start()
+        time.sleep(0.1)
+        path = profiler.stop()
+    finally:
+        stop.set()
+        worker.join()
+
+    assert path.parent == tmp_path
+    assert path.suffix == ".collapsed"
+    lines = path.read_text().splitlines()
+    spinning = [line for line in lines if line.startswith("file-indexer_0;")]
+    assert spinning
+    stack, _, count = spinning[0].rpartition(" ")
+    assert "_spin (test_profiler.py:" in stack
+    assert int(count) > 0
+    assert not any(line.startswith("bloom-profiler;") for line in lines)
+
+
+def test_profiler_must_be_started_once(tmp_path: Path) -> None:
+    profiler = SamplingProfiler(tmp_path)
+
+    with pytest.raises(ProfilerError):
+        profiler.stop()
+    profiler.start()
+    with pytest.raises(ProfilerError):
+        profiler.start()
+    profiler.stop()
+    assert not profiler.running
+
+
+@pytest.mark.asyncio
+async def test_blocked_event_loop_is_logged_with_its_stack(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    profiler = SamplingProfiler(tmp_path, interval=0.005, slow_callback=0.05)
+    profiler.start()
+    await asyncio.sleep(0.02)
+
+    with caplog.at_level(logging.WARNING, logger="bloom"):
+        _block_the_loop()
+        await asyncio.sleep(0.02)
+    profiler.stop()
+
+    assert profiler.slow_callbacks == 1
+    stall, recovery = caplog.messages
+    assert stall.startswith("Event loop blocked for over")
+    assert "in _block_the_loop" in stall
+    assert recovery.startswith("Event loop was blocked for")
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from bloom.core import tracing
+from bloom.core.llm.rate_limit import (
+    RateLimiter,
+    RateLimitExceeded,
+    RequestPriority,
+    parse_duration,
+    parse_retry_after,
+    request_priority,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "seconds"),
+    [("2", 2.0), ("1.5s", 1.5), ("20ms", 0.02), ("6m0s", 360.0), ("1h2m", 3720.0)],
+)
+def test_parse_duration(value: str, seconds: float) -> None:
+    assert parse_duration(value) == pytest.approx(seconds)
+
+
+@pytest.mark.parametrize("value", ["", "soon", "5 s", "3x"])
+def test_parse_duration_rejects_other_values(value: str) -> None:
+    assert parse_duration(value) is None
+
+
+def test_retry_after_prefers_milliseconds_and_reads_http_dates() -> None:
+    assert parse_retry_after({"retry-after-ms": "250", "retry-after": "9"}) == 0.25
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0
+    assert parse_retry_after({}) is None
+
+
+@pytest.mark.asyncio
+async def test_unknown_limits_do_not_delay_requests() -> None:
+    limiter = RateLimiter("test")
+    for _ in range(5):
+        await limiter.acquire()
+    limiter.observe(200, {})
+    await limiter.acquire()
+
+    assert limiter.stats.requests == 6
+    assert limiter.stats.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_learned_request_limit_paces_requests() -> None:
+    limiter = RateLimiter("test")
+    limiter.observe(
+        200,
+        {
+            "x-ratelimit-limit-requests": "10",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "500ms",
+        },
+    )
+
+    started = time.monotonic()
+    await limiter.acquire()
+
+    # Ten requests refill in half a second, so the next one waits ~50ms.
+    assert 0.03 < time.monotonic() - started < 0.3
+    assert limiter.stats.queued == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_after_holds_requests_and_counts_throttling() -> None:
+    limiter = RateLimiter("test")
+    limiter.observe(429, {"retry-after-ms": "50"})
+
+    started = time.monotonic()
+    await limiter.acquire()
+
+    assert time.monotonic() - started >= 0.05
+    assert limiter.stats.throttled == 1
+    assert limiter.stats.max_wait_seconds >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_waiting_requests_are_served_by_priority() -> None:
+    limiter = RateLimiter("test")
+    limiter.observe(429, {"retry-after-ms": "50"})
+    served: list[RequestPriority] = []
+
+    async def request(priority: RequestPriority) -> None:
+        with request_priority(priority):
+            await limiter.acquire()
+        served.append(priority)
+
+    await asyncio.gather(
+        request(RequestPriority.BACKGROUND),
+        request(RequestPriority.SUBAGENT),
+        request(RequestPriority.INTERACTIVE),
+    )
+
+    assert served == [
+        RequestPriority.INTERACTIVE,
+        RequestPriority.SUBAGENT,
+        RequestPriority.BACKGROUND,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_long_retry_after_fails_instead_of_waiting() -> None:
+    limiter = RateLimiter("test")
+    limiter.observe(429, {"retry-after": "3600"})
+
+    with pytest.raises(RateLimitExceeded, match="test asked to wait"):
+        await limiter.acquire()
+
+
+@pytest.mark.asyncio
+async def test_queue_time_is_traced() -> None:
+    limiter = RateLimiter("test")
+    limiter.observe(503, {"retry-after-ms": "20"})
+    tracer = tracing.TurnTracer()
+    previous = tracing.activate(tracer)
+    try:
+        with request_priority(RequestPriority.SUBAGENT):
+            await limiter.acquire()
+    finally:
+        tracing.activate(previous)
+
+    (span,) = tracer.spans
+    assert span.name == "llm.queue"
+    assert span.attributes == {"provider": "test", "priority": "subagent"}
+    assert tracer.timing().queue_wait_seconds == pytest.approx(span.seconds)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import pytest
+
+from bloom.core.types import (
+    FunctionCall,
+    LLMChunk,
+    LLMMessage,
+    LLMUsage,
+    Role,
+    StreamAccumulator,
+    ToolCall,
+)
+
+
+def _chunk(
+    content: str | None = None,
+    *,
+    reasoning: str | None = None,
+    tool_calls: list[ToolCall] | None = None,
+    usage: LLMUsage | None = None,
+) -> LLMChunk:
+    message = LLMMessage(
+        role=Role.assistant,
+        content=content,
+        reasoning_content=reasoning,
+        tool_calls=tool_calls,
+    )
+    return LLMChunk(message=message, usage=usage)
+
+
+def _call(index: int, *, id=None, name=None, arguments=None) -> ToolCall:
+    return ToolCall(
+        id=id, index=index, function=FunctionCall(name=name, arguments=arguments)
+    )
+
+
+STREAM = [
+    _chunk(reasoning="Let me "),
+    _chunk(reasoning="think."),
+    _chunk("Reading "),
+    _chunk("the file."),
+    _chunk(tool_calls=[_call(0, id="a", name="read_file", arguments='{"pa')]),
+    _chunk(tool_calls=[_call(0, arguments='th": "x"}'), _call(1, id="b")]),
+    _chunk(tool_calls=[_call(1, name="grep")]),
+    _chunk(tool_calls=[_call(1, arguments="{}")]),
+    _chunk(tool_calls=[_call(2, id="c", name="bash")]),
+    _chunk(usage=LLMUsage(prompt_tokens=10, completion_tokens=3)),
+    _chunk(usage=LLMUsage(completion_tokens=2, cached_tokens=4)),
+]
+
+
+def test_accumulator_matches_summing_chunks() -> None:
+    summed = LLMChunk(message=LLMMessage(role=Role.assistant))
+    accumulator = StreamAccumulator()
+    for chunk in STREAM:
+        summed += chunk
+        accumulator.add(chunk)
+
+    built = accumulator.build()
+
+    assert built.usage == summed.usage
+    assert built.message.model_dump(exclude={"message_id"}) == (
+        summed.message.model_dump(exclude={"message_id"})
+    )
+
+
+def test_accumulator_leaves_streamed_chunks_untouched() -> None:
+    first = _call(0, id="a", name="read_file", arguments="{")
+    accumulator = StreamAccumulator()
+    accumulator.add(_chunk(tool_calls=[first]))
+    accumulator.add(_chunk(tool_calls=[_call(0, arguments="}")]))
+
+    assert accumulator.build().message.tool_calls == [
+        _call(0, id="a", name="read_file", arguments="{}")
+    ]
+    assert first.function.arguments == "{"
+
+
+def test_accumulator_without_usage_reports_none() -> None:
+    accumulator = StreamAccumulator()
+    accumulator.add(_chunk("hi"))
+
+    assert accumulator.usage is None
+    assert accumulator.build().message.content == "hi"
+
+
+@pytest.mark.parametrize(
+    "chunk",
+    [
+        LLMChunk(message=LLMMessage(role=Role.user, content="x")),
+        _chunk(tool_calls=[ToolCall(function=FunctionCall(name="x"))]),
+    ],
+)
+def test_accumulator_rejects_chunks_summing_would_reject(chunk: LLMChunk) -> None:
+    with pytest.raises(ValueError):
+        StreamAccumulator().add(chunk)
+
+
+def test_accumulator_rejects_renamed_tool_calls() -> None:
+    accumulator = StreamAccumulator()
+    accumulator.add(_chunk(tool_calls=[_call(0, name="grep")]))
+
+    with pytest.raises(ValueError):
+        accumulator.add(_chunk(tool_calls=[_call(0, name="bash")]))
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import pytest
+
+from bloom.core.config import ModelConfig
+from bloom.core.llm.tokens import (
+    MESSAGE_OVERHEAD_TOKENS,
+    CharRatioTokenizer,
+    TokenEstimator,
+)
+from bloom.core.types import CompactStartEvent, FunctionCall, LLMMessage, Role, ToolCall
+from tests.conftest import build_test_agent_loop, build_test_bloom_config
+from tests.mock.utils import mock_llm_chunk
+from tests.stubs.fake_backend import FakeBackend
+
+
+class CountingTokenizer(CharRatioTokenizer):
+    def __init__(self) -> None:
+        super().__init__(1.0)
+        self.calls = 0
+
+    def count(self, text: str) -> int:
+        self.calls += 1
+        return super().count(text)
+
+
+def test_char_ratio_tokenizer_rounds_up() -> None:
+    tokenizer = CharRatioTokenizer(4.0)
+
+    assert tokenizer.count("") == 0
+    assert tokenizer.count("abcd") == 1
+    assert tokenizer.count("abcde") == 2
+
+
+def test_char_ratio_tokenizer_rejects_non_positive_ratio() -> None:
+    with pytest.raises(ValueError):
+        CharRatioTokenizer(0)
+
+
+def test_for_model_rejects_unknown_tokenizer() -> None:
+    model = ModelConfig(name="m", provider="p", alias="m", tokenizer="missing")
+
+    with pytest.raises(ValueError, match="Unknown tokenizer 'missing'"):
+        TokenEstimator.for_model(model)
+
+
+def test_message_count_includes_tool_calls_and_overhead() -> None:
+    estimator = TokenEstimator(CharRatioTokenizer(1.0))
+    message = LLMMessage(
+        role=Role.assistant,
+        content="abc",
+        tool_calls=[
+            ToolCall(id="c1", function=FunctionCall(name="grep", arguments="{}"))
+        ],
+    )
+
+    assert estimator.message_tokens(message) == MESSAGE_OVERHEAD_TOKENS + 3 + 4 + 2
+
+
+def test_message_count_is_cached_until_content_changes() -> None:
+    tokenizer = CountingTokenizer()
+    estimator = TokenEstimator(tokenizer)
+    message = LLMMessage(role=Role.user, content="hello")
+
+    first = estimator.message_tokens(message)
+    calls_after_first = tokenizer.calls
+    assert estimator.message_tokens(message) == first
+    assert tokenizer.calls == calls_after_first
+
+    message.content = "hello world"
+    assert estimator.message_tokens(message) == first + 6
+    assert tokenizer.calls > calls_after_first
+
+
+def test_calibration_scales_estimates_towards_reported_usage() -> None:
+    estimator = TokenEstimator(CharRatioTokenizer(1.0))
+    messages = [LLMMessage(role=Role.user, content="x" * 96)]
+    raw = estimator.raw_count(messages)
+
+    estimator.calibrate(messages, None, prompt_tokens=raw * 2)
+    assert estimator.estimate(messages) == raw * 2
+
+    estimator.calibrate(messages, None, prompt_tokens=raw * 4)
+    assert estimator.estimate(messages) == raw * 3
+
+
+def test_calibration_ignores_empty_observations() -> None:
+    estimator = TokenEstimator(CharRatioTokenizer(1.0))
+
+    estimator.calibrate([], None, prompt_tokens=100)
+    estimator.calibrate([LLMMessage(role=Role.user, content="x")], None, 0)
+
+    assert estimator.calibration == 1.0
+
+
+@pytest.mark.asyncio
+async def test_compact_uses_local_estimate_instead_of_count_tokens() -> None:
+    backend = FakeBackend([
+        [mock_llm_chunk(content="first answer")],
+        [mock_llm_chunk(content="<summary>")],
+    ])
+    agent = build_test_agent_loop(
+        config=build_test_bloom_config(system_prompt_id="tests"), backend=backend
+    )
+    [_ async for _ in agent.act("Hello")]
+
+    await agent.compact()
+
+    assert backend._count_tokens_calls == []
+    assert agent.stats.context_tokens == agent.token_estimator.estimate(
+        agent.messages, agent.format_handler.get_available_tools(agent.tool_manager)
+    )
+
+
+@pytest.mark.asyncio
+async def test_large_user_message_triggers_compaction_before_it_is_sent() -> None:
+    backend = FakeBackend([
+        [mock_llm_chunk(content="short answer", prompt_tokens=1000)],
+        [mock_llm_chunk(content="<summary>")],
+        [mock_llm_chunk(content="<final>")],
+    ])
+    cfg = build_test_bloom_config(
+        system_prompt_id="tests",
+        include_project_context=False,
+        include_prompt_detail=False,
+        auto_compact_threshold=5000,
+    )
+    agent = build_test_agent_loop(config=cfg, backend=backend)
+    [_ async for _ in agent.act("Hello")]
+    assert agent.stats.context_tokens < 5000
+
+    events = [ev async for ev in agent.act("x" * 100_000)]
+
+    compact_starts = [e for e in events if isinstance(e, CompactStartEvent)]
+    assert len(compact_starts) == 1
+    assert compact_starts[0].current_context_tokens >= 5000
+    # The oversized message went to the summary request, not a regular turn.
+    assert len(backend._requests_messages) == 3
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from bloom.core import tracing
+from bloom.core.agents.models import BuiltinAgentName
+from bloom.core.config import SessionLoggingConfig, TracingConfig
+from bloom.core.tools.base import BaseToolConfig, ToolPermission
+from bloom.core.types import FunctionCall, ToolCall
+from tests.conftest import build_test_agent_loop, build_test_bloom_config
+from tests.mock.utils import mock_llm_chunk
+from tests.stubs.fake_backend import FakeBackend
+
+
+@pytest.fixture
+def tracer():
+    tracer = tracing.TurnTracer()
+    previous = tracing.activate(tracer)
+    yield tracer
+    tracing.activate(previous)
+
+
+def test_spans_without_a_tracer_are_not_recorded() -> None:
+    assert tracing.current() is None
+    with tracing.span("session.save"):
+        pass
+
+
+def test_spans_nest_under_the_enclosing_span(tracer: tracing.TurnTracer) -> None:
+    with tracing.span("middleware", hook="before_turn"):
+        with tracing.span("session.save"):
+            pass
+        tracer.record("tool", 0, 1, tool="bash")
+
+    inner, recorded, outer = tracer.spans
+    assert outer.parent_id == tracer.root_id
+    assert inner.parent_id == outer.span_id
+    assert recorded.parent_id == outer.span_id
+
+
+def test_subagent_spans_stay_in_their_own_trace(tracer: tracing.TurnTracer) -> None:
+    with tracing.span("tool", tool="task"):
+        subagent = tracing.TurnTracer()
+        previous = tracing.activate(subagent)
+        with tracing.span("session.save"):
+            pass
+        tracing.activate(previous)
+
+    assert subagent.spans[0].parent_id == subagent.root_id
+    assert [span.name for span in tracer.spans] == ["tool"]
+
+
+def test_timing_folds_spans_by_kind(tracer: tracing.TurnTracer) -> None:
+    second = 1_000_000_000
+    tracer.record(
+        "llm.request",
+        0,
+        3 * second,
+        time_to_first_token_seconds=1.0,
+        streaming_seconds=2.0,
+    )
+    tracer.record(
+        "llm.request",
+        3 * second,
+        5 * second,
+        time_to_first_token_seconds=0.5,
+        streaming_seconds=1.5,
+    )
+    tracer.record("tool", 0, second, tool="bash")
+    tracer.record("tool", 0, 2 * second, tool="bash")
+    tracer.record("session.save", 0, second // 2)
+    tracer.add_network_wait(second)
+
+    timing = tracer.timing()
+
+    assert timing.llm_requests == 2
+    assert timing.time_to_first_token_seconds == 1.0
+    assert timing.streaming_seconds == 3.5
+    assert timing.tool_seconds == {"bash": 3.0}
+    assert timing.session_io_seconds == 0.5
+    assert timing.network_wait_seconds == 1.0
+
+
+def test_token_gaps_are_measured_within_a_stream(tracer: tracing.TurnTracer) -> None:
+    tracer.token()
+    tracer.end_stream()
+    tracer.token()
+    tracer.token()
+
+    timing = tracer.timing()
+
+    assert 0 < timing.max_token_gap_seconds < 1
+    assert timing.mean_token_gap_seconds == timing.max_token_gap_seconds
+
+
+def test_export_appends_one_otlp_line_per_turn(
+    tracer: tracing.TurnTracer, tmp_path: Path
+) -> None:
+    with tracing.span("tool", tool="bash", speculative=False):
+        pass
+    path = tmp_path / "traces" / "bloom.jsonl"
+
+    tracing.export(tracer, path)
+    tracing.export(tracer, path)
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    spans = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    root, tool = spans
+    assert root["name"] == "agent.turn"
+    assert "parentSpanId" not in root
+    assert tool["parentSpanId"] == root["spanId"]
+    assert tool["traceId"] == tracer.trace_id
+    assert tool["attributes"] == [
+        {"key": "tool", "value": {"stringValue": "bash"}},
+        {"key": "speculative", "value": {"boolValue": False}},
+    ]
+    assert int(tool["endTimeUnixNano"]) >= int(tool["startTimeUnixNano"])
+
+
+@pytest.mark.asyncio
+async def test_turn_timing_is_recorded_saved_and_exported(tmp_path: Path) -> None:
+    todo_call = ToolCall(
+        id="tc_todo",
+        index=0,
+        function=FunctionCall(name="todo", arguments='{"action": "read"}'),
+    )
+    backend = FakeBackend([
+        [
+            mock_llm_chunk(content="Checking."),
+            mock_llm_chunk(content="", tool_calls=[todo_call]),
+        ],
+        [mock_llm_chunk(content="Nothing "), mock_llm_chunk(content="to do.")],
+    ])
+    trace_file = tmp_path / "traces.jsonl"
+    config = build_test_bloom_config(
+        system_prompt_id="tests",
+        include_project_context=False,
+        include_prompt_detail=False,
+        enabled_tools=["todo"],
+        tools={"todo": BaseToolConfig(permission=ToolPermission.ALWAYS)},
+        session_logging=SessionLoggingConfig(
+            save_dir=str(tmp_path / "sessions"), enabled=True
+        ),
+        tracing=TracingConfig(export_file=str(trace_file)),
+    )
+    agent = build_test_agent_loop(
+        config=config,
+        backend=backend,
+        agent_name=BuiltinAgentName.AUTO_APPROVE,
+        enable_streaming=True,
+    )
+
+    async for _ in agent.act("Any todos?"):
+        pass
+
+    timing = agent.stats.last_turn_timing
+    assert timing is not None
+    assert timing.llm_requests == 2
+    assert set(timing.tool_seconds) == {"todo"}
+    assert timing.session_io_seconds > 0
+    assert tracing.current() is None
+
+    session_dir = agent.session_logger.session_dir
+    assert session_dir is not None
+    metadata = json.loads((session_dir / "meta.json").read_text())
+    assert metadata["stats"]["last_turn_timing"]["llm_requests"] == 2
+
+    [request] = trace_file.read_text().splitlines()
+    spans = json.loads(request)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    names = {span["name"] for span in spans}
+    assert {"agent.turn", "llm.request", "tool", "session.save"} <= names
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from bloom.core.config import SessionLoggingConfig
+from bloom.core.session import session_index
+from bloom.core.session.session_index import INDEX_FILENAME, SessionIndex
+
+
+@pytest.fixture
+def session_config(tmp_path: Path) -> SessionLoggingConfig:
+    save_dir = tmp_path / "sessions"
+    save_dir.mkdir()
+    return SessionLoggingConfig(
+        save_dir=str(save_dir), session_prefix="test", enabled=True
+    )
+
+
+def _save_session(
+    config: SessionLoggingConfig,
+    session_id: str,
+    *,
+    cwd: str = "/project",
+    end_time: str = "2024-01-01T12:00:00",
+    messages: str = '{"role": "user", "content": "Hello"}\n',
+) -> Path:
+    session_dir = Path(config.save_dir) / f"test_20240101_120000_{session_id}"
+    session_dir.mkdir(exist_ok=True)
+    (session_dir / "messages.jsonl").write_text(messages)
+    (session_dir / "meta.json").write_text(
+        json.dumps({
+            "session_id": session_id,
+            "start_time": "2024-01-01T11:00:00",
+            "end_time": end_time,
+            "title": f"Title of {session_id}",
+            "environment": {"working_directory": cwd},
+        })
+    )
+    return session_dir
+
+
+def test_sessions_are_listed_most_recent_first(
+    session_config: SessionLoggingConfig,
+) -> None:
+    _save_session(session_config, "older", end_time="2024-01-01T12:00:00")
+    newer = _save_session(session_config, "newer", end_time="2024-01-02T12:00:00")
+    _save_session(session_config, "empty", messages="")
+
+    sessions = SessionIndex(session_config).sessions()
+
+    assert [s.session_id for s in sessions] == ["newer", "older"]
+    assert sessions[0].session_dir == newer
+    assert sessions[0].title == "Title of newer"
+    assert sessions[0].cwd == "/project"
+
+
+def test_sessions_can_be_filtered_by_cwd(session_config: SessionLoggingConfig) -> None:
+    _save_session(session_config, "here", cwd="/here")
+    _save_session(session_config, "there", cwd="/there")
+
+    sessions = SessionIndex(session_config).sessions(cwd="/here")
+
+    assert [s.session_id for s in sessions] == ["here"]
+
+
+def test_index_only_rereads_changed_sessions(
+    session_config: SessionLoggingConfig, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _save_session(session_config, "unchanged")
+    changed = _save_session(session_config, "changed")
+    SessionIndex(session_config).sessions()
+    assert (Path(session_config.save_dir) / INDEX_FILENAME).exists()
+
+    read: list[str] = []
+    summarize = session_index._summarize
+
+    def record(session_dir: Path):
+        read.append(session_dir.name)
+        return summarize(session_dir)
+
+    monkeypatch.setattr(session_index, "_summarize", record)
+    _save_session(session_config, "changed", end_time="2024-01-03T12:00:00.5")
+    _save_session(session_config, "added", end_time="2024-01-02T12:00:00")
+
+    sessions = SessionIndex(session_config).sessions()
+
+    assert sorted(read) == sorted([changed.name, "test_20240101_120000_added"])
+    assert [s.session_id for s in sessions] == ["changed", "added", "unchanged"]
+
+
+def test_find_returns_none_for_unknown_session(
+    session_config: SessionLoggingConfig,
+) -> None:
+    _save_session(session_config, "known")
+
+    index = SessionIndex(session_config)
+
+    assert index.find("unknown") is None
+    found = index.find("known")
+    assert found is not None
+    assert found.title == "Title of known"
@@ -8,6 +8,7 @@ import time
 import pytest
 
 from bloom.core.config import SessionLoggingConfig
+from bloom.core.session import session_loader
 from bloom.core.session.session_loader import SessionLoader
 from bloom.core.types import LLMMessage, Role, ToolCall
 
@@ -508,6 +509,39 @@ class TestSessionLoaderLoadSession:
             SessionLoader.load_session(nonexistent_dir)
 
 
+class TestSessionLoaderLoadTail:
+    @pytest.mark.parametrize("block_size", [64, 64 * 1024])
+    def test_load_tail_matches_end_of_load_session(
+        self,
+        session_config: SessionLoggingConfig,
+        create_test_session,
+        monkeypatch: pytest.MonkeyPatch,
+        block_size: int,
+    ) -> None:
+        """Test that the tail is the end of the full history, across blocks."""
+        monkeypatch.setattr(session_loader, "TAIL_BLOCK_SIZE", block_size)
+        messages = [LLMMessage(role=Role.system, content="System prompt")] + [
+            LLMMessage(role=Role.user, content=f"Message {i}") for i in range(50)
+        ]
+        session_folder = create_test_session(
+            Path(session_config.save_dir), "test-session-123", messages=messages
+        )
+
+        history, _ = SessionLoader.load_session(session_folder)
+
+        assert SessionLoader.load_tail(session_folder, 7) == history[-7:]
+        assert SessionLoader.load_tail(session_folder, 100) == history
+
+    def test_load_tail_nonexistent_directory(
+        self, session_config: SessionLoggingConfig
+    ) -> None:
+        """Test loading the tail of a session that doesn't exist."""
+        nonexistent_dir = Path(session_config.save_dir) / "nonexistent"
+
+        with pytest.raises(ValueError, match="Error reading session messages"):
+            SessionLoader.load_tail(nonexistent_dir, 10)
+
+
 class TestSessionLoaderEdgeCases:
     def test_find_latest_session_with_different_prefixes(
         self, session_config: SessionLoggingConfig
@@ -542,6 +542,59 @@ class TestSessionLoggerResetSession:
         assert logger.session_id == "disabled"
 
 
+class TestSessionLoggerResumeSession:
+    @pytest.mark.asyncio
+    async def test_resume_session_appends_to_saved_session(
+        self,
+        session_config: SessionLoggingConfig,
+        mock_bloom_config: BloomConfig,
+        mock_tool_manager: ToolManager,
+        mock_agent_profile: AgentProfile,
+    ) -> None:
+        """Test that a resumed session keeps logging into the saved folder."""
+        messages = [
+            LLMMessage(role=Role.system, content="System prompt"),
+            LLMMessage(role=Role.user, content="Hello"),
+            LLMMessage(role=Role.assistant, content="Hi there!"),
+        ]
+        saved = SessionLogger(session_config, "saved-session")
+        await saved.save_interaction(
+            messages,
+            AgentStats(),
+            mock_bloom_config,
+            mock_tool_manager,
+            mock_agent_profile,
+        )
+        assert saved.session_dir is not None
+
+        logger = SessionLogger(session_config, "new-session")
+        logger.resume_session(saved.session_dir)
+        messages += [
+            LLMMessage(role=Role.user, content="Again"),
+            LLMMessage(role=Role.assistant, content="Hello again!"),
+        ]
+        await logger.save_interaction(
+            messages,
+            AgentStats(),
+            mock_bloom_config,
+            mock_tool_manager,
+            mock_agent_profile,
+        )
+
+        assert logger.session_id == "saved-session"
+        assert logger.session_dir == saved.session_dir
+        lines = (saved.session_dir / "messages.jsonl").read_text().splitlines()
+        assert [json.loads(line)["content"] for line in lines] == [
+            "Hello",
+            "Hi there!",
+            "Again",
+            "Hello again!",
+        ]
+        metadata = json.loads((saved.session_dir / "meta.json").read_text())
+        assert metadata["session_id"] == "saved-session"
+        assert metadata["total_messages"] == 4
+
+
 class TestSessionLoggerFileOperations:
     def test_save_folder(self, session_config: SessionLoggingConfig) -> None:
         """Test that save_folder creates correct folder name."""
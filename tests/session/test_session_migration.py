@@ -6,7 +6,11 @@ from pathlib import Path
 import pytest
 
 from bloom.core.config import SessionLoggingConfig
-from bloom.core.session.session_migration import migrate_sessions
+from bloom.core.session.session_migration import (
+    is_migrated,
+    migrate_sessions,
+    start_session_migration,
+)
 
 
 @pytest.fixture
@@ -175,3 +179,47 @@ class TestSessionMigration:
         assert valid_session_subdir.exists()
         assert not valid_session_file.exists()
         assert invalid_session_file.exists()
+
+    @pytest.mark.asyncio
+    async def test_migrate_sessions_runs_once_per_save_dir(
+        self, session_config: SessionLoggingConfig, old_session_data: dict
+    ) -> None:
+        session_dir = Path(session_config.save_dir)
+        await migrate_sessions(session_config)
+        assert is_migrated(session_dir)
+
+        late_file = session_dir / "test_session-late.json"
+        late_file.write_text(json.dumps(old_session_data))
+
+        assert await migrate_sessions(session_config) == 0
+        assert late_file.exists()
+
+    @pytest.mark.asyncio
+    async def test_migrate_sessions_reports_progress(
+        self, session_config: SessionLoggingConfig, old_session_data: dict
+    ) -> None:
+        session_dir = Path(session_config.save_dir)
+        for i in range(2):
+            (session_dir / f"test_session-{i}.json").write_text(
+                json.dumps(old_session_data)
+            )
+        progress: list[tuple[int, int]] = []
+
+        await migrate_sessions(session_config, lambda *p: progress.append(p))
+
+        assert progress == [(1, 2), (2, 2)]
+
+    def test_start_session_migration_schedules_each_dir_once(
+        self, session_config: SessionLoggingConfig, old_session_data: dict
+    ) -> None:
+        session_dir = Path(session_config.save_dir)
+        old_session_file = session_dir / "test_session-123.json"
+        old_session_file.write_text(json.dumps(old_session_data))
+
+        first = start_session_migration(session_config)
+        second = start_session_migration(session_config)
+
+        assert first is second
+        assert first.wait(timeout=5)
+        assert not old_session_file.exists()
+        assert start_session_migration(session_config).is_set()
@@ -59,6 +59,7 @@ def make_config(
     *,
     enabled_tools: list[str] | None = None,
     tools: dict[str, BaseToolConfig] | None = None,
+    stable_prompt_prefix: bool = True,
 ) -> BloomConfig:
     return build_test_bloom_config(
         auto_compact_threshold=0,
@@ -69,6 +70,7 @@ def make_config(
         include_commit_signature=False,
         enabled_tools=enabled_tools or [],
         tools=tools or {},
+        stable_prompt_prefix=stable_prompt_prefix,
     )
 
 
@@ -92,7 +94,9 @@ async def test_act_flushes_batched_messages_with_injection_middleware(
 
     backend = FakeBackend([mock_llm_chunk(content="I can write very efficient code.")])
     agent = build_test_agent_loop(
-        config=make_config(), message_observer=observer, backend=backend
+        config=make_config(stable_prompt_prefix=False),
+        message_observer=observer,
+        backend=backend,
     )
     agent.middleware_pipeline.add(InjectBeforeMiddleware())
 
@@ -588,3 +592,20 @@ async def test_empty_content_chunks_do_not_trigger_false_yields() -> None:
         ("ReasoningEvent", "Reasoning here more reasoning"),
         ("AssistantEvent", "Actual content"),
     ]
+
+
+@pytest.mark.asyncio
+async def test_streamed_events_share_the_stored_message_id() -> None:
+    backend = FakeBackend([
+        mock_llm_chunk(content="", reasoning_content="Thinking"),
+        mock_llm_chunk(content="Answer"),
+    ])
+    agent = build_test_agent_loop(
+        config=make_config(), backend=backend, enable_streaming=True
+    )
+
+    events = [event async for event in agent.act("Same id")]
+
+    streamed = [e for e in events if isinstance(e, AssistantEvent | ReasoningEvent)]
+    assert len(streamed) == 2
+    assert {e.message_id for e in streamed} == {agent.messages[-1].message_id}
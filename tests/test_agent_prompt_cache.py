@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from bloom.core.config import ModelConfig, ProviderConfig
+from bloom.core.llm.backend.generic import GenericBackend
+from bloom.core.middleware import (
+    ConversationContext,
+    MiddlewareAction,
+    MiddlewareResult,
+    ResetReason,
+)
+from bloom.core.types import AgentStats, LLMMessage, LLMUsage, Role
+from tests.conftest import build_test_agent_loop, build_test_bloom_config
+from tests.mock.utils import mock_llm_chunk
+from tests.stubs.fake_backend import FakeBackend
+
+
+class ReminderMiddleware:
+    async def before_turn(self, context: ConversationContext) -> MiddlewareResult:
+        return MiddlewareResult(
+            action=MiddlewareAction.INJECT_MESSAGE, message="<reminder>"
+        )
+
+    async def after_turn(self, context: ConversationContext) -> MiddlewareResult:
+        return MiddlewareResult()
+
+    def reset(self, reset_reason: ResetReason = ResetReason.STOP) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_injected_reminder_is_sent_after_history_without_persisting() -> None:
+    backend = FakeBackend([
+        [mock_llm_chunk(content="first")],
+        [mock_llm_chunk(content="second")],
+    ])
+    config = build_test_bloom_config(
+        system_prompt_id="tests",
+        include_project_context=False,
+        include_prompt_detail=False,
+        auto_compact_threshold=0,
+    )
+    agent = build_test_agent_loop(config=config, backend=backend)
+    agent.middleware_pipeline.add(ReminderMiddleware())
+
+    [_ async for _ in agent.act("one")]
+    [_ async for _ in agent.act("two")]
+
+    first, second = backend._requests_messages
+    assert first[-1].role == Role.user
+    assert first[-1].content == "<reminder>"
+    assert first[-2].content == "one"
+    # The second request starts with exactly what was sent the first time.
+    assert [m.content for m in second[: len(first) - 1]] == [
+        m.content for m in first[:-1]
+    ]
+    assert second[-1].content == "<reminder>"
+    assert all(m.content != "<reminder>" for m in agent.messages)
+
+
+class OneShotReminderMiddleware(ReminderMiddleware):
+    def __init__(self) -> None:
+        self.fired = False
+
+    async def before_turn(self, context: ConversationContext) -> MiddlewareResult:
+        if self.fired:
+            return MiddlewareResult()
+        self.fired = True
+        return await super().before_turn(context)
+
+
+@pytest.mark.asyncio
+async def test_reminder_is_sent_again_after_a_failed_request() -> None:
+    backend = FakeBackend(
+        [mock_llm_chunk(content="answer")],
+        exception_to_raise=RuntimeError("provider unavailable"),
+    )
+    config = build_test_bloom_config(
+        system_prompt_id="tests",
+        include_project_context=False,
+        include_prompt_detail=False,
+        auto_compact_threshold=0,
+    )
+    agent = build_test_agent_loop(config=config, backend=backend)
+    agent.middleware_pipeline.add(OneShotReminderMiddleware())
+
+    with pytest.raises(RuntimeError):
+        [_ async for _ in agent.act("one")]
+    backend._exception_to_raise = None
+    [_ async for _ in agent.act("two")]
+    [_ async for _ in agent.act("three")]
+
+    retried, after = backend._requests_messages
+    assert retried[-1].content == "<reminder>"
+    assert all(m.content != "<reminder>" for m in after)
+
+
+@pytest.mark.asyncio
+async def test_reload_keeps_system_prompt_while_history_exists(
+    tmp_working_directory: Path,
+) -> None:
+    config = build_test_bloom_config(
+        system_prompt_id="tests", include_project_context=True
+    )
+    agent = build_test_agent_loop(config=config, backend=FakeBackend([]))
+    system_message = agent.messages[0]
+    agent.messages.append(LLMMessage(role=Role.user, content="hi"))
+    (tmp_working_directory / "new_module.py").write_text("x = 1\n")
+
+    await agent.reload_with_initial_messages()
+
+    assert agent.messages[0] is system_message
+
+    agent.messages = agent.messages[:1]
+    await agent.reload_with_initial_messages()
+
+    assert "new_module.py" in (agent.messages[0].content or "")
+
+
+@pytest.mark.asyncio
+async def test_agent_accumulates_cached_prompt_tokens() -> None:
+    chunk = mock_llm_chunk(content="hi").model_copy(
+        update={"usage": LLMUsage(prompt_tokens=1_000, cached_tokens=800)}
+    )
+    agent = build_test_agent_loop(
+        config=build_test_bloom_config(
+            system_prompt_id="tests", auto_compact_threshold=0
+        ),
+        backend=FakeBackend([[chunk]]),
+    )
+
+    [_ async for _ in agent.act("hello")]
+
+    assert agent.stats.session_cached_tokens == 800
+    assert agent.stats.last_turn_cached_tokens == 800
+    assert agent.stats.cache_hit_ratio == pytest.approx(0.8)
+
+
+def test_session_cost_discounts_cached_tokens() -> None:
+    stats = AgentStats(session_prompt_tokens=2_000_000, session_cached_tokens=1_000_000)
+    stats.update_pricing(input_price=2.0, output_price=0.0)
+    assert stats.cache_savings == 0.0
+    assert stats.session_cost == pytest.approx(4.0)
+
+    stats.update_pricing(input_price=2.0, output_price=0.0, cached_input_price=0.5)
+    assert stats.cache_savings == pytest.approx(1.5)
+    assert stats.session_cost == pytest.approx(2.5)
+
+
+@pytest.mark.asyncio
+async def test_backend_parses_cached_prompt_tokens() -> None:
+    base_url = "https://api.example.com"
+    response = {
+        "id": "x",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": "hi"},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": 120,
+            "completion_tokens": 3,
+            "prompt_tokens_details": {"cached_tokens": 96},
+        },
+    }
+    with respx.mock(base_url=base_url) as mock_api:
+        mock_api.post("/v1/chat/completions").mock(
+            return_value=httpx.Response(status_code=200, json=response)
+        )
+        backend = GenericBackend(
+            provider=ProviderConfig(
+                name="provider_name",
+                api_base=f"{base_url}/v1",
+                api_key_env_var="API_KEY",
+            )
+        )
+        result = await backend.complete(
+            model=ModelConfig(name="model", provider="provider_name", alias="m"),
+            messages=[LLMMessage(role=Role.user, content="hi")],
+            temperature=0.2,
+            tools=None,
+            max_tokens=None,
+            tool_choice=None,
+            extra_headers=None,
+        )
+
+    assert result.usage is not None
+    assert result.usage.cached_tokens == 96
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+
+from bloom.core.agent_loop import AgentLoop
+from bloom.core.agents.models import BuiltinAgentName
+from bloom.core.config import BloomConfig
+from bloom.core.tools.base import BaseToolConfig, ToolPermission
+from bloom.core.tools.builtins.read_file import ReadFileResult
+from bloom.core.tools.speculation import ToolCallDeltaParser
+from bloom.core.types import (
+    FunctionCall,
+    LLMChunk,
+    Role,
+    ToolCall,
+    ToolCallEvent,
+    ToolResultEvent,
+)
+from tests.conftest import build_test_agent_loop, build_test_bloom_config
+from tests.mock.utils import mock_llm_chunk
+from tests.stubs.fake_backend import FakeBackend
+
+
+class ObservingBackend(FakeBackend):
+    """Streams chunks while yielding to the event loop, recording read_file
+    history after each chunk so tests can see speculative work happen mid-stream.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.agent: AgentLoop | None = None
+        self.reads_seen_during_stream: list[int] = []
+
+    async def complete_streaming(self, **kwargs) -> AsyncGenerator[LLMChunk]:
+        async for chunk in super().complete_streaming(**kwargs):
+            yield chunk
+            await asyncio.sleep(0.05)
+            if self.agent is not None:
+                read_file = self.agent.tool_manager.get("read_file")
+                self.reads_seen_during_stream.append(
+                    len(read_file.state.recently_read_files)  # type: ignore[attr-defined]
+                )
+
+
+def make_config(
+    *, speculative: bool = True, permission: ToolPermission = ToolPermission.ALWAYS
+) -> BloomConfig:
+    return build_test_bloom_config(
+        auto_compact_threshold=0,
+        system_prompt_id="tests",
+        include_project_context=False,
+        include_prompt_detail=False,
+        enabled_tools=["read_file", "todo"],
+        tools={"read_file": BaseToolConfig(permission=permission)},
+        speculative_tool_execution=speculative,
+    )
+
+
+def read_file_call(call_id: str, arguments: str, index: int = 0) -> ToolCall:
+    return ToolCall(
+        id=call_id,
+        index=index,
+        function=FunctionCall(name="read_file", arguments=arguments),
+    )
+
+
+@pytest.fixture
+def sample_file(tmp_working_directory: Path) -> Path:
+    path = tmp_working_directory / "notes.txt"
+    path.write_text("hello\nworld\n", encoding="utf-8")
+    return path
+
+
+def make_agent(
+    backend: ObservingBackend, config: BloomConfig, agent_name: str
+) -> AgentLoop:
+    agent = build_test_agent_loop(
+        config=config, backend=backend, agent_name=agent_name, enable_streaming=True
+    )
+    backend.agent = agent
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_read_only_tool_starts_before_stream_ends(sample_file: Path) -> None:
+    backend = ObservingBackend([
+        [
+            mock_llm_chunk(
+                content="",
+                tool_calls=[read_file_call("call_1", f'{{"path": "{sample_file}"}}')],
+            ),
+            mock_llm_chunk(content="Still "),
+            mock_llm_chunk(content="thinking..."),
+        ],
+        [mock_llm_chunk(content="Done.")],
+    ])
+    agent = make_agent(backend, make_config(), BuiltinAgentName.DEFAULT)
+
+    events = [event async for event in agent.act("Read the notes.")]
+
+    assert backend.reads_seen_during_stream[1] == 1
+    result_event = next(e for e in events if isinstance(e, ToolResultEvent))
+    assert isinstance(result_event.result, ReadFileResult)
+    assert result_event.result.content == "hello\nworld\n"
+    read_file = agent.tool_manager.get("read_file")
+    assert len(read_file.state.recently_read_files) == 1  # type: ignore[attr-defined]
+    tool_msgs = [m for m in agent.messages if m.role == Role.tool]
+    assert len(tool_msgs) == 1
+    assert "hello" in (tool_msgs[0].content or "")
+
+
+@pytest.mark.asyncio
+async def test_speculation_waits_for_complete_arguments(sample_file: Path) -> None:
+    backend = ObservingBackend([
+        [
+            mock_llm_chunk(
+                content="", tool_calls=[read_file_call("call_1", '{"path": ')]
+            ),
+            mock_llm_chunk(
+                content="", tool_calls=[read_file_call("call_1", f'"{sample_file}"}}')]
+            ),
+            mock_llm_chunk(content="ok"),
+        ],
+        [mock_llm_chunk(content="Done.")],
+    ])
+    agent = make_agent(backend, make_config(), BuiltinAgentName.DEFAULT)
+
+    events = [event async for event in agent.act("Read the notes.")]
+
+    assert backend.reads_seen_during_stream[:2] == [0, 1]
+    assert [type(e) for e in events if isinstance(e, ToolCallEvent)] == [ToolCallEvent]
+
+
+@pytest.mark.asyncio
+async def test_tools_requiring_approval_are_not_speculated(sample_file: Path) -> None:
+    backend = ObservingBackend([
+        [
+            mock_llm_chunk(
+                content="",
+                tool_calls=[read_file_call("call_1", f'{{"path": "{sample_file}"}}')],
+            ),
+            mock_llm_chunk(content="waiting"),
+        ],
+        [mock_llm_chunk(content="Done.")],
+    ])
+    agent = make_agent(
+        backend, make_config(permission=ToolPermission.ASK), BuiltinAgentName.DEFAULT
+    )
+
+    events = [event async for event in agent.act("Read the notes.")]
+
+    assert backend.reads_seen_during_stream[:2] == [0, 0]
+    result_event = next(e for e in events if isinstance(e, ToolResultEvent))
+    assert result_event.skipped is True
+
+
+@pytest.mark.asyncio
+async def test_speculation_can_be_disabled(sample_file: Path) -> None:
+    backend = ObservingBackend([
+        [
+            mock_llm_chunk(
+                content="",
+                tool_calls=[read_file_call("call_1", f'{{"path": "{sample_file}"}}')],
+            ),
+            mock_llm_chunk(content="waiting"),
+        ],
+        [mock_llm_chunk(content="Done.")],
+    ])
+    agent = make_agent(
+        backend, make_config(speculative=False), BuiltinAgentName.DEFAULT
+    )
+
+    events = [event async for event in agent.act("Read the notes.")]
+
+    assert backend.reads_seen_during_stream[:2] == [0, 0]
+    result_event = next(e for e in events if isinstance(e, ToolResultEvent))
+    assert isinstance(result_event.result, ReadFileResult)
+
+
+@pytest.mark.asyncio
+async def test_speculative_failure_is_reported_as_tool_error(
+    tmp_working_directory: Path,
+) -> None:
+    missing = tmp_working_directory / "missing.txt"
+    backend = ObservingBackend([
+        [
+            mock_llm_chunk(
+                content="",
+                tool_calls=[read_file_call("call_1", f'{{"path": "{missing}"}}')],
+            )
+        ],
+        [mock_llm_chunk(content="Done.")],
+    ])
+    agent = make_agent(backend, make_config(), BuiltinAgentName.DEFAULT)
+
+    events = [event async for event in agent.act("Read the notes.")]
+
+    result_event = next(e for e in events if isinstance(e, ToolResultEvent))
+    assert result_event.error is not None
+    assert "File not found" in result_event.error
+    assert agent.stats.tool_calls_failed == 1
+
+
+def test_delta_parser_emits_each_call_once_when_json_completes() -> None:
+    parser = ToolCallDeltaParser()
+
+    assert parser.feed([read_file_call("a", '{"path"')]) == []
+    assert parser.feed([read_file_call("", ': "x.py"')]) == []
+    completed = parser.feed([read_file_call("", "}")])
+
+    assert len(completed) == 1
+    assert completed[0].call_id == "a"
+    assert completed[0].tool_name == "read_file"
+    assert completed[0].raw_args == {"path": "x.py"}
+    assert parser.feed([read_file_call("", "")]) == []
+
+
+def test_delta_parser_tracks_parallel_calls_by_index() -> None:
+    parser = ToolCallDeltaParser()
+
+    first = parser.feed([
+        read_file_call("a", '{"path": "a.py"}', index=0),
+        read_file_call("b", '{"path": ', index=1),
+    ])
+    second = parser.feed([read_file_call("", '"b.py"}', index=1)])
+
+    assert [c.call_id for c in first] == ["a"]
+    assert [c.call_id for c in second] == ["b"]
+    assert second[0].raw_args == {"path": "b.py"}
+
+
+@pytest.mark.asyncio
+async def test_reads_after_a_write_are_not_speculated(sample_file: Path) -> None:
+    write = ToolCall(
+        id="call_1",
+        index=0,
+        function=FunctionCall(
+            name="write_file",
+            arguments=(
+                f'{{"path": "{sample_file}", "content": "new\\n", "overwrite": true}}'
+            ),
+        ),
+    )
+    read = read_file_call("call_2", f'{{"path": "{sample_file}"}}', index=1)
+    backend = ObservingBackend([
+        [mock_llm_chunk(content="", tool_calls=[write, read]), mock_llm_chunk("ok")],
+        [mock_llm_chunk(content="Done.")],
+    ])
+    config = build_test_bloom_config(
+        auto_compact_threshold=0,
+        system_prompt_id="tests",
+        include_project_context=False,
+        include_prompt_detail=False,
+        enabled_tools=["read_file", "write_file"],
+        tools={
+            "read_file": BaseToolConfig(permission=ToolPermission.ALWAYS),
+            "write_file": BaseToolConfig(permission=ToolPermission.ALWAYS),
+        },
+        speculative_tool_execution=True,
+    )
+    agent = make_agent(backend, config, BuiltinAgentName.DEFAULT)
+
+    events = [event async for event in agent.act("Rewrite and check the notes.")]
+
+    assert backend.reads_seen_during_stream[0] == 0
+    read_result = next(
+        e
+        for e in events
+        if isinstance(e, ToolResultEvent) and isinstance(e.result, ReadFileResult)
+    )
+    assert read_result.result.content == "new\n"  # type: ignore[union-attr]
+
+
+def test_delta_parser_returns_calls_in_index_order() -> None:
+    parser = ToolCallDeltaParser()
+
+    early = parser.feed([
+        read_file_call("a", '{"path": ', index=0),
+        read_file_call("b", '{"path": "b.py"}', index=1),
+    ])
+    both = parser.feed([read_file_call("", '"a.py"}', index=0)])
+
+    assert early == []
+    assert [c.call_id for c in both] == ["a", "b"]
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+
+from pydantic import BaseModel
+import pytest
+
+from bloom.core.agent_loop import AgentLoop
+from bloom.core.agents.models import BuiltinAgentName
+from bloom.core.agents.subagents import SubagentBudget, SubagentPool
+from bloom.core.config import BloomConfig
+from bloom.core.tools.base import BaseTool, BaseToolConfig, BaseToolState, InvokeContext
+from bloom.core.types import (
+    FunctionCall,
+    LLMMessage,
+    Role,
+    ToolCall,
+    ToolResultEvent,
+    ToolStreamEvent,
+)
+from tests.conftest import build_test_agent_loop, build_test_bloom_config
+from tests.mock.utils import mock_llm_chunk
+from tests.stubs.fake_backend import FakeBackend
+
+
+class SlowArgs(BaseModel):
+    delay: float
+
+
+class SlowResult(BaseModel):
+    delay: float
+
+
+class SlowTool(BaseTool[SlowArgs, SlowResult, BaseToolConfig, BaseToolState]):
+    running = 0
+    peak = 0
+
+    @classmethod
+    def get_name(cls) -> str:
+        return "slow"
+
+    @property
+    def max_concurrency(self) -> int:
+        return 4
+
+    async def run(
+        self, args: SlowArgs, ctx: InvokeContext | None = None
+    ) -> AsyncGenerator[ToolStreamEvent | SlowResult, None]:
+        type(self).running += 1
+        type(self).peak = max(type(self).peak, type(self).running)
+        await asyncio.sleep(args.delay)
+        type(self).running -= 1
+        yield SlowResult(delay=args.delay)
+
+
+def slow_call(call_id: str, delay: float, index: int) -> ToolCall:
+    return ToolCall(
+        id=call_id,
+        index=index,
+        function=FunctionCall(name="slow", arguments=f'{{"delay": {delay}}}'),
+    )
+
+
+def make_config() -> BloomConfig:
+    return build_test_bloom_config(
+        auto_compact_threshold=0,
+        system_prompt_id="tests",
+        include_project_context=False,
+        include_prompt_detail=False,
+        enabled_tools=["slow"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tool_calls_overlap_and_answer_every_call() -> None:
+    backend = FakeBackend([
+        [
+            mock_llm_chunk(
+                content="Fanning out.",
+                tool_calls=[slow_call("a", 0.2, 0), slow_call("b", 0.05, 1)],
+            )
+        ],
+        [mock_llm_chunk(content="Done.")],
+    ])
+    agent = build_test_agent_loop(
+        config=make_config(), agent_name=BuiltinAgentName.AUTO_APPROVE, backend=backend
+    )
+    agent.tool_manager._available["slow"] = SlowTool
+    SlowTool.running = SlowTool.peak = 0
+
+    events = [ev async for ev in agent.act("go")]
+
+    results = [e for e in events if isinstance(e, ToolResultEvent)]
+    assert SlowTool.peak == 2
+    # The shorter call finishes first even though it was issued second.
+    assert [r.tool_call_id for r in results] == ["b", "a"]
+    assert all(r.error is None for r in results)
+    tool_ids = {m.tool_call_id for m in agent.messages if m.role == Role.tool}
+    assert tool_ids == {"a", "b"}
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_a_returned_subagent_with_a_clean_history() -> None:
+    parent = build_test_agent_loop(config=make_config(), backend=FakeBackend([]))
+    pool = parent.subagent_pool
+
+    async with pool.lease(BuiltinAgentName.EXPLORE) as first:
+        first.messages.append(LLMMessage(role=Role.user, content="old task"))
+    assert pool.idle_count(BuiltinAgentName.EXPLORE) == 1
+
+    async with pool.lease(BuiltinAgentName.EXPLORE) as second:
+        assert second is first
+        assert [m.role for m in second.messages] == [Role.system]
+    assert pool.idle_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_drops_a_subagent_whose_lease_raised() -> None:
+    parent = build_test_agent_loop(config=make_config(), backend=FakeBackend([]))
+    pool = parent.subagent_pool
+
+    with pytest.raises(RuntimeError):
+        async with pool.lease(BuiltinAgentName.EXPLORE):
+            raise RuntimeError("interrupted")
+
+    assert pool.idle_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_keys_loops_by_budget() -> None:
+    built: list[SubagentBudget] = []
+    parent = build_test_agent_loop(config=make_config(), backend=FakeBackend([]))
+
+    def factory(agent_name: str, budget: SubagentBudget):
+        built.append(budget)
+        return parent._spawn_subagent(agent_name, budget)
+
+    pool = SubagentPool(factory)
+    async with pool.lease(BuiltinAgentName.EXPLORE, SubagentBudget(max_turns=3)) as a:
+        assert a._max_turns == 3
+    async with pool.lease(BuiltinAgentName.EXPLORE, SubagentBudget(max_turns=5)):
+        pass
+
+    assert built == [SubagentBudget(max_turns=3), SubagentBudget(max_turns=5)]
+
+
+def test_subagent_shares_backend_and_tool_catalog_with_parent() -> None:
+    parent = build_test_agent_loop(config=make_config(), backend=FakeBackend([]))
+
+    child = parent._spawn_subagent(BuiltinAgentName.EXPLORE, SubagentBudget())
+
+    assert child.backend is parent.backend
+    assert child.tool_manager.catalog == parent.tool_manager.catalog
+    assert not child.config.session_logging.enabled
+
+
+def test_subagent_config_is_a_private_copy() -> None:
+    config = make_config()
+
+    child = AgentLoop.for_subagent(config, BuiltinAgentName.EXPLORE, SubagentBudget())
+
+    assert child._base_config.active_model == config.active_model
+    assert not child._base_config.session_logging.enabled
+    assert child._base_config.tools is not config.tools
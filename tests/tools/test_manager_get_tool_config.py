@@ -71,6 +71,36 @@ def test_falls_back_to_base_config_for_unknown_tool(tool_manager):
     assert config.permission == ToolPermission.ASK
 
 
+def test_resolved_config_is_reused(tool_manager):
+    assert tool_manager.get_tool_config("bash") is tool_manager.get_tool_config("bash")
+
+
+def test_in_place_override_changes_are_picked_up():
+    bloom_config = build_test_bloom_config(
+        system_prompt_id="tests",
+        include_project_context=False,
+        tools={"bash": BaseToolConfig(permission=ToolPermission.ASK)},
+    )
+    manager = ToolManager(lambda: bloom_config)
+    assert manager.get_tool_config("bash").permission == ToolPermission.ASK
+
+    bloom_config.tools["bash"].permission = ToolPermission.ALWAYS
+
+    assert manager.get_tool_config("bash").permission == ToolPermission.ALWAYS
+
+
+def test_resolved_configs_follow_a_replaced_bloom_config(config):
+    current = {"config": config}
+    manager = ToolManager(lambda: current["config"])
+    assert manager.get_tool_config("bash").permission == ToolPermission.ASK
+
+    current["config"] = config.model_copy(
+        update={"tools": {"bash": BaseToolConfig(permission=ToolPermission.NEVER)}}
+    )
+
+    assert manager.get_tool_config("bash").permission == ToolPermission.NEVER
+
+
 class TestToolManagerFiltering:
     def test_enabled_tools_filters_to_only_enabled(self):
         bloom_config = build_test_bloom_config(
@@ -106,7 +106,7 @@ class TestTaskToolExecution:
             mock_agent_loop.act = mock_act
             mock_agent_loop.messages = mock_messages
             mock_agent_loop.set_approval_callback = MagicMock()
-            mock_agent_loop_class.return_value = mock_agent_loop
+            mock_agent_loop_class.for_subagent.return_value = mock_agent_loop
 
             args = TaskArgs(task="explore the codebase", agent="explore")
             result = await collect_result(task_tool.run(args, ctx))
@@ -134,7 +134,7 @@ class TestTaskToolExecution:
             mock_agent_loop.act = mock_act
             mock_agent_loop.messages = mock_messages
             mock_agent_loop.set_approval_callback = MagicMock()
-            mock_agent_loop_class.return_value = mock_agent_loop
+            mock_agent_loop_class.for_subagent.return_value = mock_agent_loop
 
             args = TaskArgs(task="do something", agent="explore")
             result = await collect_result(task_tool.run(args, ctx))
@@ -158,7 +158,7 @@ class TestTaskToolExecution:
             mock_agent_loop.act = mock_act
             mock_agent_loop.messages = mock_messages
             mock_agent_loop.set_approval_callback = MagicMock()
-            mock_agent_loop_class.return_value = mock_agent_loop
+            mock_agent_loop_class.for_subagent.return_value = mock_agent_loop
 
             args = TaskArgs(task="do something", agent="explore")
             result = await collect_result(task_tool.run(args, ctx))
@@ -166,3 +166,28 @@ class TestTaskToolExecution:
             assert isinstance(result, TaskResult)
             assert result.completed is False
             assert "Simulated error" in result.response
+
+    @pytest.mark.asyncio
+    async def test_subagent_inherits_loaded_config(
+        self, task_tool: Task, ctx: InvokeContext
+    ) -> None:
+        async def mock_act(task: str):
+            yield AssistantEvent(content="done")
+
+        with (
+            patch("bloom.core.tools.builtins.task.AgentLoop") as mock_agent_loop_class,
+            patch("bloom.core.config.BloomConfig.load") as mock_load,
+        ):
+            mock_agent_loop = MagicMock()
+            mock_agent_loop.act = mock_act
+            mock_agent_loop.messages = []
+            mock_agent_loop_class.for_subagent.return_value = mock_agent_loop
+
+            args = TaskArgs(task="do something", agent="explore")
+            await collect_result(task_tool.run(args, ctx))
+
+        mock_load.assert_not_called()
+        assert ctx.agent_manager is not None
+        parent_config = ctx.agent_manager.base_config
+        base_config = mock_agent_loop_class.for_subagent.call_args.args[0]
+        assert base_config is parent_config
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+from bloom.core.tools import discovery, manager
+from bloom.core.tools.manager import ToolManager
+
+TOOL_CODE = """
+from collections.abc import AsyncGenerator
+
+from pydantic import BaseModel
+
+from bloom.core.tools.base import BaseTool, BaseToolConfig, BaseToolState
+
+
+class Args(BaseModel):
+    pass
+
+
+class {name}(BaseTool[Args, Args, BaseToolConfig, BaseToolState]):
+    description = "{name}"
+
+    async def run(self, args: Args, ctx=None) -> AsyncGenerator[Args, None]:
+        yield args
+"""
+
+
+@pytest.fixture
+def tools_dir(tmp_path: Path) -> Path:
+    path = tmp_path / "tools"
+    (path / "nested").mkdir(parents=True)
+    (path / "alpha.py").write_text(TOOL_CODE.format(name="AlphaTool"))
+    (path / "nested" / "helpers.py").write_text("VALUE = 1\n")
+    return path
+
+
+def start_new_process() -> None:
+    """Forget everything a previous process would not have had in memory."""
+    manager._loaded_tool_classes.clear()
+    discovery._indexes.clear()
+    for name in [m for m in sys.modules if m.startswith("bloom_tools_discovered_")]:
+        del sys.modules[name]
+
+
+def discovered_names(search_paths: list[Path]) -> set[str]:
+    return {cls.get_name() for cls in ToolManager._iter_tool_classes(search_paths)}
+
+
+@pytest.fixture
+def imports(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    seen: list[str] = []
+    original = ToolManager._import_tool_module
+
+    def spy(file_path: Path):
+        seen.append(file_path.name)
+        return original(file_path)
+
+    monkeypatch.setattr(ToolManager, "_import_tool_module", staticmethod(spy))
+    return seen
+
+
+def test_warm_start_skips_files_without_tools(
+    tools_dir: Path, imports: list[str]
+) -> None:
+    start_new_process()
+    assert discovered_names([tools_dir]) == {"alpha_tool"}
+    assert sorted(imports) == ["alpha.py", "helpers.py"]
+
+    start_new_process()
+    imports.clear()
+    assert discovered_names([tools_dir]) == {"alpha_tool"}
+    assert imports == ["alpha.py"]
+
+
+def test_rediscovery_in_the_same_process_imports_nothing(
+    tools_dir: Path, imports: list[str]
+) -> None:
+    start_new_process()
+    discovered_names([tools_dir])
+    imports.clear()
+
+    assert discovered_names([tools_dir]) == {"alpha_tool"}
+    assert imports == []
+
+
+def test_changed_and_added_files_are_picked_up(tools_dir: Path) -> None:
+    start_new_process()
+    discovered_names([tools_dir])
+
+    (tools_dir / "nested" / "helpers.py").write_text(
+        TOOL_CODE.format(name="HelperTool") + "\n# grown\n"
+    )
+    (tools_dir / "nested" / "beta.py").write_text(TOOL_CODE.format(name="BetaTool"))
+    start_new_process()
+
+    assert discovered_names([tools_dir]) == {"alpha_tool", "helper_tool", "beta_tool"}
+
+
+def test_discovery_timings_lists_each_file(tools_dir: Path) -> None:
+    start_new_process()
+
+    timings = {t.path.name: t for t in ToolManager.discovery_timings([tools_dir])}
+
+    assert set(timings) == {"alpha.py", "helpers.py"}
+    assert timings["alpha.py"].tools == ("alpha_tool",)
+    assert timings["alpha.py"].imported
+    assert timings["helpers.py"].tools == ()